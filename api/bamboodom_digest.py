@@ -26,6 +26,7 @@ async def bamboodom_digest_handler(request: web.Request) -> web.Response:
     redis = request.app["redis"]
     bot = request.app["bot"]
     settings = request.app["settings"]
+    http_clients = request.app["http_clients"]
 
     msg_id = request.get("qstash_msg_id", "")
     lock_key = f"bamboodom:digest_lock:{msg_id}"
@@ -37,7 +38,7 @@ async def bamboodom_digest_handler(request: web.Request) -> web.Response:
         return web.json_response({"status": "duplicate"})
 
     try:
-        text = await collect_and_render()
+        text = await collect_and_render(http_clients)
     except Exception:
         log.exception("bamboodom_digest_collect_failed")
         return web.json_response({"status": "error", "reason": "collect_failed"})
@@ -85,6 +85,7 @@ async def google_callback_handler(request: web.Request) -> web.Response:
             client_id=settings.google_oauth_client_id,
             client_secret=settings.google_oauth_client_secret.get_secret_value(),
             redirect_uri=_redirect_uri(),
+            http_client=request.app["http_clients"].get("google"),
         )
     except Exception as exc:
         log.warning("gsc_token_exchange_failed", exc_info=True)
@@ -10,6 +10,13 @@ from typing import Any
 import structlog
 from aiohttp import web
 
+from bot.warmup import warmup_report
+from services.adaptive_limit import AdaptiveLimiter
+from services.http_clients import HttpClientRegistry
+from services.http_retry import provider_states
+from services.publish_queue import PublishWorkerPool
+from services.storage import ImageStorage
+
 log = structlog.get_logger()
 
 _VERSION = "2.0.0"
@@ -86,20 +93,53 @@ async def health_handler(request: web.Request) -> web.Response:
         if overall != "down":
             overall = "degraded"
 
-    # Semaphore availability (publish backpressure)
-    from bot.main import PUBLISH_SEMAPHORE
-
-    semaphore_info: dict[str, Any] = {
-        "available": PUBLISH_SEMAPHORE._value,
-        "total": 10,
+    payload: dict[str, Any] = {
+        "status": overall,
+        "version": _VERSION,
+        "uptime_seconds": round(time.monotonic() - _START_TIME),
+        "checks": checks,
     }
 
-    return web.json_response(
-        {
-            "status": overall,
-            "version": _VERSION,
-            "uptime_seconds": round(time.monotonic() - _START_TIME),
-            "checks": checks,
-            "publish_semaphore": semaphore_info,
-        }
-    )
+    payload.update(_runtime_reports(request.app))
+
+    # Startup warm-up: cold vs warm latency per core upstream
+    warmup = warmup_report()
+    if warmup:
+        payload["warmup"] = warmup
+
+    # Per-provider circuit breakers (Firecrawl, Serper, DataForSEO, WP hosts)
+    payload["circuit_breakers"] = provider_states()
+
+    return web.json_response(payload)
+
+
+def _runtime_reports(app: web.Application) -> dict[str, Any]:
+    """Metrics of long-lived components that are wired into the app."""
+    payload: dict[str, Any] = {}
+
+    # Publish worker pool: concurrency, in-flight jobs, outcomes since start
+    publish_workers = app.get("publish_workers")
+    if isinstance(publish_workers, PublishWorkerPool):
+        payload["publish_workers"] = publish_workers.stats()
+
+    # Adaptive concurrency: current limit, load signals, per-gate usage
+    limiter = app.get("concurrency_limiter")
+    if isinstance(limiter, AdaptiveLimiter):
+        payload["concurrency"] = limiter.report()
+
+    # Firecrawl per-URL cache: hit rate + credits saved since process start
+    firecrawl = app.get("firecrawl_client")
+    cache_report = firecrawl.cache_report() if firecrawl is not None else None
+    if isinstance(cache_report, dict):
+        payload["firecrawl_cache"] = cache_report
+
+    # Image storage: content-hash dedup and batch signing savings since start
+    image_storage = app.get("image_storage")
+    if isinstance(image_storage, ImageStorage):
+        payload["image_storage"] = image_storage.stats.report()
+
+    # Pooled HTTP clients: connection reuse per upstream
+    http_clients = app.get("http_clients")
+    if isinstance(http_clients, HttpClientRegistry):
+        payload["http_pools"] = http_clients.stats()
+    return payload
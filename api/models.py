@@ -24,6 +24,13 @@ class CleanupPayload(BaseModel):
     idempotency_key: str = ""
 
 
+class PrefetchPayload(BaseModel):
+    """QStash research prefetch webhook payload (warms caches before publish slots)."""
+
+    action: Literal["prefetch"] = "prefetch"
+    idempotency_key: str = ""
+
+
 class NotifyPayload(BaseModel):
     """QStash notifications webhook payload."""
 
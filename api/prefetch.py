@@ -0,0 +1,60 @@
+"""QStash research prefetch webhook handler.
+
+POST /api/prefetch — warm research/Serper/Firecrawl caches before publish slots.
+Always returns 200.
+"""
+
+import structlog
+from aiohttp import web
+
+from api import require_qstash_signature
+from api.models import PrefetchPayload
+from cache.keys import PREFETCH_LOCK_TTL, CacheKeys
+from services.prefetch import ResearchPrefetchService
+
+log = structlog.get_logger()
+
+
+@require_qstash_signature
+async def prefetch_handler(request: web.Request) -> web.Response:
+    """Handle QStash prefetch trigger with idempotency."""
+    redis = request.app["redis"]
+
+    # Idempotency lock via Upstash-Message-Id
+    msg_id = request["qstash_msg_id"]
+    lock_key = CacheKeys.prefetch_lock(msg_id)
+    acquired = await redis.set(lock_key, "1", nx=True, ex=PREFETCH_LOCK_TTL)
+    if not acquired:
+        return web.json_response({"status": "duplicate"})
+
+    try:
+        PrefetchPayload.model_validate(request["verified_body"])
+    except Exception:
+        log.warning("prefetch_invalid_payload", body=request["verified_body"])
+        return web.json_response({"status": "error", "reason": "invalid_payload"})
+
+    try:
+        settings = request.app["settings"]
+        service = ResearchPrefetchService(
+            db=request.app["db"],
+            redis=redis,
+            ai_orchestrator=request.app["ai_orchestrator"],
+            encryption_key=settings.encryption_key.get_secret_value(),
+            serper_client=request.app.get("serper_client"),
+            firecrawl_client=request.app.get("firecrawl_client"),
+            lead_minutes=settings.research_prefetch_lead_minutes,
+        )
+        result = await service.execute()
+        return web.json_response(
+            {
+                "status": "ok",
+                "due": result.due,
+                "warmed": result.warmed,
+                "skipped": result.skipped,
+                "failed": result.failed,
+            }
+        )
+
+    except Exception:
+        log.exception("prefetch_handler_error")
+        return web.json_response({"status": "error", "reason": "internal_error"})
@@ -1,10 +1,11 @@
 """QStash auto-publish webhook handler.
 
-POST /api/publish — thin aiohttp wrapper.
-Always returns 200 (except semaphore timeout / shutdown -> 503).
+POST /api/publish — enqueues a publish_jobs row and returns 202.
+The pipeline itself runs in services.publish_queue.PublishWorkerPool.
+Returns 503 only on shutdown or when the job could not be stored.
 """
 
-import asyncio
+from typing import Any
 
 import structlog
 from aiohttp import web
@@ -13,8 +14,10 @@ from api import require_qstash_signature
 from api.models import PublishPayload
 from bot.texts import strings as S
 from bot.texts.emoji import E
-from cache.keys import PUBLISH_LOCK_TTL, CacheKeys
+from db.models import PublishJob
+from services.checkpoints import publish_run_key
 from services.publish import PublishOutcome, PublishService
+from services.publish_queue import RetryableJobError
 
 log = structlog.get_logger()
 
@@ -75,78 +78,92 @@ def _build_notification_text(result: PublishOutcome) -> str:
 
 @require_qstash_signature
 async def publish_handler(request: web.Request) -> web.Response:
-    """Handle QStash publish trigger with idempotency and backpressure."""
-    from bot.main import PUBLISH_SEMAPHORE, SHUTDOWN_EVENT
+    """Accept a QStash publish trigger into the durable job queue.
 
-    redis = request.app["redis"]
+    Returns as soon as the job is stored; the pipeline runs in the worker
+    pool (run_publish_job), so QStash never waits on it or retries it.
+    """
+    from bot.main import SHUTDOWN_EVENT
 
-    # 1. Pre-semaphore shutdown check
+    # 1. Shutdown check: let QStash deliver to the replacement container
     if SHUTDOWN_EVENT.is_set():
         return web.Response(status=503, headers={"Retry-After": "60"})
 
-    # 2. Idempotency lock via Upstash-Message-Id (unique per trigger, same on retry)
-    msg_id = request["qstash_msg_id"]
-    lock_key = CacheKeys.publish_lock(msg_id)
-    acquired = await redis.set(lock_key, "1", nx=True, ex=PUBLISH_LOCK_TTL)
-    if not acquired:
-        return web.json_response({"status": "duplicate"})
-
-    # 3. Validate payload
+    # 2. Validate payload
     try:
         payload = PublishPayload.model_validate(request["verified_body"])
     except Exception:
         log.warning("publish_invalid_payload", body=request["verified_body"])
         return web.json_response({"status": "error", "reason": "invalid_payload"})
 
-    # 4. Acquire semaphore with timeout (backpressure).
-    #    Timeout covers ONLY semaphore wait, NOT the pipeline itself.
-    #    Article pipeline takes 300-400s (outline+expand+critique+images+WP).
-    #    Wrapping pipeline in 300s timeout caused CancelledError that bypassed
-    #    except-Exception logging, returned 503, and triggered infinite QStash retries.
-    try:
-        async with asyncio.timeout(300):
-            await PUBLISH_SEMAPHORE.acquire()
-    except TimeoutError:
-        await redis.delete(lock_key)
-        return web.Response(status=503, headers={"Retry-After": "120"})
-
+    # 3. Enqueue. Upstash-Message-Id (unique per trigger, same on retry) is the
+    #    job's idempotency key, so a QStash redelivery is a no-op. Without it
+    #    every trigger would share the key "" and all but the first would be
+    #    dropped as duplicates, so the delivery is rejected instead.
+    msg_id = request["qstash_msg_id"]
+    if not msg_id:
+        log.error("publish_missing_message_id", schedule_id=payload.schedule_id)
+        return web.json_response({"status": "error", "reason": "missing_message_id"}, status=400)
+    queue = request.app["publish_queue"]
     try:
-        # 5. Post-semaphore shutdown check
-        if SHUTDOWN_EVENT.is_set():
-            await redis.delete(lock_key)
-            return web.Response(status=503, headers={"Retry-After": "60"})
-
-        # 6. Execute pipeline (no timeout — pipeline has own per-step timeouts)
-        service = PublishService(
-            db=request.app["db"],
-            redis=request.app["redis"],
-            http_client=request.app["http_client"],
-            ai_orchestrator=request.app["ai_orchestrator"],
-            image_storage=request.app["image_storage"],
-            admin_ids=request.app["settings"].admin_ids,
-            scheduler_service=request.app.get("scheduler_service"),
-            serper_client=request.app.get("serper_client"),
-            firecrawl_client=request.app.get("firecrawl_client"),
-            settings=request.app["settings"],
+        job = await queue.enqueue(
+            msg_id,
+            payload.model_dump(mode="json"),
+            max_attempts=request.app["settings"].publish_job_max_attempts,
         )
-        result = await service.execute(payload)
-
-        # 7. Notify user if configured (EDGE_CASES.md notification table)
-        if result.notify and result.user_id:
-            bot = request.app["bot"]
-            try:
-                text = _build_notification_text(result)
-                await bot.send_message(result.user_id, text, parse_mode="HTML")
-            except Exception:
-                log.warning("publish_notify_failed", user_id=result.user_id)
-
-        return web.json_response({"status": result.status, "reason": result.reason})
-
     except Exception:
-        log.exception("publish_handler_error")
-        # Don't delete lock — prevents double publish on QStash retry.
-        # Return 200 to stop QStash retries (aiohttp-handlers rule).
-        # Lock expires via TTL (5 min).
-        return web.json_response({"status": "error", "reason": "internal_error"})
-    finally:
-        PUBLISH_SEMAPHORE.release()
+        # Nothing stored — let QStash retry the delivery
+        log.exception("publish_enqueue_failed", schedule_id=payload.schedule_id)
+        return web.Response(status=503, headers={"Retry-After": "30"})
+    if job is None:
+        return web.json_response({"status": "duplicate"})
+
+    workers = request.app.get("publish_workers")
+    if workers is not None:
+        workers.notify()
+    return web.json_response({"status": "queued", "job_id": job.id}, status=202)
+
+
+async def run_publish_job(app: web.Application, job: PublishJob) -> dict[str, Any]:
+    """Worker-pool handler: run the publish pipeline for one job and notify the user.
+
+    No timeout around the pipeline — it has its own per-step timeouts, and the
+    job lease is kept alive by the pool's heartbeat. Exceptions propagate to
+    the pool, which fails the job for good: they may come after the post was
+    published, and a retry would publish and charge twice.
+
+    Stage checkpoints are keyed by the job's idempotency key (the QStash message
+    id), so a retried job resumes after its last completed stage. Only a
+    resumable failure (status "retry", nothing published) is raised as
+    RetryableJobError, which the pool requeues while attempts remain.
+    """
+    payload = PublishPayload.model_validate(job.payload)
+    service = PublishService(
+        db=app["db"],
+        redis=app["redis"],
+        http_client=app["http_client"],
+        ai_orchestrator=app["ai_orchestrator"],
+        image_storage=app["image_storage"],
+        admin_ids=app["settings"].admin_ids,
+        scheduler_service=app.get("scheduler_service"),
+        serper_client=app.get("serper_client"),
+        firecrawl_client=app.get("firecrawl_client"),
+        settings=app["settings"],
+    )
+    result = await service.execute(
+        payload,
+        run_key=publish_run_key(job.idempotency_key),
+        can_retry=job.attempts < job.max_attempts,
+    )
+    if result.status == "retry":
+        raise RetryableJobError(f"Resumable publish failure: {result.reason}")
+
+    # Notify user if configured (EDGE_CASES.md notification table)
+    if result.notify and result.user_id:
+        try:
+            text = _build_notification_text(result)
+            await app["bot"].send_message(result.user_id, text, parse_mode="HTML")
+        except Exception:
+            log.warning("publish_notify_failed", user_id=result.user_id)
+
+    return {"status": result.status, "reason": result.reason}
@@ -92,6 +92,32 @@ class Settings(BaseSettings):
     # При False img-блоки идут с пустым src и B рендерит placeholder.
     bamboodom_images_enabled: bool = False
 
+    # --- Firecrawl per-URL cache (scrape + map, shared across users) ---
+    firecrawl_scrape_cache_ttl: int = 604800  # fresh window, seconds
+    firecrawl_map_cache_ttl: int = 86400
+    firecrawl_cache_stale_ttl: int = 259200  # served stale + background refresh
+    firecrawl_negative_cache_ttl: int = 3600  # failed/blocked URLs
+
+    # --- Research prefetch (/api/prefetch): warm caches this long before a slot fires ---
+    research_prefetch_lead_minutes: int = 45
+
+    # --- Startup warm-up: cap on opening pooled connections to core upstreams ---
+    startup_warmup_timeout: float = 10.0
+    upstream_keepalive_interval: float = 20.0  # re-probe idle upstreams; below the 30s pool keepalive_expiry, 0 = off
+
+    # --- Auto-publish job queue (publish_jobs + in-process worker pool) ---
+    publish_worker_concurrency: int = 10  # initial pipelines in parallel per replica; the limiter adapts it
+    publish_job_lease_seconds: int = 120  # visibility timeout; heartbeat renews it
+    publish_job_max_attempts: int = 3
+    publish_slot_tolerance_minutes: int = 5  # cron minute may move this far from the chosen time to spread load
+
+    # --- Adaptive concurrency (services/adaptive_limit.py): shared by publish pool + AIOrchestrator ---
+    concurrency_min_limit: int = 2
+    concurrency_max_limit: int = 25
+    ai_calls_per_pipeline: float = 3.0  # AI gate = pipeline limit × this (10 → 30 OpenRouter calls)
+    concurrency_max_loop_lag: float = 0.5  # seconds of event-loop lag that count as overload
+    concurrency_memory_limit_mb: int = 0  # 0 = read the container limit from cgroup
+
     # === Server ===
     port: int = 8080
 
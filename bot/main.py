@@ -8,6 +8,7 @@ except ImportError:
     pass  # uvloop optional, fallback to default event loop (e.g. Windows)
 
 import asyncio
+import functools
 import logging
 
 import httpx
@@ -30,19 +31,25 @@ from bot.middlewares import (
     ThrottlingMiddleware,
 )
 from bot.texts.strings import ERROR_GENERIC
+from bot.warmup import Activity, build_probes, start_warmup, stop_warmup
 from cache.client import RedisClient
 from cache.fsm_storage import UpstashFSMStorage
 from db.client import SupabaseClient
+from services.adaptive_limit import AdaptiveLimiter
 from services.ai.orchestrator import AIOrchestrator
 from services.ai.prompt_engine import PromptEngine
 from services.ai.rate_limiter import RateLimiter
+from services.broadcast import cancel_broadcasts
+from services.dashboard import DashboardCache, install_dashboard_cache
+from services.http_clients import HttpClientRegistry
+from services.publish_queue import PublishWorkerPool
 from services.storage import ImageStorage
 
 log = structlog.get_logger()
 
 # Graceful shutdown coordination (ARCHITECTURE.md §5.7)
 SHUTDOWN_EVENT: asyncio.Event = asyncio.Event()
-PUBLISH_SEMAPHORE: asyncio.Semaphore = asyncio.Semaphore(10)
+_broadcast_resume_task: asyncio.Task[None] | None = None
 
 
 def _init_sentry(dsn: str) -> None:
@@ -60,12 +67,9 @@ def create_bot(settings: Settings) -> Bot:
     )
 
 
-def create_http_client() -> httpx.AsyncClient:
-    """Create shared httpx client (ARCHITECTURE.md §2.2)."""
-    return httpx.AsyncClient(
-        limits=httpx.Limits(max_connections=50, max_keepalive_connections=30),
-        timeout=httpx.Timeout(30.0, connect=5.0),
-    )
+def create_http_clients() -> HttpClientRegistry:
+    """Create per-upstream pooled clients (ARCHITECTURE.md §2.2)."""
+    return HttpClientRegistry()
 
 
 def create_dispatcher(
@@ -128,8 +132,15 @@ async def _global_error_handler(event: ErrorEvent) -> bool:
     return True  # error handled, don't propagate
 
 
-async def on_startup(bot: Bot, settings: Settings) -> None:
-    """Set webhook on startup."""
+async def on_startup(
+    bot: Bot,
+    settings: Settings,
+    db: SupabaseClient | None = None,
+    redis: RedisClient | None = None,
+    http_clients: HttpClientRegistry | None = None,
+) -> None:
+    """Set webhook on startup, then warm core upstream connections and resume broadcasts in the background."""
+    global _broadcast_resume_task
     url = settings.railway_public_url
     if url:
         await bot.set_webhook(
@@ -146,6 +157,82 @@ async def on_startup(bot: Bot, settings: Settings) -> None:
     else:
         log.warning("no_railway_url", msg="RAILWAY_PUBLIC_URL not set, webhook not configured")
 
+    # Bounded, non-blocking: startup does not wait for (or fail on) the warm-up
+    probes = build_probes(
+        db=db,
+        redis=redis,
+        openrouter_client=http_clients.get("openrouter") if http_clients is not None else None,
+        openrouter_api_key=settings.openrouter_api_key.get_secret_value(),
+    )
+    # Then keep them warm: idle upstreams are re-probed before the pools drop the connection
+    activity: dict[str, Activity] = {}
+    if db is not None:
+        activity["supabase"] = db.request_count
+    if redis is not None:
+        activity["upstash"] = redis.request_count
+    if http_clients is not None:
+        activity["openrouter"] = functools.partial(http_clients.request_count, "openrouter")
+    start_warmup(
+        probes,
+        timeout=settings.startup_warmup_timeout,
+        keepalive_interval=settings.upstream_keepalive_interval,
+        activity=activity,
+    )
+
+    if db is not None and redis is not None:
+        _broadcast_resume_task = asyncio.create_task(_resume_broadcasts(bot, db, redis))
+
+
+async def _resume_broadcasts(bot: Bot, db: SupabaseClient, redis: RedisClient) -> None:
+    """Continue admin broadcasts interrupted by a restart from their Redis cursor.
+
+    Notification batches are resumed by QStash redelivery instead (api/notify.py).
+    """
+    from cache.keys import BROADCAST_LEASE_TTL
+    from routers.admin.dashboard import run_admin_broadcast
+    from services.admin import AdminService
+    from services.broadcast import interrupted_broadcasts
+
+    try:
+        pending = await interrupted_broadcasts(redis)
+    except Exception:
+        log.exception("broadcast_resume_scan_failed")
+        return
+
+    for broadcast_id, state in pending:
+        meta = state.meta
+        if meta.get("kind") != "admin":
+            continue
+        try:
+            user_ids = await AdminService(db).get_audience_ids(meta["audience"])
+            for _ in range(2):
+                result = await run_admin_broadcast(
+                    bot,
+                    redis,
+                    broadcast_id=broadcast_id,
+                    user_ids=user_ids,
+                    text=meta["text"],
+                    audience_key=meta["audience"],
+                    chat_id=meta["chat_id"],
+                    message_id=meta["message_id"],
+                )
+                if result is not None:
+                    break
+                # Lease still held by the previous process: wait for it to expire once
+                await asyncio.sleep(BROADCAST_LEASE_TTL)
+        except Exception:
+            log.exception("broadcast_resume_failed", broadcast_id=broadcast_id)
+
+
+async def _stop_broadcasts() -> None:
+    """Cancel the startup resume task and every running broadcast, waiting for their checkpoints."""
+    global _broadcast_resume_task
+    task, _broadcast_resume_task = _broadcast_resume_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    await cancel_broadcasts()
+
 
 async def _refund_active_generations(
     bot: Bot,
@@ -216,28 +303,24 @@ async def on_shutdown(
     http_client: httpx.AsyncClient,
     redis: RedisClient,
     timeout: int = 120,
+    http_clients: HttpClientRegistry | None = None,
+    publish_workers: PublishWorkerPool | None = None,
 ) -> None:
     """Clean up on shutdown with graceful drain (ARCHITECTURE.md §5.7).
 
-    Sets SHUTDOWN_EVENT, then waits for all PUBLISH_SEMAPHORE permits to be
-    released (meaning no in-flight publish tasks), up to ``timeout`` seconds.
+    Sets SHUTDOWN_EVENT, then lets in-flight publish jobs finish for up to
+    ``timeout`` seconds. Jobs still running after that are released back to
+    publish_jobs and picked up by the next container.
     """
     SHUTDOWN_EVENT.set()
     log.info("shutdown_started", drain_timeout=timeout)
+    await stop_warmup()
+    # Broadcasts checkpoint and stop before the bot session closes under them;
+    # the next container resumes them from the cursor
+    await _stop_broadcasts()
 
-    # Wait for all 10 semaphore permits to become available (no in-flight tasks).
-    # Single timeout wraps entire loop — total drain time is capped at `timeout` seconds.
-    acquired = 0
-    try:
-        async with asyncio.timeout(timeout):
-            for _ in range(10):
-                await PUBLISH_SEMAPHORE.acquire()
-                acquired += 1
-    except TimeoutError:
-        log.warning("shutdown_drain_timeout", acquired=acquired, total=10)
-    finally:
-        for _ in range(acquired):
-            PUBLISH_SEMAPHORE.release()
+    if publish_workers is not None:
+        await publish_workers.stop(timeout)
 
     # Refund active generations interrupted by shutdown
     await _refund_active_generations(bot, db, redis)
@@ -249,6 +332,8 @@ async def on_shutdown(
     # set_webhook() in on_startup() is sufficient to overwrite.
     await bot.session.close()
     await http_client.aclose()
+    if http_clients is not None:
+        await http_clients.aclose()
     await db.close()
     # Redis (Upstash HTTP) is stateless — no close needed, but param kept for consistency
     _ = redis
@@ -290,7 +375,9 @@ def create_app() -> web.Application:
         url=settings.upstash_redis_url,
         token=settings.upstash_redis_token.get_secret_value(),
     )
-    http_client = create_http_client()
+    http_clients = create_http_clients()
+    http_client = http_clients.get("default")
+    install_dashboard_cache(DashboardCache(redis))
     bot = create_bot(settings)
     dp = create_dispatcher(db, redis, http_client, settings)
 
@@ -300,13 +387,24 @@ def create_app() -> web.Application:
 
     # Register lifecycle hooks (async closures, not sync lambdas)
     async def _startup() -> None:
-        await on_startup(bot, settings)
+        await on_startup(bot, settings, db=db, redis=redis, http_clients=http_clients)
+        concurrency_limiter.start()
+        publish_workers.start()
         # Store bot username for Pinterest OAuth deep links (api/auth.py)
         bot_info = await bot.get_me()
         app["bot_username"] = bot_info.username or ""
 
     async def _shutdown() -> None:
-        await on_shutdown(bot, db, http_client, redis, timeout=settings.railway_graceful_shutdown_timeout)
+        await on_shutdown(
+            bot,
+            db,
+            http_client,
+            redis,
+            timeout=settings.railway_graceful_shutdown_timeout,
+            http_clients=http_clients,
+            publish_workers=publish_workers,
+        )
+        await concurrency_limiter.stop()
 
     dp.startup.register(_startup)
     dp.shutdown.register(_shutdown)
@@ -323,20 +421,33 @@ def create_app() -> web.Application:
     webhook_handler.register(app, path="/webhook")
     setup_application(app, dp, bot=bot)
 
+    # One concurrency limit per replica: publish pipelines and the LLM calls they fan out into
+    concurrency_limiter = AdaptiveLimiter(
+        settings.publish_worker_concurrency,
+        min_limit=settings.concurrency_min_limit,
+        max_limit=settings.concurrency_max_limit,
+        max_loop_lag=settings.concurrency_max_loop_lag,
+        memory_limit_bytes=settings.concurrency_memory_limit_mb * 2**20,
+    )
+    app["concurrency_limiter"] = concurrency_limiter
+
     # AI services (Phase 6)
     prompt_engine = PromptEngine(db, redis)
     rate_limiter = RateLimiter(redis)
     ai_orchestrator = AIOrchestrator(
-        http_client=http_client,
+        http_client=http_clients.get("openrouter"),
         api_key=settings.openrouter_api_key.get_secret_value(),
         prompt_engine=prompt_engine,
         rate_limiter=rate_limiter,
         site_url=settings.railway_public_url or "https://seo-master-bot.up.railway.app",
+        # Article calls (60-90s) and short calls (2-5s) share the gate: no latency gradient
+        gate=concurrency_limiter.gate("ai", scale=settings.ai_calls_per_pipeline, latency_signal=False),
     )
     image_storage = ImageStorage(
         supabase_url=settings.supabase_url,
         supabase_key=settings.supabase_key.get_secret_value(),
         http_client=http_client,
+        redis=redis,
     )
 
     # External service clients (Phase 10)
@@ -344,10 +455,25 @@ def create_app() -> web.Application:
     from services.external.firecrawl import FirecrawlClient
     from services.external.pagespeed import PageSpeedClient
     from services.external.serper import SerperClient
+    from services.external.url_cache import UrlCache
 
     firecrawl_client = FirecrawlClient(
         api_key=settings.firecrawl_api_key.get_secret_value(),
         http_client=http_client,
+        scrape_cache=UrlCache(
+            redis,
+            namespace="firecrawl_scrape",
+            fresh_ttl=settings.firecrawl_scrape_cache_ttl,
+            stale_ttl=settings.firecrawl_cache_stale_ttl,
+            negative_ttl=settings.firecrawl_negative_cache_ttl,
+        ),
+        map_cache=UrlCache(
+            redis,
+            namespace="firecrawl_map",
+            fresh_ttl=settings.firecrawl_map_cache_ttl,
+            stale_ttl=settings.firecrawl_cache_stale_ttl,
+            negative_ttl=settings.firecrawl_negative_cache_ttl,
+        ),
     )
     serper_client = SerperClient(
         api_key=settings.serper_api_key.get_secret_value(),
@@ -365,6 +491,7 @@ def create_app() -> web.Application:
     app["db"] = db
     app["redis"] = redis
     app["http_client"] = http_client
+    app["http_clients"] = http_clients
     app["ai_orchestrator"] = ai_orchestrator
     app["image_storage"] = image_storage
     app["bot"] = bot
@@ -389,6 +516,7 @@ def create_app() -> web.Application:
     )
 
     # Inject services into dp.workflow_data for Aiogram routers (Phase 8+)
+    dp.workflow_data["http_clients"] = http_clients
     dp.workflow_data["ai_orchestrator"] = ai_orchestrator
     dp.workflow_data["image_storage"] = image_storage
     dp.workflow_data["stars_service"] = stars_service
@@ -427,6 +555,7 @@ def create_app() -> web.Application:
         qstash_token=settings.qstash_token.get_secret_value(),
         base_url=settings.railway_public_url or "https://seo-master-bot.up.railway.app",
         encryption_key=settings.encryption_key.get_secret_value(),
+        slot_tolerance=settings.publish_slot_tolerance_minutes,
     )
     dp.workflow_data["scheduler_service"] = scheduler_service
 
@@ -434,6 +563,20 @@ def create_app() -> web.Application:
     app["yookassa_service"] = yookassa_service
     app["scheduler_service"] = scheduler_service
 
+    # Durable auto-publish queue: /api/publish enqueues, the pool runs pipelines
+    from api.publish import run_publish_job
+    from db.repositories.publish_jobs import PublishJobsRepository
+
+    publish_queue = PublishJobsRepository(db)
+    publish_workers = PublishWorkerPool(
+        publish_queue,
+        functools.partial(run_publish_job, app),
+        gate=concurrency_limiter.gate("publish", latency_signal=False),
+        lease_seconds=settings.publish_job_lease_seconds,
+    )
+    app["publish_queue"] = publish_queue
+    app["publish_workers"] = publish_workers
+
     # Pinterest OAuth redirect + callback (needed for ConnectPinterestFSM)
     from api.auth import pinterest_callback, pinterest_redirect
 
@@ -451,11 +594,13 @@ def create_app() -> web.Application:
     from api.cleanup import cleanup_handler
     from api.health import health_handler
     from api.notify import notify_handler
+    from api.prefetch import prefetch_handler
     from api.publish import publish_handler
 
     app.router.add_post("/api/publish", publish_handler)
     app.router.add_post("/api/cleanup", cleanup_handler)
     app.router.add_post("/api/notify", notify_handler)
+    app.router.add_post("/api/prefetch", prefetch_handler)
     app.router.add_get("/api/health", health_handler)
 
     # Bamboodom digest webhook (4I.4) — QStash cron 07:00 МСК
@@ -9,13 +9,15 @@ from aiogram.types import TelegramObject
 
 from cache.client import RedisClient
 from db.client import SupabaseClient
+from db.repositories.base import request_scope
 
 
 class DBSessionMiddleware(BaseMiddleware):
     """Outer middleware: injects data["db"], data["redis"], data["http_client"].
 
     All clients are created once at startup (main.py) and shared
-    across all requests (ARCHITECTURE.md §2.2).
+    across all requests (ARCHITECTURE.md §2.2). Each update runs inside
+    request_scope(), so repository get_by_id lookups are memoized per update.
     """
 
     def __init__(
@@ -37,4 +39,5 @@ class DBSessionMiddleware(BaseMiddleware):
         data["db"] = self._db
         data["redis"] = self._redis
         data["http_client"] = self._http_client
-        return await handler(event, data)
+        with request_scope():
+            return await handler(event, data)
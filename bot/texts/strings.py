@@ -764,6 +764,7 @@ SCHEDULE_CANCELLED_FALLBACK = "Настройка расписания отме
 BROADCAST_PROGRESS = "Рассылка... ({sent}/{total})\nОтправлено: {ok}, ошибок: {failed}"
 BROADCAST_PROGRESS_INIT = "Рассылка... (0/{total})"
 BROADCAST_TEXT_EXPECT = "Отправьте текст сообщения (не файл/стикер)."
+BROADCAST_ALREADY_RUNNING = "Эта рассылка уже выполняется."
 ADMIN_USER_INPUT_PROMPT = "Отправьте ID (число) или @username."
 ADMIN_BALANCE_NO_TARGET = "Ошибка: нет данных о пользователе."
 ADMIN_BALANCE_ADJUST_ERROR = "Ошибка при корректировке баланса."
@@ -0,0 +1,242 @@
+"""Startup connection warm-up for core upstreams (ARCHITECTURE.md §2.2).
+
+Runs once from on_startup() as a background task: each probe is called twice
+(cold, then warm) so the pools hold an open, negotiated connection (TLS +
+HTTP/2 where supported) before the first user request arrives. The whole
+phase is bounded by a timeout and never blocks or fails startup.
+
+Warmed connections would go cold again after an idle spell (pool
+keepalive_expiry, server idle timeouts), so a keep-alive loop re-runs each
+probe every `keepalive_interval` seconds while the upstream is idle. Each
+upstream's activity counter (request count of its client or pool) is checked
+first, and the probe is skipped when real traffic moved it since the last tick.
+
+Cold-vs-warm latency and keep-alive counters per upstream are logged and
+exposed in /api/health.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import structlog
+
+log = structlog.get_logger()
+
+Probe = Callable[[], Awaitable[Any]]
+Activity = Callable[[], int]
+
+
+@dataclass(slots=True)
+class WarmupResult:
+    """Cold/warm latency of one upstream probe."""
+
+    upstream: str
+    ok: bool
+    cold_ms: int | None = None
+    warm_ms: int | None = None
+    error: str | None = None
+
+    def report(self) -> dict[str, Any]:
+        info: dict[str, Any] = {"ok": self.ok, "cold_ms": self.cold_ms, "warm_ms": self.warm_ms}
+        if self.error:
+            info["error"] = self.error
+        return info
+
+
+@dataclass(slots=True)
+class KeepaliveStats:
+    """Keep-alive probes of one upstream since startup."""
+
+    probes: int = 0
+    skipped_busy: int = 0
+    failures: int = 0
+    last_ms: int | None = None
+    last_error: str | None = None
+
+    def report(self) -> dict[str, Any]:
+        info: dict[str, Any] = {
+            "probes": self.probes,
+            "skipped_busy": self.skipped_busy,
+            "failures": self.failures,
+            "last_ms": self.last_ms,
+        }
+        if self.last_error:
+            info["last_error"] = self.last_error
+        return info
+
+
+_last_report: dict[str, dict[str, Any]] = {}
+_keepalive: dict[str, KeepaliveStats] = {}
+_task: asyncio.Task[list[WarmupResult]] | None = None
+_keepalive_task: asyncio.Task[None] | None = None
+
+
+def _elapsed_ms(t0: float) -> int:
+    return round((time.monotonic() - t0) * 1000)
+
+
+async def _run_probe(name: str, probe: Probe, timeout: float) -> WarmupResult:
+    result = WarmupResult(upstream=name, ok=False)
+    try:
+        async with asyncio.timeout(timeout):
+            t0 = time.monotonic()
+            await probe()
+            result.cold_ms = _elapsed_ms(t0)
+            t0 = time.monotonic()
+            await probe()
+            result.warm_ms = _elapsed_ms(t0)
+        result.ok = True
+    except TimeoutError:
+        result.error = "timeout"
+    except Exception as exc:
+        result.error = str(exc)[:200]
+    return result
+
+
+async def warm_up(probes: dict[str, Probe], timeout: float) -> list[WarmupResult]:
+    """Run all probes concurrently, each bounded by *timeout* seconds.
+
+    Never raises: failures and timeouts are recorded in the result.
+    """
+    results = await asyncio.gather(*(_run_probe(name, probe, timeout) for name, probe in probes.items()))
+    _last_report.clear()
+    _last_report.update({r.upstream: r.report() for r in results})
+    log.info("startup_warmup_done", upstreams=_last_report)
+    return list(results)
+
+
+async def _keepalive_probe(name: str, probe: Probe, timeout: float) -> None:
+    stats = _keepalive.setdefault(name, KeepaliveStats())
+    t0 = time.monotonic()
+    try:
+        async with asyncio.timeout(timeout):
+            await probe()
+    except TimeoutError:
+        stats.failures += 1
+        stats.last_error = "timeout"
+    except Exception as exc:
+        stats.failures += 1
+        stats.last_error = str(exc)[:200]
+    else:
+        stats.last_error = None
+    stats.probes += 1
+    stats.last_ms = _elapsed_ms(t0)
+
+
+async def keep_alive(
+    probes: dict[str, Probe],
+    interval: float,
+    timeout: float,
+    activity: dict[str, Activity] | None = None,
+) -> None:
+    """Re-run the probes of idle upstreams every *interval* seconds until cancelled.
+
+    An upstream listed in *activity* is probed only if its counter did not move
+    since the last tick (its pool already keeps the connection warm); the
+    others are probed every tick. Never raises except CancelledError.
+    """
+    activity = activity or {}
+    seen = {name: counter() for name, counter in activity.items()}
+    while True:
+        await asyncio.sleep(interval)
+        idle: dict[str, Probe] = {}
+        for name, probe in probes.items():
+            counter = activity.get(name)
+            if counter is not None and counter() != seen[name]:
+                _keepalive.setdefault(name, KeepaliveStats()).skipped_busy += 1
+            else:
+                idle[name] = probe
+        await asyncio.gather(*(_keepalive_probe(name, probe, timeout) for name, probe in idle.items()))
+        for name, counter in activity.items():
+            seen[name] = counter()  # includes our own probe request
+
+
+def start_warmup(
+    probes: dict[str, Probe],
+    timeout: float,
+    *,
+    keepalive_interval: float = 0.0,
+    activity: dict[str, Activity] | None = None,
+) -> asyncio.Task[list[WarmupResult]] | None:
+    """Schedule warm_up() and, if keepalive_interval > 0, keep_alive() in the background.
+
+    Task references are kept module-level; stop_warmup() cancels them.
+    """
+    global _task, _keepalive_task
+    if not probes:
+        return None
+    _task = asyncio.create_task(warm_up(probes, timeout))
+    if keepalive_interval > 0:
+        _keepalive_task = asyncio.create_task(
+            keep_alive(probes, keepalive_interval, timeout, activity), name="upstream_keepalive"
+        )
+    return _task
+
+
+async def stop_warmup() -> None:
+    """Cancel the warm-up and keep-alive tasks (on shutdown)."""
+    global _task, _keepalive_task
+    for task in (_task, _keepalive_task):
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    _task = _keepalive_task = None
+
+
+def warmup_report() -> dict[str, dict[str, Any]]:
+    """Last warm-up result and keep-alive counters per upstream (empty until the warm-up finishes)."""
+    report = {name: dict(info) for name, info in _last_report.items()}
+    for name, stats in _keepalive.items():
+        report.setdefault(name, {})["keepalive"] = stats.report()
+    return report
+
+
+def build_probes(
+    *,
+    db: Any = None,
+    redis: Any = None,
+    openrouter_client: httpx.AsyncClient | None = None,
+    openrouter_api_key: str = "",
+) -> dict[str, Probe]:
+    """Cheap read-only probes for the core upstreams that are configured.
+
+    Telegram is not probed: set_webhook()/get_me() in startup already open
+    the bot session.
+    """
+    probes: dict[str, Probe] = {}
+
+    if db is not None:
+
+        async def _supabase() -> None:
+            await db.table("users").select("id").limit(1).execute()
+
+        probes["supabase"] = _supabase
+
+    if redis is not None:
+
+        async def _upstash() -> None:
+            if not await redis.ping():
+                raise RuntimeError("ping failed")
+
+        probes["upstash"] = _upstash
+
+    if openrouter_client is not None and openrouter_api_key:
+
+        async def _openrouter() -> None:
+            resp = await openrouter_client.get(
+                "https://openrouter.ai/api/v1/key",
+                headers={"Authorization": f"Bearer {openrouter_api_key}"},
+            )
+            resp.raise_for_status()
+
+        probes["openrouter"] = _openrouter
+
+    return probes
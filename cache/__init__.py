@@ -3,7 +3,6 @@ from cache.keys import (
     BRANDING_TTL,
     FSM_TTL,
     PINTEREST_AUTH_TTL,
-    PUBLISH_LOCK_TTL,
     SERPER_TTL,
     CacheKeys,
 )
@@ -12,7 +11,6 @@ __all__ = [
     "BRANDING_TTL",
     "FSM_TTL",
     "PINTEREST_AUTH_TTL",
-    "PUBLISH_LOCK_TTL",
     "SERPER_TTL",
     "CacheKeys",
     "RedisClient",
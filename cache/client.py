@@ -1,11 +1,23 @@
 """Thin async wrapper around Upstash Redis HTTP client."""
 
+from typing import Any
+
 import structlog
 from upstash_redis.asyncio import Redis as AsyncRedis
 
 log = structlog.get_logger()
 
 
+class _CountingRedis(AsyncRedis):
+    """Upstash client that counts the commands it sends (one REST request each)."""
+
+    requests = 0
+
+    async def execute(self, command: list[Any]) -> Any:
+        self.requests += 1
+        return await super().execute(command)
+
+
 class RedisClient:
     """Async Redis client backed by Upstash REST API.
 
@@ -13,7 +25,11 @@ class RedisClient:
     """
 
     def __init__(self, url: str, token: str) -> None:
-        self._redis = AsyncRedis(url=url, token=token)
+        self._redis = _CountingRedis(url=url, token=token)
+
+    def request_count(self) -> int:
+        """Commands sent so far (activity signal for the upstream keep-alive)."""
+        return self._redis.requests
 
     async def get(self, key: str) -> str | None:
         return await self._redis.get(key)
@@ -47,6 +63,15 @@ class RedisClient:
     async def decrby(self, key: str, amount: int) -> int:
         return await self._redis.decrby(key, amount)
 
+    async def sadd(self, key: str, *members: str) -> int:
+        return await self._redis.sadd(key, *members)
+
+    async def srem(self, key: str, *members: str) -> int:
+        return await self._redis.srem(key, *members)
+
+    async def scard(self, key: str) -> int:
+        return await self._redis.scard(key)
+
     async def expire(self, key: str, seconds: int) -> bool:
         return await self._redis.expire(key, seconds)
 
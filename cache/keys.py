@@ -2,9 +2,9 @@
 
 # TTL values in seconds
 FSM_TTL = 86400  # 24 hours
-PUBLISH_LOCK_TTL = 600  # 10 minutes (article pipeline takes 300-400s)
 CLEANUP_LOCK_TTL = 300  # 5 minutes
-NOTIFY_LOCK_TTL = 300  # 5 minutes
+PREFETCH_LOCK_TTL = 600  # 10 minutes (prefetch cron runs every ~10 min)
+PREFETCH_SLOT_TTL = 7200  # 2 hours (one warm-up per schedule slot)
 RENEW_LOCK_TTL = 3600  # 1 hour (API_CONTRACTS.md §2.5)
 BRANDING_TTL = 604800  # 7 days
 SERPER_TTL = 86400  # 24 hours
@@ -14,11 +14,15 @@ RATE_LIMIT_WINDOW = 3600  # 1 hour (default for per-action rate limits)
 PROMPT_CACHE_TTL = 3600  # 1 hour (prompts change only on sync_prompts CLI)
 USER_CACHE_TTL = 300  # 5 minutes (AuthMiddleware user cache)
 PIPELINE_CHECKPOINT_TTL = 86400  # 24 hours (§12.3)
+STORAGE_HOLDERS_TTL = 172800  # 48 hours (outlives 24h previews and checkpoints that hold an image)
 RESEARCH_CACHE_TTL = 604800  # 7 days (API_CONTRACTS.md §7a.4)
 BAMBOODOM_CONTEXT_TTL = 3600  # 1 hour (blog_context from bamboodom.ru)
 BAMBOODOM_CODES_TTL = 3600  # 1 hour (blog_article_codes from bamboodom.ru)
 BAMBOODOM_PUBLISH_LOCK_TTL = 3  # 3 sec (matches server rate limit: 1 publish / 3 sec)
 BAMBOODOM_PUBLISH_HISTORY_TTL = 604800  # 7 days (sandbox articles auto-expire after 7 days)
+DASHBOARD_CACHE_TTL = 900  # 15 minutes (snapshot; invalidated by write events, TTL is a safety net)
+BROADCAST_STATE_TTL = 604800  # 7 days (progress cursor; resume window after a crash)
+BROADCAST_LEASE_TTL = 60  # 1 minute (refreshed by the running sender; a crashed run frees it quickly)
 
 
 class CacheKeys:
@@ -32,10 +36,6 @@ class CacheKeys:
     def throttle(user_id: int, action: str) -> str:
         return f"throttle:{user_id}:{action}"
 
-    @staticmethod
-    def publish_lock(idempotency_key: str) -> str:
-        return f"publish_lock:{idempotency_key}"
-
     @staticmethod
     def branding(project_id: int) -> str:
         return f"branding:{project_id}"
@@ -73,8 +73,20 @@ class CacheKeys:
         return f"cleanup_lock:{msg_id}"
 
     @staticmethod
-    def notify_lock(msg_id: str) -> str:
-        return f"notify_lock:{msg_id}"
+    def broadcast_state(broadcast_id: str) -> str:
+        return f"broadcast:{broadcast_id}:state"
+
+    @staticmethod
+    def broadcast_lease(broadcast_id: str) -> str:
+        return f"broadcast:{broadcast_id}:lease"
+
+    @staticmethod
+    def prefetch_lock(msg_id: str) -> str:
+        return f"prefetch_lock:{msg_id}"
+
+    @staticmethod
+    def prefetch_slot(schedule_id: int, slot: str) -> str:
+        return f"prefetch:{schedule_id}:{slot}"
 
     @staticmethod
     def renew_lock(user_id: int) -> str:
@@ -108,4 +120,17 @@ class CacheKeys:
     def yookassa_idempotency(payment_id: str) -> str:
         return f"yookassa_payment:{payment_id}"
 
+    @staticmethod
+    def url_cache(namespace: str, url_hash: str) -> str:
+        return f"urlcache:{namespace}:{url_hash}"
+
+    @staticmethod
+    def storage_holders(path: str) -> str:
+        return f"storage_holders:{path}"
+
+    @staticmethod
+    def dashboard(user_id: int) -> str:
+        return f"dashboard:{user_id}"
+
     ACTIVE_GENERATION_PREFIX = "generation:active:"
+    BROADCAST_PREFIX = "broadcast:"
@@ -12,9 +12,15 @@ class SupabaseClient:
         rest_url = f"{url}/rest/v1"
         headers = {"apikey": key, "Authorization": f"Bearer {key}"}
         self._client = AsyncPostgrestClient(rest_url, headers=headers)
+        self._requests = 0
+
+    def request_count(self) -> int:
+        """Queries built so far (activity signal for the upstream keep-alive)."""
+        return self._requests
 
     def table(self, name: str) -> AsyncRequestBuilder:
         """Return a request builder for the given table."""
+        self._requests += 1
         return self._client.table(name)
 
     async def rpc(self, fn_name: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
@@ -23,6 +29,7 @@ class SupabaseClient:
         Returns list of rows from the function result.
         Raises exception if function doesn't exist.
         """
+        self._requests += 1
         resp = await self._client.rpc(fn_name, params or {}).execute()
         # NOTE: `or` would coerce falsy scalars (0, False) to []. Use explicit None check.
         return resp.data if resp.data is not None else []  # type: ignore[return-value]
@@ -2,26 +2,159 @@
 
 Used ONLY in repository layer for platform_connections.credentials.
 Source: docs/API_CONTRACTS.md section 8.6.
+
+One CredentialManager per encryption key for the whole process
+(get_credential_manager). Decrypted credentials are kept in a bounded LRU
+keyed on the SHA-256 of the ciphertext, so repeated reads of the same
+connection skip Fernet (HMAC + AES) and JSON parsing. A ciphertext changes on
+every encrypt(), so a re-encrypted connection can never hit a stale entry;
+ConnectionsRepository.update_credentials still evicts the old one so the
+plaintext does not linger.
 """
 
+import copy
+import hashlib
 import json
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
 from cryptography.fernet import Fernet
 
+_CACHE_SIZE = 512
+
+
+def _cache_key(encrypted: str) -> str:
+    return hashlib.sha256(encrypted.encode()).hexdigest()
+
 
 class CredentialManager:
     """Encrypt/decrypt platform credentials using Fernet symmetric encryption."""
 
-    def __init__(self, encryption_key: str) -> None:
+    def __init__(self, encryption_key: str, cache_size: int = _CACHE_SIZE) -> None:
         self._fernet = Fernet(encryption_key.encode())
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._cache_size = cache_size
 
     def encrypt(self, credentials: dict[str, Any]) -> str:
         """Dict -> encrypted string for DB storage."""
-        json_bytes = json.dumps(credentials, ensure_ascii=False).encode()
+        # dict() materializes LazyCredentials: json's C encoder reads dict storage directly
+        json_bytes = json.dumps(dict(credentials), ensure_ascii=False).encode()
         return self._fernet.encrypt(json_bytes).decode()
 
     def decrypt(self, encrypted: str) -> dict[str, Any]:
-        """Encrypted string from DB -> dict. Raises InvalidToken on bad key/data."""
-        json_bytes = self._fernet.decrypt(encrypted.encode())
-        return json.loads(json_bytes)  # type: ignore[no-any-return]
+        """Encrypted string from DB -> dict. Raises InvalidToken on bad key/data.
+
+        Returns a copy: callers may mutate it (token refresh) without touching the cache.
+        """
+        key = _cache_key(encrypted)
+        cached = self._cache.get(key)
+        if cached is None:
+            json_bytes = self._fernet.decrypt(encrypted.encode())
+            cached = json.loads(json_bytes)
+            self._cache[key] = cached  # type: ignore[assignment]
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return copy.deepcopy(cached)  # type: ignore[arg-type]
+
+    def evict(self, encrypted: str) -> None:
+        """Drop the cached plaintext for a ciphertext (after the connection is re-encrypted)."""
+        self._cache.pop(_cache_key(encrypted), None)
+
+
+@lru_cache(maxsize=4)
+def get_credential_manager(encryption_key: str) -> CredentialManager:
+    """Process-wide CredentialManager for the given key (one Fernet + one decrypt cache)."""
+    return CredentialManager(encryption_key)
+
+
+class LazyCredentials(dict[str, Any]):
+    """Credentials dict that decrypts on first access.
+
+    Connection lists are built with this so screens that only show
+    platform/identifier/status never pay for Fernet. Any read (item access,
+    get, iteration, len, bool, comparison) triggers a single decrypt.
+
+    Serializers that read dict storage directly (json's C encoder, pydantic)
+    see an empty dict: pass dict(creds) instead. PlatformConnection does this
+    in its field serializer.
+    """
+
+    __slots__ = ("_cm", "_encrypted")
+
+    def __init__(self, cm: CredentialManager, encrypted: str) -> None:
+        super().__init__()
+        self._cm: CredentialManager | None = cm
+        self._encrypted = encrypted
+
+    def _load(self) -> None:
+        if self._cm is not None:
+            # Cleared only after a successful decrypt: a failed one (InvalidToken)
+            # must raise again on the next read, not leave an empty dict behind.
+            super().update(self._cm.decrypt(self._encrypted))
+            self._cm = None
+
+    def __getitem__(self, key: str) -> Any:
+        self._load()
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        self._load()
+        return super().__contains__(key)
+
+    def __iter__(self) -> Any:
+        self._load()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._load()
+        return super().__len__()
+
+    def __eq__(self, other: object) -> bool:
+        self._load()
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        self._load()
+        return super().__repr__()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._load()
+        return super().get(key, default)
+
+    def keys(self) -> Any:
+        self._load()
+        return super().keys()
+
+    def values(self) -> Any:
+        self._load()
+        return super().values()
+
+    def items(self) -> Any:
+        self._load()
+        return super().items()
+
+    def copy(self) -> dict[str, Any]:
+        self._load()
+        return dict(super().items())
+
+    def pop(self, key: str, *default: Any) -> Any:
+        self._load()
+        return super().pop(key, *default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._load()
+        return super().setdefault(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._load()
+        super().__setitem__(key, value)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._load()
+        super().update(*args, **kwargs)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return copy.deepcopy(dict(self.items()), memo)
@@ -7,7 +7,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
 # ---------------------------------------------------------------------------
 # 1. users
@@ -148,6 +148,11 @@ class PlatformConnection(BaseModel):
     identifier: str
     created_at: datetime | None = None
 
+    @field_serializer("credentials")
+    def _dump_credentials(self, credentials: dict[str, Any]) -> dict[str, Any]:
+        # dict() forces LazyCredentials to decrypt; pydantic reads dict storage directly
+        return dict(credentials)
+
 
 class PlatformConnectionCreate(BaseModel):
     """Create model for platform_connections.
@@ -248,6 +253,7 @@ class PlatformSchedule(BaseModel):
     enabled: bool = False
     status: str = "active"
     qstash_schedule_ids: list[str] = Field(default_factory=list)
+    slot_minutes: list[int] = Field(default_factory=list)
     cross_post_connection_ids: list[int] = Field(default_factory=list)
     last_post_at: datetime | None = None
     created_at: datetime | None = None
@@ -270,6 +276,7 @@ class PlatformScheduleUpdate(BaseModel):
     enabled: bool | None = None
     status: str | None = None
     qstash_schedule_ids: list[str] | None = None
+    slot_minutes: list[int] | None = None
     cross_post_connection_ids: list[int] | None = None
     last_post_at: datetime | None = None
 
@@ -605,3 +612,40 @@ class BamboodomKeywordCreate(BaseModel):
     cluster_label: str | None = None
     status: str = "new"
     city: str | None = None
+
+
+# ---------------------------------------------------------------------------
+# 15. publish_jobs (durable auto-publish queue, 2026-10-18)
+# ---------------------------------------------------------------------------
+
+
+class PublishJob(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    idempotency_key: str  # Upstash-Message-Id of the trigger
+    payload: dict[str, Any]
+    status: str = "queued"  # queued / running / done / failed
+    attempts: int = 0
+    max_attempts: int = 3
+    available_at: datetime | None = None
+    lease_owner: str | None = None
+    lease_expires_at: datetime | None = None
+    last_error: str | None = None
+    result: dict[str, Any] | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+# ---------------------------------------------------------------------------
+# 16. pipeline_checkpoints (resumable article pipeline, 2026-10-18)
+# ---------------------------------------------------------------------------
+
+
+class PipelineCheckpoint(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    run_key: str  # publish:{msg_id} / preview:{user_id}:{category_id} / preview_wp:{preview_id}
+    stage: str  # keyword / websearch / outline / article / images / wp_media
+    data: dict[str, Any]
+    created_at: datetime | None = None
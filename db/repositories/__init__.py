@@ -3,6 +3,7 @@
 from db.repositories.audits import AuditsRepository
 from db.repositories.bamboodom_keywords import BamboodomKeywordsRepository
 from db.repositories.categories import CategoriesRepository
+from db.repositories.checkpoints import CheckpointsRepository
 from db.repositories.connections import ConnectionsRepository
 from db.repositories.payments import PaymentsRepository
 from db.repositories.previews import PreviewsRepository
@@ -10,6 +11,7 @@ from db.repositories.project_settings import ProjectPlatformSettingsRepository
 from db.repositories.projects import ProjectsRepository
 from db.repositories.prompts import PromptsRepository
 from db.repositories.publications import PublicationsRepository
+from db.repositories.publish_jobs import PublishJobsRepository
 from db.repositories.schedules import SchedulesRepository
 from db.repositories.users import UsersRepository
 
@@ -17,6 +19,7 @@ __all__ = [
     "AuditsRepository",
     "BamboodomKeywordsRepository",
     "CategoriesRepository",
+    "CheckpointsRepository",
     "ConnectionsRepository",
     "PaymentsRepository",
     "PreviewsRepository",
@@ -24,6 +27,7 @@ __all__ = [
     "ProjectsRepository",
     "PromptsRepository",
     "PublicationsRepository",
+    "PublishJobsRepository",
     "SchedulesRepository",
     "UsersRepository",
 ]
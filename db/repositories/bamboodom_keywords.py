@@ -2,7 +2,8 @@
 
 Stores keywords collected from DataForSEO Yandex per material with AI-generated
 cluster labels. Supports the auto-publishing pipeline:
-- save_batch: bulk upsert from collector (dedupes on keyword+material UNIQUE)
+- save_batch: bulk upsert from collector (dedupes on keyword+material UNIQUE),
+  one bbk_upsert_keywords RPC per chunk
 - pick_for_publishing: deterministic next-keyword selection (round-robin
   across clusters, prefers higher search_volume within cluster)
 - mark_used / mark_failed: status transitions
@@ -12,6 +13,7 @@ cluster labels. Supports the auto-publishing pipeline:
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Any
 
 import structlog
 
@@ -22,6 +24,9 @@ log = structlog.get_logger()
 
 _TABLE = "bamboodom_keywords"
 
+# Rows per bbk_upsert_keywords call (JSON body size, statement time)
+_UPSERT_CHUNK = 500
+
 VALID_MATERIALS = ("wpc", "flex", "reiki", "profiles")
 VALID_STATUSES = ("new", "queued", "used", "failed", "skipped")
 
@@ -64,9 +69,40 @@ def is_geo_candidate(keyword: str) -> bool:
     return False
 
 
+class _BulkUpsertError(Exception):
+    """bbk_upsert_keywords failed part-way: rows before ``done`` are stored."""
+
+    def __init__(self, done: int, new_count: int, updated_count: int) -> None:
+        super().__init__(f"bbk_upsert_keywords failed after {done} rows")
+        self.done = done
+        self.new_count = new_count
+        self.updated_count = updated_count
+
+
 class BamboodomKeywordsRepository(BaseRepository):
     """CRUD for bamboodom_keywords (4Y)."""
 
+    async def _bulk_upsert(self, rows: list[dict[str, Any]], update_existing: bool) -> tuple[int, int]:
+        """Set-based upsert via RPC bbk_upsert_keywords. Returns (new, updated).
+
+        Raises _BulkUpsertError if a chunk fails (RPC unavailable) — callers
+        fall back to table reads for rows[done:] only and add its counts.
+        """
+        new_count = 0
+        updated_count = 0
+        for i in range(0, len(rows), _UPSERT_CHUNK):
+            try:
+                result = await self._db.rpc(
+                    "bbk_upsert_keywords",
+                    {"p_rows": rows[i : i + _UPSERT_CHUNK], "p_update_existing": update_existing},
+                )
+            except Exception as exc:
+                raise _BulkUpsertError(i, new_count, updated_count) from exc
+            if result:
+                new_count += int(result[0].get("new_count") or 0)
+                updated_count += int(result[0].get("updated_count") or 0)
+        return new_count, updated_count
+
     async def save_batch(
         self, items: list[BamboodomKeywordCreate]
     ) -> dict[str, int]:
@@ -75,10 +111,38 @@ class BamboodomKeywordsRepository(BaseRepository):
         Returns counts: {"new": int, "updated": int, "total": int}.
         Existing rows have their search_volume / cluster updated; status not
         touched (so already-used keywords stay used).
+
+        Primary path: RPC bbk_upsert_keywords (one round trip per 500 rows).
+        Fallback (RPC unavailable only): read-then-update per row.
         """
         if not items:
             return {"new": 0, "updated": 0, "total": 0}
 
+        try:
+            new_count, updated_count = await self._bulk_upsert(
+                [it.model_dump() for it in items], update_existing=True
+            )
+        except _BulkUpsertError as exc:
+            log.warning("rpc_unavailable", fn="bbk_upsert_keywords", done=exc.done, exc_info=True)
+            rest = await self._save_batch_fallback(items[exc.done :])
+            return {
+                "new": exc.new_count + rest["new"],
+                "updated": exc.updated_count + rest["updated"],
+                "total": len(items),
+            }
+
+        log.info(
+            "bbk_save_batch",
+            total=len(items),
+            new=new_count,
+            updated=updated_count,
+        )
+        return {"new": new_count, "updated": updated_count, "total": len(items)}
+
+    async def _save_batch_fallback(
+        self, items: list[BamboodomKeywordCreate]
+    ) -> dict[str, int]:
+        """save_batch without the RPC: read existing rows, then UPDATE/INSERT."""
         # First, fetch existing rows for the same (keyword, material) pairs
         # so we can decide which fields to update vs which to leave alone.
         # Supabase doesn't expose "ON CONFLICT DO UPDATE WHERE" easily, so
@@ -245,7 +309,32 @@ class BamboodomKeywordsRepository(BaseRepository):
                     "status": "new",
                 })
 
-        # 3) read existing (keyword, material, city) to avoid duplicates.
+        # 3) insert, skipping existing (keyword, material, city) triples.
+        try:
+            new_count, _ = await self._bulk_upsert(geo_rows, update_existing=False)
+        except _BulkUpsertError as exc:
+            log.warning("rpc_unavailable", fn="bbk_upsert_keywords", material=material, done=exc.done, exc_info=True)
+            new_count = exc.new_count + await self._insert_missing_geo_rows(material, geo_rows[exc.done :])
+        skipped = len(geo_rows) - new_count
+
+        log.info(
+            "bbk_expand_to_cities",
+            material=material,
+            top_n=top_n,
+            cities=len(cities),
+            new=new_count,
+            skipped=skipped,
+            skipped_too_generic=skipped_too_generic,
+        )
+        return {
+            "new": new_count,
+            "skipped": skipped,
+            "total": len(geo_rows),
+            "skipped_too_generic": skipped_too_generic,
+        }
+
+    async def _insert_missing_geo_rows(self, material: str, geo_rows: list[dict]) -> int:
+        """expand_to_cities without the RPC: read existing triples, insert the rest."""
         keywords = list({r["keyword"] for r in geo_rows})
         existing_resp = await (
             self._table(_TABLE)
@@ -264,28 +353,11 @@ class BamboodomKeywordsRepository(BaseRepository):
             r for r in geo_rows
             if (r["keyword"], r["city"]) not in existing_keys
         ]
-        skipped = len(geo_rows) - len(new_rows)
 
-        # 4) insert new rows in chunks.
         for i in range(0, len(new_rows), 200):
             chunk = new_rows[i : i + 200]
             await self._table(_TABLE).insert(chunk).execute()
-
-        log.info(
-            "bbk_expand_to_cities",
-            material=material,
-            top_n=top_n,
-            cities=len(cities),
-            new=len(new_rows),
-            skipped=skipped,
-            skipped_too_generic=skipped_too_generic,
-        )
-        return {
-            "new": len(new_rows),
-            "skipped": skipped,
-            "total": len(geo_rows),
-            "skipped_too_generic": skipped_too_generic,
-        }
+        return len(new_rows)
 
     async def pick_for_publishing(
         self,
@@ -1,5 +1,16 @@
-"""Base repository with shared DB access and typed response helpers."""
+"""Base repository with shared DB access and typed response helpers.
 
+Request-scoped identity map (request_scope): inside one Telegram update or
+publish run, get_by_id lookups that go through _get_row_by_id() are memoized
+per (table, id), and concurrent lookups on the same table are batched into a
+single ``in_("id", [...])`` query. Writes through the same repository call
+_forget() to drop stale rows. Outside a scope every lookup hits the database.
+"""
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
 from postgrest import AsyncRequestBuilder
@@ -8,6 +19,110 @@ from bot.exceptions import AppError
 from db.client import SupabaseClient
 
 
+class _RowLoader:
+    """Memoizing batch loader for rows of one table, keyed by id."""
+
+    def __init__(self, db: SupabaseClient, table: str) -> None:
+        self._db = db
+        self._table = table
+        self._rows: dict[Any, asyncio.Future[dict[str, Any] | None]] = {}
+        self._pending: list[Any] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, row_id: Any) -> dict[str, Any] | None:
+        fut = self._rows.get(row_id)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._rows[row_id] = fut
+            self._pending.append(row_id)
+            if len(self._pending) == 1:
+                # Dispatch after the current tick so concurrent callers join the batch
+                loop.call_soon(self._dispatch)
+        row = await asyncio.shield(fut)
+        return dict(row) if row is not None else None
+
+    def _dispatch(self) -> None:
+        ids, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._fetch(ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, ids: list[Any]) -> None:
+        futures = {row_id: self._rows[row_id] for row_id in ids if row_id in self._rows}
+        try:
+            resp = await self._db.table(self._table).select("*").in_("id", ids).execute()
+        except Exception as exc:
+            for row_id, fut in futures.items():
+                if self._rows.get(row_id) is fut:
+                    del self._rows[row_id]
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        found = {row["id"]: row for row in resp.data or []}
+        for row_id, fut in futures.items():
+            if not fut.done():
+                fut.set_result(found.get(row_id))
+
+    def remember(self, row: dict[str, Any]) -> None:
+        fut = asyncio.get_running_loop().create_future()
+        fut.set_result(row)
+        self._rows[row["id"]] = fut
+
+    def forget(self, row_id: Any = None) -> None:
+        if row_id is None:
+            self._rows.clear()
+        else:
+            self._rows.pop(row_id, None)
+
+
+class RequestScope:
+    """Identity map for one Telegram update or publish run."""
+
+    def __init__(self) -> None:
+        self._loaders: dict[str, _RowLoader] = {}
+        self.closed = False
+
+    def loader(self, db: SupabaseClient, table: str) -> _RowLoader:
+        loader = self._loaders.get(table)
+        if loader is None:
+            loader = self._loaders[table] = _RowLoader(db, table)
+        return loader
+
+    def forget(self, table: str, row_id: Any = None) -> None:
+        loader = self._loaders.get(table)
+        if loader is not None:
+            loader.forget(row_id)
+
+
+_scope: ContextVar[RequestScope | None] = ContextVar("repository_scope", default=None)
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestScope]:
+    """Memoize repository lookups until the block exits (nested scopes reuse the outer one).
+
+    Background tasks spawned inside inherit the scope; once it closes they
+    read from the database again.
+    """
+    current = _scope.get()
+    if current is not None and not current.closed:
+        yield current
+        return
+    scope = RequestScope()
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        scope.closed = True
+        _scope.reset(token)
+
+
+def _active_scope() -> RequestScope | None:
+    scope = _scope.get()
+    return scope if scope is not None and not scope.closed else None
+
+
 class BaseRepository:
     """Base class for all repositories. Provides table access via SupabaseClient.
 
@@ -22,6 +137,30 @@ class BaseRepository:
         """Return a PostgREST request builder for the given table."""
         return self._db.table(name)
 
+    async def _get_row_by_id(self, table: str, row_id: Any) -> dict[str, Any] | None:
+        """Single row by primary key; memoized and batched inside request_scope()."""
+        scope = _active_scope()
+        if scope is None:
+            resp = await self._table(table).select("*").eq("id", row_id).maybe_single().execute()
+            return self._single(resp)
+        return await scope.loader(self._db, table).load(row_id)
+
+    def _refresh(self, table: str, row_id: Any, row: dict[str, Any] | None) -> None:
+        """Replace a memoized row with the representation returned by a write."""
+        scope = _active_scope()
+        if scope is None:
+            return
+        scope.forget(table, row_id)
+        if row:
+            scope.loader(self._db, table).remember(row)
+
+    @staticmethod
+    def _forget(table: str, row_id: Any = None) -> None:
+        """Drop a memoized row (or the whole table when row_id is None) after a write."""
+        scope = _active_scope()
+        if scope is not None:
+            scope.forget(table, row_id)
+
     @staticmethod
     def _single(resp: Any) -> dict[str, Any] | None:
         """Extract single row dict from maybe_single() response."""
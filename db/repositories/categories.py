@@ -19,10 +19,16 @@ class CategoriesRepository(BaseRepository):
 
     async def get_by_id(self, category_id: int) -> Category | None:
         """Get category by ID."""
-        resp = await self._table(_TABLE).select("*").eq("id", category_id).maybe_single().execute()
-        row = self._single(resp)
+        row = await self._get_row_by_id(_TABLE, category_id)
         return Category(**row) if row else None
 
+    async def get_by_ids(self, category_ids: list[int]) -> list[Category]:
+        """Get categories by IDs in a single query (missing IDs are skipped)."""
+        if not category_ids:
+            return []
+        resp = await self._table(_TABLE).select("*").in_("id", category_ids).execute()
+        return [Category(**row) for row in self._rows(resp)]
+
     async def get_by_project(self, project_id: int) -> list[Category]:
         """Get all categories for a project, ordered by name."""
         resp = await self._table(_TABLE).select("*").eq("project_id", project_id).order("name").execute()
@@ -68,40 +74,47 @@ class CategoriesRepository(BaseRepository):
             return await self.get_by_id(category_id)
         resp = await self._table(_TABLE).update(payload).eq("id", category_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, category_id, row)
         return Category(**row) if row else None
 
     async def delete(self, category_id: int) -> bool:
         """Delete category. Service must cancel QStash schedules BEFORE calling this (E24)."""
         resp = await self._table(_TABLE).delete().eq("id", category_id).execute()
+        self._forget(_TABLE, category_id)
         return len(self._rows(resp)) > 0
 
     async def clear_prices(self, category_id: int) -> Category | None:
         """Set prices to NULL. Separate from update() which uses exclude_none."""
         resp = await self._table(_TABLE).update({"prices": None}).eq("id", category_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, category_id, row)
         return Category(**row) if row else None
 
     async def clear_description(self, category_id: int) -> Category | None:
         """Set description to NULL. Separate from update() which uses exclude_none."""
         resp = await self._table(_TABLE).update({"description": None}).eq("id", category_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, category_id, row)
         return Category(**row) if row else None
 
     async def update_keywords(self, category_id: int, keywords: list[dict[str, Any]]) -> Category | None:
         """Replace keywords JSONB array."""
         resp = await self._table(_TABLE).update({"keywords": keywords}).eq("id", category_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, category_id, row)
         return Category(**row) if row else None
 
     async def update_media(self, category_id: int, media: list[dict[str, Any]]) -> Category | None:
         """Replace media JSONB array."""
         resp = await self._table(_TABLE).update({"media": media}).eq("id", category_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, category_id, row)
         return Category(**row) if row else None
 
     async def update_reviews(self, category_id: int, reviews: list[dict[str, Any]]) -> Category | None:
         """Replace reviews JSONB array."""
         resp = await self._table(_TABLE).update({"reviews": reviews}).eq("id", category_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, category_id, row)
         return Category(**row) if row else None
 
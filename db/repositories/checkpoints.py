@@ -0,0 +1,37 @@
+"""Repository for pipeline_checkpoints table — per-stage outputs of a pipeline run."""
+
+from typing import Any
+
+from db.models import PipelineCheckpoint
+from db.repositories.base import BaseRepository
+
+_TABLE = "pipeline_checkpoints"
+
+
+class CheckpointsRepository(BaseRepository):
+    """Save, load and expire pipeline stage checkpoints."""
+
+    async def get_stages(self, run_key: str, since_iso: str) -> list[PipelineCheckpoint]:
+        """All stages saved for a run after ``since_iso`` (older ones are treated as expired)."""
+        resp = await self._table(_TABLE).select("*").eq("run_key", run_key).gte("created_at", since_iso).execute()
+        return [PipelineCheckpoint(**row) for row in self._rows(resp)]
+
+    async def save(self, run_key: str, stage: str, data: dict[str, Any]) -> None:
+        """Insert or overwrite one stage."""
+        await (
+            self._table(_TABLE)
+            .upsert(
+                {"run_key": run_key, "stage": stage, "data": data},
+                on_conflict="run_key,stage",
+            )
+            .execute()
+        )
+
+    async def delete_run(self, run_key: str) -> None:
+        """Drop every stage of a finished run."""
+        await self._table(_TABLE).delete().eq("run_key", run_key).execute()
+
+    async def delete_before(self, cutoff_iso: str) -> list[PipelineCheckpoint]:
+        """Delete checkpoints created before cutoff. Returns deleted rows (for storage cleanup)."""
+        resp = await self._table(_TABLE).delete().lt("created_at", cutoff_iso).execute()
+        return [PipelineCheckpoint(**row) for row in self._rows(resp)]
@@ -1,9 +1,13 @@
-"""Repository for platform_connections table with Fernet encryption."""
+"""Repository for platform_connections table with Fernet encryption.
+
+Single-row reads decrypt eagerly; list reads attach LazyCredentials so
+decryption happens only for connections whose credentials are actually used.
+"""
 
 from typing import Any
 
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import CredentialManager, LazyCredentials
 from db.models import PlatformConnection, PlatformConnectionCreate, PlatformConnectionUpdate
 from db.repositories.base import BaseRepository
 
@@ -29,6 +33,16 @@ class ConnectionsRepository(BaseRepository):
         decrypted = self._decrypt_row(row)
         return PlatformConnection(**decrypted)
 
+    def _to_lazy_connection(self, row: dict[str, Any]) -> PlatformConnection:
+        """Convert row to PlatformConnection that decrypts credentials on first access."""
+        encrypted = row.get("credentials")
+        if not encrypted:
+            return PlatformConnection(**row)
+        conn = PlatformConnection(**{**row, "credentials": {}})
+        # Plain assignment: the model has no validate_assignment, so the lazy dict is kept as-is
+        conn.credentials = LazyCredentials(self._cm, encrypted)
+        return conn
+
     async def get_by_id(self, connection_id: int) -> PlatformConnection | None:
         """Get connection by ID with decrypted credentials."""
         resp = await self._table(_TABLE).select("*").eq("id", connection_id).maybe_single().execute()
@@ -37,15 +51,22 @@ class ConnectionsRepository(BaseRepository):
             return None
         return self._to_connection(row)
 
+    async def get_by_ids(self, connection_ids: list[int]) -> dict[int, PlatformConnection]:
+        """Load several connections in one query, keyed by id (credentials decrypted lazily)."""
+        if not connection_ids:
+            return {}
+        resp = await self._table(_TABLE).select("*").in_("id", list(set(connection_ids))).execute()
+        return {row["id"]: self._to_lazy_connection(row) for row in self._rows(resp)}
+
     async def get_by_project(self, project_id: int) -> list[PlatformConnection]:
-        """Get all connections for a project with decrypted credentials."""
+        """Get all connections for a project (credentials decrypted lazily)."""
         resp = (
             await self._table(_TABLE).select("*").eq("project_id", project_id).order("created_at", desc=True).execute()
         )
-        return [self._to_connection(row) for row in self._rows(resp)]
+        return [self._to_lazy_connection(row) for row in self._rows(resp)]
 
     async def get_by_project_and_platform(self, project_id: int, platform_type: str) -> list[PlatformConnection]:
-        """Get connections filtered by project and platform type."""
+        """Get connections filtered by project and platform type (credentials decrypted lazily)."""
         resp = (
             await self._table(_TABLE)
             .select("*")
@@ -53,7 +74,7 @@ class ConnectionsRepository(BaseRepository):
             .eq("platform_type", platform_type)
             .execute()
         )
-        return [self._to_connection(row) for row in self._rows(resp)]
+        return [self._to_lazy_connection(row) for row in self._rows(resp)]
 
     async def create(self, data: PlatformConnectionCreate, raw_credentials: dict[str, Any]) -> PlatformConnection:
         """Create connection with encrypted credentials."""
@@ -67,9 +88,14 @@ class ConnectionsRepository(BaseRepository):
     async def update_credentials(
         self, connection_id: int, raw_credentials: dict[str, Any]
     ) -> PlatformConnection | None:
-        """Re-encrypt and update credentials."""
+        """Re-encrypt and update credentials. Evicts the old plaintext from the decrypt cache."""
+        old = self._single(
+            await self._table(_TABLE).select("credentials").eq("id", connection_id).maybe_single().execute()
+        )
         encrypted = self._cm.encrypt(raw_credentials)
         resp = await self._table(_TABLE).update({"credentials": encrypted}).eq("id", connection_id).execute()
+        if old and old.get("credentials"):
+            self._cm.evict(old["credentials"])
         row = self._first(resp)
         return self._to_connection(row) if row else None
 
@@ -11,10 +11,16 @@ class ProjectsRepository(BaseRepository):
 
     async def get_by_id(self, project_id: int) -> Project | None:
         """Get project by ID."""
-        resp = await self._table(_TABLE).select("*").eq("id", project_id).maybe_single().execute()
-        row = self._single(resp)
+        row = await self._get_row_by_id(_TABLE, project_id)
         return Project(**row) if row else None
 
+    async def get_by_ids(self, project_ids: list[int]) -> list[Project]:
+        """Get projects by IDs in a single query (missing IDs are skipped)."""
+        if not project_ids:
+            return []
+        resp = await self._table(_TABLE).select("*").in_("id", project_ids).execute()
+        return [Project(**row) for row in self._rows(resp)]
+
     async def get_by_user(self, user_id: int) -> list[Project]:
         """Get all projects for a user, ordered by creation date (newest first)."""
         resp = await self._table(_TABLE).select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
@@ -43,6 +49,7 @@ class ProjectsRepository(BaseRepository):
             return await self.get_by_id(project_id)
         resp = await self._table(_TABLE).update(payload).eq("id", project_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, project_id, row)
         return Project(**row) if row else None
 
     async def count_all(self) -> int:
@@ -57,4 +64,6 @@ class ProjectsRepository(BaseRepository):
     async def delete(self, project_id: int) -> bool:
         """Delete project. Service must cancel QStash schedules BEFORE calling this (E11)."""
         resp = await self._table(_TABLE).delete().eq("id", project_id).execute()
+        self._forget(_TABLE, project_id)
+        self._forget("categories")  # CASCADE
         return len(self._rows(resp)) > 0
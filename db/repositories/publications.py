@@ -3,13 +3,18 @@
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import structlog
+
 from db.models import PublicationLog, PublicationLogCreate
 from db.repositories.base import BaseRepository
 
 _TABLE = "publication_logs"
+_STATS_TABLE = "publication_stats"
 _COOLDOWN_DAYS = 7
 _MIN_POOL_SIZE = 3
 
+log = structlog.get_logger()
+
 
 class PublicationsRepository(BaseRepository):
     """CRUD + keyword rotation for publication_logs."""
@@ -151,121 +156,145 @@ class PublicationsRepository(BaseRepository):
           - Sort: volume DESC, difficulty ASC
           - Pick: phrase
 
+        Selection (cooldown + LRU) runs in the rotate_keyword RPC in one round trip;
+        table reads are used only if the function is unavailable.
+
         Returns: (keyword_phrase, low_pool_warning). None if empty pool.
         """
         if not keywords:
             return None, True
 
-        is_cluster = bool(keywords[0].get("cluster_name"))
-
-        if is_cluster:
-            return await self._rotate_clusters(category_id, keywords, content_type)
-        return await self._rotate_legacy(category_id, keywords, content_type)
+        pool = self._rotation_pool(keywords, content_type)
+        if not pool:
+            return None, True
 
-    async def _rotate_clusters(
+        # Primary path: one RPC (GROUP BY max(created_at) over idx_pub_logs_rotation)
+        try:
+            rows = await self._db.rpc(
+                "rotate_keyword",
+                {
+                    "p_category_id": category_id,
+                    "p_pool": pool,
+                    "p_content_type": content_type,
+                    "p_cooldown_days": _COOLDOWN_DAYS,
+                    "p_min_pool_size": _MIN_POOL_SIZE,
+                },
+            )
+            if rows:
+                return rows[0].get("keyword") or None, bool(rows[0].get("low_pool"))
+        except Exception:
+            log.warning("rpc_unavailable", fn="rotate_keyword", category_id=category_id, exc_info=True)
+
+        # Fallback (RPC unavailable only): cooldown set + LRU via table reads
+        return await self._rotate_fallback(category_id, pool, content_type)
+
+    @staticmethod
+    def _rotation_pool(keywords: list[dict[str, Any]], content_type: str) -> list[str]:
+        """Candidate keywords in priority order.
+
+        Cluster format (API_CONTRACTS.md §6):
+          - Articles: cluster_type="article" only (§6 step 2)
+          - Social posts: ALL cluster_types eligible (§6.1 — no filter)
+          - Sort: total_volume DESC, avg_difficulty ASC; pick main_phrase
+        Legacy format (E36 fallback): volume DESC, difficulty ASC; pick phrase.
+        """
+        if keywords[0].get("cluster_name"):
+            if content_type == "article":
+                clusters = [c for c in keywords if c.get("cluster_type") == "article"]
+            else:
+                clusters = list(keywords)
+            clusters.sort(key=lambda c: (-c.get("total_volume", 0), c.get("avg_difficulty", 0)))
+            return [c["main_phrase"] for c in clusters if c.get("main_phrase")]
+
+        sorted_kw = sorted(keywords, key=lambda k: (-k.get("volume", 0), k.get("difficulty", 0)))
+        return [k["phrase"] for k in sorted_kw if k.get("phrase")]
+
+    async def _rotate_fallback(
         self,
         category_id: int,
-        clusters: list[dict[str, Any]],
+        pool: list[str],
         content_type: str,
     ) -> tuple[str | None, bool]:
-        """Cluster-based rotation (API_CONTRACTS.md §6).
-
-        Articles: filter cluster_type="article" only (§6 step 2).
-        Social posts: ALL cluster_types eligible (§6.1 — no filter).
-        Cooldown: per content_type (§6.1 — articles and social posts independent).
-        """
-        # Filter by cluster_type
-        if content_type == "article":
-            pool = [c for c in clusters if c.get("cluster_type") == "article"]
-        else:
-            # Social posts: ALL clusters are eligible (§6.1)
-            pool = list(clusters)
-
-        if not pool:
-            return None, True
-
+        """Client-side rotation over *pool*, same result as the rotate_keyword RPC."""
         low_pool_warning = len(pool) < _MIN_POOL_SIZE
 
-        # Sort by total_volume DESC, avg_difficulty ASC
-        sorted_clusters = sorted(
-            pool,
-            key=lambda c: (-c.get("total_volume", 0), c.get("avg_difficulty", 0)),
-        )
-
         # Cooldown is per content_type (§6.1)
         used = set(await self.get_recently_used_keywords(category_id, content_type=content_type))
-
-        # Pick first available cluster (main_phrase not on cooldown)
-        for cluster in sorted_clusters:
-            main = cluster.get("main_phrase", "")
-            if main and main not in used:
-                return main, low_pool_warning
+        for phrase in pool:
+            if phrase not in used:
+                return phrase, low_pool_warning
 
         # All on cooldown -> pick keyword with oldest cooldown (nearest to expiring)
-        pool_keywords = [c.get("main_phrase", "") for c in sorted_clusters if c.get("main_phrase")]
-        lru = await self.get_lru_keyword(
-            category_id, content_type=content_type, allowed_keywords=pool_keywords,
-        )
+        lru = await self.get_lru_keyword(category_id, content_type=content_type, allowed_keywords=pool)
         if lru:
             return lru, low_pool_warning
 
-        # Fallback: first cluster's main_phrase (no publication_logs yet)
-        first = sorted_clusters[0].get("main_phrase", "") if sorted_clusters else None
-        return first or None, low_pool_warning
+        # Fallback: first keyword in priority order (no publication_logs yet)
+        return pool[0], low_pool_warning
 
-    async def _rotate_legacy(
-        self,
-        category_id: int,
-        keywords: list[dict[str, Any]],
-        content_type: str = "article",
-    ) -> tuple[str | None, bool]:
-        """Legacy flat-keyword rotation (E36 fallback)."""
-        low_pool_warning = len(keywords) < _MIN_POOL_SIZE
-
-        # Sort by volume DESC, difficulty ASC
-        sorted_kw = sorted(
-            keywords,
-            key=lambda k: (-k.get("volume", 0), k.get("difficulty", 0)),
-        )
+    # --- counters (publication_stats, migration 20261018020000) ---
 
-        # Cooldown is per content_type (§6.1)
-        used = set(await self.get_recently_used_keywords(category_id, content_type=content_type))
+    async def _read_stats(self, scope: str, scope_ids: list[int]) -> dict[int, dict[str, Any]] | None:
+        """Counter rows for the given scope ids. None if publication_stats is unavailable.
 
-        for kw in sorted_kw:
-            phrase = kw.get("phrase", "")
-            if phrase and phrase not in used:
-                return phrase, low_pool_warning
+        publication_stats is maintained by a trigger on publication_logs, so a
+        missing row simply means zero publications.
+        """
+        try:
+            resp = (
+                await self._table(_STATS_TABLE)
+                .select("scope_id,total,success,tokens_spent")
+                .eq("scope", scope)
+                .in_("scope_id", scope_ids)
+                .execute()
+            )
+        except Exception:
+            log.warning("publication_stats_unavailable", scope=scope, exc_info=True)
+            return None
+        return {int(row["scope_id"]): row for row in self._rows(resp)}
 
-        # All on cooldown -> pick keyword with oldest cooldown (nearest to expiring)
-        pool_keywords = [k.get("phrase", "") for k in sorted_kw if k.get("phrase")]
-        lru = await self.get_lru_keyword(
-            category_id, content_type=content_type, allowed_keywords=pool_keywords,
-        )
-        if lru:
-            return lru, low_pool_warning
+    async def _stat(self, scope: str, scope_id: int, field: str) -> int | None:
+        stats = await self._read_stats(scope, [scope_id])
+        if stats is None:
+            return None
+        return int(stats.get(scope_id, {}).get(field) or 0)
 
-        # Fallback: first keyword from sorted list (no publication_logs yet)
-        first_phrase = sorted_kw[0].get("phrase", "") if sorted_kw else None
-        return first_phrase or None, low_pool_warning
+    async def _count_logs(self, column: str, value: int, *, success_only: bool = True) -> int:
+        """Fallback: count="exact" scan on publication_logs."""
+        query = self._table(_TABLE).select("id", count="exact").eq(column, value)  # type: ignore[arg-type]
+        if success_only:
+            query = query.eq("status", "success")
+        return self._count(await query.execute())
 
     async def count_by_user(self, user_id: int) -> int:
-        """Count total publications for a user."""
-        resp = (
-            await self._table(_TABLE)
-            .select("id", count="exact")  # type: ignore[arg-type]
-            .eq("user_id", user_id)
-            .execute()
-        )
-        return self._count(resp)
+        """Count total publications (any status) for a user."""
+        total = await self._stat("user", user_id, "total")
+        if total is None:
+            return await self._count_logs("user_id", user_id, success_only=False)
+        return total
 
     async def count_recent(self, days: int = 7) -> int:
-        """Count successful publications in the last N days (admin stats)."""
-        cutoff = (datetime.now(tz=UTC) - timedelta(days=days)).isoformat()
+        """Count successful publications in the last N days (admin stats).
+
+        Counted in whole UTC days from the per-day counters (the cutoff day is included).
+        """
+        cutoff = datetime.now(tz=UTC) - timedelta(days=days)
+        try:
+            resp = (
+                await self._table(_STATS_TABLE)
+                .select("success")
+                .eq("scope", "day")
+                .gte("scope_id", int(cutoff.strftime("%Y%m%d")))
+                .execute()
+            )
+            return sum(int(row.get("success") or 0) for row in self._rows(resp))
+        except Exception:
+            log.warning("publication_stats_unavailable", scope="day", exc_info=True)
         resp = (
             await self._table(_TABLE)
             .select("id", count="exact")  # type: ignore[arg-type]
             .eq("status", "success")
-            .gte("created_at", cutoff)
+            .gte("created_at", cutoff.isoformat())
             .execute()
         )
         return self._count(resp)
@@ -280,44 +309,31 @@ class PublicationsRepository(BaseRepository):
 
     async def get_count_by_category(self, category_id: int) -> int:
         """Count successful publications for a category."""
-        resp = (
-            await self._table(_TABLE)
-            .select("id", count="exact")  # type: ignore[arg-type]
-            .eq("category_id", category_id)
-            .eq("status", "success")
-            .execute()
-        )
-        return self._count(resp)
+        count = await self._stat("category", category_id, "success")
+        return count if count is not None else await self._count_logs("category_id", category_id)
 
     async def get_count_by_connection(self, connection_id: int) -> int:
         """Count successful publications for a connection."""
-        resp = (
-            await self._table(_TABLE)
-            .select("id", count="exact")  # type: ignore[arg-type]
-            .eq("connection_id", connection_id)
-            .eq("status", "success")
-            .execute()
-        )
-        return self._count(resp)
+        count = await self._stat("connection", connection_id, "success")
+        return count if count is not None else await self._count_logs("connection_id", connection_id)
 
     async def get_count_by_project(self, project_id: int) -> int:
         """Count successful publications for a project."""
-        resp = (
-            await self._table(_TABLE)
-            .select("id", count="exact")  # type: ignore[arg-type]
-            .eq("project_id", project_id)
-            .eq("status", "success")
-            .execute()
-        )
-        return self._count(resp)
+        count = await self._stat("project", project_id, "success")
+        return count if count is not None else await self._count_logs("project_id", project_id)
 
     async def get_stats_by_users_batch(self, user_ids: list[int]) -> dict[int, int]:
         """Get total successful publication counts for multiple users in one query (H24: batch).
 
-        Returns dict mapping user_id -> total_publications count.
+        Returns dict mapping user_id -> total_publications count (users without
+        publications are omitted).
         """
         if not user_ids:
             return {}
+        stats = await self._read_stats("user", user_ids)
+        if stats is not None:
+            return {uid: int(row["success"]) for uid, row in stats.items() if row.get("success")}
+
         resp = await self._table(_TABLE).select("user_id").in_("user_id", user_ids).eq("status", "success").execute()
         rows: list[dict[str, Any]] = self._rows(resp)
         counts: dict[int, int] = {}
@@ -328,15 +344,15 @@ class PublicationsRepository(BaseRepository):
 
     async def get_stats_by_user(self, user_id: int) -> dict[str, int]:
         """Get aggregated publication stats for a user."""
-        resp = (
-            await self._table(_TABLE)
-            .select("id", count="exact")  # type: ignore[arg-type]
-            .eq("user_id", user_id)
-            .eq("status", "success")
-            .execute()
-        )
-        total = self._count(resp)
-
+        stats = await self._read_stats("user", [user_id])
+        if stats is not None:
+            row = stats.get(user_id, {})
+            return {
+                "total_publications": int(row.get("success") or 0),
+                "total_tokens_spent": int(row.get("tokens_spent") or 0),
+            }
+
+        total = await self._count_logs("user_id", user_id)
         resp_tokens = (
             await self._table(_TABLE).select("tokens_spent").eq("user_id", user_id).eq("status", "success").execute()
         )
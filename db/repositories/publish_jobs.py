@@ -0,0 +1,104 @@
+"""Repository for publish_jobs table — durable auto-publish queue.
+
+Claiming goes through RPC claim_publish_jobs (migration 20261018030000):
+FOR UPDATE SKIP LOCKED is the only way to lease rows safely across replicas,
+so there is deliberately no PostgREST fallback for it. All other transitions
+are plain updates guarded by lease_owner — a worker that lost its lease
+(expired, re-claimed elsewhere) cannot overwrite the new owner's state.
+"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from db.models import PublishJob
+from db.repositories.base import BaseRepository
+
+_TABLE = "publish_jobs"
+
+
+def _now() -> datetime:
+    return datetime.now(tz=UTC)
+
+
+class PublishJobsRepository(BaseRepository):
+    """Enqueue, lease and settle publish jobs."""
+
+    async def enqueue(self, idempotency_key: str, payload: dict[str, Any], max_attempts: int = 3) -> PublishJob | None:
+        """Insert a queued job. Returns None if the key was already enqueued (QStash retry)."""
+        resp = (
+            await self._table(_TABLE)
+            .upsert(
+                {"idempotency_key": idempotency_key, "payload": payload, "max_attempts": max_attempts},
+                on_conflict="idempotency_key",
+                ignore_duplicates=True,
+            )
+            .execute()
+        )
+        row = self._first(resp)
+        return PublishJob(**row) if row else None
+
+    async def claim(self, worker_id: str, limit: int, lease_seconds: int) -> list[PublishJob]:
+        """Lease up to ``limit`` due jobs (queued, or running with an expired lease)."""
+        rows = await self._db.rpc(
+            "claim_publish_jobs",
+            {"p_worker": worker_id, "p_limit": limit, "p_lease_seconds": lease_seconds},
+        )
+        return [PublishJob(**row) for row in rows or []]
+
+    async def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int) -> bool:
+        """Extend the lease. False means the lease was lost and the job belongs to someone else."""
+        now = _now()
+        resp = (
+            await self._table(_TABLE)
+            .update(
+                {
+                    "lease_expires_at": (now + timedelta(seconds=lease_seconds)).isoformat(),
+                    "updated_at": now.isoformat(),
+                }
+            )
+            .eq("id", job_id)
+            .eq("lease_owner", worker_id)
+            .eq("status", "running")
+            .execute()
+        )
+        return bool(self._rows(resp))
+
+    async def complete(self, job_id: int, worker_id: str, result: dict[str, Any]) -> bool:
+        """Mark a leased job done with its outcome summary."""
+        return await self._settle(job_id, worker_id, {"status": "done", "result": result})
+
+    async def fail(self, job_id: int, worker_id: str, error: str, retry_in: int | None) -> bool:
+        """Record a failed attempt: requeue after ``retry_in`` seconds, or give up if None."""
+        if retry_in is None:
+            return await self._settle(job_id, worker_id, {"status": "failed", "last_error": error})
+        available_at = (_now() + timedelta(seconds=retry_in)).isoformat()
+        return await self._settle(
+            job_id, worker_id, {"status": "queued", "last_error": error, "available_at": available_at}
+        )
+
+    async def release(self, job: PublishJob, worker_id: str) -> bool:
+        """Hand a job back without consuming an attempt (graceful shutdown)."""
+        return await self._settle(
+            job.id,
+            worker_id,
+            {"status": "queued", "attempts": max(job.attempts - 1, 0), "available_at": _now().isoformat()},
+        )
+
+    async def delete_finished_before(self, cutoff_iso: str) -> int:
+        """Delete done/failed jobs last touched before cutoff. Returns deleted rows."""
+        resp = (
+            await self._table(_TABLE).delete().in_("status", ["done", "failed"]).lt("updated_at", cutoff_iso).execute()
+        )
+        return len(self._rows(resp))
+
+    async def _settle(self, job_id: int, worker_id: str, fields: dict[str, Any]) -> bool:
+        payload = {**fields, "lease_owner": None, "lease_expires_at": None, "updated_at": _now().isoformat()}
+        resp = (
+            await self._table(_TABLE)
+            .update(payload)
+            .eq("id", job_id)
+            .eq("lease_owner", worker_id)
+            .eq("status", "running")
+            .execute()
+        )
+        return bool(self._rows(resp))
@@ -52,6 +52,11 @@ class SchedulesRepository(BaseRepository):
         resp = await self._table(_TABLE).select("*").eq("enabled", True).order("created_at").execute()
         return [PlatformSchedule(**row) for row in self._rows(resp)]
 
+    async def get_slot_histogram(self) -> dict[int, int]:
+        """Enabled slots per UTC minute of the week (RPC publish_slot_histogram)."""
+        rows = await self._db.rpc("publish_slot_histogram")
+        return {int(row["minute_of_week"]): int(row["load"]) for row in rows}
+
     async def count_active(self) -> int:
         """Count enabled schedules (admin stats)."""
         resp = (
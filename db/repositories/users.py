@@ -17,10 +17,15 @@ _TABLE = "users"
 class UsersRepository(BaseRepository):
     """CRUD operations for users table."""
 
-    async def get_by_id(self, user_id: int) -> User | None:
-        """Get user by Telegram ID. Returns None if not found."""
-        resp = await self._table(_TABLE).select("*").eq("id", user_id).maybe_single().execute()
-        row = self._single(resp)
+    async def get_by_id(self, user_id: int, *, fresh: bool = False) -> User | None:
+        """Get user by Telegram ID. Returns None if not found.
+
+        fresh=True re-reads the row even if request_scope() memoized it (balance
+        checks late in a long publish run, when another process may have spent).
+        """
+        if fresh:
+            self._forget(_TABLE, user_id)
+        row = await self._get_row_by_id(_TABLE, user_id)
         return User(**row) if row else None
 
     async def get_or_create(self, data: UserCreate) -> tuple[User, bool]:
@@ -43,6 +48,7 @@ class UsersRepository(BaseRepository):
                 changes["last_activity"] = datetime.now(tz=UTC).isoformat()
                 resp = await self._table(_TABLE).update(changes).eq("id", data.id).execute()
                 row = self._first(resp)
+                self._refresh(_TABLE, data.id, row)
                 return (User(**row), False) if row else (existing, False)
             # No changes — still update activity
             await self.update_activity(data.id)
@@ -53,6 +59,7 @@ class UsersRepository(BaseRepository):
         insert_data["last_activity"] = datetime.now(tz=UTC).isoformat()
         resp = await self._table(_TABLE).insert(insert_data).execute()
         row = self._require_first(resp)
+        self._refresh(_TABLE, data.id, row)  # replaces the None memoized by get_by_id above
         return User(**row), True
 
     async def update(self, user_id: int, data: UserUpdate) -> User | None:
@@ -62,6 +69,7 @@ class UsersRepository(BaseRepository):
             return await self.get_by_id(user_id)
         resp = await self._table(_TABLE).update(payload).eq("id", user_id).execute()
         row = self._first(resp)
+        self._refresh(_TABLE, user_id, row)
         return User(**row) if row else None
 
     async def charge_balance(self, user_id: int, amount: int) -> int:
@@ -72,6 +80,7 @@ class UsersRepository(BaseRepository):
         """
         try:
             result = await self._db.rpc("charge_balance", {"p_user_id": user_id, "p_amount": amount})
+            self._forget(_TABLE, user_id)
             return self._extract_balance(result)
         except InsufficientBalanceError:
             raise
@@ -150,6 +159,7 @@ class UsersRepository(BaseRepository):
         """
         try:
             result = await self._db.rpc(fn_name, {"p_user_id": user_id, "p_amount": amount})
+            self._forget(_TABLE, user_id)
             return self._extract_balance(result)
         except Exception:
             log.warning("rpc_unavailable", fn=fn_name, user_id=user_id, exc_info=True)
@@ -180,7 +190,9 @@ class UsersRepository(BaseRepository):
         RPC functions; this is ONLY used as a fallback when RPC is unavailable.
         The `.eq("balance", expected_balance)` acts as a CAS guard.
         Returns raw PostgREST response (caller checks _rows for empty = CAS miss).
+        Drops the memoized user either way so the next CAS attempt re-reads.
         """
+        self._forget(_TABLE, user_id)
         return await (
             self._table(_TABLE)
             .update({"balance": new_balance})
@@ -348,6 +360,10 @@ class UsersRepository(BaseRepository):
         and anonymize financial records BEFORE calling this method.
         """
         resp = await self._table(_TABLE).delete().eq("id", user_id).execute()
+        self._forget(_TABLE, user_id)
+        # CASCADE: owned projects and categories are gone too
+        self._forget("projects")
+        self._forget("categories")
         return len(self._rows(resp)) > 0
 
     async def get_referral_count(self, user_id: int) -> int:
@@ -13,7 +13,7 @@ Design notes:
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
@@ -54,7 +54,7 @@ class BamboodomClient:
 
     api_base: str = ""
     api_key: str = ""
-    http_client: httpx.AsyncClient | None = None
+    http_client: httpx.AsyncClient = field(kw_only=True)  # pooled client from the caller (bot.main)
     redis: Any = None  # RedisClient; typed as Any to avoid circular import
     timeout: float = _DEFAULT_TIMEOUT
 
@@ -99,11 +99,7 @@ class BamboodomClient:
             )
 
         try:
-            if self.http_client is not None:
-                resp = await _send(self.http_client)
-            else:
-                async with httpx.AsyncClient(timeout=effective_timeout) as client:
-                    resp = await _send(client)
+            resp = await _send(self.http_client)
         except httpx.TimeoutException as exc:
             raise BamboodomAPIError(f"Timeout on {action}: {exc}") from exc
         except httpx.RequestError as exc:
@@ -403,11 +399,7 @@ class BamboodomClient:
             )
 
         try:
-            if self.http_client is not None:
-                resp = await _send(self.http_client)
-            else:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    resp = await _send(client)
+            resp = await _send(self.http_client)
         except httpx.TimeoutException as exc:
             raise BamboodomAPIError(f"Timeout on blog_upload_image multipart: {exc}") from exc
         except httpx.RequestError as exc:
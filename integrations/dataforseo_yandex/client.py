@@ -76,7 +76,8 @@ class DataForSEOYandexClient:
         self,
         login: str = "",
         password: str = "",
-        http_client: httpx.AsyncClient | None = None,
+        *,
+        http_client: httpx.AsyncClient,
     ) -> None:
         s = get_settings()
         self._login = login or s.dataforseo_login or ""
@@ -94,21 +95,12 @@ class DataForSEOYandexClient:
         last_exc: Exception | None = None
         for attempt in range(_MAX_RETRIES + 1):
             try:
-                if self._http is not None:
-                    resp = await self._http.post(
-                        f"{_API_BASE}{endpoint}",
-                        json=payload,
-                        auth=(self._login, self._password),
-                        timeout=_DEFAULT_TIMEOUT,
-                    )
-                else:
-                    async with httpx.AsyncClient(timeout=_DEFAULT_TIMEOUT) as client:
-                        resp = await client.post(
-                            f"{_API_BASE}{endpoint}",
-                            json=payload,
-                            auth=(self._login, self._password),
-                            timeout=_DEFAULT_TIMEOUT,
-                        )
+                resp = await self._http.post(
+                    f"{_API_BASE}{endpoint}",
+                    json=payload,
+                    auth=(self._login, self._password),
+                    timeout=_DEFAULT_TIMEOUT,
+                )
             except (httpx.TimeoutException, httpx.RequestError) as exc:
                 last_exc = exc
                 if attempt < _MAX_RETRIES:
@@ -49,9 +49,16 @@ class GSCQuery:
 class GoogleSearchConsoleClient:
     """GSC клиент. Получает access_token из Redis, рефрешит при необходимости."""
 
-    def __init__(self, redis: Any, site_url: str = "https://bamboodom.ru/") -> None:
+    def __init__(
+        self,
+        redis: Any,
+        site_url: str = "https://bamboodom.ru/",
+        *,
+        http_client: httpx.AsyncClient,
+    ) -> None:
         self.redis = redis
         self.site_url = site_url
+        self._http = http_client
         s = get_settings()
         self._client_id = s.google_oauth_client_id
         self._client_secret = s.google_oauth_client_secret.get_secret_value()
@@ -78,7 +85,7 @@ class GoogleSearchConsoleClient:
 
         rt = await self._get_refresh_token()
         try:
-            tok = await refresh_access_token(rt, self._client_id, self._client_secret)
+            tok = await refresh_access_token(rt, self._client_id, self._client_secret, http_client=self._http)
         except Exception as exc:
             raise GoogleTokenError(f"Не удалось обновить токен: {exc}") from exc
 
@@ -102,13 +109,12 @@ class GoogleSearchConsoleClient:
     async def _post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
         token = await self._get_access_token()
         url = f"{_API_BASE}{path}"
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.post(
-                url,
-                json=body,
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=20.0,
-            )
+        resp = await self._http.post(
+            url,
+            json=body,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=20.0,
+        )
         if resp.status_code in (401, 403):
             raise GSCError(f"HTTP {resp.status_code}: {resp.text[:300]}")
         if resp.status_code >= 400:
@@ -118,12 +124,11 @@ class GoogleSearchConsoleClient:
     async def _get(self, path: str) -> dict[str, Any]:
         token = await self._get_access_token()
         url = f"{_API_BASE}{path}"
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(
-                url,
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=20.0,
-            )
+        resp = await self._http.get(
+            url,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=20.0,
+        )
         if resp.status_code >= 400:
             raise GSCError(f"HTTP {resp.status_code}: {resp.text[:300]}")
         return resp.json()
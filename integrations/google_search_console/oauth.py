@@ -46,7 +46,8 @@ async def exchange_code_for_tokens(
     client_id: str,
     client_secret: str,
     redirect_uri: str,
-    http_client: httpx.AsyncClient | None = None,
+    *,
+    http_client: httpx.AsyncClient,
 ) -> dict[str, Any]:
     """Обменивает code на {access_token, refresh_token, expires_in, scope}."""
     data = {
@@ -57,11 +58,7 @@ async def exchange_code_for_tokens(
         "grant_type": "authorization_code",
     }
     try:
-        if http_client is not None:
-            resp = await http_client.post(_TOKEN_URL, data=data, timeout=15.0)
-        else:
-            async with httpx.AsyncClient(timeout=15.0) as c:
-                resp = await c.post(_TOKEN_URL, data=data, timeout=15.0)
+        resp = await http_client.post(_TOKEN_URL, data=data, timeout=15.0)
     except httpx.HTTPError as exc:
         raise GoogleTokenError(f"network: {exc}") from exc
     if resp.status_code >= 400:
@@ -73,7 +70,8 @@ async def refresh_access_token(
     refresh_token: str,
     client_id: str,
     client_secret: str,
-    http_client: httpx.AsyncClient | None = None,
+    *,
+    http_client: httpx.AsyncClient,
 ) -> dict[str, Any]:
     """Получить свежий access_token из refresh_token."""
     data = {
@@ -83,11 +81,7 @@ async def refresh_access_token(
         "grant_type": "refresh_token",
     }
     try:
-        if http_client is not None:
-            resp = await http_client.post(_TOKEN_URL, data=data, timeout=15.0)
-        else:
-            async with httpx.AsyncClient(timeout=15.0) as c:
-                resp = await c.post(_TOKEN_URL, data=data, timeout=15.0)
+        resp = await http_client.post(_TOKEN_URL, data=data, timeout=15.0)
     except httpx.HTTPError as exc:
         raise GoogleTokenError(f"network: {exc}") from exc
     if resp.status_code >= 400:
@@ -51,11 +51,14 @@ class OpenRouterImageClient:
         api_key: str = "",
         model: str = _DEFAULT_MODEL,
         timeout: float = _DEFAULT_TIMEOUT,
+        *,
+        http_client: httpx.AsyncClient,
     ) -> None:
         s = get_settings()
         self._api_key = api_key or s.openrouter_api_key.get_secret_value()
         self._model = model
         self._timeout = timeout
+        self._http = http_client
 
     async def generate(
         self,
@@ -96,13 +99,12 @@ class OpenRouterImageClient:
         last_err: Exception | None = None
         for attempt in range(_MAX_RETRIES + 1):
             try:
-                async with httpx.AsyncClient(timeout=self._timeout) as client:
-                    resp = await client.post(
-                        f"{_API_BASE}/chat/completions",
-                        json=payload,
-                        headers=headers,
-                        timeout=self._timeout,
-                    )
+                resp = await self._http.post(
+                    f"{_API_BASE}/chat/completions",
+                    json=payload,
+                    headers=headers,
+                    timeout=self._timeout,
+                )
                 if resp.status_code >= 500 and attempt < _MAX_RETRIES:
                     await asyncio.sleep(1.5)
                     continue
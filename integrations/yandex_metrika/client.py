@@ -17,7 +17,7 @@ Auth: header `Authorization: OAuth <token>`
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
@@ -43,7 +43,7 @@ class YandexMetrikaClient:
 
     token: str = ""
     counter_id: str = ""
-    http_client: httpx.AsyncClient | None = None
+    http_client: httpx.AsyncClient = field(kw_only=True)  # pooled client from the caller (bot.main)
     timeout: float = _DEFAULT_TIMEOUT
 
     def __post_init__(self) -> None:
@@ -67,11 +67,7 @@ class YandexMetrikaClient:
         full = {"ids": self.counter_id, "accuracy": "full", **params}
         headers = self._headers()
         try:
-            if self.http_client is not None:
-                resp = await self.http_client.get(_API_BASE, params=full, headers=headers, timeout=self.timeout)
-            else:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.get(_API_BASE, params=full, headers=headers, timeout=self.timeout)
+            resp = await self.http_client.get(_API_BASE, params=full, headers=headers, timeout=self.timeout)
         except httpx.TimeoutException as exc:
             raise YandexMetrikaError(f"Timeout: {exc}") from exc
         except httpx.RequestError as exc:
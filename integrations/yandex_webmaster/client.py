@@ -16,7 +16,7 @@ API docs:
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
@@ -55,7 +55,7 @@ class YandexWebmasterClient:
     user_id: str = ""
     host_id: str = ""
     site_url: str = ""
-    http_client: httpx.AsyncClient | None = None
+    http_client: httpx.AsyncClient = field(kw_only=True)  # pooled client from the caller (bot.main)
     timeout: float = _DEFAULT_TIMEOUT
 
     def __post_init__(self) -> None:
@@ -102,11 +102,7 @@ class YandexWebmasterClient:
             )
 
         try:
-            if self.http_client is not None:
-                resp = await _send(self.http_client)
-            else:
-                async with httpx.AsyncClient(timeout=effective_timeout) as client:
-                    resp = await _send(client)
+            resp = await _send(self.http_client)
         except httpx.TimeoutException as exc:
             raise YandexWebmasterError(f"Timeout on {path}: {exc}") from exc
         except httpx.RequestError as exc:
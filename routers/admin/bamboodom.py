@@ -74,6 +74,7 @@ from services.ai.bamboodom import (
     BamboodomArticleService,
     BamboodomGenerationError,
 )
+from services.http_clients import HttpClientRegistry
 
 log = structlog.get_logger()
 router = Router()
@@ -1938,6 +1939,7 @@ async def ai_publish_submit(  # noqa: C901 — strict end-to-end FSM handler
     state: FSMContext,
     redis: RedisClient,
     http_client: httpx.AsyncClient,
+    http_clients: HttpClientRegistry,
     db: SupabaseClient,
 ) -> None:
     if not _is_admin(user):
@@ -2138,6 +2140,7 @@ async def ai_publish_submit(  # noqa: C901 — strict end-to-end FSM handler
                     excerpt=excerpt,
                     extra_text=extra_text,
                     cover_url=cover_url,
+                    http_client=http_clients.get("media"),
                 )
                 if article_url:
                     results = await announce_to_social(
@@ -2185,11 +2188,10 @@ async def ai_publish_submit(  # noqa: C901 — strict end-to-end FSM handler
                 run_background_image_pipeline,
             )
 
-            # 5W (2026-04-28): fire-and-forget background task must use its
-            # own httpx.AsyncClient — the request-scoped http_client closes
-            # when the parent callback handler returns, while this task can
-            # run for several minutes (Gemini × 5 + multipart uploads +
-            # republish + announces).
+            # 5W (2026-04-28): fire-and-forget background task must not use
+            # the request-scoped http_client — it can run for several minutes
+            # (Gemini × 5 + multipart uploads + republish + announces). The
+            # process-wide "background" pool outlives the handler.
             async def _run_pipeline_with_own_client(
                 _slug=resp.slug,
                 _blocks=blocks or [],
@@ -2202,21 +2204,20 @@ async def ai_publish_submit(  # noqa: C901 — strict end-to-end FSM handler
                 _excerpt=excerpt,
                 _extra=extra_text,
             ) -> None:
-                async with httpx.AsyncClient(timeout=120.0) as own_client:
-                    await run_background_image_pipeline(
-                        slug=_slug,
-                        blocks=_blocks,
-                        payload=_payload,
-                        http_client=own_client,
-                        settings=_settings,
-                        sandbox=False,
-                        announce_bot=_bot,
-                        announce_db=_db,
-                        announce_title=_title,
-                        announce_url=_url,
-                        announce_excerpt=_excerpt,
-                        announce_extra_text=_extra,
-                    )
+                await run_background_image_pipeline(
+                    slug=_slug,
+                    blocks=_blocks,
+                    payload=_payload,
+                    http_clients=http_clients,
+                    settings=_settings,
+                    sandbox=False,
+                    announce_bot=_bot,
+                    announce_db=_db,
+                    announce_title=_title,
+                    announce_url=_url,
+                    announce_excerpt=_excerpt,
+                    announce_extra_text=_extra,
+                )
 
             _img_task = asyncio.create_task(
                 _run_pipeline_with_own_client(),
@@ -2292,6 +2293,7 @@ async def bamboodom_promote_submit(
     message: Message,
     user: User,
     state: FSMContext,
+    http_client: httpx.AsyncClient,
 ) -> None:
     """Принимает slug, дёргает endpoint."""
     if not _is_admin(user):
@@ -2312,7 +2314,7 @@ async def bamboodom_promote_submit(
         Screen(E.SYNC, TXT.BAMBOODOM_PROMOTE_TITLE).blank().line(TXT.BAMBOODOM_PROMOTE_PROGRESS).build()
     )
     try:
-        client = BamboodomClient()
+        client = BamboodomClient(http_client=http_client)
         result = await client.promote_from_sandbox(slug_raw)
     except BamboodomAPIError as exc:
         await progress_msg.edit_text(
@@ -2417,6 +2419,7 @@ async def bamboodom_regen_photos_submit(
     state: FSMContext,
     redis: RedisClient,
     http_client: httpx.AsyncClient,
+    http_clients: HttpClientRegistry,
 ) -> None:
     if not _is_admin(user):
         return
@@ -2528,27 +2531,26 @@ async def bamboodom_regen_photos_submit(
     # 3) run image-pipeline (async, don't block FSM)
     from services.bamboodom_images.article_images import run_background_image_pipeline
 
-    # 5W (2026-04-28): own httpx.AsyncClient — request-scoped one closes
-    # when handler returns, but this task takes 1-2 min.
+    # 5W (2026-04-28): process-wide "background" pool — the request-scoped
+    # client must not be used by a task that takes 1-2 min.
     async def _regen_with_own_client(
         _slug=slug_raw,
         _blocks=blocks,
         _payload=payload,
         _settings=settings,
     ) -> None:
-        async with httpx.AsyncClient(timeout=120.0) as own_client:
-            await run_background_image_pipeline(
-                slug=_slug,
-                blocks=_blocks,
-                payload=_payload,
-                http_client=own_client,
-                settings=_settings,
-                sandbox=False,
-                announce_bot=None,
-                announce_db=None,
-                announce_title="",
-                announce_url=None,
-            )
+        await run_background_image_pipeline(
+            slug=_slug,
+            blocks=_blocks,
+            payload=_payload,
+            http_clients=http_clients,
+            settings=_settings,
+            sandbox=False,
+            announce_bot=None,
+            announce_db=None,
+            announce_title="",
+            announce_url=None,
+        )
 
     asyncio.create_task(_regen_with_own_client(), name=f"img_regen_{slug_raw}")
     await state.clear()
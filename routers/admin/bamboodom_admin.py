@@ -54,6 +54,7 @@ from keyboards.bamboodom import (
     bamboodom_recrawl_result_kb,
     bamboodom_root_kb,
 )
+from services.http_clients import HttpClientRegistry
 from services.site_crawler import (
     crawl_bamboodom,
     save_snapshot,
@@ -121,7 +122,7 @@ def _build_admin_text() -> str:
     )
 
 
-async def _build_admin_dashboard_text(redis: RedisClient) -> str:
+async def _build_admin_dashboard_text(redis: RedisClient, http_clients: HttpClientRegistry) -> str:
     """4E дашборд: считает свежую статистику для экрана Администрирование.
 
     Источники данных:
@@ -134,11 +135,8 @@ async def _build_admin_dashboard_text(redis: RedisClient) -> str:
     blog_total: int | None = None
     blog_list_err: str | None = None
     try:
-        BamboodomClient(redis=redis)
         # Используем краулер чтобы переиспользовать логику blog_list+sitemap
-        from services.site_crawler import crawl_bamboodom
-
-        result = await crawl_bamboodom(redis)
+        result = await crawl_bamboodom(redis, http_client=http_clients.get("site_crawler"))
         blog_total = result.total_in_blog if result.total_in_blog is not None else len(result.all_urls)
         new_count = len(result.new_urls)
         all_count = len(result.all_urls)
@@ -155,7 +153,7 @@ async def _build_admin_dashboard_text(redis: RedisClient) -> str:
     settings = get_settings()
     if settings.yandex_webmaster_token.get_secret_value():
         try:
-            yw = YandexWebmasterClient()
+            yw = YandexWebmasterClient(http_client=http_clients.get("yandex_webmaster"))
             try:
                 summary = await yw.get_host_summary()
                 searchable = (summary.get("indexing_indicators") or {}).get("searchable_pages_count") or summary.get(
@@ -207,6 +205,7 @@ async def bamboodom_admin(
     callback: CallbackQuery,
     user: User,
     redis: RedisClient,
+    http_clients: HttpClientRegistry,
 ) -> None:
     """Подменю «Администрирование» — экран 4E с дашбордом статуса."""
     if not _is_admin(user):
@@ -227,7 +226,7 @@ async def bamboodom_admin(
     )
     await callback.answer()
     try:
-        text = await _build_admin_dashboard_text(redis)
+        text = await _build_admin_dashboard_text(redis, http_clients)
     except Exception as exc:
         log.warning("bamboodom_admin_dashboard_failed", exc_info=True)
         text = (
@@ -324,6 +323,7 @@ async def bamboodom_admin_recrawl_preview(
     callback: CallbackQuery,
     user: User,
     redis: RedisClient,
+    http_clients: HttpClientRegistry,
 ) -> None:
     """Сканируем сайт, показываем что нашли, ждём подтверждения."""
     if not _is_admin(user):
@@ -349,7 +349,7 @@ async def bamboodom_admin_recrawl_preview(
     await callback.answer()
 
     try:
-        result = await crawl_bamboodom(redis)
+        result = await crawl_bamboodom(redis, http_client=http_clients.get("site_crawler"))
     except Exception as exc:
         log.warning("bamboodom_recrawl_crawl_failed", exc_info=True)
         await safe_edit_text(
@@ -439,6 +439,7 @@ async def bamboodom_admin_recrawl_run(
     callback: CallbackQuery,
     user: User,
     redis: RedisClient,
+    http_clients: HttpClientRegistry,
 ) -> None:
     """Отправить новые URL'ы (из preview в Redis) в Я.Вебмастер."""
     if not _is_admin(user):
@@ -497,7 +498,7 @@ async def bamboodom_admin_recrawl_run(
         await safe_edit_text(msg, _build_progress_text(0, len(new_urls)), reply_markup=bamboodom_recrawl_progress_kb())
         await callback.answer()
 
-        client = YandexWebmasterClient()
+        client = YandexWebmasterClient(http_client=http_clients.get("yandex_webmaster"))
 
         # Прогрессовый колбэк — обновляем сообщение раз в 3 URL'а или каждые 5 секунд
         last_edit = {"i": 0, "ts": 0.0}
@@ -593,6 +594,7 @@ async def bamboodom_admin_recrawl_run(
 async def bamboodom_admin_regen_sitemap(
     callback: CallbackQuery,
     user: User,
+    http_clients: HttpClientRegistry,
 ) -> None:
     """Кнопка «Регенерировать sitemap_blog.xml» (4E).
 
@@ -617,7 +619,7 @@ async def bamboodom_admin_regen_sitemap(
     await callback.answer()
 
     try:
-        client = BamboodomClient()
+        client = BamboodomClient(http_client=http_clients.get("bamboodom"))
         data = await client.regenerate_sitemap()
     except BamboodomAPIError as exc:
         await safe_edit_text(
@@ -666,6 +668,7 @@ async def bamboodom_admin_regen_sitemap(
 async def bamboodom_admin_regen_sitemap_full(
     callback: CallbackQuery,
     user: User,
+    http_clients: HttpClientRegistry,
 ) -> None:
     """Кнопка «Регенерировать sitemap.xml (весь сайт)» (4E_full).
 
@@ -692,7 +695,7 @@ async def bamboodom_admin_regen_sitemap_full(
     await callback.answer()
 
     try:
-        client = BamboodomClient()
+        client = BamboodomClient(http_client=http_clients.get("bamboodom"))
         data = await client.regenerate_sitemap_full()
     except BamboodomAPIError as exc:
         await safe_edit_text(
@@ -39,6 +39,7 @@ from services.analytics.metrika_summary import (
     summarize_top_pages,
     summarize_traffic_sources,
 )
+from services.http_clients import HttpClientRegistry
 
 log = structlog.get_logger()
 router = Router()
@@ -106,7 +107,9 @@ async def bamboodom_analytics_root(callback: CallbackQuery, user: User) -> None:
 # ---------------------------------------------------------------------------
 
 
-async def _render_summary(callback: CallbackQuery, title: str, date1: str, date2: str) -> None:
+async def _render_summary(
+    callback: CallbackQuery, http_clients: HttpClientRegistry, title: str, date1: str, date2: str
+) -> None:
     msg = safe_message(callback)
     if not msg:
         await callback.answer()
@@ -122,7 +125,7 @@ async def _render_summary(callback: CallbackQuery, title: str, date1: str, date2
     await callback.answer()
 
     try:
-        client = YandexMetrikaClient()
+        client = YandexMetrikaClient(http_client=http_clients.get("yandex_metrika"))
         data = await client.get_summary(date1=date1, date2=date2)
     except YandexMetrikaAuthError:
         text, kb = _wrap_error(TXT.BAMBOODOM_ANALYTICS_AUTH_FAIL)
@@ -154,23 +157,23 @@ async def _render_summary(callback: CallbackQuery, title: str, date1: str, date2
 
 
 @router.callback_query(F.data == "bamboodom:analytics:yesterday")
-async def bamboodom_summary_yesterday(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_summary_yesterday(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
-    await _render_summary(callback, TXT.BAMBOODOM_SUMMARY_TITLE_YESTERDAY, "yesterday", "yesterday")
+    await _render_summary(callback, http_clients, TXT.BAMBOODOM_SUMMARY_TITLE_YESTERDAY, "yesterday", "yesterday")
 
 
 @router.callback_query(F.data == "bamboodom:analytics:week")
-async def bamboodom_summary_week(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_summary_week(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
-    await _render_summary(callback, TXT.BAMBOODOM_SUMMARY_TITLE_WEEK, "7daysAgo", "yesterday")
+    await _render_summary(callback, http_clients, TXT.BAMBOODOM_SUMMARY_TITLE_WEEK, "7daysAgo", "yesterday")
 
 
 @router.callback_query(F.data == "bamboodom:analytics:top_pages")
-async def bamboodom_top_pages(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_top_pages(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
@@ -192,7 +195,7 @@ async def bamboodom_top_pages(callback: CallbackQuery, user: User) -> None:
     )
     await callback.answer()
     try:
-        client = YandexMetrikaClient()
+        client = YandexMetrikaClient(http_client=http_clients.get("yandex_metrika"))
         items = await client.get_top_pages()
     except YandexMetrikaError as exc:
         text, kb = _wrap_error(TXT.BAMBOODOM_ANALYTICS_FAIL.format(detail=str(exc)[:200]))
@@ -210,7 +213,7 @@ async def bamboodom_top_pages(callback: CallbackQuery, user: User) -> None:
 
 
 @router.callback_query(F.data == "bamboodom:analytics:sources")
-async def bamboodom_traffic_sources(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_traffic_sources(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
@@ -232,7 +235,7 @@ async def bamboodom_traffic_sources(callback: CallbackQuery, user: User) -> None
     )
     await callback.answer()
     try:
-        client = YandexMetrikaClient()
+        client = YandexMetrikaClient(http_client=http_clients.get("yandex_metrika"))
         items = await client.get_traffic_sources()
     except YandexMetrikaError as exc:
         text, kb = _wrap_error(TXT.BAMBOODOM_ANALYTICS_FAIL.format(detail=str(exc)[:200]))
@@ -250,7 +253,7 @@ async def bamboodom_traffic_sources(callback: CallbackQuery, user: User) -> None
 
 
 @router.callback_query(F.data == "bamboodom:analytics:queries")
-async def bamboodom_search_queries(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_search_queries(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
@@ -272,7 +275,7 @@ async def bamboodom_search_queries(callback: CallbackQuery, user: User) -> None:
     )
     await callback.answer()
     try:
-        client = YandexMetrikaClient()
+        client = YandexMetrikaClient(http_client=http_clients.get("yandex_metrika"))
         items = await client.get_top_search_phrases()
     except YandexMetrikaError as exc:
         text, kb = _wrap_error(TXT.BAMBOODOM_ANALYTICS_FAIL.format(detail=str(exc)[:200]))
@@ -295,7 +298,7 @@ async def bamboodom_search_queries(callback: CallbackQuery, user: User) -> None:
 
 
 @router.callback_query(F.data == "bamboodom:analytics:digest")
-async def bamboodom_analytics_digest(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_analytics_digest(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     """Утренний дайджест: всё в одном сообщении.
 
     Источники: Метрика + blog_list + Я.Вебмастер. Каждый источник опционален —
@@ -319,7 +322,7 @@ async def bamboodom_analytics_digest(callback: CallbackQuery, user: User) -> Non
     from services.analytics.digest import collect_and_render
 
     try:
-        text = await collect_and_render()
+        text = await collect_and_render(http_clients)
     except Exception as exc:
         log.warning("digest_failed", exc_info=True)
         text = Screen(E.WARNING, TXT.BAMBOODOM_DIGEST_TITLE).blank().line(f"{E.CLOSE} {repr(exc)[:200]}").build()
@@ -332,7 +335,12 @@ async def bamboodom_analytics_digest(callback: CallbackQuery, user: User) -> Non
 
 
 @router.callback_query(F.data == "bamboodom:analytics:ranks")
-async def bamboodom_analytics_ranks(callback: CallbackQuery, user: User, redis) -> None:
+async def bamboodom_analytics_ranks(
+    callback: CallbackQuery,
+    user: User,
+    redis,
+    http_clients: HttpClientRegistry,
+) -> None:
     """Прогон ключевиков через DataForSEO Yandex SERP (4I.1)."""
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
@@ -360,7 +368,7 @@ async def bamboodom_analytics_ranks(callback: CallbackQuery, user: User, redis)
     from services.keyword_tracker import run_check
 
     try:
-        entries, cost_cents = await run_check(redis)
+        entries, cost_cents = await run_check(redis, http_clients.get("dataforseo"))
     except DataForSEOError as exc:
         text, kb = _wrap_error(TXT.BAMBOODOM_RANKS_FAIL.format(detail=str(exc)[:200]))
         await safe_edit_text(msg, text, reply_markup=kb)
@@ -404,7 +412,7 @@ async def bamboodom_analytics_ranks(callback: CallbackQuery, user: User, redis)
 
 
 @router.callback_query(F.data == "bamboodom:analytics:declining")
-async def bamboodom_analytics_declining(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_analytics_declining(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     """Сравнение трафика статей неделя-к-неделе. Просадка ≥30% — в отчёт (4I.3)."""
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
@@ -428,7 +436,7 @@ async def bamboodom_analytics_declining(callback: CallbackQuery, user: User) ->
     await callback.answer()
 
     try:
-        client = YandexMetrikaClient()
+        client = YandexMetrikaClient(http_client=http_clients.get("yandex_metrika"))
         # Период «неделя сейчас» = последние 7 дней (вчера-7 → вчера)
         # Период «прошлая неделя» = 14-7 дней назад
         cur = await client.get_top_pages("7daysAgo", "yesterday", limit=50)
@@ -513,7 +521,7 @@ async def bamboodom_research_root(callback: CallbackQuery, user: User) -> None:
 
 
 @router.callback_query(F.data.startswith("bamboodom:research:"))
-async def bamboodom_research_category(callback: CallbackQuery, user: User) -> None:
+async def bamboodom_research_category(callback: CallbackQuery, user: User, http_clients: HttpClientRegistry) -> None:
     """Подобрать темы для конкретной категории материала."""
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
@@ -549,7 +557,7 @@ async def bamboodom_research_category(callback: CallbackQuery, user: User) -> No
     )
 
     try:
-        client = DataForSEOYandexClient()
+        client = DataForSEOYandexClient(http_client=http_clients.get("dataforseo"))
         suggestions = await client.keywords_for_seed(seed=seed, limit=50)
     except DataForSEOError as exc:
         text, kb = _wrap_error(TXT.BAMBOODOM_RESEARCH_FAIL.format(detail=str(exc)[:200]))
@@ -767,7 +775,7 @@ def _build_gsc_totals_text(t) -> str:
 
 
 @router.callback_query(F.data == "bamboodom:gsc:totals")
-async def bamboodom_gsc_totals(callback: CallbackQuery, user: User, redis) -> None:
+async def bamboodom_gsc_totals(callback: CallbackQuery, user: User, redis, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
@@ -785,7 +793,7 @@ async def bamboodom_gsc_totals(callback: CallbackQuery, user: User, redis) -> No
     )
     await callback.answer()
     try:
-        client = GoogleSearchConsoleClient(redis=redis)
+        client = GoogleSearchConsoleClient(redis=redis, http_client=http_clients.get("google"))
         t = await client.totals(days=28)
     except Exception as exc:
         log.warning("gsc_totals_failed", exc_info=True)
@@ -796,7 +804,7 @@ async def bamboodom_gsc_totals(callback: CallbackQuery, user: User, redis) -> No
 
 
 @router.callback_query(F.data == "bamboodom:gsc:queries")
-async def bamboodom_gsc_queries(callback: CallbackQuery, user: User, redis) -> None:
+async def bamboodom_gsc_queries(callback: CallbackQuery, user: User, redis, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
@@ -814,7 +822,7 @@ async def bamboodom_gsc_queries(callback: CallbackQuery, user: User, redis) -> N
     )
     await callback.answer()
     try:
-        client = GoogleSearchConsoleClient(redis=redis)
+        client = GoogleSearchConsoleClient(redis=redis, http_client=http_clients.get("google"))
         rows = await client.top_queries(days=28, limit=15)
     except Exception as exc:
         log.warning("gsc_queries_failed", exc_info=True)
@@ -834,7 +842,7 @@ async def bamboodom_gsc_queries(callback: CallbackQuery, user: User, redis) -> N
 
 
 @router.callback_query(F.data == "bamboodom:gsc:pages")
-async def bamboodom_gsc_pages(callback: CallbackQuery, user: User, redis) -> None:
+async def bamboodom_gsc_pages(callback: CallbackQuery, user: User, redis, http_clients: HttpClientRegistry) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
@@ -853,7 +861,7 @@ async def bamboodom_gsc_pages(callback: CallbackQuery, user: User, redis) -> Non
     )
     await callback.answer()
     try:
-        client = GoogleSearchConsoleClient(redis=redis)
+        client = GoogleSearchConsoleClient(redis=redis, http_client=http_clients.get("google"))
         rows = await client.top_pages(days=28, limit=15)
     except Exception as exc:
         log.warning("gsc_pages_failed", exc_info=True)
@@ -18,7 +18,6 @@ from __future__ import annotations
 
 import asyncio
 
-import httpx
 import structlog
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
@@ -42,6 +41,7 @@ from keyboards.bamboodom import (
     bamboodom_keywords_publish_one_kb,
 )
 from services.bamboodom_keywords import collect_for_material
+from services.http_clients import HttpClientRegistry
 
 log = structlog.get_logger()
 
@@ -176,7 +176,7 @@ async def keywords_collect_run(
     callback: CallbackQuery,
     user: User,
     db: SupabaseClient,
-    http_client: httpx.AsyncClient,
+    http_clients: HttpClientRegistry,
 ) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
@@ -224,7 +224,7 @@ async def keywords_collect_run(
                 material=mat,
                 repo=repo,
                 openrouter_api_key=s.openrouter_api_key.get_secret_value(),
-                http_client=http_client,
+                http_clients=http_clients,
                 progress_cb=lambda stage, m=mat: _progress(stage, m),
             )
             total_stats["fetched"] += stats["fetched"]
@@ -408,7 +408,7 @@ async def keywords_publish_run(
     state: FSMContext,
     db: SupabaseClient,
     redis: RedisClient,
-    http_client: httpx.AsyncClient,
+    http_clients: HttpClientRegistry,
 ) -> None:
     if not _is_admin(user):
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
@@ -464,34 +464,33 @@ async def keywords_publish_run(
         pass
 
     async def _run_and_track() -> None:
-        # 5W (2026-04-28): create a STANDALONE httpx.AsyncClient inside the
-        # detached task. The http_client from aiogram DI is request-scoped
-        # and closes as soon as the parent callback handler returns —
-        # while this task can run for 5-10 minutes (AI generation + retry +
-        # image-pipeline). Reusing the closed parent client crashes the
-        # retry attempt with "Cannot send a request, as the client has been
-        # closed." (we hit this once validator forced an AI retry).
-        async with httpx.AsyncClient(timeout=120.0) as own_client:
-            try:
-                await _run_ai_generation(
-                    bot_msg=progress_msg,
-                    state=state,
-                    user_id=user.id,
-                    material=kw.material,
-                    keyword=keyword_for_ai,
-                    redis=redis,
-                    http_client=own_client,
-                )
-                # Successful generation lands the article in preview state.
-                # The actual publish happens via "Опубликовать" button in
-                # the AI publish flow. Status will move to 'used' there.
-                # For now mark as used optimistically so it doesn't get re-picked.
-                data = await state.get_data()
-                slug_hint = data.get("ai_published_slug") or data.get("preview_slug")
-                await repo.mark_status(kw.id, "used", published_slug=slug_hint)
-            except Exception as exc:
-                log.warning("bbk_publish_failed", kw_id=kw.id, error=str(exc)[:200])
-                await repo.mark_status(kw.id, "failed")
+        # 5W (2026-04-28): the detached task must not depend on the
+        # http_client from aiogram DI — it can run for 5-10 minutes (AI
+        # generation + retry + image-pipeline), past the parent handler.
+        # Reusing a closed client crashed the retry attempt with "Cannot
+        # send a request, as the client has been closed." The process-wide
+        # "background" pool lives until shutdown and keeps connections warm.
+        own_client = http_clients.get("background")
+        try:
+            await _run_ai_generation(
+                bot_msg=progress_msg,
+                state=state,
+                user_id=user.id,
+                material=kw.material,
+                keyword=keyword_for_ai,
+                redis=redis,
+                http_client=own_client,
+            )
+            # Successful generation lands the article in preview state.
+            # The actual publish happens via "Опубликовать" button in
+            # the AI publish flow. Status will move to 'used' there.
+            # For now mark as used optimistically so it doesn't get re-picked.
+            data = await state.get_data()
+            slug_hint = data.get("ai_published_slug") or data.get("preview_slug")
+            await repo.mark_status(kw.id, "used", published_slug=slug_hint)
+        except Exception as exc:
+            log.warning("bbk_publish_failed", kw_id=kw.id, error=str(exc)[:200])
+            await repo.mark_status(kw.id, "failed")
 
     # Detach so the user can keep navigating
     asyncio.create_task(_run_and_track(), name=f"bbk_publish_{kw.id}")
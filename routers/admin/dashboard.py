@@ -6,7 +6,7 @@ import html
 
 import httpx
 import structlog
-from aiogram import F, Router
+from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import (
@@ -38,11 +38,12 @@ from keyboards.inline import (
     user_actions_kb,
 )
 from services.admin import UserCard
+from services.broadcast import BroadcastProgress, BroadcastResult, BroadcastSender
 
 log = structlog.get_logger()
 router = Router()
 
-_BROADCAST_PROGRESS_STEP = 25
+_BROADCAST_PROGRESS_STEP = 250  # ~10 s at the broadcast rate; keeps progress edits well under limits
 
 
 class BroadcastFSM(StatesGroup):
@@ -678,6 +679,7 @@ async def broadcast_confirm(
     callback: CallbackQuery,
     user: User,
     db: SupabaseClient,
+    redis: RedisClient,
     admin_service_factory: AdminServiceFactory,
     state: FSMContext,
 ) -> None:
@@ -686,7 +688,7 @@ async def broadcast_confirm(
         await callback.answer(S.ADMIN_ACCESS_DENIED, show_alert=True)
         return
     msg = safe_message(callback)
-    if not msg:
+    if not msg or callback.bot is None:
         await callback.answer()
         return
 
@@ -698,34 +700,76 @@ async def broadcast_confirm(
 
     admin_svc = admin_service_factory(db)
     user_ids = await admin_svc.get_audience_ids(audience_key)
-    total = len(user_ids)
 
-    await safe_edit_text(msg, S.BROADCAST_PROGRESS_INIT.format(total=total))
+    await safe_edit_text(msg, S.BROADCAST_PROGRESS_INIT.format(total=len(user_ids)))
+    # Answer now: the broadcast itself takes minutes
+    await callback.answer()
 
-    sent = 0
-    failed = 0
-    bot = callback.bot
+    result = await run_admin_broadcast(
+        callback.bot,
+        redis,
+        broadcast_id=f"admin:{msg.chat.id}:{msg.message_id}",
+        user_ids=user_ids,
+        text=text,
+        audience_key=audience_key,
+        chat_id=msg.chat.id,
+        message_id=msg.message_id,
+    )
+    if result is None:
+        await msg.answer(S.BROADCAST_ALREADY_RUNNING)
 
-    for i, uid in enumerate(user_ids, start=1):
-        try:
-            if bot is not None:
-                await bot.send_message(uid, text)
-            sent += 1
-        except Exception:
-            log.warning("broadcast_send_failed", user_id=uid)
-            failed += 1
-        await asyncio.sleep(0.05)  # 50ms rate limit
 
-        # Progress update every N users (Telegram edit rate limit is acceptable to suppress)
-        if i % _BROADCAST_PROGRESS_STEP == 0 and i < total:
-            with contextlib.suppress(Exception):
-                await safe_edit_text(msg, S.BROADCAST_PROGRESS.format(sent=i, total=total, ok=sent, failed=failed))
+async def run_admin_broadcast(
+    bot: Bot,
+    redis: RedisClient,
+    *,
+    broadcast_id: str,
+    user_ids: list[int],
+    text: str,
+    audience_key: str,
+    chat_id: int,
+    message_id: int,
+) -> BroadcastResult | None:
+    """Send an admin broadcast, editing the admin's progress message.
+
+    Also called on startup to resume a broadcast interrupted by a restart
+    (bot/main.py), so everything needed is kept in the broadcast meta.
+    """
+
+    async def _edit(text_: str, markup: InlineKeyboardMarkup | None = None) -> None:
+        # Progress edits are cosmetic: "message is not modified" / edit rate limits are ignored
+        with contextlib.suppress(Exception):
+            await bot.edit_message_text(text_, chat_id=chat_id, message_id=message_id, reply_markup=markup)
+
+    async def _progress(progress: BroadcastProgress) -> None:
+        if progress.settled < progress.total:
+            await _edit(
+                S.BROADCAST_PROGRESS.format(
+                    sent=progress.settled, total=progress.total, ok=progress.sent, failed=progress.failed
+                )
+            )
+
+    result = await BroadcastSender(bot, redis).run(
+        broadcast_id,
+        [(uid, text) for uid in user_ids],
+        meta={
+            "kind": "admin",
+            "audience": audience_key,
+            "text": text,
+            "chat_id": chat_id,
+            "message_id": message_id,
+        },
+        on_progress=_progress,
+        progress_every=_BROADCAST_PROGRESS_STEP,
+    )
+    if result is None:
+        return None
 
     done_text = (
         Screen(E.CHECK, S.BROADCAST_DONE)
         .blank()
-        .line(S.BROADCAST_DONE_TEXT.format(sent=sent, failed=failed))
+        .line(S.BROADCAST_DONE_TEXT.format(sent=result.sent, failed=result.failed))
         .build()
     )
-    await safe_edit_text(msg, done_text, reply_markup=_BACK_TO_PANEL_KB)
-    await callback.answer()
+    await _edit(done_text, _BACK_TO_PANEL_KB)
+    return result
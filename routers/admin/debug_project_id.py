@@ -14,7 +14,7 @@ from aiogram.types import Message
 
 from bot.config import get_settings
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import User
 from db.repositories.connections import ConnectionsRepository
 from db.repositories.projects import ProjectsRepository
@@ -47,7 +47,7 @@ async def my_project_id_handler(
 
     settings = get_settings()
     enc_key = settings.encryption_key.get_secret_value()
-    conn_repo = ConnectionsRepository(db, CredentialManager(enc_key))
+    conn_repo = ConnectionsRepository(db, get_credential_manager(enc_key))
 
     parts: list[str] = ["<b>📋 Ваши проекты:</b>"]
     for project in projects:
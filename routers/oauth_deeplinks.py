@@ -18,7 +18,7 @@ from bot.texts import strings as S
 from cache.client import RedisClient
 from cache.keys import CacheKeys
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import PlatformConnectionCreate, Project, User
 from db.repositories.connections import ConnectionsRepository
 from db.repositories.projects import ProjectsRepository
@@ -93,7 +93,7 @@ async def _handle_pinterest_deep_link(
         return
 
     settings = get_settings()
-    cm = CredentialManager(settings.encryption_key.get_secret_value())
+    cm = get_credential_manager(settings.encryption_key.get_secret_value())
     conn_repo = ConnectionsRepository(db, cm)
 
     try:
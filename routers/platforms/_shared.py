@@ -29,6 +29,7 @@ from keyboards.inline import (
 )
 from services.analysis import SiteAnalysisService
 from services.connections import ConnectionService
+from services.dashboard import dashboard_changed
 from services.external.firecrawl import FirecrawlClient
 from services.external.pagespeed import PageSpeedClient
 from services.scheduler import SchedulerService
@@ -436,6 +437,7 @@ async def execute_connection_delete(
 
     # E24: Cancel QStash schedules for this connection
     await scheduler_service.cancel_schedules_for_connection(conn_id)
+    await dashboard_changed(user.id)
 
     # Clean up cross_post_connection_ids references
     await conn_svc.cleanup_cross_post_refs(conn_id)
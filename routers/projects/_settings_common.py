@@ -15,7 +15,7 @@ from bot.texts import strings as S
 from bot.texts.emoji import E
 from bot.texts.screens import Screen
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import Project, User
 from db.repositories.connections import ConnectionsRepository
 from keyboards.inline import (
@@ -120,7 +120,7 @@ async def _load_project(
 async def _get_platforms(
     db: SupabaseClient, key: str, pid: int,
 ) -> list[str]:
-    cm = CredentialManager(key)
+    cm = get_credential_manager(key)
     return await ConnectionsRepository(db, cm).get_platform_types_by_project(pid)
 
 
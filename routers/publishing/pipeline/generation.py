@@ -19,6 +19,7 @@ import html
 import json
 import re
 import time
+import uuid
 from typing import Any
 
 import httpx
@@ -59,7 +60,9 @@ from routers.publishing.pipeline._common import (
     try_refund,
 )
 from services.ai.rate_limiter import RateLimiter
+from services.checkpoints import STAGE_KEYWORD, StageCheckpoints, preview_run_key
 from services.connections import ConnectionService
+from services.dashboard import dashboard_changed
 from services.external.telegraph import TelegraphClient
 from services.preview import ArticleContent, PreviewService
 from services.tokens import (
@@ -412,8 +415,14 @@ async def _run_generation(
         await clear_checkpoint(redis, user.id)
         return
 
-    # Select keyword for generation
-    keyword = await select_keyword(db, category_id)
+    # Select keyword for generation (a retry after a failed run resumes its checkpoints)
+    run_id = fsm_data.get("generation_run_id")
+    if not run_id:
+        run_id = uuid.uuid4().hex
+        await state.update_data(generation_run_id=run_id)
+    checkpoint = await StageCheckpoints.open(db, preview_run_key(user.id, category_id, run_id, image_count))
+    saved_keyword = checkpoint.get(STAGE_KEYWORD)
+    keyword = saved_keyword["keyword"] if saved_keyword else await select_keyword(db, category_id)
     if not keyword:
         await try_refund(db, user, tokens_charged, "Нет ключевых фраз")
         await safe_edit_text(message, 
@@ -446,12 +455,15 @@ async def _run_generation(
             firecrawl_client=firecrawl_client,
         )
 
+        if not saved_keyword:
+            await checkpoint.save(STAGE_KEYWORD, {"keyword": keyword})
         content: ArticleContent = await preview_svc.generate_article_content(
             user_id=user.id,
             project_id=project_id,
             category_id=category_id,
             keyword=keyword,
             image_count=image_count,
+            checkpoint=checkpoint,
         )
     except Exception as exc:
         # E35: text generation failed — full refund
@@ -539,7 +551,8 @@ async def _run_generation(
         )
     )
 
-    await state.update_data(preview_id=preview.id, keyword=keyword)
+    # Run finished: the next generation (regenerate, new article) starts a new run
+    await state.update_data(preview_id=preview.id, keyword=keyword, generation_run_id=None)
     await state.set_state(ArticlePipelineFSM.preview)
 
     # Build preview text
@@ -774,6 +787,7 @@ async def publish_article(
                 tokens_spent=preview.tokens_charged or 0,
             )
         )
+        await dashboard_changed(user.id)
 
         # Show result (step 8)
         await state.set_state(ArticlePipelineFSM.result)
@@ -1018,11 +1032,7 @@ async def _do_cancel_refund(
     # C14: cleanup Storage images before refund (best-effort)
     if preview.images:
         try:
-            paths = [
-                img.get("storage_path") for img in preview.images if isinstance(img, dict) and img.get("storage_path")
-            ]
-            if paths:
-                await image_storage.cleanup_by_paths(paths)
+            await image_storage.release_images(preview.images)
         except Exception:
             log.warning(
                 "pipeline.cancel_storage_cleanup_failed",
@@ -1158,6 +1168,7 @@ async def _jump_to_category_selection(
         preview_id=None,
         keyword=None,
         tokens_charged=None,
+        generation_run_id=None,
     )
 
     from services.categories import CategoryService
@@ -33,6 +33,7 @@ from routers.publishing.pipeline.social.generation import (
     _get_publisher,
 )
 from services.connections import ConnectionService
+from services.dashboard import dashboard_changed
 from services.publishers.base import PublishRequest, PublishResult
 
 log = structlog.get_logger()
@@ -291,11 +292,18 @@ async def _execute_crosspost(
                     adapted_text = str(adapted.content) if adapted.content else generated_text
 
                 # Get publisher and publish (with token refresh for Pinterest)
-                from services.publishers.factory import make_token_refresh_cb
+                from services.publishers.factory import make_metadata_update_cb, make_token_refresh_cb
 
                 enc_key = settings.encryption_key.get_secret_value()
                 on_refresh = make_token_refresh_cb(db, conn.id, enc_key)
-                publisher = _get_publisher(conn.platform_type, http_client, settings, on_token_refresh=on_refresh)
+                on_metadata = make_metadata_update_cb(db, conn.id, enc_key)
+                publisher = _get_publisher(
+                    conn.platform_type,
+                    http_client,
+                    settings,
+                    on_token_refresh=on_refresh,
+                    on_metadata_update=on_metadata,
+                )
 
                 ct = _get_content_type(conn.platform_type)
                 category = await CategoriesRepository(db).get_by_id(category_id)
@@ -351,6 +359,7 @@ async def _execute_crosspost(
                             post_url=pub_result.post_url or "",
                         )
                     )
+                    await dashboard_changed(user.id)
                 except Exception:
                     log.exception(
                         "pipeline.crosspost.post_publish_bookkeeping_failed",
@@ -55,6 +55,7 @@ from services.ai.images import ImageService
 from services.ai.orchestrator import AIOrchestrator
 from services.ai.rate_limiter import RateLimiter
 from services.connections import ConnectionService
+from services.dashboard import dashboard_changed
 from services.external.telegraph import TelegraphClient
 from services.publishers.base import PublishRequest, PublishResult
 from services.readiness import ReadinessReport
@@ -663,12 +664,15 @@ async def publish_social_post(
 
         # Get publisher for platform (with token refresh to persist refreshed credentials)
         from bot.config import get_settings as _get_settings
-        from services.publishers.factory import make_token_refresh_cb
+        from services.publishers.factory import make_metadata_update_cb, make_token_refresh_cb
 
         _settings = _get_settings()
         _enc_key = _settings.encryption_key.get_secret_value()
         _on_refresh = make_token_refresh_cb(db, connection.id, _enc_key)
-        publisher = _get_publisher(platform_type, http_client, _settings, on_token_refresh=_on_refresh)
+        _on_metadata = make_metadata_update_cb(db, connection.id, _enc_key)
+        publisher = _get_publisher(
+            platform_type, http_client, _settings, on_token_refresh=_on_refresh, on_metadata_update=_on_metadata
+        )
         content_type = _get_content_type(platform_type)
 
         # Append hashtags for all social platforms (skip if AI already embedded them in text)
@@ -766,6 +770,7 @@ async def publish_social_post(
                 prompt_version=data.get("generated_prompt_version"),
             )
         )
+        await dashboard_changed(user.id)
 
         # Check if there are other social connections for cross-posting
         has_crosspost = False
@@ -959,6 +964,7 @@ def _get_publisher(
     http_client: httpx.AsyncClient,
     settings: Any = None,
     on_token_refresh: Any = None,
+    on_metadata_update: Any = None,
 ) -> Any:
     """Get publisher instance for platform type with proper credentials."""
     from services.publishers.factory import create_publisher
@@ -967,7 +973,13 @@ def _get_publisher(
         from bot.config import get_settings
 
         settings = get_settings()
-    return create_publisher(platform_type, http_client, settings, on_token_refresh=on_token_refresh)
+    return create_publisher(
+        platform_type,
+        http_client,
+        settings,
+        on_token_refresh=on_token_refresh,
+        on_metadata_update=on_metadata_update,
+    )
 
 
 def _get_content_type(platform_type: str) -> Literal["html", "telegram_html", "plain_text", "pin_text"]:
@@ -24,7 +24,7 @@ from bot.texts.screens import Screen
 from cache.client import RedisClient
 from cache.keys import CacheKeys
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import User
 from db.repositories.categories import CategoriesRepository
 from db.repositories.connections import ConnectionsRepository
@@ -463,7 +463,7 @@ async def pipeline_resume(
     connection_identifier = ""
     if pipeline_type == "social" and connection_id:
         settings = get_settings()
-        cm = CredentialManager(settings.encryption_key.get_secret_value())
+        cm = get_credential_manager(settings.encryption_key.get_secret_value())
         conn_repo = ConnectionsRepository(db, cm)
         conn = await conn_repo.get_by_id(connection_id)
         if conn:
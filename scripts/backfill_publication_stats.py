@@ -0,0 +1,50 @@
+"""Backfill publication_stats counters from publication_logs.
+
+Usage:
+    uv run python scripts/backfill_publication_stats.py
+
+Requires: SUPABASE_URL and SUPABASE_KEY env vars (or .env file).
+Calls RPC rebuild_publication_stats() (migration 20261018020000): full
+recount under a SHARE lock on publication_logs. Safe to re-run — use it
+after restoring logs from backup or if counters ever drift.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+async def main() -> None:
+    from postgrest import AsyncPostgrestClient
+
+    url = os.environ["SUPABASE_URL"]
+    key = os.environ["SUPABASE_KEY"]
+
+    client = AsyncPostgrestClient(
+        f"{url}/rest/v1",
+        headers={
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+        },
+    )
+
+    try:
+        resp = await client.rpc("rebuild_publication_stats", {}).execute()
+    except Exception as e:
+        print(f"ERROR rebuild_publication_stats: {e}")
+        raise SystemExit(1) from e
+    finally:
+        await client.aclose()
+
+    print(f"Done: {resp.data} counter rows rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""Spread auto-publish cron minutes of all enabled schedules (load-aware placement).
+
+Usage:
+    uv run python scripts/rebalance_publish_slots.py            # dry run: report only
+    uv run python scripts/rebalance_publish_slots.py --apply    # re-create moved schedules
+
+Requires: bot env vars (SUPABASE_*, QSTASH_TOKEN, ...) or .env file, and
+migration 20261018050000 (slot_minutes + publish_slot_histogram()).
+Each slot moves at most PUBLISH_SLOT_TOLERANCE_MINUTES from its requested
+time. Prints the peak number of slots firing in one minute before and after.
+Safe to re-run: schedules already in place are left untouched.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+async def main(apply: bool) -> None:
+    from bot.config import get_settings
+    from db.client import SupabaseClient
+    from services.scheduler import SchedulerService
+
+    settings = get_settings()
+    db = SupabaseClient(url=settings.supabase_url, key=settings.supabase_key.get_secret_value())
+    scheduler = SchedulerService(
+        db=db,
+        qstash_token=settings.qstash_token.get_secret_value(),
+        base_url=settings.railway_public_url or "https://seo-master-bot.up.railway.app",
+        encryption_key=settings.encryption_key.get_secret_value(),
+        slot_tolerance=settings.publish_slot_tolerance_minutes,
+    )
+
+    try:
+        report = await scheduler.rebalance_slots(apply=apply)
+    finally:
+        await db.close()
+
+    verb = "Moved" if apply else "Would move"
+    print(f"Schedules: {report.schedules}, slots: {report.slots}")
+    print(f"Peak slots per minute: {report.peak_before} -> {report.peak_after}")
+    print(f"{verb}: {report.moved} schedules" + (f", failed: {report.failed}" if report.failed else ""))
+    if report.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apply", action="store_true", help="re-create moved schedules in QStash")
+    asyncio.run(main(parser.parse_args().apply))
@@ -34,6 +34,7 @@ _PROMPT_MAP: dict[str, tuple[str, str]] = {
     "description_v1.yaml": ("description", "v1"),
     "cross_post_v1.yaml": ("cross_post", "v1"),
     "cross_post_v2.yaml": ("cross_post", "v2"),
+    "cross_post_batch_v1.yaml": ("cross_post_batch", "v1"),
     "seed_normalize.yaml": ("seed_normalize", "v1"),
     "research_v1.yaml": ("article_research", "v1"),
     "image_director_v1.yaml": ("image_director", "v1"),
@@ -46,6 +47,7 @@ _ACTIVE: set[tuple[str, str]] = {
     ("article_critique", "v1"),
     ("social_post", "v4"),
     ("cross_post", "v2"),
+    ("cross_post_batch", "v1"),
     ("keywords", "v3"),
     ("image", "v1"),
     ("review", "v1"),
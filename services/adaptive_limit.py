@@ -0,0 +1,288 @@
+"""Adaptive concurrency limit for pipelines and LLM calls (ARCHITECTURE.md §5.6).
+
+Zero dependencies on Telegram/Aiogram.
+
+One AdaptiveLimiter per process decides how much work the replica can
+sustain; PublishWorkerPool and AIOrchestrator each take a LimiterGate from
+it, scaled to their unit of work (one article pipeline fans out into several
+LLM calls, so the AI gate runs at a multiple of the pipeline limit).
+
+The limit follows AIMD:
+- additive increase: a gate that completed work while saturated raises the
+  limit by 1/limit (≈ +1 per `limit` completions);
+- multiplicative decrease (× _BACKOFF, at most once per cooldown) on
+  pressure: a latency-signal gate's short-term latency EWMA exceeding its
+  long-term baseline by `latency_tolerance`, a timed-out slot, event-loop lag above
+  `max_loop_lag`, or RSS above `memory_high_ratio` of the container memory
+  limit (cgroup). Lag and RSS are sampled by a background monitor, so a
+  replica backs off even while 5-minute pipelines are still running.
+
+The latency gradient only means something for homogeneous work. Neither
+production gate is: the "publish" gate mixes 5-second social posts with
+5-minute article pipelines, and the "ai" gate mixes 60-90 s article
+generations with 2-5 s keyword/description calls. A burst of the long kind
+looks like a slowdown, so both are created with latency_signal=False and are
+controlled by timeouts, loop lag and RSS only (their EWMA is still reported).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import os
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import structlog
+
+log = structlog.get_logger()
+
+_BACKOFF = 0.75
+_COOLDOWN = 10.0  # seconds between two decreases — one overload event, one cut
+_MONITOR_INTERVAL = 1.0
+_SHORT_ALPHA = 0.3
+_LONG_ALPHA = 0.05
+_MIN_SAMPLES = 5  # latency gradient is ignored until the baseline has this many samples
+
+
+def _rss_bytes() -> int | None:
+    """Resident set size of this process (Linux /proc), None elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):  # fmt: skip
+        return None
+
+
+def _cgroup_memory_limit() -> int | None:
+    """Container memory limit (cgroup v2, then v1), None if unlimited or unknown."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+        except OSError:
+            continue
+        if raw.isdigit() and int(raw) < 1 << 60:  # v1 reports "unlimited" as a huge number
+            return int(raw)
+        return None
+    return None
+
+
+class LimiterGate:
+    """Concurrency gate whose limit follows the shared AdaptiveLimiter."""
+
+    def __init__(self, limiter: AdaptiveLimiter, name: str, scale: float, *, latency_signal: bool = True) -> None:
+        self._limiter = limiter
+        self.name = name
+        self._scale = scale
+        self._latency_signal = latency_signal
+        self._in_flight = 0
+        self._waiters: list[asyncio.Future[None]] = []
+        self._short: float | None = None
+        self._long: float | None = None
+        self._samples = 0
+
+    @property
+    def limit(self) -> int:
+        return max(1, math.floor(self._limiter.value * self._scale))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def available(self) -> int:
+        return max(0, self.limit - self._in_flight)
+
+    def acquire_nowait(self) -> bool:
+        if self._in_flight >= self.limit:
+            return False
+        self._in_flight += 1
+        return True
+
+    async def acquire(self) -> None:
+        while not self.acquire_nowait():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                self._waiters.remove(waiter)
+                self.wake()  # hand a wake-up this waiter may have received to the next one
+                raise
+            self._waiters.remove(waiter)
+
+    def release(self, latency: float | None = None, *, ok: bool = True) -> None:
+        """Free a slot. latency=None (work failed for its own reasons) gives no feedback."""
+        saturated = self._in_flight >= self.limit
+        self._in_flight = max(0, self._in_flight - 1)
+        if not ok:
+            self._limiter.decrease(f"{self.name}_timeout")
+        elif latency is not None:
+            self._observe(latency, saturated)
+        self.wake()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the block; its duration feeds the limiter."""
+        await self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except TimeoutError:
+            self.release(ok=False)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release(time.monotonic() - start)
+
+    def wake(self) -> None:
+        """Let waiters re-check the limit (slot freed or limit raised)."""
+        free = self.available
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "latency_ms": round(self._short * 1000) if self._short is not None else None,
+            "baseline_ms": round(self._long * 1000) if self._long is not None else None,
+        }
+
+    def _observe(self, latency: float, saturated: bool) -> None:
+        self._samples += 1
+        if self._short is None or self._long is None:
+            self._short = self._long = latency
+        else:
+            self._short += _SHORT_ALPHA * (latency - self._short)
+            self._long += _LONG_ALPHA * (latency - self._long)
+        if (
+            self._latency_signal
+            and self._samples >= _MIN_SAMPLES
+            and self._short > self._long * self._limiter.latency_tolerance
+        ):
+            self._limiter.decrease(f"{self.name}_latency")
+        elif saturated:
+            self._limiter.increase()
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit shared by every gate of the process."""
+
+    def __init__(
+        self,
+        initial: int = 10,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 40,
+        latency_tolerance: float = 2.0,
+        max_loop_lag: float = 0.5,
+        memory_limit_bytes: int | None = None,
+        memory_high_ratio: float = 0.85,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.value = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.max_loop_lag = max_loop_lag
+        self.memory_limit_bytes = memory_limit_bytes if memory_limit_bytes else _cgroup_memory_limit()
+        self.memory_high_ratio = memory_high_ratio
+        self._gates: dict[str, LimiterGate] = {}
+        self._last_decrease = -math.inf
+        self._loop_lag = 0.0
+        self._rss: int | None = None
+        self._decreases: dict[str, int] = {}
+        self._monitor: asyncio.Task[None] | None = None
+
+    @property
+    def limit(self) -> int:
+        return math.floor(self.value)
+
+    def gate(self, name: str, scale: float = 1.0, *, latency_signal: bool = True) -> LimiterGate:
+        """Gate for one kind of work (created once, then shared).
+
+        latency_signal=False: the gate's durations are too mixed for a latency
+        gradient; only timeouts and resource pressure cut the limit.
+        """
+        if name not in self._gates:
+            self._gates[name] = LimiterGate(self, name, scale, latency_signal=latency_signal)
+        return self._gates[name]
+
+    def increase(self) -> None:
+        if self.value >= self.max_limit or self.pressure() is not None:
+            return
+        before = self.limit
+        self.value = min(self.max_limit, self.value + 1 / self.value)
+        if self.limit > before:
+            log.info("concurrency_limit_increased", limit=self.limit)
+            for gate in self._gates.values():
+                gate.wake()
+
+    def decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < _COOLDOWN or self.value <= self.min_limit:
+            return
+        self._last_decrease = now
+        self.value = max(float(self.min_limit), self.value * _BACKOFF)
+        self._decreases[reason] = self._decreases.get(reason, 0) + 1
+        log.warning("concurrency_limit_decreased", reason=reason, limit=self.limit)
+
+    def pressure(self) -> str | None:
+        """Current resource pressure reason (loop lag / memory), None when healthy."""
+        if self._loop_lag > self.max_loop_lag:
+            return "loop_lag"
+        if (
+            self._rss is not None
+            and self.memory_limit_bytes
+            and self._rss > self.memory_limit_bytes * self.memory_high_ratio
+        ):
+            return "memory"
+        return None
+
+    def observe_resources(self, loop_lag: float, rss: int | None) -> None:
+        self._loop_lag = loop_lag
+        self._rss = rss
+        reason = self.pressure()
+        if reason is not None:
+            self.decrease(reason)
+
+    def start(self) -> None:
+        """Start the loop-lag / RSS monitor (idempotent)."""
+        if self._monitor is None:
+            self._monitor = asyncio.create_task(self._monitor_loop(), name="adaptive_limit_monitor")
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor
+            self._monitor = None
+
+    def report(self) -> dict[str, Any]:
+        """Current limit and signals for /api/health."""
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "loop_lag_ms": round(self._loop_lag * 1000),
+            "rss_mb": round(self._rss / 2**20) if self._rss is not None else None,
+            "memory_limit_mb": round(self.memory_limit_bytes / 2**20) if self.memory_limit_bytes else None,
+            "decreases": dict(self._decreases),
+            "gates": {name: gate.report() for name, gate in self._gates.items()},
+        }
+
+    async def _monitor_loop(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(_MONITOR_INTERVAL)
+            lag = max(0.0, time.monotonic() - start - _MONITOR_INTERVAL)
+            self.observe_resources(lag, _rss_bytes())
@@ -23,7 +23,7 @@ from services.ai.orchestrator import (
 from services.ai.prompt_engine import PromptEngine, RenderedPrompt
 from services.ai.quality_scorer import ContentQualityScorer, QualityScore
 from services.ai.rate_limiter import RATE_LIMITS, RateLimiter
-from services.ai.reconciliation import ImageUpload, reconcile_images
+from services.ai.reconciliation import ConvertedImage, ImageUpload, reconcile_images
 from services.ai.reviews import ReviewService
 from services.ai.social_posts import SocialPostService
 from services.storage import ImageStorage, StoredImage
@@ -35,6 +35,7 @@ __all__ = [
     "ArticleService",
     "ContentQualityScorer",
     "ContentValidator",
+    "ConvertedImage",
     "DescriptionService",
     "DirectorResult",
     "GeneratedImage",
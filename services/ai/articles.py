@@ -22,6 +22,7 @@ from db.repositories.categories import CategoriesRepository
 from db.repositories.projects import ProjectsRepository
 from services.ai.content_validator import ContentValidator
 from services.ai.orchestrator import AIOrchestrator, GenerationRequest, GenerationResult
+from services.checkpoints import STAGE_OUTLINE, StageCheckpoints
 
 log = structlog.get_logger()
 
@@ -532,9 +533,13 @@ class ArticleService:
         news_data: list[dict[str, Any]] | None = None,
         autocomplete_suggestions: list[str] | None = None,
         previous_keywords: list[str] | None = None,
+        checkpoint: StageCheckpoints | None = None,
     ) -> GenerationResult:
         """Generate an SEO article via multi-step pipeline.
 
+        With ``checkpoint``, a saved outline is reused instead of regenerated
+        and a freshly generated one is saved (resumable pipeline).
+
         Returns GenerationResult with content as dict:
         {title, meta_description, content_html, content_markdown, faq_schema, images_meta}
         """
@@ -566,7 +571,7 @@ class ArticleService:
         )
 
         # Step 1: OUTLINE → Step 2: EXPAND
-        result, content_markdown = await self._generate_steps(user_id, context, keyword)
+        result, content_markdown = await self._generate_steps(user_id, context, keyword, checkpoint)
 
         # Step 3-5: Render → Score → Critique
         result, content_html, content_warnings = await self._quality_pipeline(
@@ -720,20 +725,28 @@ class ArticleService:
         user_id: int,
         context: dict[str, Any],
         keyword: str,
+        checkpoint: StageCheckpoints | None = None,
     ) -> tuple[GenerationResult, str]:
         """Steps 1-2: Generate outline then expand to full article."""
         outline_text = ""
         research_raw = context.get("_research_data")
-        try:
-            # Override research wording for outline step
-            if research_raw:
-                context["current_research"] = format_research_for_prompt(research_raw, "outline")
-            outline_result = await self._generate_outline(user_id, context)
-            if isinstance(outline_result.content, dict):
-                outline_text = _format_outline(outline_result.content)
-                log.info("outline_generated", keyword=keyword)
-        except Exception:
-            log.warning("outline_skipped", keyword=keyword, exc_info=True)
+        saved_outline = checkpoint.get(STAGE_OUTLINE) if checkpoint else None
+        if saved_outline is not None:
+            outline_text = saved_outline.get("outline", "")
+            log.info("outline_resumed", keyword=keyword)
+        else:
+            try:
+                # Override research wording for outline step
+                if research_raw:
+                    context["current_research"] = format_research_for_prompt(research_raw, "outline")
+                outline_result = await self._generate_outline(user_id, context)
+                if isinstance(outline_result.content, dict):
+                    outline_text = _format_outline(outline_result.content)
+                    log.info("outline_generated", keyword=keyword)
+            except Exception:
+                log.warning("outline_skipped", keyword=keyword, exc_info=True)
+            if outline_text and checkpoint is not None:
+                await checkpoint.save(STAGE_OUTLINE, {"outline": outline_text})
 
         context["outline"] = outline_text
         # Restore expand wording for article generation
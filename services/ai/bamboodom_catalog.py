@@ -151,7 +151,7 @@ async def _http_fetch(
     api_key: str,
     category: str | None,
     has_description: bool,
-    http_client: httpx.AsyncClient | None,
+    http_client: httpx.AsyncClient,
     timeout: float,
 ) -> dict[str, Any]:
     params: dict[str, Any] = {"action": _ENDPOINT_ACTION}
@@ -165,15 +165,8 @@ async def _http_fetch(
         "Accept": "application/json",
     }
 
-    async def _do(client: httpx.AsyncClient) -> httpx.Response:
-        return await client.get(api_base, params=params, headers=headers, timeout=timeout)
-
     try:
-        if http_client is not None:
-            resp = await _do(http_client)
-        else:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                resp = await _do(client)
+        resp = await http_client.get(api_base, params=params, headers=headers, timeout=timeout)
     except httpx.TimeoutException as exc:
         raise CatalogFetchError(f"timeout fetching catalog: {exc}") from exc
     except httpx.RequestError as exc:
@@ -218,10 +211,10 @@ def _parse_payload(raw: dict[str, Any]) -> CatalogPayload:
 
 async def fetch_catalog(
     *,
+    http_client: httpx.AsyncClient,
     category: str | None = None,
     has_description: bool = False,
     force_refresh: bool = False,
-    http_client: httpx.AsyncClient | None = None,
     api_base: str | None = None,
     api_key: str | None = None,
     timeout: float = _DEFAULT_TIMEOUT,
@@ -3,11 +3,13 @@
 Source of truth: API_CONTRACTS.md section 7.
 Multi-image: N separate requests with variation.
 Partial failure OK (K>=1 succeed).
-Returns raw bytes — storage upload is caller's responsibility.
+Returns raw bytes — storage upload is caller's responsibility; generate_pipeline()
+lets the caller convert/upload each image the moment it is generated.
 """
 
 import asyncio
 import base64
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any
 
@@ -119,6 +121,42 @@ class ImageService:
         Raises AIGenerationError if ALL fail.
         Raises RateLimitError if batch rate limit check fails.
         """
+
+        async def _keep(_index: int, image: GeneratedImage) -> GeneratedImage:
+            return image
+
+        results = await self.generate_pipeline(
+            user_id,
+            context,
+            _keep,
+            count=count,
+            block_contexts=block_contexts,
+            director_plans=director_plans,
+        )
+        return [r for r in results if isinstance(r, GeneratedImage)]
+
+    async def generate_pipeline[T](
+        self,
+        user_id: int,
+        context: dict[str, Any],
+        process: Callable[[int, GeneratedImage], Awaitable[T]],
+        count: int = 1,
+        block_contexts: list[str] | None = None,
+        director_plans: list[ImagePlan] | None = None,
+    ) -> list[T | BaseException]:
+        """Generate N images and hand each one to ``process`` as soon as it is ready.
+
+        Every image runs generate → process (e.g. WebP conversion + Storage
+        upload) as its own chain, so the batch takes roughly the slowest image
+        plus one processing step instead of waiting for all N images before
+        processing starts. Raw bytes are dropped once ``process`` returns —
+        only the processed results are held.
+
+        Returns one entry per image in placeholder order: the ``process``
+        result, or the exception that failed generation/processing.
+        Raises AIGenerationError if no image was generated at all.
+        Raises RateLimitError if batch rate limit check fails.
+        """
         # Reserve N rate limit slots ONCE before parallel generation (H14)
         if self._rate_limiter is not None:
             await self._rate_limiter.check_batch(
@@ -127,13 +165,56 @@ class ImageService:
                 count,
             )
 
+        contexts = self._build_contexts(context, count, block_contexts, director_plans)
+        generated = 0
+
+        async def _chain(index: int, img_context: dict[str, Any]) -> T:
+            nonlocal generated
+            image = await self._generate_single(user_id, img_context)
+            generated += 1
+            return await process(index, image)
+
+        results = await asyncio.gather(
+            *(_chain(i, ctx) for i, ctx in enumerate(contexts)),
+            return_exceptions=True,
+        )
+
+        errors: list[str] = []
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                errors.append(f"Image {i + 1}: {result}")
+                log.warning("image_generation_partial_failure", index=i, error=str(result))
+
+        if not generated:
+            raise AIGenerationError(
+                message=f"All {count} image generations failed: {'; '.join(errors)}",
+            )
+
+        if errors:
+            log.info(
+                "image_generation_partial",
+                succeeded=count - len(errors),
+                failed=len(errors),
+                total=count,
+            )
+
+        return results
+
+    @staticmethod
+    def _build_contexts(
+        context: dict[str, Any],
+        count: int,
+        block_contexts: list[str] | None,
+        director_plans: list[ImagePlan] | None,
+    ) -> list[dict[str, Any]]:
+        """Per-image prompt contexts with variation, Director plans and block context."""
         image_settings = context.get("image_settings", {})
         formats = image_settings.get("formats", ["1:1"])
         angles = image_settings.get("angles", [])
         if not angles:
             angles = DEFAULT_ANGLES
 
-        tasks = []
+        contexts: list[dict[str, Any]] = []
         for i in range(count):
             # Build per-image context with variation
             img_context = dict(context)
@@ -158,34 +239,8 @@ class ImageService:
                 img_context["total_images"] = str(count)
                 img_context["variation_hint"] = angles[i % len(angles)]
 
-            tasks.append(self._generate_single(user_id, img_context))
-
-        # Run all in parallel, collect results
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        images: list[GeneratedImage] = []
-        errors: list[str] = []
-        for i, result in enumerate(results):
-            if isinstance(result, BaseException):
-                errors.append(f"Image {i + 1}: {result}")
-                log.warning("image_generation_partial_failure", index=i, error=str(result))
-            elif isinstance(result, GeneratedImage):
-                images.append(result)
-
-        if not images:
-            raise AIGenerationError(
-                message=f"All {count} image generations failed: {'; '.join(errors)}",
-            )
-
-        if errors:
-            log.info(
-                "image_generation_partial",
-                succeeded=len(images),
-                failed=len(errors),
-                total=count,
-            )
-
-        return images
+            contexts.append(img_context)
+        return contexts
 
     async def _generate_single(
         self,
@@ -194,7 +249,7 @@ class ImageService:
     ) -> GeneratedImage:
         """Generate a single image.
 
-        Rate limiting is handled at the batch level in generate(),
+        Rate limiting is handled at the batch level in generate_pipeline(),
         so individual calls go directly to the orchestrator without
         per-request rate limit checks (skip_rate_limit=True).
         """
@@ -208,7 +263,7 @@ class ImageService:
         )
 
         # Call orchestrator._do_generate directly to skip per-request rate limit
-        # check (rate limit was already reserved for the full batch in generate()).
+        # check (rate limit was already reserved for the full batch in generate_pipeline()).
         result: GenerationResult = await self._orchestrator.generate_without_rate_limit(
             request,
         )
@@ -17,11 +17,14 @@ import structlog
 from openai import APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI
 
 from bot.exceptions import AIGenerationError
+from services.adaptive_limit import AdaptiveLimiter, LimiterGate
 from services.ai.prompt_engine import PromptEngine
 from services.ai.rate_limiter import RateLimiter
 
 log = structlog.get_logger()
 
+_DEFAULT_CONCURRENCY = 30  # parallel OpenRouter calls when no shared limiter is wired in
+
 # Task type literal
 TaskType = Literal[
     "article",
@@ -36,6 +39,7 @@ TaskType = Literal[
     "image_director",
     "description",
     "cross_post",
+    "cross_post_batch",
 ]
 
 # Model chains (API_CONTRACTS.md §3.1)
@@ -80,6 +84,10 @@ MODEL_CHAINS: dict[str, list[str]] = {
         "deepseek/deepseek-v3.2",
         "openai/gpt-5.2",
     ],
+    "cross_post_batch": [
+        "deepseek/deepseek-v3.2",
+        "openai/gpt-5.2",
+    ],
     "image": [
         "google/gemini-3.1-flash-image-preview",
         "google/gemini-2.5-flash-image",
@@ -98,6 +106,7 @@ BUDGET_TASKS: set[str] = {
     "review",
     "description",
     "cross_post",
+    "cross_post_batch",
     "article_outline",
     "article_critique",
     "image_director",
@@ -111,6 +120,7 @@ STRUCTURED_TASKS: set[str] = {
     "article_research",
     "social_post",
     "cross_post",
+    "cross_post_batch",
     "keywords",
     "seed_normalize",
     "review",
@@ -277,6 +287,7 @@ class AIOrchestrator:
         prompt_engine: PromptEngine,
         rate_limiter: RateLimiter,
         site_url: str = "",
+        gate: LimiterGate | None = None,
     ) -> None:
         self._client = AsyncOpenAI(
             base_url="https://openrouter.ai/api/v1",
@@ -286,7 +297,10 @@ class AIOrchestrator:
         )
         self._prompt_engine = prompt_engine
         self._rate_limiter = rate_limiter
-        self._semaphore = asyncio.Semaphore(30)  # Backpressure (ARCHITECTURE.md §5.6)
+        # Backpressure (ARCHITECTURE.md §5.6): adaptive gate shared with the publish pool, else fixed 30
+        self._gate = gate or AdaptiveLimiter(
+            _DEFAULT_CONCURRENCY, min_limit=_DEFAULT_CONCURRENCY, max_limit=_DEFAULT_CONCURRENCY
+        ).gate("ai")
         self._site_url = site_url
 
     async def generate(self, request: GenerationRequest) -> GenerationResult:
@@ -295,18 +309,18 @@ class AIOrchestrator:
         action = _RATE_ACTION.get(request.task, "text_generation")
         await self._rate_limiter.check(request.user_id, action)
 
-        # 2. Acquire semaphore (backpressure for autopublish storm)
-        async with self._semaphore:
+        # 2. Acquire a slot (backpressure for autopublish storm)
+        async with self._gate.slot():
             return await self._do_generate(request)
 
     async def generate_without_rate_limit(self, request: GenerationRequest) -> GenerationResult:
         """Generate content bypassing per-request rate limiting.
 
         Used by ImageService which does batch rate limit checks before
-        launching parallel generation tasks. The semaphore (backpressure)
-        is still applied.
+        launching parallel generation tasks. The concurrency gate
+        (backpressure) is still applied.
         """
-        async with self._semaphore:
+        async with self._gate.slot():
             return await self._do_generate(request)
 
     async def generate_stream(self, request: GenerationRequest) -> None:
@@ -19,11 +19,11 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from io import BytesIO
 
 import structlog
 
 from services.ai.markdown_renderer import slugify
+from services.image_transcode import run_in_pool, transcode_to_webp
 
 log = structlog.get_logger()
 
@@ -159,21 +159,31 @@ def _make_generic_meta(title: str, index: int) -> dict[str, str]:
 def _convert_to_webp(image_bytes: bytes) -> tuple[bytes, str]:
     """Convert image to WebP. Falls back to original format on error (E33)."""
     try:
-        from PIL import Image  # type: ignore[import-not-found]
-
-        img = Image.open(BytesIO(image_bytes))
-        buf = BytesIO()
-        img.save(buf, format="WEBP", quality=85)
-        return buf.getvalue(), "webp"
+        result = transcode_to_webp(image_bytes)
+        return result.data, result.ext
     except Exception:
         log.warning("webp_conversion_failed_in_reconciliation")
         return image_bytes, "png"
 
 
+@dataclass
+class ConvertedImage:
+    """Generated image already converted for upload (streaming pipeline)."""
+
+    data: bytes
+    ext: str
+
+
+async def convert_image(image_bytes: bytes) -> ConvertedImage:
+    """Convert one generated image off the event loop as soon as it is ready (E33 fallback applies)."""
+    data, ext = await run_in_pool(_convert_to_webp, image_bytes)
+    return ConvertedImage(data=data, ext=ext)
+
+
 def reconcile_images(
     content_markdown: str,
     images_meta: list[dict[str, str]],
-    generated_images: list[bytes | BaseException],
+    generated_images: list[bytes | ConvertedImage | BaseException],
     title: str,
 ) -> tuple[str, list[ImageUpload]]:
     """Reconcile AI text images_meta with generated images.
@@ -182,17 +192,19 @@ def reconcile_images(
         content_markdown: Markdown text with {{IMAGE_N}} placeholders.
         images_meta: List of metadata dicts [{alt, filename, figcaption}] from AI response.
         generated_images: List of image bytes or exceptions from parallel generation.
+            ConvertedImage entries were converted by the streaming pipeline and
+            are not converted again.
         title: Article title for generating fallback metadata.
 
     Returns:
         Tuple of (processed_markdown, list_of_image_uploads).
     """
-    # Filter out failed images (keep only bytes)
-    valid_images: list[bytes] = [img for img in generated_images if isinstance(img, bytes)]
+    # Filter out failed images (keep only bytes / converted images)
+    valid_images = [img for img in generated_images if isinstance(img, bytes | ConvertedImage)]
 
     uploads: list[ImageUpload] = []
 
-    for i, img_bytes in enumerate(valid_images):
+    for i, image in enumerate(valid_images):
         # Determine metadata for this image (generic fallback when images > meta)
         meta = images_meta[i] if i < len(images_meta) else _make_generic_meta(title, i)
 
@@ -207,12 +219,12 @@ def reconcile_images(
             filename = f"{slugify(title)}-{i + 1}"
 
         # Convert to WebP (E33: fallback to PNG on error)
-        converted_bytes, ext = _convert_to_webp(img_bytes)
+        converted = image if isinstance(image, ConvertedImage) else ConvertedImage(*_convert_to_webp(image))
 
         uploads.append(
             ImageUpload(
-                data=converted_bytes,
-                filename=f"{filename}.{ext}",
+                data=converted.data,
+                filename=f"{filename}.{converted.ext}",
                 alt_text=alt,
                 caption=figcaption,
             )
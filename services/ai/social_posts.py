@@ -4,6 +4,7 @@ Source of truth: API_CONTRACTS.md section 5 (social_v4.yaml).
 Zero Telegram/Aiogram dependencies.
 """
 
+import asyncio
 from typing import Any
 
 import nh3
@@ -13,6 +14,8 @@ from db.client import SupabaseClient
 from db.models import Project
 from db.repositories.categories import CategoriesRepository
 from db.repositories.projects import ProjectsRepository
+from platform_rules import get_rule_for_platform
+from services.ai.content_validator import PLATFORM_LIMITS
 from services.ai.orchestrator import AIOrchestrator, GenerationRequest, GenerationResult
 
 log = structlog.get_logger()
@@ -48,6 +51,36 @@ SOCIAL_POST_SCHEMA: dict[str, Any] = {
     },
 }
 
+# Batched cross-post adaptation: one variant per target platform
+CROSS_POST_BATCH_SCHEMA: dict[str, Any] = {
+    "name": "cross_post_batch_response",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "variants": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "platform": {"type": "string", "enum": ["telegram", "vk", "pinterest"]},
+                        "text": {"type": "string"},
+                        "hashtags": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                        },
+                        "pin_title": {"type": "string"},
+                    },
+                    "required": ["platform", "text", "hashtags", "pin_title"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["variants"],
+        "additionalProperties": False,
+    },
+}
+
 
 _PLATFORM_SOCIAL_FIELDS: dict[str, str] = {
     "vk": "company_vk",
@@ -260,6 +293,130 @@ class SocialPostService:
 
         return result
 
+    async def adapt_for_platforms(
+        self,
+        original_text: str,
+        source_platform: str,
+        target_platforms: list[str],
+        user_id: int,
+        project_id: int,
+        keyword: str,
+    ) -> dict[str, GenerationResult | BaseException]:
+        """Adapt a post for several platforms in one LLM call (cross-posting).
+
+        The source text and system prompt are sent once (task cross_post_batch)
+        and every variant is sanitized and checked against platform_rules.
+        Platforms whose variant is missing or invalid — or all of them, if the
+        batch call fails — fall back to adapt_for_platform concurrently.
+
+        Returns a result per platform; a failed fallback is returned as its
+        exception, like asyncio.gather(return_exceptions=True).
+        """
+        platforms = list(dict.fromkeys(target_platforms))
+        if not platforms:
+            return {}
+        project = await self._projects.get_by_id(project_id)
+        if project is None:
+            from bot.exceptions import AIGenerationError
+
+            raise AIGenerationError(message="Project not found")
+
+        results: dict[str, GenerationResult | BaseException] = {}
+        if len(platforms) > 1:
+            try:
+                results.update(
+                    await self._adapt_batch(original_text, source_platform, platforms, user_id, project, keyword)
+                )
+            except Exception:
+                log.warning("cross_post_batch_failed", platforms=platforms, exc_info=True)
+
+        missing = [p for p in platforms if p not in results]
+        if missing:
+            if len(platforms) > 1:
+                log.info("cross_post_batch_fallback", platforms=missing)
+            singles = await asyncio.gather(
+                *(
+                    self.adapt_for_platform(original_text, source_platform, p, user_id, project_id, keyword)
+                    for p in missing
+                ),
+                return_exceptions=True,
+            )
+            results.update(zip(missing, singles, strict=True))
+        return results
+
+    async def _adapt_batch(
+        self,
+        original_text: str,
+        source_platform: str,
+        platforms: list[str],
+        user_id: int,
+        project: Project,
+        keyword: str,
+    ) -> dict[str, GenerationResult]:
+        """One cross_post_batch call. Returns only variants that pass validation."""
+        context: dict[str, Any] = {
+            "original_text": original_text,
+            "source_platform": source_platform,
+            "target_platforms": platforms,
+            "platform_limits": {p: PLATFORM_LIMITS.get(p, {}) for p in platforms},
+            "keyword": keyword,
+            "company_name": project.company_name,
+            "specialization": project.specialization,
+            "company_description": project.description or "",
+            "website_url": project.website_url or "",
+            "company_city": project.company_city or "",
+            "company_phone": project.company_phone or "",
+            "telegram_link": _get_social_link(project, "telegram"),
+            "vk_link": _get_social_link(project, "vk"),
+            "language": "ru",
+        }
+        request = GenerationRequest(
+            task="cross_post_batch",
+            context=context,
+            user_id=user_id,
+            response_schema=CROSS_POST_BATCH_SCHEMA,
+        )
+        batch = await self._call_orchestrator(request)
+        variants = batch.content.get("variants", []) if isinstance(batch.content, dict) else []
+
+        accepted: dict[str, dict[str, Any]] = {}
+        for variant in variants:
+            platform = variant.get("platform") if isinstance(variant, dict) else None
+            if platform not in platforms or platform in accepted:
+                continue
+            allowed_tags = _SOCIAL_TAGS.get(platform, set())
+            content = {
+                "text": nh3.clean(str(variant.get("text", "")), tags=allowed_tags, attributes=_SOCIAL_ATTRS),
+                "hashtags": list(variant.get("hashtags") or []),
+                "pin_title": str(variant.get("pin_title", "")),
+            }
+            if platform == "pinterest":
+                _enforce_pinterest_limits(content)
+            # Pin image is attached at publish time — only text limits are checked here
+            validation = get_rule_for_platform(platform).validate(
+                content["text"], "social_post", title=content["pin_title"], has_image=platform == "pinterest"
+            )
+            if not content["text"].strip() or not validation.is_valid:
+                log.warning("cross_post_batch_variant_rejected", platform=platform, errors=validation.errors)
+                continue
+            accepted[platform] = content
+
+        # Usage is reported for the whole call; spread it over the variants
+        share = max(len(accepted), 1)
+        return {
+            platform: GenerationResult(
+                content=content,
+                model_used=batch.model_used,
+                input_tokens=batch.input_tokens // share,
+                output_tokens=batch.output_tokens // share,
+                cost_usd=batch.cost_usd / share,
+                generation_time_ms=batch.generation_time_ms,
+                prompt_version=batch.prompt_version,
+                fallback_used=batch.fallback_used,
+            )
+            for platform, content in accepted.items()
+        }
+
 
 # ---------------------------------------------------------------------------
 # Pinterest hard limits
@@ -15,7 +15,7 @@ from decimal import Decimal
 import structlog
 
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import SiteAuditCreate, SiteBrandingCreate
 from db.repositories.audits import AuditsRepository
 from db.repositories.connections import ConnectionsRepository
@@ -146,6 +146,6 @@ class SiteAnalysisService:
 
     async def _save_internal_links(self, connection_id: int, urls: list[str]) -> None:
         """Store internal links in connection metadata for caching."""
-        cm = CredentialManager(self._encryption_key)
+        cm = get_credential_manager(self._encryption_key)
         repo = ConnectionsRepository(self._db, cm)
         await repo.merge_metadata(connection_id, {"internal_links": "\n".join(urls)})
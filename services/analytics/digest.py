@@ -38,6 +38,7 @@ from services.analytics.metrika_summary import (
     fmt_percent,
     shorten_url,
 )
+from services.http_clients import HttpClientRegistry
 
 log = structlog.get_logger()
 
@@ -53,35 +54,33 @@ class DigestData:
     errors: list[str] = field(default_factory=list)
 
 
-async def _fetch_metrika(data: DigestData) -> None:
+async def _fetch_metrika(data: DigestData, http_clients: HttpClientRegistry) -> None:
     s = get_settings()
     if not s.yandex_metrika_token.get_secret_value() or not s.yandex_metrika_counter_id:
         return
     try:
-        client = YandexMetrikaClient()
+        client = YandexMetrikaClient(http_client=http_clients.get("yandex_metrika"))
         data.metrika_summary = await client.get_summary("yesterday", "yesterday")
         data.metrika_top = await client.get_top_pages("yesterday", "yesterday", limit=3)
     except YandexMetrikaError as exc:
         data.errors.append(f"Метрика: {exc}")
 
 
-async def _fetch_blog(data: DigestData) -> None:
+async def _fetch_blog(data: DigestData, http_clients: HttpClientRegistry) -> None:
     s = get_settings()
     if not s.bamboodom_blog_key.get_secret_value():
         return
     try:
         # Используем blog_list endpoint напрямую
-        import httpx
-
         yesterday = (dt.date.today() - dt.timedelta(days=1)).isoformat()
-        async with httpx.AsyncClient(timeout=10.0) as h:
-            resp = await h.get(
-                s.bamboodom_api_base,
-                params={"action": "blog_list", "limit": 100},
-                headers={"X-Blog-Key": s.bamboodom_blog_key.get_secret_value()},
-            )
-            resp.raise_for_status()
-            payload = resp.json()
+        resp = await http_clients.get("bamboodom").get(
+            s.bamboodom_api_base,
+            params={"action": "blog_list", "limit": 100},
+            headers={"X-Blog-Key": s.bamboodom_blog_key.get_secret_value()},
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        payload = resp.json()
         items = payload.get("items") or []
         data.blog_total = int(payload.get("total") or len(items))
         # Считаем опубликованные «вчера»
@@ -97,12 +96,12 @@ async def _fetch_blog(data: DigestData) -> None:
         data.errors.append(f"blog_list: {exc}")
 
 
-async def _fetch_yw(data: DigestData) -> None:
+async def _fetch_yw(data: DigestData, http_clients: HttpClientRegistry) -> None:
     s = get_settings()
     if not s.yandex_webmaster_token.get_secret_value():
         return
     try:
-        client = YandexWebmasterClient()
+        client = YandexWebmasterClient(http_client=http_clients.get("yandex_webmaster"))
         try:
             data.yw_quota = await client.get_recrawl_quota_info() or {}
         except YandexWebmasterError:
@@ -118,13 +117,13 @@ async def _fetch_yw(data: DigestData) -> None:
         data.errors.append(f"Я.Вебмастер: {exc}")
 
 
-async def collect_digest() -> DigestData:
+async def collect_digest(http_clients: HttpClientRegistry) -> DigestData:
     """Параллельный сбор данных из всех источников. Graceful degrade."""
     data = DigestData()
     await asyncio.gather(
-        _fetch_metrika(data),
-        _fetch_blog(data),
-        _fetch_yw(data),
+        _fetch_metrika(data, http_clients),
+        _fetch_blog(data, http_clients),
+        _fetch_yw(data, http_clients),
         return_exceptions=False,
     )
     return data
@@ -192,6 +191,6 @@ def render_digest(data: DigestData) -> str:
     return screen.build()
 
 
-async def collect_and_render() -> str:
-    data = await collect_digest()
+async def collect_and_render(http_clients: HttpClientRegistry) -> str:
+    data = await collect_digest(http_clients)
     return render_digest(data)
@@ -19,10 +19,10 @@ from typing import Any
 import httpx
 import structlog
 
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.repositories.connections import ConnectionsRepository
 from services.publishers import PublishRequest
-from services.publishers.factory import create_publisher, make_token_refresh_cb
+from services.publishers.factory import create_publisher, make_metadata_update_cb, make_token_refresh_cb
 
 log = structlog.get_logger()
 
@@ -105,7 +105,7 @@ async def announce_to_social(
         return {p: "skip:no_project_id" for p in PLATFORMS}
 
     enc_key = settings.encryption_key.get_secret_value()
-    cm = CredentialManager(enc_key)
+    cm = get_credential_manager(enc_key)
     conn_repo = ConnectionsRepository(db, cm)
 
     image_bytes: bytes | None = None
@@ -159,8 +159,11 @@ async def announce_to_social(
         )
 
         on_refresh = make_token_refresh_cb(db, connection.id, enc_key)
+        on_metadata = make_metadata_update_cb(db, connection.id, enc_key)
         try:
-            publisher = create_publisher(platform, http_client, settings, on_token_refresh=on_refresh)
+            publisher = create_publisher(
+                platform, http_client, settings, on_token_refresh=on_refresh, on_metadata_update=on_metadata
+            )
             result = await publisher.publish(request)
         except Exception as exc:
             log.warning("announce_publish_failed", platform=platform, exc_info=True)
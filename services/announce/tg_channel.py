@@ -18,6 +18,7 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
 import structlog
 
 from bot.config import get_settings
@@ -121,6 +122,8 @@ async def announce_article(
     excerpt: str = "",
     extra_text: str = "",
     cover_url: str | None = None,
+    *,
+    http_client: httpx.AsyncClient,
 ) -> bool:
     """Постит анонс в TG-канал. Возвращает True если успешно, False — если skip/error.
 
@@ -135,6 +138,8 @@ async def announce_article(
     отдельный Bot для постинга в bamboodom-канал, а не наш основной
     @best_seo_master_bot. Удобно когда канал админит специализированный
     бот (например @BamBooDom_bot админит @bamboodom).
+
+    http_client — пул для скачивания cover (media).
     """
     channel = _resolve_channel()
     if not channel:
@@ -186,47 +191,46 @@ async def announce_article(
 
         # Try to download + convert once, then retry only the send.
         try:
-            import httpx as _httpx
-            from PIL import Image as _PilImage  # type: ignore[import-not-found]
             from io import BytesIO as _BytesIO
 
-            async with _httpx.AsyncClient(timeout=20.0) as _hc:
-                for fetch_attempt in range(1, 4):
-                    try:
-                        r = await _hc.get(cover_clean)
-                        if r.status_code == 200 and r.content:
-                            raw = r.content
-                            try:
-                                img = _PilImage.open(_BytesIO(raw)).convert("RGB")
-                                buf = _BytesIO()
-                                img.save(buf, format="JPEG", quality=88, optimize=True)
-                                photo_bytes = buf.getvalue()
-                                log.info(
-                                    "tg_announce_cover_converted",
-                                    src_size=len(raw),
-                                    jpeg_size=len(photo_bytes),
-                                    fetch_attempt=fetch_attempt,
-                                )
-                                break
-                            except Exception as conv_exc:
-                                log.warning(
-                                    "tg_announce_cover_convert_failed",
-                                    error=str(conv_exc)[:200],
-                                )
-                                break
-                        log.warning(
-                            "tg_announce_cover_fetch_status",
-                            status=r.status_code,
-                            fetch_attempt=fetch_attempt,
-                        )
-                    except Exception as fexc:
-                        log.warning(
-                            "tg_announce_cover_fetch_failed",
-                            error=str(fexc)[:200],
-                            fetch_attempt=fetch_attempt,
-                        )
-                    if fetch_attempt < 3:
-                        await _aio.sleep(3 * fetch_attempt)
+            from PIL import Image as _PilImage  # type: ignore[import-not-found]
+
+            for fetch_attempt in range(1, 4):
+                try:
+                    r = await http_client.get(cover_clean, timeout=20.0)
+                    if r.status_code == 200 and r.content:
+                        raw = r.content
+                        try:
+                            img = _PilImage.open(_BytesIO(raw)).convert("RGB")
+                            buf = _BytesIO()
+                            img.save(buf, format="JPEG", quality=88, optimize=True)
+                            photo_bytes = buf.getvalue()
+                            log.info(
+                                "tg_announce_cover_converted",
+                                src_size=len(raw),
+                                jpeg_size=len(photo_bytes),
+                                fetch_attempt=fetch_attempt,
+                            )
+                            break
+                        except Exception as conv_exc:
+                            log.warning(
+                                "tg_announce_cover_convert_failed",
+                                error=str(conv_exc)[:200],
+                            )
+                            break
+                    log.warning(
+                        "tg_announce_cover_fetch_status",
+                        status=r.status_code,
+                        fetch_attempt=fetch_attempt,
+                    )
+                except Exception as fexc:
+                    log.warning(
+                        "tg_announce_cover_fetch_failed",
+                        error=str(fexc)[:200],
+                        fetch_attempt=fetch_attempt,
+                    )
+                if fetch_attempt < 3:
+                    await _aio.sleep(3 * fetch_attempt)
         except Exception as outer:
             log.warning("tg_announce_cover_pipeline_failed", error=str(outer)[:200])
 
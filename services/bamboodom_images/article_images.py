@@ -18,7 +18,6 @@ Graceful degrade: ошибка одной картинки → src="" остаё
 from __future__ import annotations
 
 import asyncio
-import io
 from typing import Any
 
 import httpx
@@ -29,6 +28,8 @@ from integrations.openrouter_image import (
     OpenRouterImageClient,
     OpenRouterImageError,
 )
+from services.http_clients import HttpClientRegistry
+from services.image_transcode import transcode
 
 log = structlog.get_logger()
 
@@ -128,41 +129,21 @@ def _style_suffix_for(material: str | None) -> str:
     return _STYLE_BY_MATERIAL.get(material.strip().lower(), _STYLE_SUFFIX_DEFAULT)
 
 
-def _crop_and_webp(raw_bytes: bytes, slot: str, target_width: int = _WEBP_TARGET_WIDTH) -> bytes:
+async def _crop_and_webp(raw_bytes: bytes, slot: str, target_width: int = _WEBP_TARGET_WIDTH) -> bytes:
     """Crop to slot aspect + resize to target_width + encode as WebP.
 
     Имеется в виду: Gemini рисует ~16:9. Мы должны получить нужный нам
     аспект (например 21:9 для hero, 1:1 для square). Cropим по центру.
+    Crop и resize — один проход Pillow, вне event loop (services.image_transcode).
     """
-    from PIL import Image  # lazy import to avoid pillow at module import time
-
-    aspect_w, aspect_h = _SLOT_ASPECTS.get(slot, (16, 9))
-    img = Image.open(io.BytesIO(raw_bytes))
-    img = img.convert("RGB")  # WebP поддерживает RGBA, но для фото RGB достаточно
-
-    src_w, src_h = img.size
-    # Целевой аспект: target_h = target_w * aspect_h / aspect_w
-    target_aspect = aspect_w / aspect_h
-    src_aspect = src_w / src_h
-
-    if src_aspect > target_aspect:
-        # Картинка шире чем нужно — обрезаем по бокам
-        new_w = int(src_h * target_aspect)
-        offset = (src_w - new_w) // 2
-        img = img.crop((offset, 0, offset + new_w, src_h))
-    elif src_aspect < target_aspect:
-        # Картинка выше чем нужно — обрезаем сверху-снизу
-        new_h = int(src_w / target_aspect)
-        offset = (src_h - new_h) // 2
-        img = img.crop((0, offset, src_w, offset + new_h))
-
-    # Resize to target width keeping aspect
-    final_h = int(target_width * aspect_h / aspect_w)
-    img = img.resize((target_width, final_h), Image.Resampling.LANCZOS)
-
-    out = io.BytesIO()
-    img.save(out, format="WEBP", quality=82, method=4)
-    return out.getvalue()
+    result = await transcode(
+        raw_bytes,
+        quality=82,
+        aspect=_SLOT_ASPECTS.get(slot, (16, 9)),
+        target_width=target_width,
+        rgb=True,  # WebP поддерживает RGBA, но для фото RGB достаточно
+    )
+    return result.data
 
 
 async def _generate_one(
@@ -171,6 +152,7 @@ async def _generate_one(
     slug: str,
     bamboodom_client: BamboodomClient,
     image_client: OpenRouterImageClient,
+    media_client: httpx.AsyncClient,
     semaphore: asyncio.Semaphore,
     material: str | None = None,
 ) -> tuple[dict[str, Any], str]:
@@ -201,11 +183,10 @@ async def _generate_one(
             if result.data_b64:
                 raw = OpenRouterImageClient.decode_b64(result.data_b64)
             elif result.url:
-                # Fetch URL bytes through our http client
-                async with httpx.AsyncClient(timeout=30.0) as c:
-                    r = await c.get(result.url)
-                    r.raise_for_status()
-                    raw = r.content
+                # Fetch URL bytes through the shared media pool
+                r = await media_client.get(result.url, timeout=30.0)
+                r.raise_for_status()
+                raw = r.content
             else:
                 return block, "error:no_data"
         except (httpx.HTTPError, ValueError) as exc:
@@ -214,7 +195,7 @@ async def _generate_one(
 
         # 3. Crop + WebP
         try:
-            webp_bytes = _crop_and_webp(raw, slot)
+            webp_bytes = await _crop_and_webp(raw, slot)
         except Exception as exc:
             log.warning("img_pipeline_pillow_failed", slot=slot, exc_info=True)
             return block, f"error:pillow:{exc}"
@@ -291,7 +272,7 @@ async def generate_article_images(
     *,
     slug: str,
     blocks: list[dict[str, Any]],
-    http_client: httpx.AsyncClient,
+    http_clients: HttpClientRegistry,
     settings: Any,
     parallel: int = 1,
     inter_request_delay: float = 1.2,
@@ -310,8 +291,9 @@ async def generate_article_images(
     if not img_blocks:
         return {"no_img_blocks": 1}
 
-    bamboodom_client = BamboodomClient(http_client=http_client)
-    image_client = OpenRouterImageClient()
+    bamboodom_client = BamboodomClient(http_client=http_clients.get("background"))
+    image_client = OpenRouterImageClient(http_client=http_clients.get("openrouter"))
+    media_client = http_clients.get("media")
     semaphore = asyncio.Semaphore(parallel)
 
     tasks = [
@@ -320,6 +302,7 @@ async def generate_article_images(
             slug=slug,
             bamboodom_client=bamboodom_client,
             image_client=image_client,
+            media_client=media_client,
             semaphore=semaphore,
             material=material,
         )
@@ -354,7 +337,7 @@ async def run_background_image_pipeline(
     slug: str,
     blocks: list[dict[str, Any]],
     payload: dict[str, Any] | None = None,
-    http_client: httpx.AsyncClient,
+    http_clients: HttpClientRegistry,
     settings: Any,
     sandbox: bool = False,
     parallel: int = 1,
@@ -385,7 +368,10 @@ async def run_background_image_pipeline(
     заменяем blocks на обновлённые и шлём весь payload заново.
 
     Safe to fire-and-forget — exceptions logged but never re-raised.
+    Runs for minutes, so it sends through the process-wide "background" pool
+    of `http_clients`, never a request-scoped client.
     """
+    http_client = http_clients.get("background")
     try:
         # Extract material from payload.category for material-aware
         # Gemini prompts (5T). Falls back to None → default suffix.
@@ -397,7 +383,7 @@ async def run_background_image_pipeline(
         counter = await generate_article_images(
             slug=slug,
             blocks=blocks,
-            http_client=http_client,
+            http_clients=http_clients,
             settings=settings,
             parallel=parallel,
             material=material_from_payload,
@@ -502,6 +488,7 @@ async def run_background_image_pipeline(
                     excerpt=announce_excerpt,
                     extra_text=announce_extra_text,
                     cover_url=hero_src or None,
+                    http_client=http_clients.get("media"),
                 )
 
                 # Connections-based publishers (VK/Pinterest/TG via project).
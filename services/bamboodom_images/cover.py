@@ -25,6 +25,7 @@ import structlog
 from bot.config import get_settings
 from integrations.bamboodom import BamboodomAPIError, BamboodomClient
 from integrations.openrouter_image import OpenRouterImageClient, OpenRouterImageError
+from services.http_clients import HttpClientRegistry
 
 log = structlog.get_logger()
 
@@ -62,6 +63,8 @@ def _public_url_for_tmp(filename: str) -> str | None:
 async def generate_and_upload_cover(
     cover_prompt: str,
     alt: str = "",
+    *,
+    http_clients: HttpClientRegistry,
 ) -> str | None:
     """Полный цикл: prompt → OpenRouter → bamboodom upload → URL.
 
@@ -76,7 +79,7 @@ async def generate_and_upload_cover(
 
     # 1. OpenRouter image generation
     try:
-        img_client = OpenRouterImageClient()
+        img_client = OpenRouterImageClient(http_client=http_clients.get("openrouter"))
         result = await img_client.generate(cover_prompt)
     except OpenRouterImageError as exc:
         log.warning("cover_openrouter_failed", error=str(exc)[:200])
@@ -105,7 +108,7 @@ async def generate_and_upload_cover(
 
     # 3. Bamboodom upload_image
     try:
-        b_client = BamboodomClient()
+        b_client = BamboodomClient(http_client=http_clients.get("bamboodom"))
         resp = await b_client.upload_image(source_url=source_url, alt=alt)
     except BamboodomAPIError as exc:
         log.warning("cover_bamboodom_upload_failed", error=str(exc)[:200])
@@ -68,7 +68,7 @@ async def cluster_keywords(
     material: str,
     api_key: str,
     *,
-    http_client: httpx.AsyncClient | None = None,
+    http_client: httpx.AsyncClient,
 ) -> dict[str, str]:
     """Cluster a list of phrases into theme labels.
 
@@ -81,64 +81,58 @@ async def cluster_keywords(
         return {}
     material_label = _MATERIAL_LABELS.get(material, material)
 
-    own_client = http_client is None
-    client = http_client or httpx.AsyncClient(timeout=_TIMEOUT)
-
     out: dict[str, str] = {}
-    try:
-        for i in range(0, len(keywords), _MAX_KEYWORDS_PER_CALL):
-            chunk = keywords[i : i + _MAX_KEYWORDS_PER_CALL]
-            user = _USER_TEMPLATE.format(
-                material_label=material_label,
-                phrases_json=json.dumps(chunk, ensure_ascii=False),
+    for i in range(0, len(keywords), _MAX_KEYWORDS_PER_CALL):
+        chunk = keywords[i : i + _MAX_KEYWORDS_PER_CALL]
+        user = _USER_TEMPLATE.format(
+            material_label=material_label,
+            phrases_json=json.dumps(chunk, ensure_ascii=False),
+        )
+        payload = {
+            "model": _CLUSTER_MODEL,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": user},
+            ],
+            "temperature": 0.1,
+            "max_tokens": 4000,
+        }
+        try:
+            resp = await http_client.post(
+                _OPENROUTER_URL,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json=payload,
+                timeout=_TIMEOUT,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            content = (
+                data.get("choices", [{}])[0]
+                .get("message", {})
+                .get("content", "")
+                .strip()
+            )
+            # Strip optional markdown wrapper
+            if content.startswith("```"):
+                content = content.strip("`").lstrip("json").strip()
+            items = json.loads(content)
+            for item in items:
+                kw = (item.get("keyword") or "").strip()
+                lbl = (item.get("label") or "").strip().lower()
+                if not kw:
+                    continue
+                if lbl not in THEME_LABELS:
+                    lbl = "общее"
+                out[kw] = lbl
+        except Exception as exc:
+            log.warning(
+                "bbk_cluster_chunk_failed",
+                error=str(exc)[:200],
+                chunk_size=len(chunk),
             )
-            payload = {
-                "model": _CLUSTER_MODEL,
-                "messages": [
-                    {"role": "system", "content": _SYSTEM_PROMPT},
-                    {"role": "user", "content": user},
-                ],
-                "temperature": 0.1,
-                "max_tokens": 4000,
-            }
-            try:
-                resp = await client.post(
-                    _OPENROUTER_URL,
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    json=payload,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                content = (
-                    data.get("choices", [{}])[0]
-                    .get("message", {})
-                    .get("content", "")
-                    .strip()
-                )
-                # Strip optional markdown wrapper
-                if content.startswith("```"):
-                    content = content.strip("`").lstrip("json").strip()
-                items = json.loads(content)
-                for item in items:
-                    kw = (item.get("keyword") or "").strip()
-                    lbl = (item.get("label") or "").strip().lower()
-                    if not kw:
-                        continue
-                    if lbl not in THEME_LABELS:
-                        lbl = "общее"
-                    out[kw] = lbl
-            except Exception as exc:
-                log.warning(
-                    "bbk_cluster_chunk_failed",
-                    error=str(exc)[:200],
-                    chunk_size=len(chunk),
-                )
-                # Fallback: tag the whole chunk as "общее" so save still works
-                for kw in chunk:
-                    out.setdefault(kw, "общее")
-    finally:
-        if own_client:
-            await client.aclose()
+            # Fallback: tag the whole chunk as "общее" so save still works
+            for kw in chunk:
+                out.setdefault(kw, "общее")
 
     # Anything missed → "общее"
     for kw in keywords:
@@ -11,8 +11,6 @@ Orchestration:
 
 from __future__ import annotations
 
-
-import httpx
 import structlog
 
 from bot.config import get_settings
@@ -23,6 +21,7 @@ from services.bamboodom_keywords.clusterer import (
     label_to_cluster_id,
 )
 from services.external.dataforseo import DataForSEOClient
+from services.http_clients import HttpClientRegistry
 
 log = structlog.get_logger()
 
@@ -175,7 +174,7 @@ async def collect_for_material(
     repo: BamboodomKeywordsRepository,
     openrouter_api_key: str,
     *,
-    http_client: httpx.AsyncClient | None = None,
+    http_clients: HttpClientRegistry,
     progress_cb=None,
 ) -> dict[str, int]:
     """Run end-to-end collection for one material.
@@ -200,42 +199,31 @@ async def collect_for_material(
     # (services/external/dataforseo.py). location_code=2804 (Ukraine) because
     # Russia (2643) is banned for Google Ads keyword_suggestions endpoint.
     # Russian-language search trends overlap heavily between Yandex/Google.
-    if http_client is None:
-        # Fallback for callers that didn't pass an http client.
-        own_http = True
-        http_client = httpx.AsyncClient(timeout=60.0)
-    else:
-        own_http = False
-
     settings = get_settings()
     dfs_client = DataForSEOClient(
         login=settings.dataforseo_login,
         password=settings.dataforseo_password.get_secret_value(),
-        http_client=http_client,
+        http_client=http_clients.get("dataforseo"),
     )
     fetched: dict[str, tuple[int, float | None]] = {}
-    try:
-        for seed in seeds:
-            try:
-                results = await dfs_client.keyword_suggestions(seed=seed, limit=_MAX_PER_SEED)
-            except Exception as exc:
-                log.warning(
-                    "bbk_collect_seed_failed",
-                    seed=seed,
-                    material=material,
-                    error=str(exc)[:200],
-                )
+    for seed in seeds:
+        try:
+            results = await dfs_client.keyword_suggestions(seed=seed, limit=_MAX_PER_SEED)
+        except Exception as exc:
+            log.warning(
+                "bbk_collect_seed_failed",
+                seed=seed,
+                material=material,
+                error=str(exc)[:200],
+            )
+            continue
+        for v in results:
+            phrase = (v.phrase or "").strip().lower()
+            if not phrase:
                 continue
-            for v in results:
-                phrase = (v.phrase or "").strip().lower()
-                if not phrase:
-                    continue
-                existing_vol = fetched.get(phrase, (0, None))[0]
-                if v.volume > existing_vol:
-                    fetched[phrase] = (v.volume, v.competition)
-    finally:
-        if own_http:
-            await http_client.aclose()
+            existing_vol = fetched.get(phrase, (0, None))[0]
+            if v.volume > existing_vol:
+                fetched[phrase] = (v.volume, v.competition)
 
     # 2) Filter
     min_vol = _MIN_VOLUME_BY_MATERIAL.get(material, _MIN_VOLUME_DEFAULT)
@@ -269,7 +257,7 @@ async def collect_for_material(
         phrases,
         material=material,
         api_key=openrouter_api_key,
-        http_client=http_client,
+        http_client=http_clients.get("openrouter"),
     )
 
     # 4) Build batch + save
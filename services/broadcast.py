@@ -0,0 +1,409 @@
+"""Telegram broadcast engine (D6): admin broadcasts and QStash notifications.
+
+Zero dependencies on routers/FSM — takes a Bot and a RedisClient.
+
+Throughput: a process-wide token bucket keeps the bot under Telegram's bulk
+limit (~30 msg/s) and up to _CONCURRENCY sends are in flight at once, so a
+broadcast is paced by the bucket, not by per-request latency.
+
+TelegramRetryAfter is handled per chat: the chat is retried after the
+requested delay in its own task while the workers keep serving other chats.
+A chat still rate limited after _MAX_ATTEMPTS counts as failed, as do users
+who blocked the bot and chats Telegram rejects (TelegramBadRequest). Network
+and Telegram server errors are retried; when they persist, or on any other
+error, the run stops with the chat unsettled instead of writing it off.
+
+Restart safety: recipients are processed in chat_id order. The progress
+cursor (highest chat_id below which every chat is settled, the chats settled
+ahead of it, sent/failed counts) is checkpointed to Redis every
+_CHECKPOINT_EVERY chats, so a rerun of the same broadcast_id continues where
+the crashed run stopped; only chats settled after the last checkpoint may be
+messaged twice. A run that stops early (error, cancellation on shutdown)
+checkpoints the chats settled so far and never marks the broadcast done. A
+lease key with a short TTL, refreshed by a heartbeat, keeps two processes
+from running the same broadcast. Running broadcasts are tracked so shutdown
+can cancel them (cancel_broadcasts) before the bot session is closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import structlog
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+from cache.client import RedisClient
+from cache.keys import BROADCAST_LEASE_TTL, BROADCAST_STATE_TTL, CacheKeys
+
+log = structlog.get_logger()
+
+TELEGRAM_BROADCAST_RATE = 25.0  # msg/s — headroom under Telegram's ~30 msg/s bulk limit
+_CONCURRENCY = 10
+_MAX_ATTEMPTS = 3
+_CHECKPOINT_EVERY = 50
+_TRANSIENT_RETRY_DELAY = 2.0  # seconds, multiplied by the attempt number
+
+_bucket: TokenBucket | None = None
+_running: set[asyncio.Task[Any]] = set()
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `capacity` stored."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it (FIFO via the lock)."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def get_broadcast_bucket() -> TokenBucket:
+    """Bucket shared by every broadcast in the process (Telegram limits are per bot)."""
+    global _bucket
+    if _bucket is None:
+        _bucket = TokenBucket(TELEGRAM_BROADCAST_RATE)
+    return _bucket
+
+
+async def cancel_broadcasts() -> None:
+    """Cancel every broadcast running in this process and wait for their checkpoints (shutdown)."""
+    tasks = [task for task in _running if not task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+        log.info("broadcasts_cancelled", count=len(tasks))
+
+
+@dataclass
+class BroadcastState:
+    """Persisted progress of one broadcast."""
+
+    last_chat_id: int | None = None  # every chat_id <= this is settled
+    ahead: list[int] = field(default_factory=list)  # settled chat_ids above last_chat_id
+    sent: int = 0
+    failed: int = 0
+    done: bool = False
+    meta: dict[str, Any] = field(default_factory=dict)  # caller data needed to resume after a restart
+
+    @classmethod
+    def from_json(cls, raw: str) -> BroadcastState:
+        data = json.loads(raw)
+        return cls(
+            last_chat_id=data.get("last_chat_id"),
+            ahead=list(data.get("ahead", [])),
+            sent=data.get("sent", 0),
+            failed=data.get("failed", 0),
+            done=data.get("done", False),
+            meta=data.get("meta", {}),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BroadcastProgress:
+    settled: int
+    total: int
+    sent: int
+    failed: int
+
+
+@dataclass(frozen=True, slots=True)
+class BroadcastResult:
+    sent: int
+    failed: int
+    resumed: bool  # continued from an interrupted run's checkpoint
+    already_done: bool = False
+
+
+ProgressCallback = Callable[[BroadcastProgress], Awaitable[None]]
+
+
+async def load_broadcast_state(redis: RedisClient, broadcast_id: str) -> BroadcastState | None:
+    raw = await redis.get(CacheKeys.broadcast_state(broadcast_id))
+    return BroadcastState.from_json(raw) if raw else None
+
+
+async def interrupted_broadcasts(redis: RedisClient) -> list[tuple[str, BroadcastState]]:
+    """Unfinished broadcasts with a checkpoint (candidates for resume on startup)."""
+    found: list[tuple[str, BroadcastState]] = []
+    prefix, suffix = CacheKeys.BROADCAST_PREFIX, ":state"
+    for key in await redis.scan_keys(f"{prefix}*{suffix}"):
+        raw = await redis.get(key)
+        if not raw:
+            continue
+        state = BroadcastState.from_json(raw)
+        if not state.done:
+            found.append((key[len(prefix) : -len(suffix)], state))
+    return found
+
+
+class _Cursor:
+    """Settled-prefix tracker over chat_id-ordered recipients."""
+
+    def __init__(self, chat_ids: list[int], state: BroadcastState) -> None:
+        self._ids = chat_ids
+        self._settled = [False] * len(chat_ids)
+        self._next = 0
+        self._ahead = set(state.ahead)
+        self.state = state
+
+    def settle(self, pos: int, ok: bool) -> None:
+        self._settled[pos] = True
+        self._ahead.add(self._ids[pos])
+        if ok:
+            self.state.sent += 1
+        else:
+            self.state.failed += 1
+        while self._next < len(self._ids) and self._settled[self._next]:
+            self._ahead.discard(self._ids[self._next])
+            self.state.last_chat_id = self._ids[self._next]
+            self._next += 1
+
+    def snapshot(self) -> str:
+        last = self.state.last_chat_id
+        ahead = sorted(c for c in self._ahead if last is None or c > last)
+        return json.dumps({**asdict(self.state), "ahead": ahead})
+
+
+class BroadcastSender:
+    """Send one text per chat at the bot-wide rate, resumable by broadcast_id."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        redis: RedisClient,
+        *,
+        bucket: TokenBucket | None = None,
+        concurrency: int = _CONCURRENCY,
+        max_attempts: int = _MAX_ATTEMPTS,
+    ) -> None:
+        self._bot = bot
+        self._redis = redis
+        self._bucket = bucket or get_broadcast_bucket()
+        self._concurrency = concurrency
+        self._max_attempts = max_attempts
+
+    async def run(
+        self,
+        broadcast_id: str,
+        recipients: Iterable[tuple[int, str]],
+        *,
+        parse_mode: str | None = None,
+        meta: dict[str, Any] | None = None,
+        on_progress: ProgressCallback | None = None,
+        progress_every: int = 100,
+    ) -> BroadcastResult | None:
+        """Deliver recipients' messages. None if the broadcast is already running elsewhere.
+
+        parse_mode=None keeps the bot's default. A chat listed twice gets its
+        first message only.
+        """
+        lease_key = CacheKeys.broadcast_lease(broadcast_id)
+        if not await self._redis.set(lease_key, "1", nx=True, ex=BROADCAST_LEASE_TTL):
+            log.info("broadcast_busy", broadcast_id=broadcast_id)
+            return None
+
+        heartbeat = asyncio.create_task(self._heartbeat(lease_key))
+        current = asyncio.current_task()
+        if current is not None:
+            _running.add(current)
+        try:
+            state = await load_broadcast_state(self._redis, broadcast_id)
+            if state is not None and state.done:
+                return BroadcastResult(sent=state.sent, failed=state.failed, resumed=True, already_done=True)
+            resumed = state is not None
+            state = state or BroadcastState(meta=meta or {})
+
+            messages: dict[int, str] = {}
+            for chat_id, text in recipients:
+                messages.setdefault(chat_id, text)
+            skip = set(state.ahead)
+            todo = sorted(
+                (chat_id, text)
+                for chat_id, text in messages.items()
+                if (state.last_chat_id is None or chat_id > state.last_chat_id) and chat_id not in skip
+            )
+
+            run = _Run(self, broadcast_id, todo, state, parse_mode, on_progress, progress_every, len(messages))
+            started = time.monotonic()
+            if resumed:
+                log.info("broadcast_resumed", broadcast_id=broadcast_id, remaining=len(todo), sent=state.sent)
+            try:
+                await run.execute()
+            except BaseException:
+                # Interrupted: keep what was settled, leave the rest for the resume
+                await self._save(broadcast_id, run.cursor.snapshot())
+                raise
+
+            state.done = True
+            await self._save(broadcast_id, run.cursor.snapshot())
+            elapsed = time.monotonic() - started
+            log.info(
+                "broadcast_finished",
+                broadcast_id=broadcast_id,
+                sent=state.sent,
+                failed=state.failed,
+                delivered_now=len(todo),
+                elapsed_s=round(elapsed, 1),
+            )
+            return BroadcastResult(sent=state.sent, failed=state.failed, resumed=resumed)
+        finally:
+            if current is not None:
+                _running.discard(current)
+            heartbeat.cancel()
+            try:
+                await self._redis.delete(lease_key)
+            except Exception:
+                log.warning("broadcast_lease_release_failed", broadcast_id=broadcast_id)
+
+    async def _deliver(self, chat_id: int, text: str, parse_mode: str | None) -> bool | float:
+        """One send attempt. True/False when settled, retry-after seconds when rate limited.
+
+        Errors that say nothing about the chat (network, server, closed
+        session) propagate: the chat must not be settled as failed.
+        """
+        await self._bucket.acquire()
+        kwargs = {"parse_mode": parse_mode} if parse_mode else {}
+        try:
+            await self._bot.send_message(chat_id, text, **kwargs)
+        except TelegramRetryAfter as e:
+            log.warning("broadcast_rate_limited", chat_id=chat_id, retry_after=e.retry_after)
+            return float(e.retry_after)
+        except TelegramForbiddenError:
+            return False  # User blocked the bot
+        except TelegramBadRequest as e:
+            log.warning("broadcast_chat_rejected", chat_id=chat_id, error=e.message)
+            return False  # Chat not found / deactivated: retrying will not help
+        return True
+
+    async def _save(self, broadcast_id: str, snapshot: str) -> None:
+        """Checkpoint progress. Best-effort: a lost write only means a few repeats on resume."""
+        try:
+            await self._redis.set(CacheKeys.broadcast_state(broadcast_id), snapshot, ex=BROADCAST_STATE_TTL)
+        except Exception:
+            log.warning("broadcast_checkpoint_failed", broadcast_id=broadcast_id)
+
+    async def _heartbeat(self, lease_key: str) -> None:
+        while True:
+            await asyncio.sleep(BROADCAST_LEASE_TTL / 3)
+            try:
+                await self._redis.expire(lease_key, BROADCAST_LEASE_TTL)
+            except Exception:
+                log.warning("broadcast_lease_refresh_failed", lease_key=lease_key)
+
+
+class _Run:
+    """Workers, delayed per-chat retries and checkpoints of one BroadcastSender.run()."""
+
+    def __init__(
+        self,
+        sender: BroadcastSender,
+        broadcast_id: str,
+        todo: list[tuple[int, str]],
+        state: BroadcastState,
+        parse_mode: str | None,
+        on_progress: ProgressCallback | None,
+        progress_every: int,
+        total: int,
+    ) -> None:
+        self._sender = sender
+        self._broadcast_id = broadcast_id
+        self._queue = iter(enumerate(todo))
+        self._workers = min(sender._concurrency, len(todo))
+        self._slots = asyncio.Semaphore(sender._concurrency)
+        self._parse_mode = parse_mode
+        self._on_progress = on_progress
+        self._progress_every = progress_every
+        self._total = total
+        self._retries: set[asyncio.Task[None]] = set()
+        self._since_checkpoint = 0
+        self._since_progress = 0
+        self.cursor = _Cursor([chat_id for chat_id, _ in todo], state)
+
+    async def execute(self) -> None:
+        workers = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+        try:
+            await asyncio.gather(*workers)
+            # A retry may schedule another retry, so drain until none are left
+            while self._retries:
+                pending = list(self._retries)
+                await asyncio.gather(*pending)
+                self._retries.difference_update(pending)
+        except BaseException:
+            # One failure stops the whole run: no sends after the checkpoint
+            tasks = [*workers, *self._retries]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _worker(self) -> None:
+        # Workers share one iterator: each chat is taken exactly once
+        for pos, (chat_id, text) in self._queue:
+            await self._attempt(pos, chat_id, text, 1)
+
+    async def _attempt(self, pos: int, chat_id: int, text: str, attempt: int) -> None:
+        async with self._slots:
+            try:
+                outcome = await self._sender._deliver(chat_id, text, self._parse_mode)
+            except (TelegramNetworkError, TelegramServerError):  # fmt: skip
+                if attempt >= self._sender._max_attempts:
+                    raise  # Telegram unreachable: stop the run, the chat stays unsettled
+                log.warning("broadcast_send_transient_error", chat_id=chat_id, attempt=attempt, exc_info=True)
+                outcome = _TRANSIENT_RETRY_DELAY * attempt
+        if isinstance(outcome, bool):
+            await self._settle(pos, outcome)
+        elif attempt >= self._sender._max_attempts:
+            log.warning("broadcast_retry_exhausted", chat_id=chat_id, attempts=attempt)
+            await self._settle(pos, False)
+        else:
+            # Wait out this chat's retry-after without holding a worker
+            task = asyncio.create_task(self._retry_later(pos, chat_id, text, outcome, attempt + 1))
+            self._retries.add(task)
+            task.add_done_callback(self._retries.discard)
+
+    async def _retry_later(self, pos: int, chat_id: int, text: str, delay: float, attempt: int) -> None:
+        await asyncio.sleep(delay)
+        await self._attempt(pos, chat_id, text, attempt)
+
+    async def _settle(self, pos: int, ok: bool) -> None:
+        self.cursor.settle(pos, ok)
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= _CHECKPOINT_EVERY:
+            self._since_checkpoint = 0
+            await self._sender._save(self._broadcast_id, self.cursor.snapshot())
+
+        self._since_progress += 1
+        if self._on_progress is not None and self._since_progress >= self._progress_every:
+            self._since_progress = 0
+            state = self.cursor.state
+            progress = BroadcastProgress(state.sent + state.failed, self._total, state.sent, state.failed)
+            try:
+                await self._on_progress(progress)
+            except Exception:
+                log.warning("broadcast_progress_callback_failed", broadcast_id=self._broadcast_id)
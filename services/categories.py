@@ -18,6 +18,7 @@ from db.repositories.categories import CategoriesRepository
 from db.repositories.previews import PreviewsRepository
 from db.repositories.projects import ProjectsRepository
 from db.repositories.schedules import SchedulesRepository
+from services.dashboard import dashboard_changed
 from services.scheduler import SchedulerService
 from services.tokens import TokenService
 
@@ -118,7 +119,9 @@ class CategoryService:
         if not project or project.user_id != user_id:
             return None
 
-        return await self._cats_repo.create(CategoryCreate(project_id=project_id, name=name))
+        category = await self._cats_repo.create(CategoryCreate(project_id=project_id, name=name))
+        await dashboard_changed(user_id)
+        return category
 
     async def check_category_limit(
         self,
@@ -176,6 +179,7 @@ class CategoryService:
         if deleted:
             remaining = await self._cats_repo.get_by_project(project_id)
             log.info("category_deleted", category_id=category_id, user_id=user_id)
+            await dashboard_changed(user_id)
 
         return deleted, category, remaining
 
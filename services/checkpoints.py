@@ -0,0 +1,129 @@
+"""Stage checkpoints for the article pipeline.
+
+Zero dependencies on Telegram/Aiogram.
+
+The article pipeline (websearch → outline → expand/critique → Director +
+images → WP media upload → WP post) takes minutes. StageCheckpoints persists
+each stage's output in pipeline_checkpoints under a run key, so when a later
+stage fails the retry (publish job retry, user pressing "retry") resumes
+after the last completed stage instead of paying for everything again.
+
+Checkpointing is best-effort: a failed read starts from scratch and a failed
+write is logged — the pipeline never fails because of it. Checkpoints older
+than _MAX_AGE are ignored on read and garbage-collected by CleanupService.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+
+from db.client import SupabaseClient
+from db.repositories.checkpoints import CheckpointsRepository
+
+log = structlog.get_logger()
+
+STAGE_KEYWORD = "keyword"
+STAGE_WEBSEARCH = "websearch"
+STAGE_OUTLINE = "outline"
+STAGE_ARTICLE = "article"
+STAGE_IMAGES = "images"
+STAGE_WP_MEDIA = "wp_media"
+
+_MAX_AGE = timedelta(hours=24)
+
+
+def max_age_cutoff() -> str:
+    """ISO timestamp before which checkpoints are expired."""
+    return (datetime.now(tz=UTC) - _MAX_AGE).isoformat()
+
+
+def image_storage_paths(images_stage: dict[str, Any] | None) -> list[str]:
+    """Storage objects referenced by an images-stage checkpoint (publish or preview layout)."""
+    if not images_stage:
+        return []
+    paths = list(images_stage.get("paths", []))
+    paths += [img["storage_path"] for img in images_stage.get("stored_images", []) if img.get("storage_path")]
+    return paths
+
+
+def publish_run_key(message_id: str) -> str:
+    return f"publish:{message_id}" if message_id else ""
+
+
+def preview_run_key(user_id: int, category_id: int, run_id: str, image_count: int) -> str:
+    """Manual generation run: run_id lives in the FSM session until the run succeeds.
+
+    Only "retry" after a failure reuses it; any other generation gets a new
+    run_id and never resumes someone else's checkpoint. image_count is part of
+    the key because a retry with a different count cannot reuse the images stage.
+    """
+    return f"preview:{user_id}:{category_id}:{run_id}:{image_count}"
+
+
+def preview_publish_run_key(preview_id: int) -> str:
+    return f"preview_wp:{preview_id}"
+
+
+class StageCheckpoints:
+    """Stage outputs of one pipeline run. An empty run key disables checkpointing."""
+
+    def __init__(
+        self, db: SupabaseClient | None, run_key: str, stages: dict[str, dict[str, Any]] | None = None
+    ) -> None:
+        self._repo = CheckpointsRepository(db) if db is not None and run_key else None
+        self.run_key = run_key
+        self._stages = stages or {}
+
+    @classmethod
+    async def open(cls, db: SupabaseClient, run_key: str) -> StageCheckpoints:
+        """Load every saved stage for the run in one query."""
+        if not run_key:
+            return cls(None, "")
+        stages: dict[str, dict[str, Any]] = {}
+        try:
+            rows = await CheckpointsRepository(db).get_stages(run_key, max_age_cutoff())
+            stages = {row.stage: row.data for row in rows}
+        except Exception:
+            log.warning("checkpoint_load_failed", run_key=run_key, exc_info=True)
+        if stages:
+            log.info("checkpoint_resume", run_key=run_key, stages=sorted(stages))
+        return cls(db, run_key, stages)
+
+    @classmethod
+    def disabled(cls) -> StageCheckpoints:
+        return cls(None, "")
+
+    @property
+    def stages(self) -> set[str]:
+        return set(self._stages)
+
+    def get(self, stage: str) -> dict[str, Any] | None:
+        return self._stages.get(stage)
+
+    async def save(self, stage: str, data: dict[str, Any]) -> bool:
+        """Persist a completed stage. Returns False if it was not stored."""
+        if self._repo is None:
+            return False
+        try:
+            # Round-trip through JSON: JSONB needs plain types (datetimes → str)
+            payload = json.loads(json.dumps(data, default=str))
+            await self._repo.save(self.run_key, stage, payload)
+        except Exception:
+            log.warning("checkpoint_save_failed", run_key=self.run_key, stage=stage, exc_info=True)
+            return False
+        self._stages[stage] = payload
+        return True
+
+    async def clear(self) -> None:
+        """Drop the run's checkpoints after the pipeline succeeded."""
+        if self._repo is None or not self._stages:
+            return
+        try:
+            await self._repo.delete_run(self.run_key)
+        except Exception:
+            log.warning("checkpoint_clear_failed", run_key=self.run_key, exc_info=True)
+        self._stages = {}
@@ -1,4 +1,4 @@
-"""Cleanup service — expired preview refund, old log deletion.
+"""Cleanup service — expired preview refund, old log, publish job and checkpoint deletion.
 
 Triggered by QStash daily cron. Zero Telegram deps.
 """
@@ -13,9 +13,12 @@ import httpx
 import structlog
 
 from db.client import SupabaseClient
+from db.repositories.checkpoints import CheckpointsRepository
 from db.repositories.previews import PreviewsRepository
 from db.repositories.publications import PublicationsRepository
+from db.repositories.publish_jobs import PublishJobsRepository
 from db.repositories.users import UsersRepository
+from services.checkpoints import STAGE_IMAGES, image_storage_paths, max_age_cutoff
 from services.external.telegraph import TelegraphClient
 from services.storage import ImageStorage
 from services.tokens import TokenService
@@ -23,6 +26,7 @@ from services.tokens import TokenService
 log = structlog.get_logger()
 
 _LOG_RETENTION_DAYS = 90
+_PUBLISH_JOB_RETENTION_DAYS = 7
 
 
 @dataclass
@@ -33,6 +37,8 @@ class CleanupResult:
     refunded: list[dict[str, Any]] = field(default_factory=list)
     logs_deleted: int = 0
     images_deleted: int = 0
+    jobs_deleted: int = 0
+    checkpoints_deleted: int = 0
 
 
 class CleanupService:
@@ -61,11 +67,19 @@ class CleanupService:
         # 2. Delete old publication logs (>90 days)
         await self._delete_old_logs(result)
 
+        # 3. Delete settled publish jobs (>7 days)
+        await self._delete_finished_jobs(result)
+
+        # 4. Delete abandoned pipeline checkpoints (>24h) and their stored images
+        await self._delete_old_checkpoints(result)
+
         log.info(
             "cleanup_complete",
             expired=result.expired_count,
             refunds=len(result.refunded),
             logs_deleted=result.logs_deleted,
+            jobs_deleted=result.jobs_deleted,
+            checkpoints_deleted=result.checkpoints_deleted,
         )
         return result
 
@@ -104,10 +118,7 @@ class CleanupService:
 
                 # Clean up storage images
                 if preview.images:
-                    paths = [img.get("storage_path", "") for img in preview.images if img.get("storage_path")]
-                    if paths:
-                        deleted = await self._image_storage.cleanup_by_paths(paths)
-                        result.images_deleted += deleted
+                    result.images_deleted += await self._image_storage.release_images(preview.images)
 
                 # Delete Telegraph page
                 if preview.telegraph_path:
@@ -127,3 +138,28 @@ class CleanupService:
             result.logs_deleted = await PublicationsRepository(self._db).delete_old_logs(cutoff)
         except Exception:
             log.exception("cleanup_old_logs_failed")
+
+    async def _delete_finished_jobs(self, result: CleanupResult) -> None:
+        """Delete done/failed publish_jobs older than 7 days."""
+        cutoff = (datetime.now(tz=UTC) - timedelta(days=_PUBLISH_JOB_RETENTION_DAYS)).isoformat()
+        try:
+            result.jobs_deleted = await PublishJobsRepository(self._db).delete_finished_before(cutoff)
+        except Exception:
+            log.exception("cleanup_publish_jobs_failed")
+
+    async def _delete_old_checkpoints(self, result: CleanupResult) -> None:
+        """Delete expired pipeline_checkpoints rows, then release the Storage images they held."""
+        try:
+            rows = await CheckpointsRepository(self._db).delete_before(max_age_cutoff())
+        except Exception:
+            log.exception("cleanup_checkpoints_failed")
+            return
+        result.checkpoints_deleted = len(rows)
+        for row in rows:
+            paths = image_storage_paths(row.data) if row.stage == STAGE_IMAGES else []
+            if not paths:
+                continue
+            try:
+                result.images_deleted += await self._image_storage.release(paths, row.run_key)
+            except Exception:
+                log.exception("cleanup_checkpoint_images_failed", run_key=row.run_key)
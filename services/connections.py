@@ -15,7 +15,7 @@ import structlog
 
 from bot.config import get_settings
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import PlatformConnection, PlatformConnectionCreate
 from db.repositories.connections import ConnectionsRepository
 from services.publishers.vk import VK_API_URL, VK_API_VERSION
@@ -31,7 +31,7 @@ class ConnectionService:
 
     def __init__(self, db: SupabaseClient, http_client: httpx.AsyncClient) -> None:
         settings = get_settings()
-        cm = CredentialManager(settings.encryption_key.get_secret_value())
+        cm = get_credential_manager(settings.encryption_key.get_secret_value())
         self._db = db
         self._repo = ConnectionsRepository(db, cm)
         self._http = http_client
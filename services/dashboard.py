@@ -1,14 +1,24 @@
 """Dashboard data aggregation service.
 
 Zero dependencies on Telegram/Aiogram.
+
+Snapshots are cached per user in two tiers (DashboardCache): a short-lived
+process-local L1 and Redis L2. The main menu is rendered from the snapshot;
+Postgres is touched only on a miss. Writes that change what the dashboard
+shows (project/category create+delete, schedule create/toggle/delete,
+publication logs) call dashboard_changed(user_id) to drop the snapshot.
 """
 
 from __future__ import annotations
 
 import asyncio
 import html
+import time
+from collections import OrderedDict
 from datetime import datetime
+from typing import TYPE_CHECKING
 
+import structlog
 from pydantic import BaseModel
 
 from bot.texts.emoji import E
@@ -27,12 +37,18 @@ from bot.texts.strings import (
     WELCOME_TEXT,
     WELCOME_TITLE,
 )
+from cache.keys import DASHBOARD_CACHE_TTL, CacheKeys
 from db.client import SupabaseClient
 from db.repositories.categories import CategoriesRepository
 from db.repositories.projects import ProjectsRepository
 from db.repositories.publications import PublicationsRepository
 from db.repositories.schedules import SchedulesRepository
 
+if TYPE_CHECKING:
+    from cache.client import RedisClient
+
+log = structlog.get_logger()
+
 # Average token cost per scheduled post, by platform type.
 _PLATFORM_COST: dict[str, int] = {
     "wordpress": 320,
@@ -47,6 +63,11 @@ _AVG_ARTICLE_COST = 320
 # Average social post cost for "~N posts" estimate
 _AVG_SOCIAL_COST = 40
 
+# L1 (process-local) snapshot lifetime. Short: other processes only see
+# invalidations through Redis, so L1 bounds their staleness.
+_LOCAL_TTL = 30.0
+_LOCAL_MAX_ENTRIES = 4096
+
 
 class LastPublication(BaseModel, frozen=True):
     """Most recent publication summary for dashboard."""
@@ -68,17 +89,121 @@ class DashboardData(BaseModel, frozen=True):
     tokens_per_month: int
 
 
+class DashboardCache:
+    """Two-tier per-user DashboardData cache: process-local L1 + Redis L2.
+
+    Redis failures degrade to a rebuild from Postgres, never to an error.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient | None,
+        *,
+        ttl: int = DASHBOARD_CACHE_TTL,
+        local_ttl: float = _LOCAL_TTL,
+        local_max_entries: int = _LOCAL_MAX_ENTRIES,
+    ) -> None:
+        self._redis = redis
+        self._ttl = ttl
+        self._local_ttl = local_ttl
+        self._local_max = local_max_entries
+        self._local: OrderedDict[int, tuple[float, DashboardData]] = OrderedDict()
+        # Bumped on every invalidation: a snapshot built before a write must not be stored after it
+        self.generation = 0
+
+    def _remember(self, user_id: int, data: DashboardData) -> None:
+        self._local[user_id] = (time.monotonic() + self._local_ttl, data)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self._local_max:
+            self._local.popitem(last=False)
+
+    async def get(self, user_id: int) -> DashboardData | None:
+        entry = self._local.get(user_id)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                return entry[1]
+            del self._local[user_id]
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(CacheKeys.dashboard(user_id))
+            if not raw:
+                return None
+            data = DashboardData.model_validate_json(raw)
+        except Exception:
+            log.warning("dashboard_cache_read_failed", user_id=user_id, exc_info=True)
+            return None
+        self._remember(user_id, data)
+        return data
+
+    async def put(self, user_id: int, data: DashboardData, generation: int) -> None:
+        """Store a snapshot unless an invalidation happened since *generation* was read."""
+        if generation != self.generation:
+            return
+        self._remember(user_id, data)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(CacheKeys.dashboard(user_id), data.model_dump_json(), ex=self._ttl)
+        except Exception:
+            log.warning("dashboard_cache_write_failed", user_id=user_id, exc_info=True)
+
+    async def invalidate(self, *user_ids: int) -> None:
+        self.generation += 1
+        for uid in user_ids:
+            self._local.pop(uid, None)
+        if self._redis is None or not user_ids:
+            return
+        try:
+            await self._redis.delete(*(CacheKeys.dashboard(uid) for uid in user_ids))
+        except Exception:
+            log.warning("dashboard_cache_invalidate_failed", user_ids=list(user_ids), exc_info=True)
+
+
+_cache: DashboardCache | None = None
+
+
+def install_dashboard_cache(cache: DashboardCache | None) -> None:
+    """Make *cache* the process-wide dashboard cache (called from create_app)."""
+    global _cache
+    _cache = cache
+
+
+async def dashboard_changed(*user_ids: int) -> None:
+    """Write event: something shown on these users' dashboards changed.
+
+    No-op when no cache is installed (scripts, tests).
+    """
+    if _cache is not None:
+        await _cache.invalidate(*user_ids)
+
+
 class DashboardService:
     """Aggregates dashboard metrics from multiple repositories.
 
     Used by start.py _build_dashboard to replace direct repo calls.
+    Reads go through the process-wide DashboardCache when one is installed.
     """
 
-    def __init__(self, db: SupabaseClient, encryption_key: str = "") -> None:
+    def __init__(self, db: SupabaseClient, encryption_key: str = "", cache: DashboardCache | None = None) -> None:
         self._db = db
         self._encryption_key = encryption_key
+        self._cache = cache
 
     async def get_dashboard_data(self, user_id: int) -> DashboardData:
+        """Dashboard snapshot for the user: cached, rebuilt from Postgres on a miss."""
+        cache = self._cache or _cache
+        if cache is None:
+            return await self._build(user_id)
+        cached = await cache.get(user_id)
+        if cached is not None:
+            return cached
+        generation = cache.generation
+        data = await self._build(user_id)
+        await cache.put(user_id, data, generation)
+        return data
+
+    async def _build(self, user_id: int) -> DashboardData:
         """Aggregate dashboard data: projects, schedules, publications."""
         projects_repo = ProjectsRepository(self._db)
         pub_repo = PublicationsRepository(self._db)
@@ -127,9 +252,7 @@ class DashboardService:
         cats_repo = CategoriesRepository(self._db)
         sched_repo = SchedulesRepository(self._db)
 
-        cat_lists = await asyncio.gather(*(cats_repo.get_by_project(pid) for pid in project_ids))
-
-        all_cats = [c for cats in cat_lists for c in cats]
+        all_cats = await cats_repo.get_by_projects(project_ids)
         category_count = len(all_cats)
         all_cat_ids = [c.id for c in all_cats]
         if not all_cat_ids:
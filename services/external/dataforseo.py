@@ -3,6 +3,7 @@
 Spec: docs/API_CONTRACTS.md section 8.2
 Edge case E03: DataForSEO unavailable -> fallback to AI-generated keywords.
 Retry: C10 — retry on 429/5xx with backoff, Retry-After support.
+Provider guard "dataforseo": circuit breaker + shared 429 pause (services/http_retry.py).
 
 API endpoints:
   - keyword_suggestions: POST /v3/dataforseo_labs/google/keyword_suggestions/live
@@ -22,6 +23,8 @@ from typing import Any
 import httpx
 import structlog
 
+from services.http_retry import get_provider_guard
+
 log = structlog.get_logger()
 
 # Max keywords per search_volume batch (API limit is 1000, we use 700 for safety)
@@ -100,19 +103,25 @@ class DataForSEOClient:
         Retries on: timeout, connect error, 429, 5xx.
         No retry on: 401/403 (auth), other 4xx (client error).
         Respects Retry-After header for 429 (C10).
+        Raises CircuitOpenError (an httpx.HTTPError) while the provider circuit is open.
         """
         url = f"{self._base}/{endpoint}"
+        guard = get_provider_guard("dataforseo")
+
+        async def _do_post() -> httpx.Response:
+            resp = await self._http.post(
+                url,
+                json=payload,
+                auth=(self._login, self._password),
+                timeout=30.0,
+            )
+            resp.raise_for_status()
+            return resp
 
         last_exc: Exception | None = None
         for attempt in range(_MAX_RETRIES + 1):
             try:
-                resp = await self._http.post(
-                    url,
-                    json=payload,
-                    auth=(self._login, self._password),
-                    timeout=30.0,
-                )
-                resp.raise_for_status()
+                resp = await guard.call(_do_post)
                 data: dict[str, Any] = resp.json()
 
                 # Check top-level status
@@ -7,7 +7,8 @@ Edge cases:
 
 Uses native httpx (not firecrawl-py SDK) for full async support.
 All public methods return None/empty on failure (graceful degradation).
-Retry: C10 — retry on 429/5xx with backoff.
+Retry: C10 — retry on 429/5xx with backoff, through the "firecrawl" provider guard.
+Caching: scrape/map results shared per normalized URL via UrlCache (optional).
 
 Endpoints used:
   POST /v2/scrape   — competitor content (markdown+summary), 1 credit
@@ -19,14 +20,17 @@ Endpoints used:
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
 
 import httpx
 import structlog
 
 from services.http_retry import retry_with_backoff
 
+if TYPE_CHECKING:
+    from services.external.url_cache import UrlCache
+
 log = structlog.get_logger()
 
 FIRECRAWL_API_BASE = "https://api.firecrawl.dev/v2"
@@ -132,12 +136,29 @@ class FirecrawlClient:
 
     Uses shared httpx.AsyncClient (never creates its own).
     Cost: 1 credit/scrape, 1 credit/map (5000 URLs), 5 credits/extract, 2 credits/10 search results.
+    scrape_content / map_site go through the shared per-URL caches when provided.
     """
 
-    def __init__(self, api_key: str, http_client: httpx.AsyncClient) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        http_client: httpx.AsyncClient,
+        scrape_cache: UrlCache | None = None,
+        map_cache: UrlCache | None = None,
+    ) -> None:
         self._api_key = api_key
         self._http = http_client
         self._base = FIRECRAWL_API_BASE
+        self._scrape_cache = scrape_cache
+        self._map_cache = map_cache
+
+    def cache_report(self) -> dict[str, dict[str, Any]]:
+        """Hit rate and credits saved per cache namespace (empty if caching is off)."""
+        report: dict[str, dict[str, Any]] = {}
+        for cache in (self._scrape_cache, self._map_cache):
+            if cache is not None:
+                report[cache.namespace] = cache.report()
+        return report
 
     def _headers(self) -> dict[str, str]:
         return {
@@ -169,6 +190,7 @@ class FirecrawlClient:
             max_retries=2,
             base_delay=1.0,
             operation=f"firecrawl_{operation}",
+            provider="firecrawl",
         )
 
     # ------------------------------------------------------------------
@@ -180,8 +202,25 @@ class FirecrawlClient:
 
         POST /v2/scrape with formats: ['markdown', 'summary'].
         Returns ScrapeResult on success, None on timeout (E31).
-        Cost: 1 credit/page.
+        Cost: 1 credit/page (0 on cache hit; failures are negative-cached).
         """
+        if self._scrape_cache is None:
+            return await self._scrape_content_uncached(url)
+
+        async def _fetch() -> dict[str, Any] | None:
+            result = await self._scrape_content_uncached(url)
+            return asdict(result) if result else None
+
+        data = await self._scrape_cache.get_or_fetch(url, _fetch)
+        if data is None:
+            return None
+        try:
+            return ScrapeResult(**{**data, "url": url})
+        except TypeError:
+            log.warning("firecrawl.scrape_cache_corrupt", url=url)
+            return await self._scrape_content_uncached(url)
+
+    async def _scrape_content_uncached(self, url: str) -> ScrapeResult | None:
         try:
             resp = await self._post(
                 "scrape",
@@ -230,8 +269,25 @@ class FirecrawlClient:
         """Get internal links via /v2/map endpoint.
 
         POST /v2/map with url and limit. Returns MapResult on success, None on failure.
-        Cost: 1 credit per 5000 URLs.
+        Cost: 1 credit per 5000 URLs (0 on cache hit).
         """
+        if self._map_cache is None:
+            return await self._map_site_uncached(url, limit)
+
+        async def _fetch() -> dict[str, Any] | None:
+            result = await self._map_site_uncached(url, limit)
+            return asdict(result) if result else None
+
+        data = await self._map_cache.get_or_fetch(url, _fetch, variant=str(limit))
+        if data is None:
+            return None
+        try:
+            return MapResult(**data)
+        except TypeError:
+            log.warning("firecrawl.map_cache_corrupt", url=url)
+            return await self._map_site_uncached(url, limit)
+
+    async def _map_site_uncached(self, url: str, limit: int) -> MapResult | None:
         try:
             resp = await self._post(
                 "map",
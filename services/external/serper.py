@@ -3,6 +3,7 @@
 Spec: docs/API_CONTRACTS.md section 8.3
 Edge case E04: Serper unavailable -> return empty result, article generated without Serper data.
 Retry: C10 — retry on 429/5xx with backoff, Retry-After support.
+Provider guard "serper": circuit breaker + shared 429 pause (services/http_retry.py).
 
 Endpoints:
 - /search — organic results + PAA + related searches (24h cache)
@@ -25,6 +26,8 @@ from typing import Any
 import httpx
 import structlog
 
+from services.http_retry import get_provider_guard
+
 log = structlog.get_logger()
 
 _MAX_RETRY_AFTER = 60.0
@@ -201,6 +204,24 @@ class SerperClient:
             log.warning("serper.autocomplete_failed", query=query, exc_info=True)
             return []
 
+    async def _post(self, endpoint: str, payload: dict[str, Any]) -> httpx.Response:
+        """Single Serper POST through the shared provider guard (breaker + 429 pause)."""
+
+        async def _do_post() -> httpx.Response:
+            resp = await self._http.post(
+                f"{SERPER_API_BASE}{endpoint}",
+                headers={
+                    "X-API-KEY": self._api_key,
+                    "Content-Type": "application/json",
+                },
+                json=payload,
+                timeout=_SERPER_TIMEOUT,
+            )
+            resp.raise_for_status()
+            return resp
+
+        return await get_provider_guard("serper").call(_do_post)
+
     async def _request_with_retry(
         self,
         endpoint: str,
@@ -215,16 +236,7 @@ class SerperClient:
         last_error: str = ""
         for attempt in range(1, attempts + 1):
             try:
-                resp = await self._http.post(
-                    f"{SERPER_API_BASE}{endpoint}",
-                    headers={
-                        "X-API-KEY": self._api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                    timeout=_SERPER_TIMEOUT,
-                )
-                resp.raise_for_status()
+                resp = await self._post(endpoint, payload)
                 return resp.json()  # type: ignore[no-any-return]
             except httpx.HTTPStatusError as exc:
                 last_error = str(exc)
@@ -264,16 +276,7 @@ class SerperClient:
 
         for attempt in range(1, attempts + 1):
             try:
-                resp = await self._http.post(
-                    f"{SERPER_API_BASE}/search",
-                    headers={
-                        "X-API-KEY": self._api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json={"q": query, "num": num, "gl": gl, "hl": hl},
-                    timeout=_SERPER_TIMEOUT,
-                )
-                resp.raise_for_status()
+                resp = await self._post("/search", {"q": query, "num": num, "gl": gl, "hl": hl})
                 body = resp.json()
 
                 organic = body.get("organic", [])
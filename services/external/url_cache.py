@@ -0,0 +1,261 @@
+"""Redis-backed per-URL cache for paid crawl results (Firecrawl scrape / map).
+
+Competitor URLs recur across keywords, categories and users of the same niche,
+so results are shared globally (not per user) and keyed on the normalized URL.
+
+Policy:
+  - fresh: age <= fresh_ttl -> served from cache
+  - stale: fresh_ttl < age <= fresh_ttl + stale_ttl -> served from cache,
+    refreshed in background (stale-while-revalidate)
+  - negative: failed/blocked URLs cached as ``null`` for negative_ttl
+  - concurrent misses for the same URL in one process share a single fetch
+
+Redis failures never break the caller: the cache degrades to a direct fetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import structlog
+
+from cache.keys import CacheKeys
+
+if TYPE_CHECKING:
+    from cache.client import RedisClient
+
+log = structlog.get_logger()
+
+# Query params that never change page content (analytics/tracking)
+_TRACKING_PARAMS = frozenset({"gclid", "yclid", "fbclid", "_openstat", "from", "ref"})
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Emit a summary stats log line every N lookups per namespace
+_STATS_LOG_EVERY = 50
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for cache keys.
+
+    Lowercases scheme/host, drops default ports, fragments, tracking params
+    (utm_*, gclid, yclid, ...) and trailing slashes; sorts the query string.
+    """
+    raw = url.strip()
+    try:
+        parts = urlsplit(raw)
+    except ValueError:
+        return raw
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    path = parts.path.rstrip("/") or "/"
+    query_pairs = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ]
+    query = urlencode(sorted(query_pairs))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+@dataclass(slots=True)
+class UrlCacheStats:
+    """Process-local counters for one cache namespace."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    errors: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.stale_hits + self.negative_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        served = self.hits + self.stale_hits + self.negative_hits
+        return round(served / self.lookups, 4) if self.lookups else 0.0
+
+
+class UrlCache:
+    """Shared per-URL JSON cache with stale-while-revalidate and negative caching.
+
+    One instance per namespace (e.g. ``firecrawl_scrape``, ``firecrawl_map``).
+    ``credits_per_fetch`` is used only for reporting saved upstream credits;
+    stale hits do not count, since each one pays for a background refresh.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient | None,
+        *,
+        namespace: str,
+        fresh_ttl: int,
+        stale_ttl: int = 0,
+        negative_ttl: int = 0,
+        credits_per_fetch: int = 1,
+    ) -> None:
+        self._redis = redis
+        self._namespace = namespace
+        self._fresh_ttl = fresh_ttl
+        self._stale_ttl = stale_ttl
+        self._negative_ttl = negative_ttl
+        self._credits_per_fetch = credits_per_fetch
+        self._inflight: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
+        self.stats = UrlCacheStats()
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    def _key(self, url: str, variant: str) -> str:
+        raw = f"{normalize_url(url)}|{variant}"
+        digest = hashlib.sha256(raw.encode()).hexdigest()[:32]
+        return CacheKeys.url_cache(self._namespace, digest)
+
+    async def get_or_fetch(
+        self,
+        url: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+        *,
+        variant: str = "",
+    ) -> dict[str, Any] | None:
+        """Return cached value for *url* or call *fetch* and cache its result.
+
+        ``fetch`` returns a JSON-serializable dict, or None on failure
+        (which is negative-cached). ``variant`` distinguishes request params
+        for the same URL (e.g. map limit).
+        """
+        key = self._key(url, variant)
+        if self.stats.lookups and self.stats.lookups % _STATS_LOG_EVERY == 0:
+            log.info("url_cache_stats", namespace=self._namespace, **self.report())
+        envelope = await self._read(key)
+        if envelope is not None:
+            value = envelope.get("value")
+            age = time.time() - float(envelope.get("fetched_at", 0))
+            if value is None:
+                self.stats.negative_hits += 1
+                log.debug("url_cache_negative_hit", namespace=self._namespace, url=url[:200])
+                return None
+            if age <= self._fresh_ttl:
+                self.stats.hits += 1
+                log.debug("url_cache_hit", namespace=self._namespace, url=url[:200])
+                return value if isinstance(value, dict) else None
+            self.stats.stale_hits += 1
+            log.debug("url_cache_stale_hit", namespace=self._namespace, url=url[:200], age_s=round(age))
+            self._schedule_refresh(key, url, fetch)
+            return value if isinstance(value, dict) else None
+
+        self.stats.misses += 1
+        return await self._fetch_shared(key, fetch)
+
+    async def _fetch_shared(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+        *,
+        cache_failure: bool = True,
+    ) -> dict[str, Any] | None:
+        """Single-flight fetch: concurrent callers for the same key await one request."""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[dict[str, Any] | None] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+            if value is not None or cache_failure:
+                await self._write(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a future without waiters does not log "never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        url: str,
+        fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> None:
+        if key in self._inflight:
+            return
+
+        async def _refresh() -> None:
+            try:
+                # Keep serving the stale copy if the refresh failed (no negative entry)
+                value = await self._fetch_shared(key, fetch, cache_failure=False)
+                if value is not None:
+                    self.stats.refreshes += 1
+            except Exception:
+                log.warning("url_cache_refresh_failed", namespace=self._namespace, url=url[:200], exc_info=True)
+
+        task = asyncio.create_task(_refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _read(self, key: str) -> dict[str, Any] | None:
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(key)
+            if not raw:
+                return None
+            envelope = json.loads(raw)
+            return envelope if isinstance(envelope, dict) else None
+        except Exception:
+            self.stats.errors += 1
+            log.debug("url_cache_read_error", namespace=self._namespace, key=key)
+            return None
+
+    async def _write(self, key: str, value: dict[str, Any] | None) -> None:
+        if self._redis is None:
+            return
+        if value is None:
+            if self._negative_ttl <= 0:
+                return
+            ttl = self._negative_ttl
+        else:
+            ttl = self._fresh_ttl + self._stale_ttl
+        try:
+            envelope = {"fetched_at": time.time(), "value": value}
+            await self._redis.set(key, json.dumps(envelope, ensure_ascii=False), ex=ttl)
+        except Exception:
+            self.stats.errors += 1
+            log.debug("url_cache_write_error", namespace=self._namespace, key=key)
+
+    def report(self) -> dict[str, Any]:
+        """Counters + hit rate + upstream credits saved (for logs and /api/health)."""
+        s = self.stats
+        return {
+            "hits": s.hits,
+            "stale_hits": s.stale_hits,
+            "negative_hits": s.negative_hits,
+            "misses": s.misses,
+            "refreshes": s.refreshes,
+            "errors": s.errors,
+            "hit_rate": s.hit_rate,
+            "credits_saved": (s.hits + s.negative_hits) * self._credits_per_fetch,
+        }
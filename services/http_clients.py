@@ -0,0 +1,177 @@
+"""Pooled HTTP clients per upstream (ARCHITECTURE.md §2.2).
+
+One httpx.AsyncClient per upstream, created lazily and kept for the whole
+process: TLS sessions and keep-alive connections are reused across calls
+instead of paying a new handshake per request.
+
+HttpClientRegistry is created in bot.main.create_app() and passed down
+explicitly: aiogram handlers get it as `http_clients` from workflow_data,
+aiohttp handlers from app["http_clients"]. Integration clients take the pool
+they send through as a required argument — nothing constructs an ad-hoc
+client per call.
+
+Connection reuse is metered per pool: every request is counted, and a new
+TCP connection is detected via the httpcore "connection.connect_tcp" trace
+event. reused = requests - new_connections.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import structlog
+
+log = structlog.get_logger()
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True, slots=True)
+class PoolConfig:
+    """Limits and defaults for one upstream pool."""
+
+    timeout: float
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    follow_redirects: bool = False
+
+
+UPSTREAMS: dict[str, PoolConfig] = {
+    # Publishers, payments, Firecrawl/Serper/DataForSEO (Google)
+    "default": PoolConfig(timeout=30.0, max_connections=50, max_keepalive=30),
+    # Detached admin tasks (AI generation, image pipeline) that outlive the handler
+    "background": PoolConfig(timeout=120.0, max_connections=20, max_keepalive=10),
+    # AIOrchestrator; HTTP/2 multiplexes concurrent generations over few connections
+    "openrouter": PoolConfig(timeout=120.0, max_connections=50, max_keepalive=30, http2=True),
+    "bamboodom": PoolConfig(timeout=30.0, max_connections=10, max_keepalive=5),
+    "site_crawler": PoolConfig(timeout=30.0, max_connections=10, max_keepalive=5, follow_redirects=True),
+    "media": PoolConfig(timeout=30.0, max_connections=20, max_keepalive=10, follow_redirects=True),
+    "yandex_webmaster": PoolConfig(timeout=15.0, max_connections=5, max_keepalive=5, http2=True),
+    "yandex_metrika": PoolConfig(timeout=15.0, max_connections=5, max_keepalive=5, http2=True),
+    "google": PoolConfig(timeout=20.0, max_connections=10, max_keepalive=5, http2=True),
+    "dataforseo": PoolConfig(timeout=60.0, max_connections=10, max_keepalive=5),
+}
+
+_NEW_CONNECTION_EVENT = "connection.connect_tcp.complete"
+
+TraceCallback = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+
+@dataclass
+class PoolStats:
+    """Connection-reuse counters for one pool."""
+
+    requests: int = 0
+    new_connections: int = 0
+    errors: int = 0
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.new_connections - self.errors, 0)
+
+    def report(self) -> dict[str, Any]:
+        completed = self.requests - self.errors
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused": self.reused,
+            "reuse_ratio": round(self.reused / completed, 3) if completed > 0 else 0.0,
+            "errors": self.errors,
+        }
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport and counts requests vs newly opened TCP connections."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, stats: PoolStats) -> None:
+        self._inner = inner
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        outer: TraceCallback | None = request.extensions.get("trace")
+
+        async def _trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == _NEW_CONNECTION_EVENT:
+                stats.new_connections += 1
+            if outer is not None:
+                await outer(event_name, info)
+
+        request.extensions["trace"] = _trace
+        stats.requests += 1
+        try:
+            return await self._inner.handle_async_request(request)
+        except httpx.TransportError:
+            stats.errors += 1
+            raise
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def build_pooled_client(config: PoolConfig, stats: PoolStats) -> httpx.AsyncClient:
+    """Create a metered httpx client with the pool limits from *config*."""
+    http2 = config.http2 and _HTTP2_AVAILABLE
+    limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+    return httpx.AsyncClient(
+        transport=_MeteredTransport(transport, stats),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        follow_redirects=config.follow_redirects,
+    )
+
+
+class HttpClientRegistry:
+    """Lazily created pooled clients, one per upstream name.
+
+    Unknown upstream names share the "default" pool.
+    """
+
+    def __init__(self, upstreams: dict[str, PoolConfig] | None = None) -> None:
+        self._upstreams = upstreams if upstreams is not None else UPSTREAMS
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, PoolStats] = {}
+
+    def get(self, upstream: str = "default") -> httpx.AsyncClient:
+        """Pooled client for *upstream*; recreated if it was closed."""
+        name = upstream if upstream in self._upstreams else "default"
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            stats = self._stats.setdefault(name, PoolStats())
+            client = build_pooled_client(self._upstreams[name], stats)
+            self._clients[name] = client
+        return client
+
+    def request_count(self, upstream: str) -> int:
+        """Requests sent through *upstream*'s pool so far (0 before it is created)."""
+        name = upstream if upstream in self._upstreams else "default"
+        stats = self._stats.get(name)
+        return stats.requests if stats is not None else 0
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Connection-reuse metrics per pool (for /api/health)."""
+        report: dict[str, dict[str, Any]] = {}
+        for name, stats in sorted(self._stats.items()):
+            config = self._upstreams[name]
+            report[name] = {**stats.report(), "http2": config.http2 and _HTTP2_AVAILABLE}
+        return report
+
+    async def aclose(self) -> None:
+        """Close every pool, logging final reuse metrics."""
+        for client in self._clients.values():
+            if not client.is_closed:
+                await client.aclose()
+        log.info("http_pools_closed", pools=self.stats())
+        self._clients.clear()
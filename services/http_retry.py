@@ -9,12 +9,21 @@ Rules:
   - 401/403: never retry (auth failure)
   - Other 4xx: never retry (client error)
   - Network errors (timeout, connect): retry with backoff
+
+Per-provider guard (ProviderGuard), shared by all callers in the process:
+  - circuit breaker: closed -> open after N consecutive failures (5xx/network),
+    open -> half-open after a cool-down, one probe decides closed/open again
+  - fast-fail with CircuitOpenError while open (no retries, no sleeps)
+  - bounded concurrency per provider/host (asyncio.Semaphore)
+  - shared Retry-After: one 429 pauses every caller of that provider
 """
 
 from __future__ import annotations
 
 import asyncio
+import time
 from collections.abc import Awaitable, Callable
+from typing import Any
 
 import httpx
 import structlog
@@ -38,6 +47,38 @@ _RETRYABLE_NETWORK_ERRORS = (
 )
 
 
+# Circuit breaker defaults
+_FAILURE_THRESHOLD = 5  # consecutive failures before the circuit opens
+_RECOVERY_TIMEOUT = 30.0  # seconds in open state before a half-open probe
+
+# Max in-flight requests per provider. WordPress guards are per host
+# ("wordpress:<host>"), kept low because shared hosting chokes early.
+_DEFAULT_CONCURRENCY = 10
+_PROVIDER_CONCURRENCY: dict[str, int] = {
+    "firecrawl": 10,
+    "serper": 20,
+    "dataforseo": 10,
+    "wordpress": 4,
+}
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling a provider whose circuit is open.
+
+    Subclasses httpx.TransportError so existing ``except httpx.HTTPError``
+    degradation paths handle it; not in _RETRYABLE_NETWORK_ERRORS, so never retried.
+    """
+
+    def __init__(self, provider: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {provider}, retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
 def _parse_retry_after(response: httpx.Response) -> float | None:
     """Extract Retry-After header value as seconds.
 
@@ -97,12 +138,172 @@ def _get_retry_delay(exc: BaseException, attempt: int, base_delay: float) -> flo
     return min(backoff, _MAX_RETRY_AFTER)
 
 
+def _is_provider_failure(exc: BaseException) -> bool:
+    """Whether an exception says the provider itself is unhealthy.
+
+    Counts: 5xx, network errors. Not counted: 429 (handled by the shared pause),
+    other 4xx (our request was wrong, the provider answered fine).
+    """
+    if isinstance(exc, httpx.TransportError):
+        return not isinstance(exc, CircuitOpenError)
+    status = _get_status_code(exc)
+    return status is not None and status >= 500
+
+
+class ProviderGuard:
+    """Circuit breaker + concurrency limit + shared Retry-After for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_concurrency: int = _DEFAULT_CONCURRENCY,
+        failure_threshold: int = _FAILURE_THRESHOLD,
+        recovery_timeout: float = _RECOVERY_TIMEOUT,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit past its cool-down reports as half-open."""
+        if self._state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self._recovery_timeout:
+            return CIRCUIT_HALF_OPEN
+        return self._state
+
+    def _admit(self) -> bool:
+        """Check the breaker before a call. Returns True if the call is the half-open probe."""
+        if self._state == CIRCUIT_OPEN:
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self._recovery_timeout:
+                self._rejected += 1
+                raise CircuitOpenError(self.name, self._recovery_timeout - elapsed)
+            self._state = CIRCUIT_HALF_OPEN
+        if self._state == CIRCUIT_HALF_OPEN:
+            if self._probe_in_flight:
+                self._rejected += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def _record_success(self) -> None:
+        if self._state != CIRCUIT_CLOSED:
+            log.info("circuit_closed", provider=self.name)
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+
+    def _record_failure(self, exc: BaseException) -> None:
+        self._failures += 1
+        if self._state == CIRCUIT_HALF_OPEN or self._failures >= self._failure_threshold:
+            if self._state != CIRCUIT_OPEN:
+                log.warning(
+                    "circuit_opened",
+                    provider=self.name,
+                    failures=self._failures,
+                    error=str(exc)[:200],
+                )
+            self._state = CIRCUIT_OPEN
+            self._opened_at = time.monotonic()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller of this provider for *seconds* (429 Retry-After)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + min(seconds, _MAX_RETRY_AFTER))
+
+    async def call[T](self, func: Callable[[], Awaitable[T]]) -> T:
+        """Run one attempt of *func* under the breaker, the shared pause and the concurrency bound.
+
+        Raises CircuitOpenError without calling *func* while the circuit is open.
+        """
+        is_probe = self._admit()
+        try:
+            async with self._semaphore:
+                wait = self._paused_until - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._in_flight += 1
+                try:
+                    result = await func()
+                finally:
+                    self._in_flight -= 1
+        except Exception as exc:
+            if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+                retry_after = _parse_retry_after(exc.response)
+                if retry_after is not None:
+                    self.pause(retry_after)
+                self._record_success()  # provider is alive, just throttling us
+            elif _is_provider_failure(exc):
+                self._record_failure(exc)
+            else:
+                self._record_success()
+            raise
+        finally:
+            if is_probe:
+                self._probe_in_flight = False
+        self._record_success()
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        """State for /api/health."""
+        state = self.state
+        info: dict[str, Any] = {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rejected": self._rejected,
+        }
+        if state == CIRCUIT_OPEN:
+            info["retry_in_s"] = round(self._recovery_timeout - (time.monotonic() - self._opened_at), 1)
+        paused_for = self._paused_until - time.monotonic()
+        if paused_for > 0:
+            info["paused_for_s"] = round(paused_for, 1)
+        return info
+
+
+_GUARDS: dict[str, ProviderGuard] = {}
+
+
+def get_provider_guard(provider: str) -> ProviderGuard:
+    """Process-wide guard for *provider* (e.g. "serper", "wordpress:example.com")."""
+    guard = _GUARDS.get(provider)
+    if guard is None:
+        family = provider.split(":", 1)[0]
+        guard = ProviderGuard(
+            provider,
+            max_concurrency=_PROVIDER_CONCURRENCY.get(family, _DEFAULT_CONCURRENCY),
+        )
+        _GUARDS[provider] = guard
+    return guard
+
+
+def provider_states() -> dict[str, dict[str, Any]]:
+    """Snapshot of every provider guard created in this process."""
+    return {name: guard.snapshot() for name, guard in sorted(_GUARDS.items())}
+
+
+def reset_provider_guards() -> None:
+    """Drop all guards (tests)."""
+    _GUARDS.clear()
+
+
 async def retry_with_backoff[T](
     func: Callable[[], Awaitable[T]],
     *,
     max_retries: int = 2,
     base_delay: float = 1.0,
     operation: str = "http_request",
+    provider: str | None = None,
 ) -> T:
     """Execute an async function with retry on transient failures.
 
@@ -111,6 +312,8 @@ async def retry_with_backoff[T](
         max_retries: Maximum number of retry attempts (0 = no retry).
         base_delay: Base delay in seconds for exponential backoff.
         operation: Human-readable name for logging.
+        provider: If set, every attempt runs through get_provider_guard(provider);
+            an open circuit raises CircuitOpenError immediately.
 
     Returns:
         The result of func() on success.
@@ -119,9 +322,12 @@ async def retry_with_backoff[T](
         The last exception if all attempts fail, or immediately on non-retryable errors.
     """
     last_exc: BaseException | None = None
+    guard = get_provider_guard(provider) if provider else None
 
     for attempt in range(max_retries + 1):
         try:
+            if guard is not None:
+                return await guard.call(func)
             return await func()
         except Exception as exc:
             last_exc = exc
@@ -0,0 +1,137 @@
+"""Off-loop image transcoding to WebP (ARCHITECTURE.md §5.9).
+
+Shared by ImageStorage.upload, reconciliation and the Bamboodom image
+pipeline. Pillow decode/encode is CPU-bound and would otherwise block the
+event loop for the whole batch; transcode() runs it in a small dedicated
+thread pool. Pillow releases the GIL inside its codecs, so threads scale
+without pickling image bytes to a process pool.
+
+Each image is handled in a single pass: decode → optional RGB → center crop
+and resize in one resample (Image.resize with box=) → encode. Input that is
+already WebP and needs no geometry change is passed through untouched, so
+an image converted during reconciliation is not re-encoded on upload.
+
+Per-image CPU time (thread CPU, not wall time spent queued) is returned and
+logged as image_transcoded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any
+
+import structlog
+
+log = structlog.get_logger()
+
+_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TranscodeResult:
+    """Encoded image plus the cost of producing it."""
+
+    data: bytes
+    ext: str
+    mime: str
+    reencoded: bool
+    cpu_ms: float
+
+
+def is_webp(data: bytes) -> bool:
+    """RIFF/WEBP container signature."""
+    return len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WEBP"
+
+
+def _center_crop_box(width: int, height: int, aspect: tuple[int, int]) -> tuple[int, int, int, int]:
+    """Largest centered box of the given aspect ratio."""
+    target = aspect[0] / aspect[1]
+    if width / height > target:
+        new_w = int(height * target)
+        offset = (width - new_w) // 2
+        return offset, 0, offset + new_w, height
+    if width / height < target:
+        new_h = int(width / target)
+        offset = (height - new_h) // 2
+        return 0, offset, width, offset + new_h
+    return 0, 0, width, height
+
+
+def transcode_to_webp(
+    image_bytes: bytes,
+    *,
+    quality: int = 85,
+    aspect: tuple[int, int] | None = None,
+    target_width: int | None = None,
+    rgb: bool = False,
+) -> TranscodeResult:
+    """Encode an image as WebP in one pass. Raises if Pillow cannot decode it.
+
+    aspect: center-crop to this ratio. target_width: resize to this width
+    (height follows the aspect). Both are applied in the same resample.
+    """
+    start = time.thread_time()
+    if aspect is None and target_width is None and is_webp(image_bytes):
+        return TranscodeResult(image_bytes, "webp", "image/webp", reencoded=False, cpu_ms=0.0)
+
+    from PIL import Image  # type: ignore[import-not-found]
+
+    img = Image.open(BytesIO(image_bytes))
+    if rgb:
+        img = img.convert("RGB")
+
+    if aspect is not None or target_width is not None:
+        width, height = img.size
+        box = _center_crop_box(width, height, aspect) if aspect else (0, 0, width, height)
+        box_w, box_h = box[2] - box[0], box[3] - box[1]
+        if target_width is not None:
+            ratio_w, ratio_h = aspect or (box_w, box_h)
+            size = (target_width, int(target_width * ratio_h / ratio_w))
+        else:
+            size = (box_w, box_h)
+        img = img.resize(size, Image.Resampling.LANCZOS, box=box)
+
+    buf = BytesIO()
+    img.save(buf, format="WEBP", quality=quality)
+    data = buf.getvalue()
+    cpu_ms = round((time.thread_time() - start) * 1000, 1)
+    log.info("image_transcoded", bytes_in=len(image_bytes), bytes_out=len(data), cpu_ms=cpu_ms)
+    return TranscodeResult(data, "webp", "image/webp", reencoded=True, cpu_ms=cpu_ms)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="image-transcode")
+    return _executor
+
+
+async def run_in_pool[T](func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a CPU-bound image function on the transcoding pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def transcode(
+    image_bytes: bytes,
+    *,
+    quality: int = 85,
+    aspect: tuple[int, int] | None = None,
+    target_width: int | None = None,
+    rgb: bool = False,
+) -> TranscodeResult:
+    """transcode_to_webp() off the event loop."""
+    if aspect is None and target_width is None and is_webp(image_bytes):
+        # Pass-through needs no CPU work — skip the pool hop
+        return transcode_to_webp(image_bytes)
+    return await run_in_pool(
+        transcode_to_webp, image_bytes, quality=quality, aspect=aspect, target_width=target_width, rgb=rgb
+    )
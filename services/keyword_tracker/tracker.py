@@ -21,6 +21,7 @@ from dataclasses import dataclass
 from typing import Any
 from zoneinfo import ZoneInfo
 
+import httpx
 import structlog
 
 from integrations.dataforseo_yandex import DataForSEOError, DataForSEOYandexClient, SerpRank
@@ -184,7 +185,7 @@ async def get_last_ranks(redis: Any) -> list[RankEntry]:
 # --------- Run ----------
 
 
-async def run_check(redis: Any) -> tuple[list[RankEntry], int]:
+async def run_check(redis: Any, http_client: httpx.AsyncClient) -> tuple[list[RankEntry], int]:
     """Делает прогон всех ключей через DataForSEO, сохраняет, возвращает результаты с дельтой.
 
     Возвращает (entries, cost_cents) где cost_cents — оценка стоимости в центах.
@@ -193,7 +194,7 @@ async def run_check(redis: Any) -> tuple[list[RankEntry], int]:
     keywords = await get_keywords(redis)
     if not keywords:
         return [], 0
-    client = DataForSEOYandexClient()
+    client = DataForSEOYandexClient(http_client=http_client)
     if not client.configured:
         raise DataForSEOError(0, "DATAFORSEO_LOGIN/PASSWORD не настроены")
     today = dt.datetime.now(TZ).date()
@@ -0,0 +1,237 @@
+"""Predictive research prefetch ahead of scheduled publish slots.
+
+Triggered by QStash cron (/api/prefetch, every ~10 min). For each enabled
+WordPress schedule whose next slot fires within the lead window, predicts
+the rotation keyword (deterministic given publication history) and runs the
+same websearch stage as PublishService._generate_article. That warms the
+research, Serper and Firecrawl caches, so the publish request itself only
+hits warm caches.
+Zero dependencies on Telegram/Aiogram.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import structlog
+
+from cache.keys import PREFETCH_SLOT_TTL, CacheKeys
+from db.client import SupabaseClient
+from db.credential_manager import get_credential_manager
+from db.models import Category, PlatformSchedule, Project
+from db.repositories.categories import CategoriesRepository
+from db.repositories.connections import ConnectionsRepository
+from db.repositories.projects import ProjectsRepository
+from db.repositories.publications import PublicationsRepository
+from db.repositories.schedules import SchedulesRepository
+from services.research_helpers import gather_websearch_data
+
+if TYPE_CHECKING:
+    from cache.client import RedisClient
+    from services.ai.orchestrator import AIOrchestrator
+    from services.external.firecrawl import FirecrawlClient
+    from services.external.serper import SerperClient
+
+log = structlog.get_logger()
+
+# Same mapping as services/scheduler.py _DAY_MAP, in Python weekday() numbering
+_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+# Max schedules warmed in parallel (each = Serper x3 + Firecrawl x3 + Sonar Pro)
+_PREFETCH_CONCURRENCY = 3
+
+_BATCH_IDS = 200  # IDs per in_() lookup — keeps PostgREST URLs short
+
+
+@dataclass
+class PrefetchResult:
+    """Result of one prefetch run."""
+
+    due: int = 0
+    warmed: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def upcoming_slots(
+    schedule: PlatformSchedule,
+    timezone: str,
+    now: datetime,
+    lead: timedelta,
+) -> list[datetime]:
+    """Nominal slot times (UTC) of *schedule* in the window (now, now + lead].
+
+    Ignores the cron minute placement (±publish_slot_tolerance_minutes): the lead window is much wider.
+    """
+    try:
+        tz = ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):  # fmt: skip
+        tz = ZoneInfo("Europe/Moscow")
+    allowed_days = {_WEEKDAYS[d] for d in schedule.schedule_days if d in _WEEKDAYS}
+    local_now = now.astimezone(tz)
+    window_end = now + lead
+
+    slots: list[datetime] = []
+    for day_offset in range(lead.days + 2):
+        day = (local_now + timedelta(days=day_offset)).date()
+        if allowed_days and day.weekday() not in allowed_days:
+            continue
+        for time_slot in schedule.schedule_times:
+            try:
+                hour, minute = (int(p) for p in time_slot.split(":"))
+                fire_at = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz).astimezone(UTC)
+            except ValueError:
+                continue
+            if now < fire_at <= window_end:
+                slots.append(fire_at)
+    return sorted(slots)
+
+
+class ResearchPrefetchService:
+    """Warms websearch caches for publish slots that fire within the lead window."""
+
+    def __init__(
+        self,
+        db: SupabaseClient,
+        redis: RedisClient,
+        ai_orchestrator: AIOrchestrator,
+        encryption_key: str,
+        serper_client: SerperClient | None = None,
+        firecrawl_client: FirecrawlClient | None = None,
+        lead_minutes: int = 45,
+    ) -> None:
+        self._db = db
+        self._redis = redis
+        self._ai_orchestrator = ai_orchestrator
+        self._serper = serper_client
+        self._firecrawl = firecrawl_client
+        self._lead = timedelta(minutes=lead_minutes)
+        self._schedules = SchedulesRepository(db)
+        self._categories = CategoriesRepository(db)
+        self._projects = ProjectsRepository(db)
+        self._publications = PublicationsRepository(db)
+        self._connections = ConnectionsRepository(db, get_credential_manager(encryption_key))
+
+    async def execute(self, now: datetime | None = None) -> PrefetchResult:
+        """Find due WordPress slots and warm caches for each predicted keyword."""
+        now = now or datetime.now(tz=UTC)
+        result = PrefetchResult()
+
+        # Only articles run the websearch stage; social posts have nothing to warm
+        schedules = [
+            s for s in await self._schedules.get_enabled() if s.platform_type == "wordpress" and s.schedule_times
+        ]
+        if not schedules:
+            return result
+
+        # Two batched reads instead of two per schedule: the slot check needs the project's timezone
+        cat_ids = sorted({s.category_id for s in schedules})
+        categories: dict[int, Category] = {}
+        for i in range(0, len(cat_ids), _BATCH_IDS):
+            batch = await self._categories.get_by_ids(cat_ids[i : i + _BATCH_IDS])
+            categories.update((c.id, c) for c in batch if c.keywords)
+        proj_ids = sorted({c.project_id for c in categories.values()})
+        projects: dict[int, Project] = {}
+        for i in range(0, len(proj_ids), _BATCH_IDS):
+            batch = await self._projects.get_by_ids(proj_ids[i : i + _BATCH_IDS])
+            projects.update((p.id, p) for p in batch)
+
+        due: list[tuple[PlatformSchedule, Category, Project, datetime]] = []
+        for s in schedules:
+            category = categories.get(s.category_id)
+            project = projects.get(category.project_id) if category else None
+            if not category or not project:
+                continue
+            slots = upcoming_slots(s, project.timezone, now, self._lead)
+            if slots:
+                due.append((s, category, project, slots[0]))
+        result.due = len(due)
+
+        semaphore = asyncio.Semaphore(_PREFETCH_CONCURRENCY)
+
+        async def _bounded(item: tuple[PlatformSchedule, Category, Project, datetime]) -> str:
+            async with semaphore:
+                return await self._prefetch_schedule(*item)
+
+        outcomes = await asyncio.gather(*(_bounded(item) for item in due), return_exceptions=True)
+        for (schedule, *_), outcome in zip(due, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                result.failed += 1
+                log.warning("prefetch_schedule_failed", schedule_id=schedule.id, error=str(outcome)[:200])
+            elif outcome == "warmed":
+                result.warmed += 1
+            else:
+                result.skipped += 1
+
+        log.info(
+            "prefetch_run_done",
+            schedules=len(schedules),
+            due=result.due,
+            warmed=result.warmed,
+            skipped=result.skipped,
+            failed=result.failed,
+        )
+        return result
+
+    async def _prefetch_schedule(
+        self,
+        schedule: PlatformSchedule,
+        category: Category,
+        project: Project,
+        fires_at: datetime,
+    ) -> str:
+        """Warm caches for the due slot of one schedule.
+
+        Returns "skipped" (already warmed / no keyword) or "warmed".
+        """
+        # One warm-up per slot across replicas and overlapping cron runs
+        slot_key = CacheKeys.prefetch_slot(schedule.id, fires_at.strftime("%Y%m%dT%H%M"))
+        if not await self._redis.set(slot_key, "1", nx=True, ex=PREFETCH_SLOT_TTL):
+            return "skipped"
+        try:
+            return await self._warm(schedule, category, project, fires_at)
+        except BaseException:
+            # Release the slot so the next cron run retries the warm-up
+            await self._redis.delete(slot_key)
+            raise
+
+    async def _warm(self, schedule: PlatformSchedule, category: Category, project: Project, fires_at: datetime) -> str:
+        """Predict the slot's rotation keyword and run the publish-path websearch stage."""
+        keyword, _low_pool = await self._publications.get_rotation_keyword(
+            schedule.category_id, category.keywords, "article"
+        )
+        if not keyword:
+            return "skipped"
+
+        connection = await self._connections.get_by_id(schedule.connection_id)
+        cached_links = (connection.metadata or {}).get("internal_links") if connection else None
+
+        # Arguments mirror PublishService._generate_article so cache keys match
+        websearch = await gather_websearch_data(
+            keyword=keyword,
+            project_url=project.website_url,
+            serper=self._serper,
+            firecrawl=self._firecrawl,
+            orchestrator=self._ai_orchestrator,
+            redis=self._redis,
+            specialization=project.specialization or "",
+            company_name=project.company_name or "",
+            geography=project.company_city or "",
+            company_description_short=(project.description or "")[:200],
+            internal_links_cache=cached_links,
+        )
+        log.info(
+            "prefetch_slot_warmed",
+            schedule_id=schedule.id,
+            category_id=schedule.category_id,
+            keyword=keyword,
+            fires_at=fires_at.isoformat(),
+            has_serper=websearch.get("serper_data") is not None,
+            has_research=websearch.get("research_data") is not None,
+            competitor_count=len(websearch.get("competitor_pages", [])),
+        )
+        return "warmed"
@@ -7,7 +7,8 @@ Zero Telegram/Aiogram dependencies.
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass, field
+import uuid
+from dataclasses import asdict, dataclass, field
 from typing import TYPE_CHECKING, Any
 
 import structlog
@@ -17,7 +18,15 @@ from db.client import SupabaseClient
 from db.repositories.audits import AuditsRepository
 from db.repositories.projects import ProjectsRepository
 from services.ai.articles import RESEARCH_SCHEMA
-from services.ai.orchestrator import AIOrchestrator, GenerationRequest
+from services.ai.orchestrator import AIOrchestrator, GenerationRequest, GenerationResult
+from services.checkpoints import (
+    STAGE_ARTICLE,
+    STAGE_IMAGES,
+    STAGE_WEBSEARCH,
+    STAGE_WP_MEDIA,
+    StageCheckpoints,
+    preview_publish_run_key,
+)
 from services.external.firecrawl import FirecrawlClient
 from services.external.serper import SerperClient
 from services.research_helpers import gather_websearch_data
@@ -28,6 +37,7 @@ if TYPE_CHECKING:
 
     from cache.client import RedisClient
     from db.models import ArticlePreview, PlatformConnection
+    from services.ai.images import GeneratedImage
     from services.publishers.base import PublishResult
 
 log = structlog.get_logger()
@@ -86,12 +96,16 @@ class PreviewService:
         keyword: str,
         image_count: int | None = None,
         platform_type: str = "wordpress",
+        checkpoint: StageCheckpoints | None = None,
     ) -> ArticleContent:
         """Run full article pipeline: websearch → text + images in parallel.
 
         Args:
             image_count: Override image count. If None, uses category settings.
             platform_type: Platform for settings resolution (default wordpress).
+            checkpoint: Stage checkpoints of the run (services/checkpoints.py).
+                A failed run retried with the same run key resumes after its
+                last completed stage; checkpoints are dropped once it succeeds.
 
         Returns ArticleContent with real AI-generated content.
         Raises on text generation failure (caller should refund).
@@ -99,12 +113,6 @@ class PreviewService:
         from services.ai.articles import ArticleService, sanitize_html
         from services.ai.images import ImageService
         from services.ai.markdown_renderer import render_markdown
-        from services.ai.reconciliation import (
-            distribute_images,
-            extract_block_contexts,
-            reconcile_images,
-            split_into_blocks,
-        )
 
         article_service = ArticleService(self._orchestrator, self._db)
         image_service = ImageService(self._orchestrator)
@@ -121,20 +129,25 @@ class PreviewService:
         if image_count is None:
             image_count = max(0, _safe_int(eff_image_settings.get("count"), 0))
 
+        checkpoint = checkpoint or StageCheckpoints.disabled()
+
         # Phase 1: Gather websearch + research data (Serper PAA + Firecrawl + Sonar Pro)
-        project_url = project.website_url if project else None
-        websearch = await gather_websearch_data(
-            keyword,
-            project_url,
-            serper=self._serper,
-            firecrawl=self._firecrawl,
-            orchestrator=self._orchestrator,
-            redis=self._redis,
-            specialization=(project.specialization or "") if project else "",
-            company_name=(project.company_name or "") if project else "",
-            geography=(project.company_city or "") if project else "",
-            company_description_short=((project.description or "")[:200]) if project else "",
-        )
+        websearch = checkpoint.get(STAGE_WEBSEARCH)
+        if websearch is None:
+            project_url = project.website_url if project else None
+            websearch = await gather_websearch_data(
+                keyword,
+                project_url,
+                serper=self._serper,
+                firecrawl=self._firecrawl,
+                orchestrator=self._orchestrator,
+                redis=self._redis,
+                specialization=(project.specialization or "") if project else "",
+                company_name=(project.company_name or "") if project else "",
+                geography=(project.company_city or "") if project else "",
+                company_description_short=((project.description or "")[:200]) if project else "",
+            )
+            await checkpoint.save(STAGE_WEBSEARCH, websearch)
 
         image_context: dict[str, Any] = {
             "keyword": keyword,
@@ -162,21 +175,28 @@ class PreviewService:
                     image_context["background_color"] = colors["background"]
 
         # Phase 2: Text generation (outline → expand → quality → critique)
-        text_result = await article_service.generate(
-            user_id=user_id,
-            project_id=project_id,
-            category_id=category_id,
-            keyword=keyword,
-            image_count=image_count,
-            serper_data=websearch["serper_data"],
-            competitor_pages=websearch["competitor_pages"],
-            competitor_analysis=websearch["competitor_analysis"],
-            competitor_gaps=websearch["competitor_gaps"],
-            internal_links=websearch.get("internal_links", ""),
-            research_data=websearch.get("research_data"),
-            news_data=websearch.get("news_data"),
-            autocomplete_suggestions=websearch.get("autocomplete_suggestions"),
-        )
+        saved_article = checkpoint.get(STAGE_ARTICLE)
+        if saved_article:
+            text_result = GenerationResult(**saved_article)
+            log.info("article_resumed", keyword=keyword, user_id=user_id)
+        else:
+            text_result = await article_service.generate(
+                user_id=user_id,
+                project_id=project_id,
+                category_id=category_id,
+                keyword=keyword,
+                image_count=image_count,
+                serper_data=websearch["serper_data"],
+                competitor_pages=websearch["competitor_pages"],
+                competitor_analysis=websearch["competitor_analysis"],
+                competitor_gaps=websearch["competitor_gaps"],
+                internal_links=websearch.get("internal_links", ""),
+                research_data=websearch.get("research_data"),
+                news_data=websearch.get("news_data"),
+                autocomplete_suggestions=websearch.get("autocomplete_suggestions"),
+                checkpoint=checkpoint,
+            )
+            await checkpoint.save(STAGE_ARTICLE, asdict(text_result))
 
         content = text_result.content if isinstance(text_result.content, dict) else {}
         title = content.get("title", keyword)
@@ -184,9 +204,117 @@ class PreviewService:
         meta_description: str = content.get("meta_description", "")
         images_meta: list[dict[str, str]] = content.get("images_meta", [])
 
+        # Phase 3: images → reconcile → Storage (checkpointed as one stage)
+        saved_images = checkpoint.get(STAGE_IMAGES)
+        if saved_images is not None:
+            processed_md = saved_images["processed_md"]
+            stored_images: list[dict[str, Any]] = saved_images["stored_images"]
+        else:
+            processed_md, stored_images = await self._generate_and_store_images(
+                image_service,
+                user_id=user_id,
+                project_id=project_id,
+                image_count=image_count,
+                title=title,
+                content_markdown=content_markdown,
+                images_meta=images_meta,
+                image_context=image_context,
+                eff_image_settings=eff_image_settings,
+                project=project,
+                branding=branding,
+                storage_holder=checkpoint.run_key or f"preview:{uuid.uuid4().hex}",
+            )
+            await checkpoint.save(STAGE_IMAGES, {"processed_md": processed_md, "stored_images": stored_images})
+
+        # Replace {{RECONCILED_IMAGE_N}} with real Storage URLs in markdown
+        for i, img_info in enumerate(stored_images):
+            placeholder = f"{{{{RECONCILED_IMAGE_{i + 1}}}}}"
+            processed_md = processed_md.replace(placeholder, img_info["url"])
+
+        # Remove any unreplaced reconciled placeholders (upload failures)
+        processed_md = re.sub(
+            r"!\[[^\]]*\]\(\{\{RECONCILED_IMAGE_\d+\}\}[^)]*\)",
+            "",
+            processed_md,
+        )
+        processed_md = re.sub(r"\{\{RECONCILED_IMAGE_\d+\}\}", "", processed_md)
+
+        # Render markdown→HTML with real image URLs embedded
+        content_html = render_markdown(processed_md, branding={}, insert_toc=True)
+        content_html = sanitize_html(content_html)
+
+        word_count = len(content_markdown.split())
+
+        # Word count warning: log if significantly below target (not a hard block)
+        words_min = _safe_int(eff_text_settings.get("words_min"), 1500)
+        if word_count < int(words_min * 0.8):
+            log.warning(
+                "article_word_count_below_target",
+                word_count=word_count,
+                words_min=words_min,
+                threshold=int(words_min * 0.8),
+                keyword=keyword,
+            )
+
+        content_warnings: list[str] = content.get("content_warnings", [])
+
+        await checkpoint.clear()
+        return ArticleContent(
+            title=title,
+            content_html=content_html,
+            word_count=word_count,
+            images_count=len(stored_images),
+            meta_description=meta_description,
+            stored_images=stored_images,
+            content_warnings=content_warnings,
+        )
+
+    async def _generate_and_store_images(
+        self,
+        image_service: Any,
+        *,
+        user_id: int,
+        project_id: int,
+        image_count: int,
+        title: str,
+        content_markdown: str,
+        images_meta: list[dict[str, str]],
+        image_context: dict[str, Any],
+        eff_image_settings: dict[str, Any],
+        project: Any,
+        branding: Any,
+        storage_holder: str,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Generate block-aware images, reconcile them with the text and upload to Storage.
+
+        ``storage_holder`` (the run key) is recorded on every stored image, so
+        the preview's cancel/expiry releases only its own claim on a shared object.
+
+        Each image is converted and uploaded as soon as it is generated
+        (ImageService.generate_pipeline); signed URLs for all of them come from
+        one batch request. An image whose upload or signing failed is dropped
+        before reconciliation so its placeholder is removed.
+        Returns (processed_markdown, stored_images).
+        """
+        from services.ai.reconciliation import (
+            ConvertedImage,
+            convert_image,
+            distribute_images,
+            extract_block_contexts,
+            reconcile_images,
+            split_into_blocks,
+        )
+
+        async def _convert_and_store(index: int, image: GeneratedImage) -> tuple[ConvertedImage, str]:
+            converted = await convert_image(image.data)
+            path = await self._image_storage.store(
+                converted.data, user_id, project_id, mime=f"image/{converted.ext}", holder=storage_holder
+            )
+            return converted, path
+
         # Phase 3: Block-aware image generation (§7.4.1 + §7.4.2)
         # Images AFTER text — each prompt gets H2-section context + Director plans
-        raw_images: list[bytes] = []
+        ready: list[tuple[ConvertedImage, str]] = []
         director_result = None
         if image_count > 0:
             blocks = split_into_blocks(content_markdown)
@@ -226,91 +354,49 @@ class PreviewService:
             if director_result:
                 log.info("image_director_narrative", visual_narrative=director_result.visual_narrative)
 
+            # Generate → WebP → Storage per image as it completes; results in placeholder order
             try:
-                image_result = await image_service.generate(
-                    user_id=user_id,
-                    context=image_context,
+                results = await image_service.generate_pipeline(
+                    user_id,
+                    image_context,
+                    _convert_and_store,
                     count=image_count,
                     block_contexts=block_contexts,
                     director_plans=director_plans,
                 )
-                raw_images = [img.data for img in image_result]
+                ready = [r for r in results if isinstance(r, tuple)]
             except AIGenerationError:
                 log.warning("image_gen_failed", exc_info=True)
 
-        # Reconcile images with text (E32-E35)
-        images_for_reconcile: list[bytes | BaseException] = list(raw_images)
+        signed: dict[str, str] = {}
+        if ready:
+            try:
+                signed = await self._image_storage.sign_urls([path for _, path in ready])
+            except Exception:
+                log.warning("image_sign_failed", exc_info=True)
+            ready = [(converted, path) for converted, path in ready if path in signed]
+
+        # Reconcile images with text (E32-E35). Images are already in Storage,
+        # so real URLs can be injected into {{RECONCILED_IMAGE_N}} placeholders.
         processed_md, uploads = reconcile_images(
             content_markdown=content_markdown,
             images_meta=images_meta,
-            generated_images=images_for_reconcile,
+            generated_images=[converted for converted, _ in ready],
             title=title,
         )
+        stored_images: list[dict[str, Any]] = [
+            {
+                "url": signed[path],
+                "storage_path": path,
+                "storage_holder": storage_holder,
+                "alt_text": upload.alt_text,
+                "filename": upload.filename,
+                "caption": upload.caption,
+            }
+            for upload, (_, path) in zip(uploads, ready, strict=True)
+        ]
 
-        # Upload images to Supabase Storage BEFORE rendering markdown→HTML
-        # so we can inject real URLs into {{RECONCILED_IMAGE_N}} placeholders
-        stored_images: list[dict[str, Any]] = []
-        for i, upload in enumerate(uploads):
-            try:
-                stored = await self._image_storage.upload(
-                    upload.data,
-                    user_id,
-                    project_id,
-                    i,
-                )
-                stored_images.append(
-                    {
-                        "url": stored.signed_url,
-                        "storage_path": stored.path,
-                        "alt_text": upload.alt_text,
-                        "filename": upload.filename,
-                        "caption": upload.caption,
-                    }
-                )
-            except Exception:
-                log.warning("image_upload_failed", index=i)
-
-        # Replace {{RECONCILED_IMAGE_N}} with real Storage URLs in markdown
-        for i, img_info in enumerate(stored_images):
-            placeholder = f"{{{{RECONCILED_IMAGE_{i + 1}}}}}"
-            processed_md = processed_md.replace(placeholder, img_info["url"])
-
-        # Remove any unreplaced reconciled placeholders (upload failures)
-        processed_md = re.sub(
-            r"!\[[^\]]*\]\(\{\{RECONCILED_IMAGE_\d+\}\}[^)]*\)",
-            "",
-            processed_md,
-        )
-        processed_md = re.sub(r"\{\{RECONCILED_IMAGE_\d+\}\}", "", processed_md)
-
-        # Render markdown→HTML with real image URLs embedded
-        content_html = render_markdown(processed_md, branding={}, insert_toc=True)
-        content_html = sanitize_html(content_html)
-
-        word_count = len(content_markdown.split())
-
-        # Word count warning: log if significantly below target (not a hard block)
-        words_min = _safe_int(eff_text_settings.get("words_min"), 1500)
-        if word_count < int(words_min * 0.8):
-            log.warning(
-                "article_word_count_below_target",
-                word_count=word_count,
-                words_min=words_min,
-                threshold=int(words_min * 0.8),
-                keyword=keyword,
-            )
-
-        content_warnings: list[str] = content.get("content_warnings", [])
-
-        return ArticleContent(
-            title=title,
-            content_html=content_html,
-            word_count=word_count,
-            images_count=len(stored_images),
-            meta_description=meta_description,
-            stored_images=stored_images,
-            content_warnings=content_warnings,
-        )
+        return processed_md, stored_images
 
     async def warmup_research_schema(self) -> None:
         """Warm up Sonar Pro JSON Schema cache to avoid +30s on first user request.
@@ -344,7 +430,8 @@ class PreviewService:
     ) -> PublishResult:
         """Publish article preview to WordPress.
 
-        Downloads images from Supabase Storage, uploads to WP.
+        Downloads images from Supabase Storage, uploads to WP. Media uploaded by
+        a failed attempt is checkpointed per preview and reused on retry.
         """
         from services.publishers.base import PublishRequest
         from services.publishers.wordpress import WordPressPublisher
@@ -353,6 +440,7 @@ class PreviewService:
         image_bytes_list: list[bytes] = []
         images_meta_list: list[dict[str, str]] = []
         storage_urls: list[str] = []
+        download_failed = False
         for img_info in preview.images or []:
             storage_path = img_info.get("storage_path")
             if storage_path:
@@ -369,6 +457,7 @@ class PreviewService:
                     storage_urls.append(img_info.get("url", ""))
                 except Exception:
                     log.warning("image_download_failed", path=storage_path)
+                    download_failed = True
 
         publisher = WordPressPublisher(self._http_client)
 
@@ -391,18 +480,21 @@ class PreviewService:
                 wp_category_id = await publisher.resolve_wp_category(base_url, auth, category_name)
                 if wp_category_id is not None:
                     from bot.config import get_settings
-                    from db.credential_manager import CredentialManager
+                    from db.credential_manager import get_credential_manager
                     from db.repositories.connections import ConnectionsRepository
 
                     settings = get_settings()
-                    cm = CredentialManager(settings.encryption_key.get_secret_value())
+                    cm = get_credential_manager(settings.encryption_key.get_secret_value())
                     conn_repo = ConnectionsRepository(self._db, cm)
                     await conn_repo.merge_metadata(
                         connection.id,
                         {"wp_categories": {**cached_wp_cats, category_name: wp_category_id}},
                     )
 
-        return await publisher.publish(
+        checkpoint = await StageCheckpoints.open(self._db, preview_publish_run_key(preview.id))
+        # WP media IDs map to images by index — unusable if an image is missing this time
+        saved_media = None if download_failed else checkpoint.get(STAGE_WP_MEDIA)
+        result = await publisher.publish(
             PublishRequest(
                 connection=connection,
                 content=preview.content_html or "",
@@ -416,6 +508,12 @@ class PreviewService:
                     "meta_description": meta_desc,
                     "storage_urls": storage_urls,
                     **({"wp_category_id": wp_category_id} if wp_category_id else {}),
+                    **({"wp_media": saved_media["media"]} if saved_media else {}),
                 },
             )
         )
+        if result.success:
+            await checkpoint.clear()
+        elif result.uploaded_media and not download_failed:
+            await checkpoint.save(STAGE_WP_MEDIA, {"media": result.uploaded_media})
+        return result
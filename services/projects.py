@@ -14,7 +14,7 @@ from typing import Any
 import structlog
 
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import Category, Project, ProjectCreate, ProjectPlatformSettings, ProjectUpdate
 from db.repositories.categories import CategoriesRepository
 from db.repositories.connections import ConnectionsRepository
@@ -22,6 +22,7 @@ from db.repositories.previews import PreviewsRepository
 from db.repositories.project_settings import ProjectPlatformSettingsRepository
 from db.repositories.projects import ProjectsRepository
 from db.repositories.publications import PublicationsRepository
+from services.dashboard import dashboard_changed
 from services.scheduler import SchedulerService
 from services.tokens import TokenService
 
@@ -95,7 +96,7 @@ class ProjectService:
         if not project:
             return None
 
-        cm = CredentialManager(self._encryption_key)
+        cm = get_credential_manager(self._encryption_key)
         conn_repo = ConnectionsRepository(self._db, cm)
         cats_repo = CategoriesRepository(self._db)
         pubs_repo = PublicationsRepository(self._db)
@@ -128,7 +129,9 @@ class ProjectService:
         count = await self._repo.get_count_by_user(data.user_id)
         if count >= MAX_PROJECTS_PER_USER:
             return None
-        return await self._repo.create(data)
+        project = await self._repo.create(data)
+        await dashboard_changed(data.user_id)
+        return project
 
     # ------------------------------------------------------------------
     # Update
@@ -287,5 +290,6 @@ class ProjectService:
 
         if deleted:
             log.info("project_deleted", project_id=project_id, user_id=user_id)
+            await dashboard_changed(user_id)
 
         return deleted, project
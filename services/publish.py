@@ -10,7 +10,8 @@ Zero dependencies on Telegram/Aiogram.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import asdict, dataclass
 from dataclasses import field as dataclasses_field
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, Literal
@@ -22,16 +23,36 @@ from bot.config import get_settings
 from bot.exceptions import AIGenerationError, InsufficientBalanceError
 from cache.client import RedisClient
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
-from db.models import PlatformScheduleUpdate, PublicationLogCreate
+from db.credential_manager import get_credential_manager
+from db.models import (
+    Category,
+    PlatformConnection,
+    PlatformSchedule,
+    PlatformScheduleUpdate,
+    Project,
+    PublicationLogCreate,
+    User,
+)
 from db.repositories.audits import AuditsRepository
+from db.repositories.base import request_scope
 from db.repositories.categories import CategoriesRepository
 from db.repositories.connections import ConnectionsRepository
 from db.repositories.projects import ProjectsRepository
 from db.repositories.publications import PublicationsRepository
 from db.repositories.schedules import SchedulesRepository
 from db.repositories.users import UsersRepository
-from services.ai.orchestrator import AIOrchestrator
+from services.ai.orchestrator import AIOrchestrator, GenerationResult
+from services.ai.reconciliation import ConvertedImage, convert_image
+from services.checkpoints import (
+    STAGE_ARTICLE,
+    STAGE_IMAGES,
+    STAGE_KEYWORD,
+    STAGE_WEBSEARCH,
+    STAGE_WP_MEDIA,
+    StageCheckpoints,
+    image_storage_paths,
+)
+from services.dashboard import dashboard_changed
 from services.projects import ProjectService
 from services.publishers.base import PublishRequest, PublishResult
 from services.research_helpers import gather_websearch_data
@@ -49,6 +70,7 @@ if TYPE_CHECKING:
 log = structlog.get_logger()
 
 _PINTEREST_MIN_IMAGES = 1
+_CROSS_POST_CONCURRENCY = 3  # parallel cross-post targets per publish run
 
 
 def _safe_int(value: Any, default: int) -> int:
@@ -87,7 +109,7 @@ class CrossPostResult:
 class PublishOutcome:
     """Result of auto-publish pipeline."""
 
-    status: str  # "ok", "error", "skipped"
+    status: str  # "ok", "error", "skipped", "retry" (resumable failure, job should be retried)
     reason: str = ""
     post_url: str = ""
     keyword: str = ""
@@ -99,6 +121,21 @@ class PublishOutcome:
     cross_post_results: list[CrossPostResult] = dataclasses_field(default_factory=list)
 
 
+@dataclass
+class PublishContext:
+    """Records one publish run works on, loaded and validated once by _load_context()."""
+
+    schedule: PlatformSchedule
+    user: User
+    category: Category
+    project: Project | None
+    connection: PlatformConnection
+    conn_repo: ConnectionsRepository
+    text_settings: dict[str, Any] = dataclasses_field(default_factory=dict)
+    image_settings: dict[str, Any] = dataclasses_field(default_factory=dict)
+    checkpoint: StageCheckpoints = dataclasses_field(default_factory=StageCheckpoints.disabled)
+
+
 class PublishService:
     """Auto-publish pipeline — called by QStash webhook handler."""
 
@@ -132,85 +169,53 @@ class PublishService:
         self._publications = PublicationsRepository(db)
         self._schedules = SchedulesRepository(db)
 
-    async def execute(self, payload: PublishPayload) -> PublishOutcome:
+    async def execute(self, payload: PublishPayload, *, run_key: str = "", can_retry: bool = False) -> PublishOutcome:
         """Execute auto-publish pipeline.
 
         Flow: check schedule (H13) -> load data -> check connection ->
         check keywords (E17) -> rotate keyword (E22/E23) ->
         check balance (E01) -> charge -> generate -> publish -> log -> return.
-        """
-        user_id = payload.user_id
 
-        # 0. Check schedule enabled (H13: QStash cron may fire after user disabled schedule)
-        schedule = await self._schedules.get_by_id(payload.schedule_id)
-        if not schedule or not schedule.enabled:
-            log.warning(
-                "schedule_disabled_or_missing",
-                schedule_id=payload.schedule_id,
-                user_id=user_id,
-            )
-            return PublishOutcome(status="skipped", reason="schedule_disabled", user_id=user_id)
-
-        # 1. Load user
-        user = await self._users.get_by_id(user_id)
-        if not user:
-            return PublishOutcome(status="error", reason="user_not_found", user_id=user_id)
-
-        # 2. Load category
-        category = await self._categories.get_by_id(payload.category_id)
-        if not category:
-            return PublishOutcome(
-                status="error",
-                reason="category_not_found",
-                user_id=user_id,
-                notify=user.notify_publications,
-            )
+        Runs inside request_scope(): repeated user/project/category lookups
+        (context load, cross-posts, notifications) hit the DB once per run.
 
-        # 2b. Load project (needed for settings fallback: project → category)
-        project = await self._projects.get_by_id(payload.project_id)
+        ``run_key`` enables stage checkpoints for articles (services/checkpoints.py):
+        a run with the same key resumes after the last completed stage. With
+        ``can_retry`` a failure after the article was checkpointed returns
+        status="retry" instead of logging an error, so the caller re-runs it.
+        """
+        with request_scope():
+            outcome = await self._execute(payload, run_key, can_retry)
+        if outcome.status != "skipped":
+            # Publication logs and disabled schedules change the dashboard snapshot
+            await dashboard_changed(payload.user_id)
+        return outcome
+
+    async def _execute(self, payload: PublishPayload, run_key: str = "", can_retry: bool = False) -> PublishOutcome:
+        user_id = payload.user_id
 
-        # Context for user-facing notifications
+        # 0-4. Load schedule, user, category, project, connection, settings (validated once)
+        loaded = await self._load_context(payload)
+        if isinstance(loaded, PublishOutcome):
+            return loaded
+        ctx = loaded
+        user, category, schedule = ctx.user, ctx.category, ctx.schedule
+        eff_image_settings = ctx.image_settings
         cat_name = category.name
-        proj_name = project.name if project else ""
-
-        # 3. Check keywords (E17: no keywords configured)
-        if not category.keywords:
-            log.warning("publish_no_keywords", category_id=payload.category_id, user_id=user_id)
-            return PublishOutcome(
-                status="error",
-                reason="no_keywords",
-                user_id=user_id,
-                notify=user.notify_publications,
-                category_name=cat_name,
-                project_name=proj_name,
-            )
-
-        # 4. Load connection
-        settings = get_settings()
-        cm = CredentialManager(settings.encryption_key.get_secret_value())
-        conn_repo = ConnectionsRepository(self._db, cm)
-        connection = await conn_repo.get_by_id(payload.connection_id)
-        if not connection or connection.status != "active":
-            return PublishOutcome(
-                status="error",
-                reason="connection_inactive",
-                user_id=user_id,
-                notify=user.notify_publications,
-                category_name=cat_name,
-                project_name=proj_name,
-            )
-
-        # 4b. Resolve effective settings: platform override → project defaults → empty
-        project_svc = ProjectService(self._db)
-        eff_text_settings, eff_image_settings = await project_svc.resolve_effective_settings(
-            payload.project_id, connection.platform_type,
-        )
+        proj_name = ctx.project.name if ctx.project else ""
 
         # 5. Rotate keyword (E22/E23: low pool warning)
         content_type = "article" if payload.platform_type == "wordpress" else "social_post"
-        keyword, low_pool = await self._publications.get_rotation_keyword(
-            payload.category_id, category.keywords, content_type
-        )
+        if content_type == "article" and run_key:
+            ctx.checkpoint = await StageCheckpoints.open(self._db, run_key)
+        saved_keyword = ctx.checkpoint.get(STAGE_KEYWORD)
+        if saved_keyword:
+            # Resumed run: keep the keyword the saved stages were generated for
+            keyword, low_pool = saved_keyword["keyword"], False
+        else:
+            keyword, low_pool = await self._publications.get_rotation_keyword(
+                payload.category_id, category.keywords, content_type
+            )
         if not keyword:
             # Try expanding keyword pool before giving up
             log.warning("publish_no_available_keyword_attempting_expand", category_id=payload.category_id)
@@ -219,7 +224,7 @@ class PublishService:
                 # Reload category after expansion
                 refreshed = await self._categories.get_by_id(payload.category_id)
                 if refreshed and refreshed.keywords:
-                    category = refreshed
+                    category = ctx.category = refreshed
                     keyword, low_pool = await self._publications.get_rotation_keyword(
                         payload.category_id, category.keywords, content_type
                     )
@@ -237,11 +242,12 @@ class PublishService:
                 project_name=proj_name,
             )
 
+        if not saved_keyword:
+            await ctx.checkpoint.save(STAGE_KEYWORD, {"keyword": keyword})
+
         if low_pool:
             log.warning("publish_low_keyword_pool", category_id=payload.category_id, keyword=keyword)
             # Fire-and-forget: expand keyword pool in background
-            import asyncio
-
             task = asyncio.create_task(self._try_expand_keywords(payload, category, user_id))
             task.add_done_callback(lambda t: t.result() if not t.cancelled() else None)
 
@@ -277,37 +283,112 @@ class PublishService:
         # 8-9. Generate, publish, charge on success (charge-after-result)
         return await self._publish_and_log(
             payload=payload,
-            user=user,
-            category=category,
-            connection=connection,
+            ctx=ctx,
             keyword=keyword,
             content_type=content_type,
             estimated_cost=estimated_cost,
-            schedule=schedule,
             cluster=cluster,
+            can_retry=can_retry,
+        )
+
+    async def _load_context(self, payload: PublishPayload) -> PublishContext | PublishOutcome:
+        """Load everything the pipeline needs and validate it in one place.
+
+        The schedule is checked first (H13: QStash cron may fire after user disabled
+        schedule); the remaining independent records are then fetched concurrently.
+        Returns a PublishOutcome instead of a context when the run must not proceed.
+        """
+        user_id = payload.user_id
+
+        schedule = await self._schedules.get_by_id(payload.schedule_id)
+        if not schedule or not schedule.enabled:
+            log.warning(
+                "schedule_disabled_or_missing",
+                schedule_id=payload.schedule_id,
+                user_id=user_id,
+            )
+            return PublishOutcome(status="skipped", reason="schedule_disabled", user_id=user_id)
+
+        settings = get_settings()
+        cm = get_credential_manager(settings.encryption_key.get_secret_value())
+        conn_repo = ConnectionsRepository(self._db, cm)
+        project_svc = ProjectService(self._db)
+
+        # Effective settings: platform override → project defaults → empty
+        user, category, project, connection, (text_settings, image_settings) = await asyncio.gather(
+            self._users.get_by_id(user_id),
+            self._categories.get_by_id(payload.category_id),
+            self._projects.get_by_id(payload.project_id),
+            conn_repo.get_by_id(payload.connection_id),
+            project_svc.resolve_effective_settings(payload.project_id, payload.platform_type),
+        )
+
+        if not user:
+            return PublishOutcome(status="error", reason="user_not_found", user_id=user_id)
+
+        notify = user.notify_publications
+        if not category or category.project_id != payload.project_id:
+            return PublishOutcome(status="error", reason="category_not_found", user_id=user_id, notify=notify)
+
+        cat_name = category.name
+        proj_name = project.name if project else ""
+        if project and project.user_id != user_id:
+            log.warning("publish_project_owner_mismatch", project_id=payload.project_id, user_id=user_id)
+            return PublishOutcome(status="error", reason="project_not_found", user_id=user_id)
+
+        # E17: no keywords configured
+        if not category.keywords:
+            log.warning("publish_no_keywords", category_id=payload.category_id, user_id=user_id)
+            return PublishOutcome(
+                status="error",
+                reason="no_keywords",
+                user_id=user_id,
+                notify=notify,
+                category_name=cat_name,
+                project_name=proj_name,
+            )
+
+        if not connection or connection.status != "active" or connection.project_id != payload.project_id:
+            return PublishOutcome(
+                status="error",
+                reason="connection_inactive",
+                user_id=user_id,
+                notify=notify,
+                category_name=cat_name,
+                project_name=proj_name,
+            )
+
+        if connection.platform_type != payload.platform_type:
+            text_settings, image_settings = await project_svc.resolve_effective_settings(
+                payload.project_id, connection.platform_type
+            )
+
+        return PublishContext(
+            schedule=schedule,
+            user=user,
+            category=category,
             project=project,
-            eff_text_settings=eff_text_settings,
-            eff_image_settings=eff_image_settings,
+            connection=connection,
+            conn_repo=conn_repo,
+            text_settings=text_settings,
+            image_settings=image_settings,
         )
 
     async def _publish_and_log(
         self,
         payload: PublishPayload,
-        user: Any,
-        category: Any,
-        connection: Any,
+        ctx: PublishContext,
         keyword: str,
         content_type: str,
         estimated_cost: int,
-        schedule: Any,
         cluster: dict[str, Any] | None = None,
-        project: Any = None,
-        eff_text_settings: dict[str, Any] | None = None,
-        eff_image_settings: dict[str, Any] | None = None,
+        can_retry: bool = False,
     ) -> PublishOutcome:
         """Generate content, publish, then charge on success (charge-after-result)."""
         user_id = payload.user_id
+        user, schedule = ctx.user, ctx.schedule
         charged = False
+        published = False
         actual_cost = 0
         try:
             gen_result, pub_result, failed_images = await self._generate_and_publish(
@@ -315,14 +396,17 @@ class PublishService:
                 project_id=payload.project_id,
                 category_id=payload.category_id,
                 keyword=keyword,
-                connection=connection,
+                connection=ctx.connection,
                 content_type=content_type,
-                category=category,
+                category=ctx.category,
                 cluster=cluster,
-                project=project,
-                eff_text_settings=eff_text_settings,
-                eff_image_settings=eff_image_settings,
+                project=ctx.project,
+                eff_text_settings=ctx.text_settings,
+                eff_image_settings=ctx.image_settings,
+                checkpoint=ctx.checkpoint,
             )
+            published = True
+            await self._finish_checkpoint(ctx.checkpoint)
 
             # E34: deduct cost for failed images (30 tokens per image)
             actual_cost = estimated_cost
@@ -379,13 +463,10 @@ class PublishService:
                     )
                 if lead_text:
                     cross_results = await self._execute_cross_posts(
-                        user_id=user_id,
-                        schedule=schedule,
+                        ctx=ctx,
                         keyword=keyword,
                         lead_text=lead_text,
                         lead_platform=payload.platform_type,
-                        project_id=payload.project_id,
-                        category_id=payload.category_id,
                     )
 
             total_cost = actual_cost + sum(cr.tokens_spent for cr in cross_results if cr.tokens_spent)
@@ -400,6 +481,12 @@ class PublishService:
             )
 
         except Exception as exc:
+            if can_retry and not published and STAGE_ARTICLE in ctx.checkpoint.stages:
+                # The article is checkpointed: a retry resumes at the failed stage, so this
+                # is not (yet) a failed publication — no error log, no schedule error counter
+                log.warning("publish_failed_resumable", user_id=user_id, keyword=keyword, exc_info=True)
+                return PublishOutcome(status="retry", reason=str(exc), keyword=keyword, user_id=user_id)
+
             log.exception("publish_generation_failed", user_id=user_id, keyword=keyword)
 
             # Track consecutive platform errors for schedule pause
@@ -451,6 +538,16 @@ class PublishService:
                 notify=user.notify_publications,
             )
 
+    async def _finish_checkpoint(self, checkpoint: StageCheckpoints) -> None:
+        """Drop a published run's checkpoints and release its Storage images."""
+        paths = image_storage_paths(checkpoint.get(STAGE_IMAGES))
+        await checkpoint.clear()
+        if paths:
+            try:
+                await self._image_storage.release(paths, checkpoint.run_key)
+            except Exception:
+                log.warning("checkpoint_images_cleanup_failed", paths=len(paths), exc_info=True)
+
     async def _mark_schedule_success(self, schedule_id: int, schedule_pk: int) -> None:
         """Update schedule last_post_at and reset error counter on success."""
         await self._schedules.update(
@@ -485,6 +582,7 @@ class PublishService:
         project: Any = None,
         eff_text_settings: dict[str, Any] | None = None,
         eff_image_settings: dict[str, Any] | None = None,
+        checkpoint: StageCheckpoints | None = None,
     ) -> tuple[Any, PublishResult, int]:
         """Generate content + images, then publish.
 
@@ -504,6 +602,7 @@ class PublishService:
                 project=project,
                 eff_text_settings=eff_text_settings,
                 eff_image_settings=eff_image_settings,
+                checkpoint=checkpoint,
             )
 
         return await self._generate_social_post(
@@ -530,12 +629,15 @@ class PublishService:
         project: Any = None,
         eff_text_settings: dict[str, Any] | None = None,
         eff_image_settings: dict[str, Any] | None = None,
+        checkpoint: StageCheckpoints | None = None,
     ) -> tuple[Any, PublishResult, int]:
         """Sequential article pipeline: websearch → text → Director → images (C1, C2, §7.4.2).
 
         Phase 1: Gather web research (Serper + Firecrawl + Perplexity) in parallel.
         Phase 2: Generate text (needs article for Director context).
         Phase 3: Image Director + Image Generation (Director needs article text).
+        Each phase output is saved to ``checkpoint``; phases already saved by a
+        previous attempt of the run are loaded instead of recomputed.
         Returns (gen_result, pub_result, failed_image_count).
         """
         from services.ai.articles import ArticleService
@@ -546,6 +648,7 @@ class PublishService:
         article_service = ArticleService(self._ai_orchestrator, self._db, skip_rate_limit=True)
         image_service = ImageService(self._ai_orchestrator)
         publisher = WordPressPublisher(self._http_client)
+        checkpoint = checkpoint or StageCheckpoints.disabled()
 
         # Resolve WP category (auto-map bot category → WP category)
         wp_category_id: int | None = None
@@ -560,7 +663,7 @@ class PublishService:
                 wp_category_id = await publisher.resolve_wp_category(base_url, auth, category.name)
                 if wp_category_id is not None:
                     settings = get_settings()
-                    cm = CredentialManager(settings.encryption_key.get_secret_value())
+                    cm = get_credential_manager(settings.encryption_key.get_secret_value())
                     conn_repo = ConnectionsRepository(self._db, cm)
                     await conn_repo.merge_metadata(
                         connection.id,
@@ -581,62 +684,24 @@ class PublishService:
             image_context["company_name"] = project.company_name or ""
             image_context["specialization"] = project.specialization or ""
 
-        # Phase 1: Gather web research data (C1 — Serper + Firecrawl + Perplexity)
-        project_url = project.website_url if project else None
-        # Use cached internal links from site analysis (PRD §7.1) if available
-        cached_links = (connection.metadata or {}).get("internal_links") if connection else None
-        websearch = await gather_websearch_data(
-            keyword=keyword,
-            project_url=project_url,
-            serper=self._serper,
-            firecrawl=self._firecrawl,
-            orchestrator=self._ai_orchestrator,
-            redis=self._redis,
-            specialization=(project.specialization or "") if project else "",
-            company_name=(project.company_name or "") if project else "",
-            geography=(project.company_city or "") if project else "",
-            company_description_short=((project.description or "")[:200]) if project else "",
-            internal_links_cache=cached_links,
-        )
-
-        # Data readiness gate: if all external sources failed, skip this slot
-        # (article quality will be too low without competitor/research data)
-        serper_empty = not websearch.get("serper_data") or not websearch["serper_data"].get("organic")
-        research_empty = not websearch.get("research_data")
-        if serper_empty and research_empty:
-            log.warning(
-                "publish_skipped_no_external_data",
-                keyword=keyword,
+        saved_article = checkpoint.get(STAGE_ARTICLE)
+        if saved_article:
+            # Resumed run: the article survived the failed attempt, skip Phases 1-2
+            text_result = GenerationResult(**saved_article)
+            log.info("article_resumed", keyword=keyword, user_id=user_id)
+        else:
+            text_result = await self._generate_article_text(
+                article_service,
+                checkpoint,
                 user_id=user_id,
-                has_serper=not serper_empty,
-                has_research=not research_empty,
-                reason="both_empty",
+                project_id=project_id,
+                category_id=category_id,
+                keyword=keyword,
+                connection=connection,
+                cluster=cluster,
+                project=project,
+                eff_text_settings=eff_text_settings,
             )
-            raise RuntimeError("External data unavailable (Serper + Research empty), skipping slot")
-
-        # Load previous keywords for anti-repetition in prompts
-        previous_keywords = await self._publications.get_recently_used_keywords(
-            category_id, content_type="article",
-        )
-
-        # Phase 2: Text generation (sequential — Director needs article text)
-        text_result = await article_service.generate(
-            user_id=user_id,
-            project_id=project_id,
-            category_id=category_id,
-            keyword=keyword,
-            cluster=cluster,
-            overrides=eff_text_settings,
-            serper_data=websearch["serper_data"],
-            competitor_pages=websearch["competitor_pages"],
-            competitor_analysis=websearch["competitor_analysis"],
-            competitor_gaps=websearch["competitor_gaps"],
-            internal_links=websearch.get("internal_links", ""),
-            research_data=websearch.get("research_data"),
-            news_data=websearch.get("news_data"),
-            autocomplete_suggestions=websearch.get("autocomplete_suggestions"),
-            previous_keywords=previous_keywords,
-        )
 
         # Extract text content
         content_markdown = ""
@@ -665,7 +730,7 @@ class PublishService:
         block_contexts_list: list[str] | None = None
         branding = None
         blocks = split_into_blocks(content_markdown) if content_markdown else []
-        if blocks and image_count > 0:
+        if blocks and image_count > 0 and STAGE_IMAGES not in checkpoint.stages:
             block_indices = distribute_images(blocks, image_count)
             block_contexts_list = extract_block_contexts(blocks, block_indices)
 
@@ -699,21 +764,16 @@ class PublishService:
                 log.info("image_director_narrative", visual_narrative=director_result.visual_narrative)
 
         # Generate images (with Director plans or mechanical fallback)
-        raw_images: list[bytes | BaseException] = []
-        failed_images = 0
-        try:
-            image_result_list = await image_service.generate(
-                user_id=user_id,
-                context=image_context,
-                count=image_count,
-                block_contexts=block_contexts_list,
-                director_plans=director_plans,
-            )
-            raw_images = [img.data for img in image_result_list]
-            failed_images = image_count - len(image_result_list)
-        except AIGenerationError:
-            log.warning("image_generation_failed", exc_info=True)
-            failed_images = image_count
+        article_images, failed_images, images_intact = await self._generate_article_images(
+            image_service,
+            checkpoint,
+            user_id=user_id,
+            project_id=project_id,
+            image_context=image_context,
+            image_count=image_count,
+            block_contexts=block_contexts_list,
+            director_plans=director_plans,
+        )
 
         # Validate images_meta before reconciliation (API_CONTRACTS.md §3.7)
         from services.ai.content_validator import ContentValidator
@@ -733,7 +793,7 @@ class PublishService:
         processed_md, uploads = reconcile_images(
             content_markdown=content_markdown,
             images_meta=images_meta,
-            generated_images=raw_images,
+            generated_images=article_images,
             title=title,
         )
 
@@ -761,6 +821,8 @@ class PublishService:
         # with real WP media URLs after upload (preview flow uses Supabase Storage
         # URLs; auto-publish skips Storage and passes placeholders directly).
         reconciled_urls = [f"{{{{RECONCILED_IMAGE_{i + 1}}}}}" for i in range(len(uploads))]
+        # WP media IDs map to images by index — unusable if a checkpointed image was lost
+        saved_media = checkpoint.get(STAGE_WP_MEDIA) if images_intact else None
 
         pub_result = await publisher.publish(
             PublishRequest(
@@ -777,15 +839,170 @@ class PublishService:
                     "focus_keyword": keyword,
                     "storage_urls": reconciled_urls,
                     **({"wp_category_id": wp_category_id} if wp_category_id else {}),
+                    # Media uploaded by a previous attempt (saved only together with its images)
+                    **({"wp_media": saved_media["media"]} if saved_media else {}),
                 },
             )
         )
 
         if not pub_result.success:
+            if pub_result.uploaded_media and STAGE_IMAGES in checkpoint.stages:
+                await checkpoint.save(STAGE_WP_MEDIA, {"media": pub_result.uploaded_media})
             raise RuntimeError(f"Publish failed: {pub_result.error}")
 
         return text_result, pub_result, failed_images
 
+    async def _generate_article_text(
+        self,
+        article_service: Any,
+        checkpoint: StageCheckpoints,
+        *,
+        user_id: int,
+        project_id: int,
+        category_id: int,
+        keyword: str,
+        connection: Any,
+        cluster: dict[str, Any] | None,
+        project: Any,
+        eff_text_settings: dict[str, Any] | None,
+    ) -> GenerationResult:
+        """Phases 1-2 of the article pipeline: websearch, then outline + article (checkpointed)."""
+        websearch = checkpoint.get(STAGE_WEBSEARCH)
+        if websearch is None:
+            # Phase 1: Gather web research data (C1 — Serper + Firecrawl + Perplexity)
+            project_url = project.website_url if project else None
+            # Use cached internal links from site analysis (PRD §7.1) if available
+            cached_links = (connection.metadata or {}).get("internal_links") if connection else None
+            websearch = await gather_websearch_data(
+                keyword=keyword,
+                project_url=project_url,
+                serper=self._serper,
+                firecrawl=self._firecrawl,
+                orchestrator=self._ai_orchestrator,
+                redis=self._redis,
+                specialization=(project.specialization or "") if project else "",
+                company_name=(project.company_name or "") if project else "",
+                geography=(project.company_city or "") if project else "",
+                company_description_short=((project.description or "")[:200]) if project else "",
+                internal_links_cache=cached_links,
+            )
+
+            # Data readiness gate: if all external sources failed, skip this slot
+            # (article quality will be too low without competitor/research data)
+            serper_empty = not websearch.get("serper_data") or not websearch["serper_data"].get("organic")
+            research_empty = not websearch.get("research_data")
+            if serper_empty and research_empty:
+                log.warning(
+                    "publish_skipped_no_external_data",
+                    keyword=keyword,
+                    user_id=user_id,
+                    has_serper=not serper_empty,
+                    has_research=not research_empty,
+                    reason="both_empty",
+                )
+                raise RuntimeError("External data unavailable (Serper + Research empty), skipping slot")
+            await checkpoint.save(STAGE_WEBSEARCH, websearch)
+
+        # Load previous keywords for anti-repetition in prompts
+        previous_keywords = await self._publications.get_recently_used_keywords(
+            category_id, content_type="article",
+        )
+
+        # Phase 2: Text generation (sequential — Director needs article text)
+        text_result = await article_service.generate(
+            user_id=user_id,
+            project_id=project_id,
+            category_id=category_id,
+            keyword=keyword,
+            cluster=cluster,
+            overrides=eff_text_settings,
+            serper_data=websearch["serper_data"],
+            competitor_pages=websearch["competitor_pages"],
+            competitor_analysis=websearch["competitor_analysis"],
+            competitor_gaps=websearch["competitor_gaps"],
+            internal_links=websearch.get("internal_links", ""),
+            research_data=websearch.get("research_data"),
+            news_data=websearch.get("news_data"),
+            autocomplete_suggestions=websearch.get("autocomplete_suggestions"),
+            previous_keywords=previous_keywords,
+            checkpoint=checkpoint,
+        )
+        await checkpoint.save(STAGE_ARTICLE, asdict(text_result))
+        return text_result
+
+    async def _generate_article_images(
+        self,
+        image_service: Any,
+        checkpoint: StageCheckpoints,
+        *,
+        user_id: int,
+        project_id: int,
+        image_context: dict[str, Any],
+        image_count: int,
+        block_contexts: list[str] | None,
+        director_plans: Any,
+    ) -> tuple[list[ConvertedImage | BaseException], int, bool]:
+        """Generate article images and checkpoint them, or load them from a previous attempt.
+
+        Each image is converted to WebP (and stored for the checkpoint) as soon
+        as it is generated, so only converted bytes are held while the rest of
+        the batch is still running.
+        Returns (images, failed_count, intact) in placeholder order — intact is
+        False when a checkpointed image could not be loaded back.
+        """
+        saved = checkpoint.get(STAGE_IMAGES)
+        if saved is not None:
+            loaded = await self._load_checkpoint_images(saved["paths"])
+            lost = sum(isinstance(img, BaseException) for img in loaded)
+            return loaded, saved["failed"] + lost, lost == 0
+
+        async def _convert_and_checkpoint(index: int, image: Any) -> tuple[ConvertedImage, str | None]:
+            converted = await convert_image(image.data)
+            if not checkpoint.run_key:
+                return converted, None
+            try:
+                # Only the path is checkpointed — no signed URL needed
+                path = await self._image_storage.store(
+                    converted.data, user_id, project_id, mime=f"image/{converted.ext}", holder=checkpoint.run_key
+                )
+            except Exception:
+                log.warning("checkpoint_images_upload_failed", user_id=user_id, index=index, exc_info=True)
+                return converted, None
+            return converted, path
+
+        ready: list[tuple[ConvertedImage, str | None]] = []
+        try:
+            results = await image_service.generate_pipeline(
+                user_id,
+                image_context,
+                _convert_and_checkpoint,
+                count=image_count,
+                block_contexts=block_contexts,
+                director_plans=director_plans,
+            )
+            ready = [r for r in results if isinstance(r, tuple)]
+        except AIGenerationError:
+            log.warning("image_generation_failed", exc_info=True)
+
+        images: list[ConvertedImage | BaseException] = [converted for converted, _ in ready]
+        failed_images = image_count - len(images)
+        paths = [path for _, path in ready]
+        # Checkpoint only a complete set: paths map to placeholders by position
+        if checkpoint.run_key and all(paths):
+            await checkpoint.save(STAGE_IMAGES, {"paths": paths, "failed": failed_images})
+        return images, failed_images, True
+
+    async def _load_checkpoint_images(self, paths: list[str]) -> list[ConvertedImage | BaseException]:
+        """Download checkpointed images; a missing object counts as a failed image (E34).
+
+        Checkpointed objects were converted before upload, so they are not converted again.
+        """
+        loaded = await asyncio.gather(*(self._image_storage.download(p) for p in paths), return_exceptions=True)
+        return [
+            img if isinstance(img, BaseException) else ConvertedImage(data=img, ext=path.rsplit(".", 1)[-1])
+            for img, path in zip(loaded, paths, strict=True)
+        ]
+
     async def _generate_social_post(
         self,
         user_id: int,
@@ -896,146 +1113,205 @@ class PublishService:
 
     async def _execute_cross_posts(
         self,
-        user_id: int,
-        schedule: Any,
+        ctx: PublishContext,
         keyword: str,
         lead_text: str,
         lead_platform: str,
-        project_id: int,
-        category_id: int,
     ) -> list[CrossPostResult]:
-        """Execute cross-posts for dependent connections after lead publish."""
+        """Execute cross-posts for dependent connections after lead publish.
+
+        Target connections are loaded in one query and one upfront charge
+        reserves tokens for every target the balance covers (targets beyond it
+        get "insufficient_balance"). The reserved targets' platforms are adapted
+        in one batched LLM call (SocialPostService.adapt_for_platforms), then
+        targets publish concurrently, at most _CROSS_POST_CONCURRENCY at a time;
+        failed ones are refunded together.
+        Results keep the order of cross_post_connection_ids.
+        """
         from services.ai.social_posts import SocialPostService
 
-        settings = get_settings()
-        cm = CredentialManager(settings.encryption_key.get_secret_value())
-        conn_repo = ConnectionsRepository(self._db, cm)
-        social_service = SocialPostService(self._ai_orchestrator, self._db, skip_rate_limit=True)
-        category = await self._categories.get_by_id(category_id)
-        results: list[CrossPostResult] = []
+        user_id = ctx.user.id
+        project_id = ctx.category.project_id
+        conn_ids = ctx.schedule.cross_post_connection_ids
+        connections = await ctx.conn_repo.get_by_ids(conn_ids)
+        results: list[CrossPostResult | None] = [None] * len(conn_ids)
 
-        for conn_id in schedule.cross_post_connection_ids:
-            conn = await conn_repo.get_by_id(conn_id)
-            # Verify connection exists, is active, and belongs to same project
+        # Verify connection exists, is active, and belongs to same project
+        targets: list[tuple[int, PlatformConnection]] = []
+        for pos, conn_id in enumerate(conn_ids):
+            conn = connections.get(conn_id)
             if not conn or conn.status != "active" or conn.project_id != project_id:
-                results.append(
-                    CrossPostResult(
-                        connection_id=conn_id,
-                        platform=conn.platform_type if conn else "unknown",
-                        status="error",
-                        error="connection_inactive",
-                    )
+                results[pos] = CrossPostResult(
+                    connection_id=conn_id,
+                    platform=conn.platform_type if conn else "unknown",
+                    status="error",
+                    error="connection_inactive",
                 )
-                continue
+            else:
+                targets.append((pos, conn))
 
-            cost = estimate_cross_post_cost()
-            if not await self._tokens.check_balance(user_id, cost):
-                results.append(
-                    CrossPostResult(
-                        connection_id=conn_id,
-                        platform=conn.platform_type,
-                        status="error",
-                        error="insufficient_balance",
-                    )
-                )
-                log.warning("cross_post_insufficient_balance", user_id=user_id, conn_id=conn_id)
-                break  # stop remaining cross-posts
+        cost = estimate_cross_post_cost()
+        reserved = await self._reserve_cross_posts(user_id, keyword, cost, len(targets))
+        for pos, conn in targets[reserved:]:
+            results[pos] = CrossPostResult(
+                connection_id=conn.id, platform=conn.platform_type, status="error", error="insufficient_balance"
+            )
+        targets = targets[:reserved]
 
+        # All target platforms are adapted in one batched LLM call
+        social_service = SocialPostService(self._ai_orchestrator, self._db, skip_rate_limit=True)
+        platforms = list(dict.fromkeys(conn.platform_type for _, conn in targets))
+        adapted: dict[str, GenerationResult | BaseException] = {}
+        if platforms:
             try:
-                adapted = await social_service.adapt_for_platform(
+                adapted = await social_service.adapt_for_platforms(
                     original_text=lead_text,
                     source_platform=lead_platform,
-                    target_platform=conn.platform_type,
+                    target_platforms=platforms,
                     user_id=user_id,
                     project_id=project_id,
                     keyword=keyword,
                 )
+            except Exception as exc:
+                adapted = dict.fromkeys(platforms, exc)
+        semaphore = asyncio.Semaphore(_CROSS_POST_CONCURRENCY)
 
-                adapted_text = ""
-                if isinstance(adapted.content, dict):
-                    adapted_text = adapted.content.get("text", "")
-
-                # Append hashtags for all social platforms (skip if AI already embedded them)
-                if isinstance(adapted.content, dict) and conn.platform_type in ("vk", "telegram", "pinterest"):
-                    hashtags = adapted.content.get("hashtags", [])
-                    if hashtags:
-                        tags_str = " ".join(f"#{h.lstrip('#')}" for h in hashtags)
-                        if tags_str not in adapted_text:
-                            adapted_text = f"{adapted_text}\n\n{tags_str}"
-
-                publisher = self._get_publisher(conn.platform_type, conn.id)
-                from services.ai.content_validator import ContentValidator
-
-                validator = ContentValidator()
-                validation = validator.validate(adapted_text, "social_post", conn.platform_type)
-                if not validation.is_valid:
-                    raise RuntimeError(f"Validation failed: {'; '.join(validation.errors)}")
-
-                ct: Literal["html", "telegram_html", "plain_text", "pin_text"] = self._get_content_type(
-                    conn.platform_type
-                )  # type: ignore[assignment]
-
-                # Build metadata for Pinterest
-                xp_metadata: dict[str, str] = {}
-                if conn.platform_type == "pinterest" and isinstance(adapted.content, dict):
-                    xp_metadata["pin_title"] = adapted.content.get("pin_title", "")[:100]
-
-                pub_result = await publisher.publish(
-                    PublishRequest(
-                        connection=conn,
-                        content=adapted_text,
-                        content_type=ct,
-                        category=category,
-                        metadata=xp_metadata,
-                    )
-                )
+        async def _run(conn: PlatformConnection) -> CrossPostResult:
+            async with semaphore:
+                return await self._cross_post_one(ctx, conn, adapted.get(conn.platform_type), keyword, cost)
 
-                if not pub_result.success:
-                    raise RuntimeError(f"Publish failed: {pub_result.error}")
+        done = await asyncio.gather(*(_run(conn) for _, conn in targets))
+        for (pos, _), result in zip(targets, done, strict=True):
+            results[pos] = result
 
-                # Charge AFTER successful cross-post (charge-after-result)
-                try:
-                    await self._tokens.charge(user_id, cost, "cross_post", description=f"Cross-post: {keyword}")
-                except Exception:
-                    log.warning("cross_post_charge_failed", user_id=user_id, conn_id=conn_id, cost=cost)
+        failed = sum(1 for r in done if r.status != "ok")
+        if failed and user_id not in self._admin_ids:
+            try:
+                await self._tokens.refund(
+                    user_id, cost * failed, description=f"Refund cross-post errors ({failed}): {keyword}"
+                )
+            except Exception:
+                log.exception("cross_post_refund_failed", user_id=user_id, amount=cost * failed)
+
+        return [r for r in results if r is not None]
+
+    async def _reserve_cross_posts(self, user_id: int, keyword: str, cost: int, count: int) -> int:
+        """Charge once for as many cross-posts as the balance covers. Returns the reserved count."""
+        if count == 0:
+            return 0
+        # fresh: the user row memoized at the start of this multi-minute run may be stale
+        balance = await self._tokens.get_balance(user_id, fresh=True)
+        affordable = min(count, balance // cost) if cost > 0 else count
+        if affordable < count:
+            log.warning("cross_post_insufficient_balance", user_id=user_id, targets=count, affordable=affordable)
+        if affordable == 0:
+            return 0
+        try:
+            await self._tokens.charge(
+                user_id, cost * affordable, "cross_post", description=f"Cross-posts ({affordable}): {keyword}"
+            )
+        except Exception:
+            # Balance changed since the read (concurrent spend) or the charge RPC failed
+            log.warning("cross_post_reservation_failed", user_id=user_id, amount=cost * affordable, exc_info=True)
+            return 0
+        return affordable
 
-                # Log cross-post publication
-                await self._publications.create_log(
-                    PublicationLogCreate(
-                        user_id=user_id,
-                        project_id=project_id,
-                        category_id=category_id,
-                        platform_type=conn.platform_type,
-                        connection_id=conn_id,
-                        keyword=keyword,
-                        content_type="cross_post",
-                        tokens_spent=cost,
-                        status="success",
-                        post_url=pub_result.post_url or "",
-                    )
+    async def _cross_post_one(
+        self,
+        ctx: PublishContext,
+        conn: PlatformConnection,
+        adapted: GenerationResult | BaseException | None,
+        keyword: str,
+        cost: int,
+    ) -> CrossPostResult:
+        """Publish one target's adapted text and log the outcome (tokens already reserved)."""
+        user_id = ctx.user.id
+        project_id = ctx.category.project_id
+        category_id = ctx.category.id
+        try:
+            if isinstance(adapted, BaseException):
+                raise adapted
+            if adapted is None:
+                raise RuntimeError(f"No adaptation for {conn.platform_type}")
+
+            adapted_text = ""
+            if isinstance(adapted.content, dict):
+                adapted_text = adapted.content.get("text", "")
+
+            # Append hashtags for all social platforms (skip if AI already embedded them)
+            if isinstance(adapted.content, dict) and conn.platform_type in ("vk", "telegram", "pinterest"):
+                hashtags = adapted.content.get("hashtags", [])
+                if hashtags:
+                    tags_str = " ".join(f"#{h.lstrip('#')}" for h in hashtags)
+                    if tags_str not in adapted_text:
+                        adapted_text = f"{adapted_text}\n\n{tags_str}"
+
+            publisher = self._get_publisher(conn.platform_type, conn.id)
+            from services.ai.content_validator import ContentValidator
+
+            validator = ContentValidator()
+            validation = validator.validate(adapted_text, "social_post", conn.platform_type)
+            if not validation.is_valid:
+                raise RuntimeError(f"Validation failed: {'; '.join(validation.errors)}")
+
+            ct: Literal["html", "telegram_html", "plain_text", "pin_text"] = self._get_content_type(
+                conn.platform_type
+            )  # type: ignore[assignment]
+
+            # Build metadata for Pinterest
+            xp_metadata: dict[str, str] = {}
+            if conn.platform_type == "pinterest" and isinstance(adapted.content, dict):
+                xp_metadata["pin_title"] = adapted.content.get("pin_title", "")[:100]
+
+            pub_result = await publisher.publish(
+                PublishRequest(
+                    connection=conn,
+                    content=adapted_text,
+                    content_type=ct,
+                    category=ctx.category,
+                    metadata=xp_metadata,
                 )
+            )
 
-                results.append(
-                    CrossPostResult(
-                        connection_id=conn_id,
-                        platform=conn.platform_type,
-                        status="ok",
-                        post_url=pub_result.post_url or "",
-                        tokens_spent=cost,
-                    )
+            if not pub_result.success:
+                raise RuntimeError(f"Publish failed: {pub_result.error}")
+
+            # Log cross-post publication
+            await self._publications.create_log(
+                PublicationLogCreate(
+                    user_id=user_id,
+                    project_id=project_id,
+                    category_id=category_id,
+                    platform_type=conn.platform_type,
+                    connection_id=conn.id,
+                    keyword=keyword,
+                    content_type="cross_post",
+                    tokens_spent=cost,
+                    status="success",
+                    post_url=pub_result.post_url or "",
                 )
+            )
 
-            except Exception as exc:
-                # No charge was made — no refund needed (charge-after-result)
-                log.exception("cross_post_failed", conn_id=conn_id, keyword=keyword)
+            return CrossPostResult(
+                connection_id=conn.id,
+                platform=conn.platform_type,
+                status="ok",
+                post_url=pub_result.post_url or "",
+                tokens_spent=cost,
+            )
+
+        except Exception as exc:
+            # Reserved tokens are refunded by the caller
+            log.exception("cross_post_failed", conn_id=conn.id, keyword=keyword)
 
+            try:
                 await self._publications.create_log(
                     PublicationLogCreate(
                         user_id=user_id,
                         project_id=project_id,
                         category_id=category_id,
                         platform_type=conn.platform_type,
-                        connection_id=conn_id,
+                        connection_id=conn.id,
                         keyword=keyword,
                         content_type="cross_post",
                         tokens_spent=0,
@@ -1043,17 +1319,15 @@ class PublishService:
                         error_message=str(exc)[:500],
                     )
                 )
+            except Exception:
+                log.exception("cross_post_error_log_failed", conn_id=conn.id)
 
-                results.append(
-                    CrossPostResult(
-                        connection_id=conn_id,
-                        platform=conn.platform_type,
-                        status="error",
-                        error=str(exc)[:200],
-                    )
-                )
-
-        return results
+            return CrossPostResult(
+                connection_id=conn.id,
+                platform=conn.platform_type,
+                status="error",
+                error=str(exc)[:200],
+            )
 
     @staticmethod
     def _extract_log_metadata(gen_result: Any) -> tuple[int, int | None]:
@@ -1130,12 +1404,23 @@ class PublishService:
         return make_token_refresh_cb(self._db, connection_id, enc_key)
 
     def _get_publisher(self, platform_type: str, connection_id: int = 0) -> Any:
-        """Get publisher instance for platform type with token refresh callback."""
-        from services.publishers.factory import create_publisher
+        """Get publisher instance for platform type with token refresh and metadata callbacks."""
+        from services.publishers.factory import create_publisher, make_metadata_update_cb
 
         settings = self._settings or get_settings()
         on_refresh = self._make_token_refresh_cb(connection_id) if connection_id else None
-        return create_publisher(platform_type, self._http_client, settings, on_token_refresh=on_refresh)
+        on_metadata = (
+            make_metadata_update_cb(self._db, connection_id, settings.encryption_key.get_secret_value())
+            if connection_id
+            else None
+        )
+        return create_publisher(
+            platform_type,
+            self._http_client,
+            settings,
+            on_token_refresh=on_refresh,
+            on_metadata_update=on_metadata,
+        )
 
     @staticmethod
     def _get_content_type(platform_type: str) -> str:
@@ -0,0 +1,358 @@
+"""Durable auto-publish queue and in-process worker pool.
+
+Zero dependencies on Telegram/Aiogram.
+
+POST /api/publish only enqueues a job and answers QStash at once; the article
+pipeline (300-400 s) runs here, outside any HTTP request. Each job is leased
+for ``lease_seconds`` and the lease is renewed by a heartbeat while the
+pipeline runs. If the process dies (deploy, OOM) the lease lapses and any
+replica re-claims the job — the visibility timeout. A heartbeat that finds
+the lease gone cancels the pipeline, so two replicas never run one job.
+
+Only a RetryableJobError (resumable failure, nothing published yet) is
+requeued, with exponential backoff until the job's max_attempts is spent.
+Any other exception is terminal: it may come after the post went out, and a
+retry would publish and charge twice.
+
+PublishJobsRepository (Postgres, publish_jobs) is the production queue;
+InMemoryPublishQueue is the local stand-in with the same semantics for tests
+and runs without a database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from itertools import count
+from typing import Any, Protocol
+
+import structlog
+
+from db.models import PublishJob
+from services.adaptive_limit import AdaptiveLimiter, LimiterGate
+
+log = structlog.get_logger()
+
+JobHandler = Callable[[PublishJob], Awaitable[dict[str, Any]]]
+
+
+class RetryableJobError(Exception):
+    """Raised by a JobHandler when the job may safely run again (nothing was published)."""
+
+
+class PublishJobQueue(Protocol):
+    """Storage contract shared by PublishJobsRepository and InMemoryPublishQueue."""
+
+    async def enqueue(
+        self, idempotency_key: str, payload: dict[str, Any], max_attempts: int = 3
+    ) -> PublishJob | None: ...
+
+    async def claim(self, worker_id: str, limit: int, lease_seconds: int) -> list[PublishJob]: ...
+
+    async def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int) -> bool: ...
+
+    async def complete(self, job_id: int, worker_id: str, result: dict[str, Any]) -> bool: ...
+
+    async def fail(self, job_id: int, worker_id: str, error: str, retry_in: int | None) -> bool: ...
+
+    async def release(self, job: PublishJob, worker_id: str) -> bool: ...
+
+
+def _now() -> datetime:
+    return datetime.now(tz=UTC)
+
+
+class InMemoryPublishQueue:
+    """Process-local PublishJobQueue with the same lease semantics as publish_jobs."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[int, PublishJob] = {}
+        self._keys: set[str] = set()
+        self._ids = count(1)
+
+    async def enqueue(self, idempotency_key: str, payload: dict[str, Any], max_attempts: int = 3) -> PublishJob | None:
+        if idempotency_key in self._keys:
+            return None
+        self._keys.add(idempotency_key)
+        now = _now()
+        job = PublishJob(
+            id=next(self._ids),
+            idempotency_key=idempotency_key,
+            payload=payload,
+            max_attempts=max_attempts,
+            available_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        self._jobs[job.id] = job
+        return job.model_copy()
+
+    async def claim(self, worker_id: str, limit: int, lease_seconds: int) -> list[PublishJob]:
+        now = _now()
+        due = [
+            job
+            for job in self._jobs.values()
+            if (job.status == "queued" and job.available_at is not None and job.available_at <= now)
+            or (job.status == "running" and job.lease_expires_at is not None and job.lease_expires_at < now)
+        ]
+        due.sort(key=lambda j: (j.available_at or now, j.id))
+        claimed: list[PublishJob] = []
+        for job in due[:limit]:
+            job.status = "running"
+            job.attempts += 1
+            job.lease_owner = worker_id
+            job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+            job.updated_at = now
+            claimed.append(job.model_copy())
+        return claimed
+
+    async def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int) -> bool:
+        job = self._leased(job_id, worker_id)
+        if job is None:
+            return False
+        job.lease_expires_at = _now() + timedelta(seconds=lease_seconds)
+        return True
+
+    async def complete(self, job_id: int, worker_id: str, result: dict[str, Any]) -> bool:
+        return self._settle(job_id, worker_id, status="done", result=result)
+
+    async def fail(self, job_id: int, worker_id: str, error: str, retry_in: int | None) -> bool:
+        if retry_in is None:
+            return self._settle(job_id, worker_id, status="failed", last_error=error)
+        return self._settle(
+            job_id,
+            worker_id,
+            status="queued",
+            last_error=error,
+            available_at=_now() + timedelta(seconds=retry_in),
+        )
+
+    async def release(self, job: PublishJob, worker_id: str) -> bool:
+        return self._settle(job.id, worker_id, status="queued", attempts=max(job.attempts - 1, 0), available_at=_now())
+
+    def get(self, job_id: int) -> PublishJob | None:
+        """Snapshot of a job (tests, local debugging)."""
+        job = self._jobs.get(job_id)
+        return job.model_copy() if job else None
+
+    def _leased(self, job_id: int, worker_id: str) -> PublishJob | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != "running" or job.lease_owner != worker_id:
+            return None
+        return job
+
+    def _settle(self, job_id: int, worker_id: str, **fields: Any) -> bool:
+        job = self._leased(job_id, worker_id)
+        if job is None:
+            return False
+        for name, value in fields.items():
+            setattr(job, name, value)
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.updated_at = _now()
+        return True
+
+
+def _default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class PublishWorkerPool:
+    """Claims publish jobs and runs as many of them at once as its gate allows.
+
+    One dispatcher task leases as many jobs as there are free slots, then
+    sleeps until a slot frees up, notify() is called (a job was just
+    enqueued in this process) or ``poll_interval`` passes (jobs enqueued by
+    other replicas, retries becoming due, expired leases).
+
+    With a LimiterGate the slot count follows the process AdaptiveLimiter and
+    each job's duration feeds it back; without one it is a fixed ``concurrency``.
+    """
+
+    def __init__(
+        self,
+        queue: PublishJobQueue,
+        handler: JobHandler,
+        *,
+        concurrency: int = 10,
+        gate: LimiterGate | None = None,
+        lease_seconds: int = 120,
+        heartbeat_interval: float | None = None,
+        poll_interval: float = 5.0,
+        retry_base_delay: int = 60,
+        retry_max_delay: int = 900,
+        worker_id: str | None = None,
+    ) -> None:
+        self._queue = queue
+        self._handler = handler
+        if gate is None:
+            fixed = max(1, concurrency)
+            gate = AdaptiveLimiter(fixed, min_limit=fixed, max_limit=fixed).gate("publish", latency_signal=False)
+        self._gate = gate
+        self._lease_seconds = lease_seconds
+        self._heartbeat_interval = heartbeat_interval if heartbeat_interval is not None else lease_seconds / 3
+        self._poll_interval = poll_interval
+        self._retry_base_delay = retry_base_delay
+        self._retry_max_delay = retry_max_delay
+        self.worker_id = worker_id or _default_worker_id()
+        self._running: dict[int, asyncio.Task[None]] = {}
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._completed = 0
+        self._retried = 0
+        self._failed = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    def start(self) -> None:
+        """Start the dispatcher (idempotent)."""
+        if self._dispatcher is None:
+            self._stopping = False
+            self._dispatcher = asyncio.create_task(self._dispatch_loop(), name="publish_dispatcher")
+            log.info("publish_workers_started", worker_id=self.worker_id, concurrency=self._gate.limit)
+
+    def notify(self) -> None:
+        """Wake the dispatcher now instead of at the next poll."""
+        self._wake.set()
+
+    def retry_delay(self, attempt: int) -> int:
+        """Backoff before the next attempt: base * 2^(attempt-1), capped."""
+        return min(self._retry_base_delay * 2 ** max(attempt - 1, 0), self._retry_max_delay)
+
+    async def stop(self, timeout: float) -> None:
+        """Stop claiming, give in-flight jobs ``timeout`` seconds, then release the rest.
+
+        Released jobs go back to the queue without consuming an attempt, so
+        the next replica picks them up right away.
+        """
+        self._stopping = True
+        self._wake.set()
+        if self._dispatcher is not None:
+            await self._dispatcher
+            self._dispatcher = None
+        tasks = list(self._running.values())
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            log.warning("publish_workers_drain_timeout", released=len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for /api/health."""
+        return {
+            "worker_id": self.worker_id,
+            "concurrency": self._gate.limit,
+            "in_flight": len(self._running),
+            "completed": self._completed,
+            "retried": self._retried,
+            "failed": self._failed,
+        }
+
+    async def _dispatch_loop(self) -> None:
+        while not self._stopping:
+            self._wake.clear()
+            free = self._gate.available
+            jobs: list[PublishJob] = []
+            if free > 0:
+                try:
+                    jobs = await self._queue.claim(self.worker_id, free, self._lease_seconds)
+                except Exception:
+                    log.warning("publish_queue_claim_failed", exc_info=True)
+            for job in jobs:
+                self._gate.acquire_nowait()
+                task = asyncio.create_task(self._run(job), name=f"publish_job_{job.id}")
+                self._running[job.id] = task
+                task.add_done_callback(lambda _t, job_id=job.id: self._on_done(job_id))
+            if jobs and len(jobs) == free:
+                continue  # Filled every slot — there may be more due jobs
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(self._poll_interval):
+                    await self._wake.wait()
+
+    def _on_done(self, job_id: int) -> None:
+        self._running.pop(job_id, None)
+        self._wake.set()
+
+    async def _run(self, job: PublishJob) -> None:
+        latency: float | None = None
+        timed_out = False
+        try:
+            latency, timed_out = await self._execute(job)
+        finally:
+            # Only clean runs and timeouts say something about this replica's capacity
+            self._gate.release(latency, ok=not timed_out)
+
+    async def _execute(self, job: PublishJob) -> tuple[float | None, bool]:
+        """Run one job. Returns (duration if it succeeded, whether it timed out)."""
+        if job.attempts > job.max_attempts:
+            # Lease expired on the last attempt (worker killed mid-run) — do not start again
+            await self._settle(self._queue.fail(job.id, self.worker_id, "lease_expired", None), job)
+            self._failed += 1
+            log.error("publish_job_exhausted", job_id=job.id, attempts=job.attempts)
+            return None, False
+
+        # The handler runs as a child task so a lost lease can cancel just the pipeline
+        handler = asyncio.ensure_future(self._handler(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, handler))
+        started = time.monotonic()
+        try:
+            result = await handler
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled():
+                # Lease lost: the job belongs to another worker now — do not settle it
+                self._failed += 1
+                log.error("publish_job_abandoned", job_id=job.id, attempts=job.attempts)
+                return None, False
+            with contextlib.suppress(Exception):
+                await self._queue.release(job, self.worker_id)
+            raise
+        except Exception as exc:
+            retryable = isinstance(exc, RetryableJobError) and job.attempts < job.max_attempts
+            retry_in = self.retry_delay(job.attempts) if retryable else None
+            await self._settle(self._queue.fail(job.id, self.worker_id, repr(exc)[:500], retry_in), job)
+            if retry_in is None:
+                self._failed += 1
+                log.exception("publish_job_failed", job_id=job.id, attempts=job.attempts)
+            else:
+                self._retried += 1
+                log.warning("publish_job_retry", job_id=job.id, attempts=job.attempts, retry_in=retry_in, exc_info=True)
+            return None, isinstance(exc, TimeoutError)
+        else:
+            latency = time.monotonic() - started
+            await self._settle(self._queue.complete(job.id, self.worker_id, result), job)
+            self._completed += 1
+            return latency, False
+        finally:
+            heartbeat.cancel()
+
+    async def _settle(self, op: Awaitable[bool], job: PublishJob) -> None:
+        try:
+            if not await op:
+                log.warning("publish_job_lease_lost", job_id=job.id)
+        except Exception:
+            # Lease lapses and the job is re-claimed — at-least-once, never lost
+            log.warning("publish_job_settle_failed", job_id=job.id, exc_info=True)
+
+    async def _heartbeat(self, job: PublishJob, handler: asyncio.Future[dict[str, Any]]) -> None:
+        """Renew the lease; if it is gone, cancel the handler and return."""
+        while True:
+            await asyncio.sleep(self._heartbeat_interval)
+            try:
+                if not await self._queue.heartbeat(job.id, self.worker_id, self._lease_seconds):
+                    log.warning("publish_job_lease_lost", job_id=job.id)
+                    handler.cancel()
+                    return
+            except Exception:
+                log.warning("publish_job_heartbeat_failed", job_id=job.id, exc_info=True)
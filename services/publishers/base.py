@@ -18,6 +18,10 @@ TokenRefreshCallback = Callable[
     Coroutine[Any, Any, None],
 ]
 
+# Callback type for publishers that cache lookups in connection metadata
+# (keys are merged into platform_connections.metadata)
+MetadataUpdateCallback = Callable[[dict[str, Any]], Coroutine[Any, Any, None]]
+
 
 @dataclass(frozen=True, slots=True)
 class PublishRequest:
@@ -41,6 +45,9 @@ class PublishResult:
     post_url: str | None = None
     platform_post_id: str | None = None
     error: str | None = None
+    # WordPress: media already uploaded ({"id", "url"} per image, in order).
+    # Set on failure too, so a retry can pass it back as metadata["wp_media"].
+    uploaded_media: list[dict[str, Any]] = field(default_factory=list)
 
 
 class BasePublisher(ABC):
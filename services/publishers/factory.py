@@ -11,7 +11,7 @@ from typing import Any, Protocol
 import httpx
 from pydantic import SecretStr
 
-from .base import BasePublisher, TokenRefreshCallback
+from .base import BasePublisher, MetadataUpdateCallback, TokenRefreshCallback
 
 
 class PublisherSettings(Protocol):
@@ -27,6 +27,7 @@ def create_publisher(
     http_client: httpx.AsyncClient,
     settings: PublisherSettings,
     on_token_refresh: TokenRefreshCallback | None = None,
+    on_metadata_update: MetadataUpdateCallback | None = None,
 ) -> BasePublisher:
     """Create publisher for platform with proper credentials from settings."""
     from .pinterest import PinterestPublisher
@@ -44,6 +45,7 @@ def create_publisher(
                 http_client,
                 vk_app_id=settings.vk_app_id,
                 on_token_refresh=on_token_refresh,
+                on_metadata_update=on_metadata_update,
             )
         case "pinterest":
             return PinterestPublisher(
@@ -65,11 +67,28 @@ def make_token_refresh_cb(
     """Build callback to persist refreshed OAuth credentials in DB."""
 
     async def _cb(_old_creds: dict[str, Any], new_creds: dict[str, Any]) -> None:
-        from db.credential_manager import CredentialManager
+        from db.credential_manager import get_credential_manager
         from db.repositories.connections import ConnectionsRepository
 
-        cm = CredentialManager(enc_key)
+        cm = get_credential_manager(enc_key)
         repo = ConnectionsRepository(db, cm)
         await repo.update_credentials(connection_id, new_creds)
 
     return _cb
+
+
+def make_metadata_update_cb(
+    db: Any,
+    connection_id: int,
+    enc_key: str,
+) -> MetadataUpdateCallback:
+    """Build callback to merge publisher-cached keys into connection metadata."""
+
+    async def _cb(extra: dict[str, Any]) -> None:
+        from db.credential_manager import get_credential_manager
+        from db.repositories.connections import ConnectionsRepository
+
+        repo = ConnectionsRepository(db, get_credential_manager(enc_key))
+        await repo.merge_metadata(connection_id, extra)
+
+    return _cb
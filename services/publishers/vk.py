@@ -13,10 +13,19 @@ Dual-mode:
 - Group: owner_id=-{group_id}, photo upload with group_id
 - Personal: owner_id={user_vk_id} or omitted, photo upload without group_id
   Detected via creds.get("target") == "personal"
+
+Photo upload: wall upload server first (user tokens, one photo per request),
+album upload as fallback (community tokens). The album path uploads up to
+_VK_MAX_PHOTOS files in one multipart request and saves them with one
+photos.save. Once it worked for a group, the album id is cached in connection
+metadata (vk_albums) and later posts go straight to it; upload-server URLs are
+reused for _UPLOAD_URL_TTL. A cached 4-image post is upload + save + wall.post.
 """
 
 from __future__ import annotations
 
+import hashlib
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -25,7 +34,7 @@ import structlog
 
 from db.models import PlatformConnection
 
-from .base import BasePublisher, PublishRequest, PublishResult, TokenRefreshCallback
+from .base import BasePublisher, MetadataUpdateCallback, PublishRequest, PublishResult, TokenRefreshCallback
 
 log = structlog.get_logger()
 
@@ -34,6 +43,12 @@ VK_API_VERSION = "5.199"
 _VK_TEXT_LIMIT = 16384
 _VK_TOKEN_URL = "https://id.vk.ru/oauth2/auth"  # noqa: S105
 _REFRESH_THRESHOLD = timedelta(minutes=5)
+_VK_MAX_PHOTOS = 5  # album upload server accepts file1..file5 per request
+_UPLOAD_URL_TTL = 600.0  # seconds an upload-server URL is reused
+_ALBUM_TITLE = "SEO Bot"
+
+# Upload-server URLs shared by publisher instances: key → (url, monotonic expiry)
+_upload_urls: dict[tuple[str, ...], tuple[str, float]] = {}
 
 
 class VKPublisher(BasePublisher):
@@ -44,10 +59,12 @@ class VKPublisher(BasePublisher):
         http_client: httpx.AsyncClient,
         vk_app_id: int = 0,
         on_token_refresh: TokenRefreshCallback | None = None,
+        on_metadata_update: MetadataUpdateCallback | None = None,
     ) -> None:
         self._client = http_client
         self._app_id = vk_app_id
         self._on_token_refresh = on_token_refresh
+        self._on_metadata_update = on_metadata_update
 
     # ------------------------------------------------------------------
     # token refresh (pattern: PinterestPublisher)
@@ -191,80 +208,170 @@ class VKPublisher(BasePublisher):
             log.error("vk_publish_error", error=str(exc))
             return PublishResult(success=False, error=str(exc))
 
-    async def _upload_photo_wall(
+    async def _get_upload_url(
         self,
         token: str,
-        group_id: str,
-        image_data: bytes,
-    ) -> str | None:
-        """Upload photo via photos.getWallUploadServer (user tokens).
-
-        Returns attachment string like 'photo-123_456' or None on failure.
-        When group_id is empty (personal page), omit group_id from API calls.
+        method: str,
+        params: dict[str, Any],
+        *,
+        fresh: bool = False,
+    ) -> tuple[str, bool] | None:
+        """Upload-server URL for method, reused for _UPLOAD_URL_TTL.
+
+        Returns (url, from_cache) or None if VK refused to issue one.
         """
-        params: dict[str, str] = {"access_token": token, "v": VK_API_VERSION}
-        if group_id:
-            params["group_id"] = group_id
+        digest = hashlib.sha256(token.encode()).hexdigest()[:16]
+        key = (digest, method, *(f"{k}={v}" for k, v in sorted(params.items())))
+        now = time.monotonic()
+        cached = _upload_urls.get(key)
+        if cached and not fresh and cached[1] > now:
+            return cached[0], True
+
         resp = await self._client.post(
-            f"{VK_API_URL}/photos.getWallUploadServer",
-            data=params,
+            f"{VK_API_URL}/{method}",
+            data={"access_token": token, **params, "v": VK_API_VERSION},
             timeout=15,
         )
         server_data = resp.json()
         if "error" in server_data:
+            _upload_urls.pop(key, None)
+            log.warning(
+                "vk_upload_server_failed",
+                method=method,
+                error_code=server_data["error"].get("error_code"),
+                error_msg=server_data["error"].get("error_msg", ""),
+            )
+            return None
+
+        for stale in [k for k, (_, expires) in _upload_urls.items() if expires <= now]:
+            del _upload_urls[stale]
+        url = str(server_data["response"]["upload_url"])
+        _upload_urls[key] = (url, now + _UPLOAD_URL_TTL)
+        return url, False
+
+    async def _upload_files(
+        self,
+        token: str,
+        method: str,
+        params: dict[str, Any],
+        files: dict[str, tuple[str, bytes, str]],
+        result_field: str,
+    ) -> dict[str, Any] | None:
+        """POST files to the upload server; a cached URL that stopped working is refreshed once."""
+        server = await self._get_upload_url(token, method, params)
+        if server is None:
+            return None
+        upload_url, from_cache = server
+        upload_data = await self._post_upload(upload_url, files)
+        if upload_data.get(result_field):
+            return upload_data
+        if not from_cache:
+            return None
+
+        log.info("vk_upload_url_expired", method=method)
+        server = await self._get_upload_url(token, method, params, fresh=True)
+        if server is None:
             return None
-        upload_url = server_data["response"]["upload_url"]
-        return await self._upload_and_save_wall(token, group_id, upload_url, image_data)
+        upload_data = await self._post_upload(server[0], files)
+        return upload_data if upload_data.get(result_field) else None
 
-    async def _upload_photo_album(
+    async def _post_upload(self, upload_url: str, files: dict[str, tuple[str, bytes, str]]) -> dict[str, Any]:
+        """POST multipart files to an upload server. Non-JSON replies (expired URL) count as empty."""
+        upload_resp = await self._client.post(upload_url, files=files, timeout=30)
+        try:
+            data = upload_resp.json()
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    async def _upload_photos_wall(
         self,
         token: str,
         group_id: str,
-        image_data: bytes,
-    ) -> str | None:
-        """Upload photo via album (community token fallback).
+        images: list[bytes],
+    ) -> list[str]:
+        """Upload photos via photos.getWallUploadServer (user tokens).
+
+        The wall upload server takes one photo per request and
+        photos.saveWallPhoto saves one upload, so each image costs two calls
+        (the server URL is reused). Returns attachment strings like
+        'photo-123_456'; stops at the first failure.
+        When group_id is empty (personal page), omit group_id from API calls.
+        """
+        params: dict[str, Any] = {"group_id": group_id} if group_id else {}
+        attachments: list[str] = []
+        for image_data in images:
+            upload_data = await self._upload_files(
+                token,
+                "photos.getWallUploadServer",
+                params,
+                {"photo": ("image.png", image_data, "image/png")},
+                "photo",
+            )
+            if upload_data is None:
+                break
 
-        Creates/reuses a hidden album, uploads photo there.
-        Returns attachment string like 'photo-123_456' or None on failure.
+            save_resp = await self._client.post(
+                f"{VK_API_URL}/photos.saveWallPhoto",
+                data={
+                    "access_token": token,
+                    "photo": upload_data["photo"],
+                    "server": upload_data.get("server", ""),
+                    "hash": upload_data.get("hash", ""),
+                    "v": VK_API_VERSION,
+                    **params,
+                },
+                timeout=15,
+            )
+            save_data = save_resp.json()
+            if "error" in save_data:
+                break
+            photo = save_data["response"][0]
+            attachments.append(f"photo{photo['owner_id']}_{photo['id']}")
+        return attachments
+
+    async def _upload_photos_album(
+        self,
+        token: str,
+        group_id: str,
+        images: list[bytes],
+        albums: dict[str, int],
+    ) -> list[str]:
+        """Upload photos into the bot album (community token fallback).
+
+        All images go to the upload server in one multipart request
+        (file1..file5) and are saved with one photos.save call. The album id
+        comes from ``albums`` (connection metadata) when cached; a newly
+        resolved one is persisted via on_metadata_update.
         Skipped for personal pages (empty group_id).
         """
         if not group_id:
-            return None
-        # Get or create album for bot uploads
-        album_id = await self._get_or_create_album(token, group_id)
-        if not album_id:
-            return None
+            return []
+        files = {
+            f"file{i}": (f"image{i}.png", data, "image/png") for i, data in enumerate(images[:_VK_MAX_PHOTOS], 1)
+        }
 
-        resp = await self._client.post(
-            f"{VK_API_URL}/photos.getUploadServer",
-            data={
-                "access_token": token,
-                "album_id": album_id,
-                "group_id": group_id,
-                "v": VK_API_VERSION,
-            },
-            timeout=15,
+        album_id = albums.get(str(group_id))
+        cached_album = album_id is not None
+        if album_id is None:
+            album_id = await self._get_or_create_album(token, group_id)
+            if not album_id:
+                return []
+        upload_data = await self._upload_files(
+            token, "photos.getUploadServer", {"album_id": album_id, "group_id": group_id}, files, "photos_list"
         )
-        server_data = resp.json()
-        if "error" in server_data:
-            log.warning(
-                "vk_album_upload_server_failed",
-                error_code=server_data["error"].get("error_code"),
-                error_msg=server_data["error"].get("error_msg", ""),
+        if upload_data is None and cached_album:
+            # Cached album may have been deleted in VK — look it up again
+            album_id = await self._get_or_create_album(token, group_id)
+            cached_album = False
+            if not album_id:
+                return []
+            upload_data = await self._upload_files(
+                token, "photos.getUploadServer", {"album_id": album_id, "group_id": group_id}, files, "photos_list"
             )
-            return None
-
-        upload_url = server_data["response"]["upload_url"]
-
-        # Upload file
-        upload_resp = await self._client.post(
-            upload_url,
-            files={"file1": ("image.png", image_data, "image/png")},
-            timeout=30,
-        )
-        upload_data = upload_resp.json()
+        if upload_data is None:
+            return []
 
-        # Save photo
         save_resp = await self._client.post(
             f"{VK_API_URL}/photos.save",
             data={
@@ -285,10 +392,20 @@ class VKPublisher(BasePublisher):
                 error_code=save_data["error"].get("error_code"),
                 error_msg=save_data["error"].get("error_msg", ""),
             )
-            return None
+            return []
+
+        if not cached_album:
+            await self._remember_album(albums, group_id, album_id)
+        return [f"photo{photo['owner_id']}_{photo['id']}" for photo in save_data["response"]]
 
-        photo = save_data["response"][0]
-        return f"photo{photo['owner_id']}_{photo['id']}"
+    async def _remember_album(self, albums: dict[str, int], group_id: str, album_id: int) -> None:
+        """Cache the group's album id in connection metadata (best-effort)."""
+        if self._on_metadata_update is None:
+            return
+        try:
+            await self._on_metadata_update({"vk_albums": {**albums, str(group_id): album_id}})
+        except Exception:
+            log.warning("vk_album_cache_save_failed", group_id=group_id, exc_info=True)
 
     async def _get_or_create_album(self, token: str, group_id: str) -> int | None:
         """Get or create a hidden album for bot photo uploads."""
@@ -301,7 +418,7 @@ class VKPublisher(BasePublisher):
         albums_data = resp.json()
         if "response" in albums_data:
             for album in albums_data["response"].get("items", []):
-                if album.get("title") == "SEO Bot":
+                if album.get("title") == _ALBUM_TITLE:
                     return int(album["id"])
 
         # Create new album
@@ -310,7 +427,7 @@ class VKPublisher(BasePublisher):
             data={
                 "access_token": token,
                 "group_id": group_id,
-                "title": "SEO Bot",
+                "title": _ALBUM_TITLE,
                 "upload_by_admins_only": 1,
                 "comments_disabled": 1,
                 "v": VK_API_VERSION,
@@ -327,42 +444,6 @@ class VKPublisher(BasePublisher):
             return None
         return int(create_data["response"]["id"])
 
-    async def _upload_and_save_wall(
-        self,
-        token: str,
-        group_id: str,
-        upload_url: str,
-        image_data: bytes,
-    ) -> str | None:
-        """Upload file to VK server and save as wall photo."""
-        upload_resp = await self._client.post(
-            upload_url,
-            files={"photo": ("image.png", image_data, "image/png")},
-            timeout=30,
-        )
-        upload_data = upload_resp.json()
-
-        save_params: dict[str, Any] = {
-            "access_token": token,
-            "photo": upload_data["photo"],
-            "server": upload_data["server"],
-            "hash": upload_data["hash"],
-            "v": VK_API_VERSION,
-        }
-        if group_id:
-            save_params["group_id"] = group_id
-
-        save_resp = await self._client.post(
-            f"{VK_API_URL}/photos.saveWallPhoto",
-            data=save_params,
-            timeout=15,
-        )
-        save_data = save_resp.json()
-        if "error" in save_data:
-            return None
-        photo = save_data["response"][0]
-        return f"photo{photo['owner_id']}_{photo['id']}"
-
     async def _do_publish(
         self,
         request: PublishRequest,
@@ -373,21 +454,26 @@ class VKPublisher(BasePublisher):
         """Execute the actual VK publish flow."""
         attachments: list[str] = []
 
-        # 1. Upload photo: try wall upload first, fallback to album upload
+        # 1. Upload photos: wall upload first, fallback to album upload
         if request.images:
-            image_data = request.images[0]
+            images = request.images[:_VK_MAX_PHOTOS]
+            albums: dict[str, int] = dict((request.connection.metadata or {}).get("vk_albums") or {})
+            album_known = bool(group_id) and str(group_id) in albums
 
-            # Try wall upload (works with user tokens)
-            attachment = await self._upload_photo_wall(token, group_id, image_data)
+            if album_known:
+                # Album upload worked for this group before — wall upload would fail again
+                attachments = await self._upload_photos_album(token, group_id, images, albums)
 
-            if not attachment and group_id:
+            if not attachments:
+                # Works with user tokens
+                attachments = await self._upload_photos_wall(token, group_id, images)
+
+            if not attachments and group_id and not album_known:
                 # Fallback: album upload (works with community tokens, not for personal pages)
                 log.info("vk_trying_album_upload", group_id=group_id)
-                attachment = await self._upload_photo_album(token, group_id, image_data)
+                attachments = await self._upload_photos_album(token, group_id, images, albums)
 
-            if attachment:
-                attachments.append(attachment)
-            else:
+            if not attachments:
                 log.warning("vk_all_photo_uploads_failed", group_id=group_id or "personal")
 
         # 2. Publish wall post
@@ -4,20 +4,36 @@ Source of truth: docs/API_CONTRACTS.md section 3.3.
 Edge cases: E02 (WP unavailable).
 Write idempotency (CR-78a): no retry on POST/create operations
 (retry could duplicate posts/media). Only connection-level errors are retried.
+Each site runs through its own provider guard ("wordpress:<host>"): bounded
+concurrent publishes per host, fast-fail while the host's circuit is open.
+Images are uploaded concurrently (at most _MEDIA_UPLOAD_CONCURRENCY per
+publish), with alt text and caption sent as query args of the upload itself
+instead of a second POST per image. Media uploaded before a failure is
+reported in PublishResult.uploaded_media ({"index", "id", "url"}); passing it
+back as metadata["wp_media"] reuses those attachments instead of uploading
+duplicates.
 """
 
 from __future__ import annotations
 
+import asyncio
+import time
+from typing import Any
+from urllib.parse import urlparse
+
 import httpx
 import structlog
 
 from db.models import PlatformConnection
 from services.ai.markdown_renderer import slugify
+from services.http_retry import get_provider_guard
 
 from .base import BasePublisher, PublishRequest, PublishResult
 
 log = structlog.get_logger()
 
+_MEDIA_UPLOAD_CONCURRENCY = 3
+
 
 class WordPressPublisher(BasePublisher):
     """WP REST API v2. Authorization: Application Password (Basic Auth)."""
@@ -33,6 +49,10 @@ class WordPressPublisher(BasePublisher):
     def _base_url(creds: dict[str, str]) -> str:
         return creds["url"].rstrip("/") + "/wp-json/wp/v2"
 
+    @staticmethod
+    def _guard_name(creds: dict[str, str]) -> str:
+        return f"wordpress:{urlparse(creds['url']).netloc.lower()}"
+
     @staticmethod
     def _auth(creds: dict[str, str]) -> httpx.BasicAuth:
         return httpx.BasicAuth(creds["login"], creds["app_password"])
@@ -60,68 +80,43 @@ class WordPressPublisher(BasePublisher):
         creds = request.connection.credentials
         base = self._base_url(creds)
         auth = self._auth(creds)
+        # Media from a previous attempt; entries without "index" predate concurrent uploads (positional)
+        uploaded: list[dict[str, Any]] = [
+            {**media, "index": media.get("index", pos)}
+            for pos, media in enumerate(request.metadata.get("wp_media") or [])
+        ]
 
         try:
-            return await self._do_publish(request, base, auth)
+            return await get_provider_guard(self._guard_name(creds)).call(
+                lambda: self._do_publish(request, base, auth, uploaded)
+            )
         except httpx.HTTPStatusError as exc:
             log.error(
                 "wordpress_publish_failed",
                 status=exc.response.status_code,
                 body=exc.response.text[:500],
             )
-            return PublishResult(success=False, error=str(exc))
+            return PublishResult(success=False, error=str(exc), uploaded_media=uploaded)
         except httpx.HTTPError as exc:
             log.error("wordpress_publish_error", error=str(exc))
-            return PublishResult(success=False, error=str(exc))
+            return PublishResult(success=False, error=str(exc), uploaded_media=uploaded)
 
     async def _do_publish(
         self,
         request: PublishRequest,
         base: str,
         auth: httpx.BasicAuth,
+        uploaded: list[dict[str, Any]],
     ) -> PublishResult:
-        """Execute the actual WP publish flow (called inside retry_with_backoff)."""
-        # 1. Upload images -> attachment IDs (with SEO metadata from images_meta)
-        attachment_ids: list[int] = []
-        wp_media_urls: list[str] = []
-        for i, img_bytes in enumerate(request.images):
-            meta = request.images_meta[i] if i < len(request.images_meta) else {}
-            raw_filename = meta.get("filename", f"image-{i}")
-            # Avoid double extension — reconciliation already adds .webp/.png
-            if not raw_filename.lower().endswith((".webp", ".png")):
-                raw_filename = f"{raw_filename}.webp"
-            filename = raw_filename
-            alt_text = meta.get("alt", "")
-            mime = "image/webp" if img_bytes[:4] == b"RIFF" else "image/png"
+        """Execute the actual WP publish flow (called inside the host's provider guard).
 
-            resp = await self._client.post(
-                f"{base}/media",
-                content=img_bytes,
-                auth=auth,
-                headers={
-                    "Content-Type": mime,
-                    "Content-Disposition": f'attachment; filename="{filename}"',
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            media_json = resp.json()
-            media_id = media_json["id"]
-            media_url = media_json.get("source_url", "")
-
-            # Update alt_text and caption via WP REST (Image SEO)
-            if alt_text or meta.get("figcaption"):
-                await self._client.post(
-                    f"{base}/media/{media_id}",
-                    json={
-                        "alt_text": alt_text,
-                        "caption": meta.get("figcaption", ""),
-                    },
-                    auth=auth,
-                    timeout=15,
-                )
-            attachment_ids.append(media_id)
-            wp_media_urls.append(media_url)
+        ``uploaded`` holds media from a previous attempt (reused by image index)
+        and is extended in place as new media is uploaded.
+        """
+        # 1. Upload images -> attachment IDs (with SEO metadata from images_meta)
+        media = await self._upload_media(request, base, auth, uploaded)
+        attachment_ids = [m["id"] for m in media]
+        wp_media_urls = [m.get("url", "") for m in media]
 
         # 2. Replace Supabase Storage URLs in content with WP media URLs
         content = request.content
@@ -154,7 +149,86 @@ class WordPressPublisher(BasePublisher):
             success=True,
             post_url=post["link"],
             platform_post_id=str(post["id"]),
+            uploaded_media=list(uploaded),
+        )
+
+    async def _upload_media(
+        self,
+        request: PublishRequest,
+        base: str,
+        auth: httpx.BasicAuth,
+        uploaded: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Upload every image not in ``uploaded``, at most _MEDIA_UPLOAD_CONCURRENCY at a time.
+
+        All started uploads are allowed to finish even if one fails, so the
+        successful ones are recorded in ``uploaded`` for the retry; the first
+        error is raised afterwards. Returns media in image order.
+        """
+        done = {m["index"]: m for m in uploaded}
+        pending = [i for i in range(len(request.images)) if i not in done]
+        if pending:
+            semaphore = asyncio.Semaphore(_MEDIA_UPLOAD_CONCURRENCY)
+
+            async def _upload(index: int) -> None:
+                async with semaphore:
+                    item = await self._upload_one(request, index, base, auth)
+                uploaded.append(item)
+                done[index] = item
+
+            started = time.monotonic()
+            results = await asyncio.gather(*(_upload(i) for i in pending), return_exceptions=True)
+            log.info(
+                "wp_media_upload_done",
+                uploaded=len(pending),
+                reused=len(request.images) - len(pending),
+                elapsed_ms=int((time.monotonic() - started) * 1000),
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return [done[i] for i in range(len(request.images))]
+
+    async def _upload_one(
+        self, request: PublishRequest, index: int, base: str, auth: httpx.BasicAuth
+    ) -> dict[str, Any]:
+        """POST one image to /media; alt text and caption go with the upload as query args."""
+        img_bytes = request.images[index]
+        meta = request.images_meta[index] if index < len(request.images_meta) else {}
+        filename = meta.get("filename", f"image-{index}")
+        # Avoid double extension — reconciliation already adds .webp/.png
+        if not filename.lower().endswith((".webp", ".png")):
+            filename = f"{filename}.webp"
+        mime = "image/webp" if img_bytes[:4] == b"RIFF" else "image/png"
+        # Image SEO: WP REST applies alt_text/caption args on create (no second POST /media/{id})
+        params: dict[str, str] = {}
+        if meta.get("alt"):
+            params["alt_text"] = meta["alt"]
+        if meta.get("figcaption"):
+            params["caption"] = meta["figcaption"]
+
+        started = time.monotonic()
+        resp = await self._client.post(
+            f"{base}/media",
+            content=img_bytes,
+            params=params,
+            auth=auth,
+            headers={
+                "Content-Type": mime,
+                "Content-Disposition": f'attachment; filename="{filename}"',
+            },
+            timeout=30,
+        )
+        resp.raise_for_status()
+        media_json = resp.json()
+        log.info(
+            "wp_media_uploaded",
+            index=index,
+            media_id=media_json["id"],
+            size=len(img_bytes),
+            elapsed_ms=int((time.monotonic() - started) * 1000),
         )
+        return {"index": index, "id": media_json["id"], "url": media_json.get("source_url", "")}
 
     async def resolve_wp_category(
         self, base_url: str, auth: httpx.BasicAuth, category_name: str
@@ -9,15 +9,15 @@ from __future__ import annotations
 
 import asyncio
 import json
-import random
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import asdict, dataclass
 
 import structlog
-from qstash import QStash
+from qstash import AsyncQStash
 
 from bot.exceptions import ScheduleError
 from db.client import SupabaseClient
-from db.credential_manager import CredentialManager
+from db.credential_manager import get_credential_manager
 from db.models import (
     Category,
     PlatformConnection,
@@ -30,6 +30,17 @@ from db.repositories.categories import CategoriesRepository
 from db.repositories.connections import ConnectionsRepository
 from db.repositories.projects import ProjectsRepository
 from db.repositories.schedules import SchedulesRepository
+from services.dashboard import dashboard_changed
+from services.slot_placement import (
+    DEFAULT_TOLERANCE,
+    add_load,
+    parse_slot,
+    peak,
+    place_minute,
+    place_slots,
+    slot_dows,
+    utc_offset_minutes,
+)
 from services.tokens import estimate_article_cost, estimate_social_post_cost
 
 log = structlog.get_logger()
@@ -39,6 +50,9 @@ _DAY_MAP = {"mon": "1", "tue": "2", "wed": "3", "thu": "4", "fri": "5", "sat": "
 
 _SOCIAL_PLATFORM_TYPES = {"telegram", "vk", "pinterest"}
 
+_QSTASH_CONCURRENCY = 8  # parallel schedule create/delete calls per process
+_BATCH_IDS = 200  # IDs per in_() lookup — keeps PostgREST URLs short
+
 
 @dataclass(frozen=True, slots=True)
 class SchedulerContext:
@@ -74,6 +88,19 @@ class UpdateCrosspostResult:
     has_other_social: bool
 
 
+@dataclass(frozen=True, slots=True)
+class RebalanceReport:
+    """Outcome of re-placing all enabled schedules (peak = max slots in one minute)."""
+
+    schedules: int
+    slots: int
+    moved: int
+    failed: int
+    peak_before: int
+    peak_after: int
+    applied: bool
+
+
 class SchedulerService:
     """Manages QStash cron schedules and scheduler UI data loading."""
 
@@ -83,36 +110,58 @@ class SchedulerService:
         qstash_token: str,
         base_url: str,
         encryption_key: str = "",
+        slot_tolerance: int = DEFAULT_TOLERANCE,
     ) -> None:
         self._db = db
-        self._qstash = QStash(token=qstash_token)
+        self._qstash = AsyncQStash(token=qstash_token)
+        # Shared by create and delete: bulk cancels must not flood the QStash API
+        self._qstash_semaphore = asyncio.Semaphore(_QSTASH_CONCURRENCY)
         self._base_url = base_url.rstrip("/")
         self._encryption_key = encryption_key
+        self._slot_tolerance = slot_tolerance
         self._schedules = SchedulesRepository(db)
 
+    async def slot_histogram(self) -> Counter[int]:
+        """Load of all enabled schedules per UTC minute of the week (empty if unavailable)."""
+        try:
+            return Counter(await self._schedules.get_slot_histogram())
+        except Exception:
+            log.warning("publish_slot_histogram_failed", exc_info=True)
+            return Counter()
+
+    async def place_slots(self, schedule: PlatformSchedule, timezone: str) -> list[int]:
+        """Least-loaded cron minute (local minute of day) for each time slot."""
+        histogram = await self.slot_histogram()
+        return place_slots(histogram, schedule.schedule_days, schedule.schedule_times, timezone, self._slot_tolerance)
+
     async def create_qstash_schedules(
         self,
         schedule: PlatformSchedule,
         user_id: int,
         project_id: int,
         timezone: str,
+        minutes: list[int] | None = None,
     ) -> list[str]:
-        """Create QStash cron schedules for each time slot.
+        """Create QStash cron schedules for each time slot (concurrently, bounded).
 
         Returns list of QStash schedule IDs.
         Cron format: CRON_TZ={timezone} {min} {hour} * * {days}
-        On partial failure, cleans up already-created schedules before raising.
+        minutes: placed minute of day per slot (see place_slots); placed here if omitted.
+        Slot IDs are deterministic (pub-{schedule.id}-{n}-{minute}): a retry upserts instead
+        of duplicating, and on partial failure every new slot ID is deleted — including a
+        create that timed out after QStash had already stored it — before raising.
+        IDs already recorded on the schedule are live and never compensated.
         """
-        schedule_ids: list[str] = []
         days_cron = ",".join(_DAY_MAP.get(d, d) for d in schedule.schedule_days) if schedule.schedule_days else "*"
+        if minutes is None:
+            minutes = await self.place_slots(schedule, timezone)
 
-        for time_slot in schedule.schedule_times:
-            hour, minute = time_slot.split(":")
-            # Add jitter +-5 min to spread QStash triggers and avoid thundering herd
-            jitter = random.randint(-5, 5)  # noqa: S311
-            actual_minute = (int(minute) + jitter) % 60
-            cron = f"CRON_TZ={timezone} {actual_minute} {int(hour)} * * {days_cron}"
+        slots: list[tuple[str, str, str]] = []
+        for n, (time_slot, minute) in enumerate(zip(schedule.schedule_times, minutes, strict=True)):
+            cron = f"CRON_TZ={timezone} {minute % 60} {minute // 60} * * {days_cron}"
+            slots.append((f"pub-{schedule.id}-{n}-{minute}", time_slot, cron))
 
+        async def _create(slot_id: str, time_slot: str, cron: str) -> str:
             body = {
                 "schedule_id": schedule.id,
                 "category_id": schedule.category_id,
@@ -122,41 +171,47 @@ class SchedulerService:
                 "project_id": project_id,
                 "idempotency_key": f"pub_{schedule.id}_{time_slot}",
             }
-
-            try:
-                result = await asyncio.to_thread(
-                    self._qstash.schedule.create,
+            async with self._qstash_semaphore:
+                result = await self._qstash.schedule.create(
                     destination=f"{self._base_url}/api/publish",
                     cron=cron,
                     body=json.dumps(body),
                     headers={"Content-Type": "application/json"},
+                    schedule_id=slot_id,
                 )
-                sid = str(getattr(result, "schedule_id", None) or result)
-                schedule_ids.append(sid)
-                log.info(
-                    "qstash_schedule_created",
-                    schedule_id=schedule.id,
-                    qstash_id=sid,
-                    cron=cron,
-                )
-            except Exception as exc:
-                log.exception("qstash_schedule_create_failed", schedule_id=schedule.id, cron=cron)
-                # Clean up already-created schedules on partial failure
-                if schedule_ids:
-                    await self.delete_qstash_schedules(schedule_ids)
-                raise ScheduleError(message=f"Failed to create QStash schedule: {cron}") from exc
-
-        return schedule_ids
+            sid = str(getattr(result, "schedule_id", None) or result)
+            log.info("qstash_schedule_created", schedule_id=schedule.id, qstash_id=sid, cron=cron)
+            return sid
+
+        results = await asyncio.gather(*(_create(*slot) for slot in slots), return_exceptions=True)
+
+        failed = [(slot, r) for slot, r in zip(slots, results, strict=True) if isinstance(r, BaseException)]
+        if failed:
+            for (_, _, cron), exc in failed:
+                log.error("qstash_schedule_create_failed", schedule_id=schedule.id, cron=cron, exc_info=exc)
+            # Compensate: drop created slots and any create whose outcome is unknown
+            created = [r for r in results if isinstance(r, str)]
+            live = set(schedule.qstash_schedule_ids)
+            orphans = dict.fromkeys([*created, *(slot[0] for slot, _ in failed)])
+            await self.delete_qstash_schedules([sid for sid in orphans if sid not in live])
+            (_, _, cron), exc = failed[0]
+            raise ScheduleError(message=f"Failed to create QStash schedule: {cron}") from exc
+
+        return [r for r in results if isinstance(r, str)]
 
     async def delete_qstash_schedules(self, schedule_ids: list[str]) -> None:
-        """Delete QStash schedules. Ignores 404 (already deleted)."""
-        for sid in schedule_ids:
+        """Delete QStash schedules concurrently (bounded). Ignores 404 (already deleted)."""
+
+        async def _delete(sid: str) -> None:
             try:
-                await asyncio.to_thread(self._qstash.schedule.delete, sid)
+                async with self._qstash_semaphore:
+                    await self._qstash.schedule.delete(sid)
                 log.info("qstash_schedule_deleted", qstash_id=sid)
             except Exception:
                 log.warning("qstash_schedule_delete_failed", qstash_id=sid, exc_info=True)
 
+        await asyncio.gather(*(_delete(sid) for sid in schedule_ids))
+
     async def toggle_schedule(
         self,
         schedule_id: int,
@@ -172,31 +227,31 @@ class SchedulerService:
 
         if enabled and not schedule.enabled:
             # Create QStash schedules
-            qstash_ids = await self.create_qstash_schedules(schedule, user_id, project_id, timezone)
-            return await self._schedules.update(
+            minutes = await self.place_slots(schedule, timezone)
+            qstash_ids = await self.create_qstash_schedules(schedule, user_id, project_id, timezone, minutes)
+            updated = await self._schedules.update(
                 schedule_id,
-                PlatformScheduleUpdate(enabled=True, qstash_schedule_ids=qstash_ids, status="active"),
+                PlatformScheduleUpdate(
+                    enabled=True, qstash_schedule_ids=qstash_ids, slot_minutes=minutes, status="active"
+                ),
             )
         elif not enabled and schedule.enabled:
             # Delete QStash schedules
             await self.delete_qstash_schedules(schedule.qstash_schedule_ids)
-            return await self._schedules.update(
+            updated = await self._schedules.update(
                 schedule_id,
                 PlatformScheduleUpdate(enabled=False, qstash_schedule_ids=[], status="active"),
             )
+        else:
+            return schedule
 
-        return schedule
+        await dashboard_changed(user_id)
+        return updated
 
     async def cancel_schedules_for_category(self, category_id: int) -> None:
         """Cancel all QStash schedules for a category (E24)."""
         schedules = await self._schedules.get_by_category(category_id)
-        for s in schedules:
-            if s.qstash_schedule_ids:
-                await self.delete_qstash_schedules(s.qstash_schedule_ids)
-                await self._schedules.update(
-                    s.id,
-                    PlatformScheduleUpdate(qstash_schedule_ids=[], enabled=False),
-                )
+        await self._cancel_schedules(schedules)
         log.info("schedules_cancelled_for_category", category_id=category_id, count=len(schedules))
 
     async def cancel_schedules_for_project(self, project_id: int) -> None:
@@ -206,27 +261,28 @@ class SchedulerService:
         if not cat_ids:
             return
         schedules = await self._schedules.get_by_project(cat_ids)
-        for s in schedules:
-            if s.qstash_schedule_ids:
-                await self.delete_qstash_schedules(s.qstash_schedule_ids)
-                await self._schedules.update(
-                    s.id,
-                    PlatformScheduleUpdate(qstash_schedule_ids=[], enabled=False),
-                )
+        await self._cancel_schedules(schedules)
         log.info("schedules_cancelled_for_project", project_id=project_id, count=len(schedules))
 
     async def cancel_schedules_for_connection(self, connection_id: int) -> None:
         """Cancel all QStash schedules for a connection."""
         schedules = await self._schedules.get_by_connection(connection_id)
-        for s in schedules:
-            if s.qstash_schedule_ids:
-                await self.delete_qstash_schedules(s.qstash_schedule_ids)
-                await self._schedules.update(
-                    s.id,
-                    PlatformScheduleUpdate(qstash_schedule_ids=[], enabled=False),
-                )
+        await self._cancel_schedules(schedules)
         log.info("schedules_cancelled_for_connection", connection_id=connection_id, count=len(schedules))
 
+    async def _cancel_schedules(self, schedules: list[PlatformSchedule]) -> None:
+        """Bulk cancel: one bounded batch of QStash deletes, then disable the rows."""
+        active = [s for s in schedules if s.qstash_schedule_ids]
+        if not active:
+            return
+        await self.delete_qstash_schedules([sid for s in active for sid in s.qstash_schedule_ids])
+        await asyncio.gather(
+            *(
+                self._schedules.update(s.id, PlatformScheduleUpdate(qstash_schedule_ids=[], enabled=False))
+                for s in active
+            )
+        )
+
     async def create_schedule(
         self,
         category_id: int,
@@ -252,7 +308,8 @@ class SchedulerService:
         )
 
         try:
-            qstash_ids = await self.create_qstash_schedules(db_schedule, user_id, project_id, timezone)
+            minutes = await self.place_slots(db_schedule, timezone)
+            qstash_ids = await self.create_qstash_schedules(db_schedule, user_id, project_id, timezone, minutes)
         except Exception:
             # Clean up orphaned DB row if QStash creation fails
             log.exception("qstash_schedule_creation_failed", schedule_id=db_schedule.id)
@@ -260,8 +317,9 @@ class SchedulerService:
             raise
         updated = await self._schedules.update(
             db_schedule.id,
-            PlatformScheduleUpdate(enabled=True, qstash_schedule_ids=qstash_ids, status="active"),
+            PlatformScheduleUpdate(enabled=True, qstash_schedule_ids=qstash_ids, slot_minutes=minutes, status="active"),
         )
+        await dashboard_changed(user_id)
         return updated or db_schedule
 
     async def delete_schedule(self, schedule_id: int) -> bool:
@@ -273,6 +331,92 @@ class SchedulerService:
             await self.delete_qstash_schedules(schedule.qstash_schedule_ids)
         return await self._schedules.delete(schedule_id)
 
+    async def rebalance_slots(self, *, apply: bool = False) -> RebalanceReport:
+        """Re-place every enabled schedule's slots to flatten the per-minute load.
+
+        Greedy over all schedules (most slot-days first): each slot goes to the
+        least-loaded minute within tolerance of its requested time, keeping its
+        current minute on ties. With apply=True, moved schedules are re-created in
+        QStash (new IDs first, then old ones deleted) and slot_minutes saved.
+        Schedules without slot_minutes (placed by the old random jitter) are
+        always re-created so their real cron minute becomes known.
+        """
+        schedules = await self._schedules.get_enabled()
+        cat_ids = sorted({s.category_id for s in schedules})
+        categories: dict[int, Category] = {}
+        for i in range(0, len(cat_ids), _BATCH_IDS):
+            batch = await CategoriesRepository(self._db).get_by_ids(cat_ids[i : i + _BATCH_IDS])
+            categories.update((c.id, c) for c in batch)
+        proj_ids = sorted({c.project_id for c in categories.values()})
+        projects: dict[int, Project] = {}
+        for i in range(0, len(proj_ids), _BATCH_IDS):
+            batch = await ProjectsRepository(self._db).get_by_ids(proj_ids[i : i + _BATCH_IDS])
+            projects.update((p.id, p) for p in batch)
+
+        plans: list[tuple[PlatformSchedule, Project, list[int], int, list[int]]] = []
+        before: Counter[int] = Counter()
+        for s in schedules:
+            cat = categories.get(s.category_id)
+            project = projects.get(cat.project_id) if cat else None
+            if not project or not s.schedule_times:
+                continue
+            dows = slot_dows(s.schedule_days)
+            offset = utc_offset_minutes(project.timezone or "UTC")
+            current = (
+                list(s.slot_minutes)
+                if len(s.slot_minutes) == len(s.schedule_times)
+                else [parse_slot(t) for t in s.schedule_times]
+            )
+            for minute in current:
+                add_load(before, dows, minute, offset)
+            plans.append((s, project, dows, offset, current))
+
+        after: Counter[int] = Counter()
+        moves: list[tuple[PlatformSchedule, Project, list[int]]] = []
+        for s, project, dows, offset, current in sorted(
+            plans, key=lambda p: (-len(p[2]) * len(p[0].schedule_times), p[0].id)
+        ):
+            placed: list[int] = []
+            for time_slot, minute in zip(s.schedule_times, current, strict=True):
+                new = place_minute(after, dows, parse_slot(time_slot), offset, self._slot_tolerance, prefer=minute)
+                add_load(after, dows, new, offset)
+                placed.append(new)
+            if placed != s.slot_minutes:
+                moves.append((s, project, placed))
+
+        failed = 0
+        if apply:
+            semaphore = asyncio.Semaphore(_QSTASH_CONCURRENCY)
+
+            async def _move(s: PlatformSchedule, project: Project, minutes: list[int]) -> bool:
+                async with semaphore:
+                    try:
+                        ids = await self.create_qstash_schedules(
+                            s, project.user_id, project.id, project.timezone or "UTC", minutes
+                        )
+                    except ScheduleError:
+                        return False  # old slots are untouched and still live
+                    await self.delete_qstash_schedules([sid for sid in s.qstash_schedule_ids if sid not in ids])
+                    await self._schedules.update(
+                        s.id, PlatformScheduleUpdate(qstash_schedule_ids=ids, slot_minutes=minutes)
+                    )
+                    return True
+
+            results = await asyncio.gather(*(_move(*m) for m in moves))
+            failed = results.count(False)
+
+        report = RebalanceReport(
+            schedules=len(plans),
+            slots=sum(len(p[0].schedule_times) for p in plans),
+            moved=len(moves) - failed,
+            failed=failed,
+            peak_before=peak(before),
+            peak_after=peak(after),
+            applied=apply,
+        )
+        log.info("publish_slots_rebalanced", **asdict(report))
+        return report
+
     @staticmethod
     def estimate_weekly_cost(days: int, posts_per_day: int, platform_type: str) -> int:
         """Estimate weekly token cost for a schedule."""
@@ -303,7 +447,7 @@ class SchedulerService:
 
     def _conn_repo(self) -> ConnectionsRepository:
         """Create ConnectionsRepository with CredentialManager."""
-        cm = CredentialManager(self._encryption_key)
+        cm = get_credential_manager(self._encryption_key)
         return ConnectionsRepository(self._db, cm)
 
     @staticmethod
@@ -458,6 +602,7 @@ class SchedulerService:
         for s in existing:
             if s.connection_id == conn_id:
                 await self.delete_schedule(s.id)
+        await dashboard_changed(user_id)
         return True
 
     async def has_active_schedule(self, cat_id: int, conn_id: int) -> bool:
@@ -335,6 +335,7 @@ def diff_against_snapshot(all_urls: list[str], snapshot: set[str]) -> list[str]:
 async def crawl_bamboodom(
     redis: Any,
     *,
+    http_client: httpx.AsyncClient,
     site: str = DEFAULT_SITE,
     sitemap_url: str = DEFAULT_BLOG_SITEMAP,
 ) -> CrawlResult:
@@ -348,27 +349,26 @@ async def crawl_bamboodom(
     api_key = settings.bamboodom_blog_key.get_secret_value()
 
     result = CrawlResult()
-    async with httpx.AsyncClient(timeout=_DEFAULT_TIMEOUT, follow_redirects=True) as client:
-        # Канал 1: blog_list
-        if api_key and api_base:
-            bl_urls, total, bl_errs = await _fetch_blog_list(client, api_base, api_key)
-            if bl_errs:
-                result.errors.extend(bl_errs)
-                result.blog_list_failed = True
-            result.blog_list_count = len(bl_urls)
-            if total is not None:
-                result.total_in_blog = total
-        else:
-            bl_urls = []
+    # Канал 1: blog_list
+    if api_key and api_base:
+        bl_urls, total, bl_errs = await _fetch_blog_list(http_client, api_base, api_key)
+        if bl_errs:
+            result.errors.extend(bl_errs)
             result.blog_list_failed = True
-            result.errors.append("blog_list: BAMBOODOM_BLOG_KEY/API_BASE не настроены")
-
-        # Канал 2: sitemap_blog.xml
-        sm_urls, sm_errs = await _crawl_sitemap(client, sitemap_url, site)
-        if sm_errs:
-            result.errors.extend(sm_errs)
-            result.sitemap_failed = True
-        result.sitemap_count = len(sm_urls)
+        result.blog_list_count = len(bl_urls)
+        if total is not None:
+            result.total_in_blog = total
+    else:
+        bl_urls = []
+        result.blog_list_failed = True
+        result.errors.append("blog_list: BAMBOODOM_BLOG_KEY/API_BASE не настроены")
+
+    # Канал 2: sitemap_blog.xml
+    sm_urls, sm_errs = await _crawl_sitemap(http_client, sitemap_url, site)
+    if sm_errs:
+        result.errors.extend(sm_errs)
+        result.sitemap_failed = True
+    result.sitemap_count = len(sm_urls)
 
     # Дедуп с приоритетом blog_list (он каноничнее)
     seen: set[str] = set()
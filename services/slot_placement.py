@@ -0,0 +1,116 @@
+"""Load-aware placement of auto-publish cron minutes (ARCHITECTURE.md §5.10).
+
+Zero dependencies on Telegram/Aiogram.
+
+Users pick round times (09:00, 12:00), so thousands of schedules fire in the
+same minute and every replica's publish pool is flooded at once. Instead of a
+blind ±5 min jitter, each slot goes to the least-loaded minute within
+`tolerance` of the requested time, judged by a histogram of all enabled
+schedules.
+
+The histogram is keyed by UTC minute of the week (0 = Sunday 00:00 UTC):
+one slot adds 1 to every weekday it runs on, shifted by the project's
+current UTC offset. The same mapping is computed in SQL by
+publish_slot_histogram() (migration 20261018050000).
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DEFAULT_TOLERANCE = 5  # minutes either side of the requested time
+
+# Cron DOW numbering (API_CONTRACTS.md §1.8): sun = 0
+_DOW = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+
+
+def utc_offset_minutes(timezone: str, at: datetime | None = None) -> int:
+    """Current UTC offset of an IANA timezone in minutes (0 for unknown zones)."""
+    try:
+        zone = ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):  # fmt: skip
+        return 0
+    offset = (at or datetime.now(tz=UTC)).astimezone(zone).utcoffset()
+    return int(offset.total_seconds() // 60) if offset else 0
+
+
+def parse_slot(time_slot: str) -> int:
+    """'HH:MM' → minute of the day."""
+    hour, minute = time_slot.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def slot_dows(days: Iterable[str]) -> list[int]:
+    """schedule_days → cron weekday numbers; no days means every day (cron '*')."""
+    dows = sorted({_DOW[d] for d in days if d in _DOW})
+    return dows or list(range(7))
+
+
+def week_minutes(dows: Iterable[int], minute: int, offset: int) -> list[int]:
+    """UTC minutes of the week at which a local slot fires."""
+    return [(dow * MINUTES_PER_DAY + minute - offset) % MINUTES_PER_WEEK for dow in dows]
+
+
+def add_load(histogram: Counter[int], dows: Iterable[int], minute: int, offset: int) -> None:
+    histogram.update(week_minutes(dows, minute, offset))
+
+
+def peak(histogram: Mapping[int, int]) -> int:
+    """Highest number of slots firing in the same minute."""
+    return max(histogram.values(), default=0)
+
+
+def place_minute(
+    histogram: Mapping[int, int],
+    dows: list[int],
+    requested: int,
+    offset: int,
+    tolerance: int = DEFAULT_TOLERANCE,
+    *,
+    prefer: int | None = None,
+) -> int:
+    """Least-loaded local minute of the day within ±tolerance of `requested`.
+
+    Load of a candidate = its busiest weekday, then its total over the week.
+    Ties keep `prefer` (the current placement, to avoid churn on rebalance) or
+    are broken at random, so an empty histogram degrades to plain jitter.
+    The window does not cross midnight: the slot stays on its days.
+    """
+    low = max(0, requested - tolerance)
+    high = min(MINUTES_PER_DAY - 1, requested + tolerance)
+    best: list[int] = []
+    best_cost: tuple[int, int] | None = None
+    for minute in range(low, high + 1):
+        loads = [histogram.get(m, 0) for m in week_minutes(dows, minute, offset)]
+        cost = (max(loads), sum(loads))
+        if best_cost is None or cost < best_cost:
+            best, best_cost = [minute], cost
+        elif cost == best_cost:
+            best.append(minute)
+    if prefer is not None and prefer in best:
+        return prefer
+    return random.choice(best)  # noqa: S311
+
+
+def place_slots(
+    histogram: Counter[int],
+    days: list[str],
+    times: list[str],
+    timezone: str,
+    tolerance: int = DEFAULT_TOLERANCE,
+) -> list[int]:
+    """Place every slot of one schedule, adding each to `histogram` as it goes."""
+    dows = slot_dows(days)
+    offset = utc_offset_minutes(timezone)
+    minutes: list[int] = []
+    for time_slot in times:
+        minute = place_minute(histogram, dows, parse_slot(time_slot), offset, tolerance)
+        add_load(histogram, dows, minute, offset)
+        minutes.append(minute)
+    return minutes
@@ -2,17 +2,29 @@
 
 Uses raw httpx calls to Supabase Storage REST API (no SDK).
 Bucket: content-images (24h cleanup via api/cleanup.py).
-Path format: {user_id}/{project_id}/{timestamp}.webp (see ARCHITECTURE.md §5.9).
+Path format: {user_id}/{project_id}/{sha256}.webp (see ARCHITECTURE.md §5.9).
+
+Objects are content-addressed per user and project: the same bytes from a
+preview, a publish run or a retry map to one path, and store() asks Storage
+whether the object exists before sending it. An object can be referenced by
+several owners (pipeline run keys), so each owner is recorded as a holder in
+Redis and release() deletes an object only when its last holder lets go.
+Signed URLs for a whole article come from one call to the batch signing
+endpoint.
 """
 
-import time
+import hashlib
+from collections import defaultdict
 from dataclasses import dataclass
-from io import BytesIO
+from typing import Any
 
 import httpx
 import structlog
 
 from bot.exceptions import AppError
+from cache.client import RedisClient
+from cache.keys import STORAGE_HOLDERS_TTL, CacheKeys
+from services.image_transcode import run_in_pool, transcode_to_webp
 
 log = structlog.get_logger()
 
@@ -28,6 +40,35 @@ class StoredImage:
     signed_url: str
 
 
+@dataclass
+class StorageStats:
+    """Dedup and signing counters since process start."""
+
+    uploads: int = 0
+    bytes_uploaded: int = 0
+    dedup_hits: int = 0
+    bytes_saved: int = 0
+    requests_saved: int = 0
+    sign_requests: int = 0
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "uploads": self.uploads,
+            "bytes_uploaded": self.bytes_uploaded,
+            "dedup_hits": self.dedup_hits,
+            "bytes_saved": self.bytes_saved,
+            "requests_saved": self.requests_saved,
+            "sign_requests": self.sign_requests,
+        }
+
+
+def _is_duplicate(resp: httpx.Response) -> bool:
+    """Storage answers 409 (or 400 with statusCode "409") when the object exists."""
+    if resp.status_code == 409:
+        return True
+    return resp.status_code == 400 and "Duplicate" in resp.text
+
+
 class ImageStorage:
     """Upload/download/cleanup images in Supabase Storage."""
 
@@ -36,6 +77,7 @@ class ImageStorage:
         supabase_url: str,
         supabase_key: str,
         http_client: httpx.AsyncClient,
+        redis: RedisClient,
     ) -> None:
         self._base_url = f"{supabase_url}/storage/v1"
         self._headers = {
@@ -43,46 +85,122 @@ class ImageStorage:
             "Authorization": f"Bearer {supabase_key}",
         }
         self._http = http_client
+        self._redis = redis
+        self.stats = StorageStats()
 
-    async def upload(
+    async def store(
         self,
         image_bytes: bytes,
         user_id: int,
         project_id: int,
-        index: int,
         mime: str = "image/png",
-    ) -> StoredImage:
-        """Upload image as WebP and return path + signed URL (25h TTL).
+        *,
+        holder: str,
+    ) -> str:
+        """Store image under its content hash and return the path (no signed URL).
 
-        Path: {user_id}/{project_id}/{timestamp}_{index}.webp
+        ``holder`` (the run key that keeps the path) is recorded before the
+        existence check, so a concurrent release() by another holder cannot
+        delete the object this call is about to reuse. An existing object is
+        not sent again.
+        Conversion runs off the event loop; WebP input is uploaded as is.
         Falls back to original format if WebP conversion fails (E33).
         """
-        image_bytes, ext, mime = self._convert_to_webp(image_bytes, mime)
-        ts = int(time.time())
-        path = f"{user_id}/{project_id}/{ts}_{index}.{ext}"
+        image_bytes, ext, mime = await run_in_pool(self._convert_to_webp, image_bytes, mime)
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        path = f"{user_id}/{project_id}/{digest}.{ext}"
+
+        key = CacheKeys.storage_holders(path)
+        await self._redis.sadd(key, holder)
+        await self._redis.expire(key, STORAGE_HOLDERS_TTL)
+
+        if await self._exists(path):
+            self.stats.dedup_hits += 1
+            self.stats.bytes_saved += len(image_bytes)
+            log.info("image_upload_skipped", path=path)
+            return path
 
-        # Upload
+        # No upsert: a concurrent upload of the same bytes answers "Duplicate"
         resp = await self._http.post(
             f"{self._base_url}/object/{BUCKET}/{path}",
             content=image_bytes,
-            headers={
-                **self._headers,
-                "Content-Type": mime,
-                "x-upsert": "true",
-            },
+            headers={**self._headers, "Content-Type": mime},
         )
-        if resp.status_code not in (200, 201):
+        self.stats.bytes_uploaded += len(image_bytes)
+        if _is_duplicate(resp):
+            log.info("image_upload_exists", path=path)
+        elif resp.status_code not in (200, 201):
             log.error("storage_upload_failed", status=resp.status_code, body=resp.text[:200])
             raise AppError(
                 message=f"Storage upload failed: {resp.status_code}",
                 user_message="Ошибка загрузки изображения",
             )
+        else:
+            self.stats.uploads += 1
+        return path
 
-        # Get signed URL
-        signed_url = await self._get_signed_url(path)
-        log.info("image_uploaded", path=path, user_id=user_id, project_id=project_id, index=index)
+    async def release(self, paths: list[str], holder: str) -> int:
+        """Drop ``holder``'s claim on paths; delete objects no other holder keeps.
 
-        return StoredImage(path=path, signed_url=signed_url)
+        Paths without any recorded holder (stored before holders existed) are
+        deleted. Returns count of deleted files.
+        """
+        orphaned: list[str] = []
+        for path in dict.fromkeys(paths):
+            key = CacheKeys.storage_holders(path)
+            if holder:
+                await self._redis.srem(key, holder)
+            if await self._redis.scard(key) == 0:
+                orphaned.append(path)
+        if len(orphaned) < len(set(paths)):
+            log.info("storage_release_kept", kept=len(set(paths)) - len(orphaned), holder=holder)
+        return await self.cleanup_by_paths(orphaned)
+
+    async def release_images(self, images: list[dict[str, Any]]) -> int:
+        """release() for stored_images entries ({storage_path, storage_holder})."""
+        by_holder: dict[str, list[str]] = defaultdict(list)
+        for img in images:
+            if isinstance(img, dict) and img.get("storage_path"):
+                by_holder[img.get("storage_holder") or ""].append(img["storage_path"])
+        deleted = 0
+        for holder, paths in by_holder.items():
+            deleted += await self.release(paths, holder)
+        return deleted
+
+    async def _exists(self, path: str) -> bool:
+        """Whether the object is already in the bucket (metadata only, no body)."""
+        resp = await self._http.get(
+            f"{self._base_url}/object/info/{BUCKET}/{path}",
+            headers=self._headers,
+        )
+        return resp.status_code == 200
+
+    async def sign_urls(self, paths: list[str]) -> dict[str, str]:
+        """Signed URLs (25h TTL) for many objects in one request.
+
+        Returns {path: url}; paths the endpoint could not sign are omitted.
+        """
+        if not paths:
+            return {}
+        resp = await self._http.post(
+            f"{self._base_url}/object/sign/{BUCKET}",
+            json={"expiresIn": SIGNED_URL_TTL, "paths": paths},
+            headers={**self._headers, "Content-Type": "application/json"},
+        )
+        self.stats.sign_requests += 1
+        if resp.status_code != 200:
+            raise AppError(
+                message=f"Signed URL creation failed: {resp.status_code}",
+                user_message="Ошибка создания ссылки на изображение",
+            )
+        signed: dict[str, str] = {}
+        for item in resp.json():
+            if item.get("signedURL") and not item.get("error"):
+                signed[item["path"]] = f"{self._base_url}{item['signedURL']}"
+        self.stats.requests_saved += len(paths) - 1
+        if len(signed) < len(paths):
+            log.warning("storage_sign_partial", requested=len(paths), signed=len(signed))
+        return signed
 
     async def download(self, path: str) -> bytes:
         """Download image bytes from storage."""
@@ -111,7 +229,7 @@ class ImageStorage:
         return deleted
 
     async def cleanup_prefix(self, prefix: str) -> int:
-        """Delete all images under a prefix (e.g. '{user_id}/{project_id}/')."""
+        """Delete all images under a prefix (e.g. '{user_id}/{project_id}/'), scope folders included."""
         resp = await self._http.post(
             f"{self._base_url}/object/list/{BUCKET}",
             json={"prefix": prefix, "limit": 100},
@@ -125,41 +243,22 @@ class ImageStorage:
         if not files:
             return 0
 
-        paths = [f"{prefix}{f['name']}" for f in files]
-        return await self.cleanup_by_paths(paths)
+        deleted = 0
+        paths: list[str] = []
+        for f in files:
+            if "id" in f and f["id"] is None:  # folder entry: per-run scope of older paths
+                deleted += await self.cleanup_prefix(f"{prefix}{f['name']}/")
+            else:
+                paths.append(f"{prefix}{f['name']}")
+        return deleted + await self.cleanup_by_paths(paths)
 
     @staticmethod
     def _convert_to_webp(image_bytes: bytes, mime: str) -> tuple[bytes, str, str]:
         """Convert image to WebP. Falls back to original format on error (E33)."""
         try:
-            from PIL import Image  # type: ignore[import-not-found]
-
-            img = Image.open(BytesIO(image_bytes))
-            buf = BytesIO()
-            img.save(buf, format="WEBP", quality=85)
-            return buf.getvalue(), "webp", "image/webp"
+            result = transcode_to_webp(image_bytes)
+            return result.data, result.ext, result.mime
         except Exception:
             log.warning("webp_conversion_failed", original_mime=mime)
             ext = "png" if "png" in mime else "jpg"
             return image_bytes, ext, mime
-
-    async def _get_signed_url(self, path: str) -> str:
-        """Create a signed URL with 25h TTL."""
-        resp = await self._http.post(
-            f"{self._base_url}/object/sign/{BUCKET}/{path}",
-            json={"expiresIn": SIGNED_URL_TTL},
-            headers={**self._headers, "Content-Type": "application/json"},
-        )
-        if resp.status_code != 200:
-            raise AppError(
-                message=f"Signed URL creation failed: {resp.status_code}",
-                user_message="Ошибка создания ссылки на изображение",
-            )
-        data = resp.json()
-        signed = data.get("signedURL")
-        if not signed:
-            raise AppError(
-                message=f"Unexpected signed URL response: {data}",
-                user_message="Ошибка создания ссылки на изображение",
-            )
-        return f"{self._base_url}{signed}"
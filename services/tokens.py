@@ -99,9 +99,12 @@ class TokenService:
             return False
         return user.balance >= required
 
-    async def get_balance(self, user_id: int) -> int:
-        """Get current balance for user. Returns 0 if user not found."""
-        user = await self._users.get_by_id(user_id)
+    async def get_balance(self, user_id: int, *, fresh: bool = False) -> int:
+        """Get current balance for user. Returns 0 if user not found.
+
+        fresh=True bypasses the request-scoped identity map (see UsersRepository.get_by_id).
+        """
+        user = await self._users.get_by_id(user_id, fresh=True) if fresh else await self._users.get_by_id(user_id)
         return user.balance if user else 0
 
     async def charge(
@@ -0,0 +1,51 @@
+-- Server-side keyword rotation (API_CONTRACTS.md §6, 2026-10-18)
+-- One RPC replaces get_recently_used_keywords + get_lru_keyword: the app sends
+-- the candidate pool already filtered (cluster_type) and ordered by priority
+-- (volume DESC, difficulty ASC); Postgres picks the keyword with
+-- GROUP BY max(created_at) instead of shipping publication history to Python.
+
+-- Rotation reads only successful rows per (category, content_type); keep the
+-- index covering so max(created_at) per keyword is an index-only scan.
+DROP INDEX IF EXISTS idx_pub_logs_rotation;
+CREATE INDEX idx_pub_logs_rotation
+    ON publication_logs (category_id, content_type, keyword, created_at DESC)
+    WHERE status = 'success';
+
+-- rotate_keyword: next keyword + low-pool flag (E22 LRU fallback, E23 warning)
+--   1. first keyword in pool order not used within p_cooldown_days
+--   2. all on cooldown -> least recently used (oldest max(created_at))
+-- p_content_type NULL = cooldown shared across content types.
+CREATE OR REPLACE FUNCTION rotate_keyword(
+    p_category_id INTEGER,
+    p_pool TEXT[],
+    p_content_type VARCHAR DEFAULT NULL,
+    p_cooldown_days INTEGER DEFAULT 7,
+    p_min_pool_size INTEGER DEFAULT 3
+)
+RETURNS TABLE (keyword TEXT, low_pool BOOLEAN) AS $$
+    WITH candidates AS (
+        SELECT c.kw, c.pos
+        FROM unnest(p_pool) WITH ORDINALITY AS c(kw, pos)
+    ),
+    last_used AS (
+        SELECT pl.keyword AS kw, max(pl.created_at) AS last_at
+        FROM publication_logs pl
+        WHERE pl.category_id = p_category_id
+          AND pl.status = 'success'
+          AND (p_content_type IS NULL OR pl.content_type = p_content_type)
+          AND pl.keyword = ANY(p_pool)
+        GROUP BY pl.keyword
+    ),
+    ranked AS (
+        SELECT c.kw, c.pos,
+               CASE WHEN lu.last_at > now() - make_interval(days => p_cooldown_days)
+                    THEN lu.last_at END AS cooldown_since
+        FROM candidates c
+        LEFT JOIN last_used lu ON lu.kw = c.kw
+    )
+    SELECT r.kw::TEXT,
+           coalesce(cardinality(p_pool), 0) < p_min_pool_size
+    FROM ranked r
+    ORDER BY r.cooldown_since ASC NULLS FIRST, r.pos
+    LIMIT 1;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,71 @@
+-- Set-based bulk upsert for bamboodom_keywords (2026-10-18)
+-- Replaces read-then-UPDATE-per-row in BamboodomKeywordsRepository.save_batch
+-- (one HTTP call per existing keyword) and read-then-insert in expand_to_cities.
+--
+-- p_rows: JSON array of {keyword, material, city, search_volume, competition,
+--         cluster_id, cluster_label, status}. Duplicates in the batch: last wins.
+-- p_update_existing:
+--   TRUE  (save_batch)       existing rows get search_volume / competition /
+--                            cluster refreshed; status is kept (used stays used)
+--   FALSE (expand_to_cities) existing rows are left untouched
+-- Returns new/updated counts in one round trip.
+--
+-- Two INSERTs because uniqueness is split across partial indexes (5G):
+-- (keyword, material) WHERE city IS NULL and (keyword, material, city) WHERE
+-- city IS NOT NULL.
+
+CREATE OR REPLACE FUNCTION bbk_upsert_keywords(
+    p_rows JSONB,
+    p_update_existing BOOLEAN DEFAULT TRUE
+)
+RETURNS TABLE (new_count INTEGER, updated_count INTEGER) AS $$
+    WITH src AS (
+        SELECT DISTINCT ON (s.keyword, s.material, coalesce(s.city, '')) s.*
+        FROM (
+            SELECT e.ord,
+                   e.item->>'keyword' AS keyword,
+                   e.item->>'material' AS material,
+                   nullif(e.item->>'city', '') AS city,
+                   coalesce((e.item->>'search_volume')::INTEGER, 0) AS search_volume,
+                   (e.item->>'competition')::REAL AS competition,
+                   (e.item->>'cluster_id')::INTEGER AS cluster_id,
+                   e.item->>'cluster_label' AS cluster_label,
+                   coalesce(e.item->>'status', 'new') AS status
+            FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS e(item, ord)
+        ) s
+        ORDER BY s.keyword, s.material, coalesce(s.city, ''), s.ord DESC
+    ),
+    generic AS (
+        INSERT INTO bamboodom_keywords AS t
+            (keyword, material, city, search_volume, competition, cluster_id, cluster_label, status)
+        SELECT keyword, material, city, search_volume, competition, cluster_id, cluster_label, status
+        FROM src WHERE city IS NULL
+        ON CONFLICT (keyword, material) WHERE city IS NULL DO UPDATE SET
+            search_volume = EXCLUDED.search_volume,
+            competition = EXCLUDED.competition,
+            cluster_id = coalesce(EXCLUDED.cluster_id, t.cluster_id),
+            cluster_label = coalesce(nullif(EXCLUDED.cluster_label, ''), t.cluster_label)
+        WHERE p_update_existing
+        RETURNING (xmax = 0) AS inserted
+    ),
+    geo AS (
+        INSERT INTO bamboodom_keywords AS t
+            (keyword, material, city, search_volume, competition, cluster_id, cluster_label, status)
+        SELECT keyword, material, city, search_volume, competition, cluster_id, cluster_label, status
+        FROM src WHERE city IS NOT NULL
+        ON CONFLICT (keyword, material, city) WHERE city IS NOT NULL DO UPDATE SET
+            search_volume = EXCLUDED.search_volume,
+            competition = EXCLUDED.competition,
+            cluster_id = coalesce(EXCLUDED.cluster_id, t.cluster_id),
+            cluster_label = coalesce(nullif(EXCLUDED.cluster_label, ''), t.cluster_label)
+        WHERE p_update_existing
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT (count(*) FILTER (WHERE u.inserted))::INTEGER,
+           (count(*) FILTER (WHERE NOT u.inserted))::INTEGER
+    FROM (
+        SELECT inserted FROM generic
+        UNION ALL
+        SELECT inserted FROM geo
+    ) u;
+$$ LANGUAGE sql;
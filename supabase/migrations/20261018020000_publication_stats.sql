@@ -0,0 +1,102 @@
+-- Incrementally maintained publication counters (2026-10-18)
+-- Replaces count="exact" scans and per-row downloads on publication_logs in
+-- PublicationsRepository (count_*, get_count_by_*, get_stats_by_user[s_batch]).
+--
+-- One row per (scope, scope_id):
+--   scope = 'user' | 'project' | 'category' | 'connection'  -> scope_id = FK value
+--   scope = 'day'                                            -> scope_id = YYYYMMDD (UTC)
+--   total        all log rows (any status)
+--   success      rows with status = 'success'
+--   tokens_spent sum(tokens_spent) over success rows
+--
+-- Kept in sync by an AFTER row trigger on publication_logs, so inserts from
+-- any path, status changes, ON DELETE SET NULL (category/connection removed),
+-- cascades and delete_old_logs() are all reflected. Counts therefore match
+-- what a scan of publication_logs would return.
+
+CREATE TABLE IF NOT EXISTS publication_stats (
+    scope         VARCHAR(12) NOT NULL,
+    scope_id      BIGINT NOT NULL,
+    total         INTEGER NOT NULL DEFAULT 0,
+    success       INTEGER NOT NULL DEFAULT 0,
+    tokens_spent  BIGINT NOT NULL DEFAULT 0,
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (scope, scope_id)
+);
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one log row from every scope it belongs to
+CREATE OR REPLACE FUNCTION _publication_stats_apply(p_row publication_logs, p_sign INTEGER)
+RETURNS VOID AS $$
+    INSERT INTO publication_stats AS s (scope, scope_id, total, success, tokens_spent)
+    SELECT k.scope,
+           k.scope_id,
+           p_sign,
+           CASE WHEN p_row.status = 'success' THEN p_sign ELSE 0 END,
+           CASE WHEN p_row.status = 'success' THEN p_sign * coalesce(p_row.tokens_spent, 0) ELSE 0 END
+    FROM (VALUES
+        ('user', p_row.user_id),
+        ('project', p_row.project_id::BIGINT),
+        ('category', p_row.category_id::BIGINT),
+        ('connection', p_row.connection_id::BIGINT),
+        ('day', to_char(p_row.created_at AT TIME ZONE 'UTC', 'YYYYMMDD')::BIGINT)
+    ) AS k(scope, scope_id)
+    WHERE k.scope_id IS NOT NULL
+    ON CONFLICT (scope, scope_id) DO UPDATE SET
+        total = s.total + EXCLUDED.total,
+        success = s.success + EXCLUDED.success,
+        tokens_spent = s.tokens_spent + EXCLUDED.tokens_spent,
+        updated_at = now();
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION trg_publication_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM _publication_stats_apply(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM _publication_stats_apply(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS publication_stats_sync ON publication_logs;
+CREATE TRIGGER publication_stats_sync
+    AFTER INSERT OR DELETE
+        OR UPDATE OF user_id, project_id, category_id, connection_id, status, tokens_spent, created_at
+    ON publication_logs
+    FOR EACH ROW EXECUTE FUNCTION trg_publication_stats();
+
+-- Full recount from publication_logs (initial backfill, drift repair).
+-- SHARE lock blocks concurrent log writes for the duration so no trigger
+-- delta is lost between the DELETE and the INSERT. Returns counter rows written.
+CREATE OR REPLACE FUNCTION rebuild_publication_stats()
+RETURNS INTEGER AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    LOCK TABLE publication_logs IN SHARE MODE;
+    DELETE FROM publication_stats;
+    INSERT INTO publication_stats (scope, scope_id, total, success, tokens_spent)
+    SELECT k.scope,
+           k.scope_id,
+           count(*),
+           count(*) FILTER (WHERE pl.status = 'success'),
+           coalesce(sum(pl.tokens_spent) FILTER (WHERE pl.status = 'success'), 0)
+    FROM publication_logs pl
+    CROSS JOIN LATERAL (VALUES
+        ('user', pl.user_id),
+        ('project', pl.project_id::BIGINT),
+        ('category', pl.category_id::BIGINT),
+        ('connection', pl.connection_id::BIGINT),
+        ('day', to_char(pl.created_at AT TIME ZONE 'UTC', 'YYYYMMDD')::BIGINT)
+    ) AS k(scope, scope_id)
+    WHERE k.scope_id IS NOT NULL
+    GROUP BY k.scope, k.scope_id;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_publication_stats();
@@ -0,0 +1,60 @@
+-- Durable auto-publish job queue (2026-10-18)
+-- POST /api/publish no longer runs the 300-400 s article pipeline inside the
+-- QStash request: it inserts a job here and returns 202. An in-process worker
+-- pool (services/publish_queue.py) claims jobs with a lease, heartbeats while
+-- the pipeline runs and records the result.
+--
+-- status:
+--   queued   waiting; claimable once available_at <= now()
+--   running  leased by lease_owner until lease_expires_at (heartbeat extends it)
+--   done     pipeline finished (result holds the PublishOutcome summary)
+--   failed   gave up after max_attempts
+--
+-- A running job whose lease expired (container killed by a deploy, OOM) is
+-- claimable again — that is the visibility timeout. attempts counts claims, so
+-- a job that keeps killing its worker still ends up 'failed'.
+
+CREATE TABLE IF NOT EXISTS publish_jobs (
+    id                BIGSERIAL PRIMARY KEY,
+    idempotency_key   VARCHAR(200) NOT NULL UNIQUE,  -- Upstash-Message-Id
+    payload           JSONB NOT NULL,
+    status            VARCHAR(10) NOT NULL DEFAULT 'queued',
+    attempts          INTEGER NOT NULL DEFAULT 0,
+    max_attempts      INTEGER NOT NULL DEFAULT 3,
+    available_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    lease_owner       VARCHAR(100),
+    lease_expires_at  TIMESTAMPTZ,
+    last_error        TEXT,
+    result            JSONB,
+    created_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at        TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_publish_jobs_queued
+    ON publish_jobs(available_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_publish_jobs_running
+    ON publish_jobs(lease_expires_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_publish_jobs_finished
+    ON publish_jobs(updated_at) WHERE status IN ('done', 'failed');
+
+-- Atomically lease up to p_limit jobs for p_worker.
+-- SKIP LOCKED lets several replicas claim concurrently without blocking or
+-- handing the same job out twice.
+CREATE OR REPLACE FUNCTION claim_publish_jobs(p_worker TEXT, p_limit INTEGER, p_lease_seconds INTEGER)
+RETURNS SETOF publish_jobs AS $$
+    UPDATE publish_jobs j
+    SET status = 'running',
+        attempts = j.attempts + 1,
+        lease_owner = p_worker,
+        lease_expires_at = now() + make_interval(secs => p_lease_seconds),
+        updated_at = now()
+    WHERE j.id IN (
+        SELECT id FROM publish_jobs
+        WHERE (status = 'queued' AND available_at <= now())
+           OR (status = 'running' AND lease_expires_at < now())
+        ORDER BY available_at, id
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING j.*;
+$$ LANGUAGE sql;
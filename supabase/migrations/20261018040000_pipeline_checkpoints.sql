@@ -0,0 +1,23 @@
+-- Article pipeline stage checkpoints (2026-10-18)
+-- services/checkpoints.py::StageCheckpoints persists the output of each
+-- expensive pipeline stage (keyword, websearch, outline, article, images,
+-- wp_media) under a run key, so a retry resumes after the last completed
+-- stage instead of regenerating a 5-minute article from scratch.
+--
+-- Run keys:
+--   publish:{Upstash-Message-Id}            auto-publish job (stable across job retries)
+--   preview:{user_id}:{category_id}         manual article pipeline, cleared on success
+--   preview_wp:{preview_id}                 WP publish of a preview (uploaded media IDs)
+--
+-- Rows are deleted by the pipeline on success and garbage-collected by
+-- CleanupService after 24 h (images stage storage objects included).
+
+CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+    run_key     VARCHAR(200) NOT NULL,
+    stage       VARCHAR(20) NOT NULL,
+    data        JSONB NOT NULL,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (run_key, stage)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_checkpoints_created ON pipeline_checkpoints(created_at);
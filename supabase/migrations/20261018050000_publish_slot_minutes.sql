@@ -0,0 +1,55 @@
+-- Load-aware auto-publish slot placement (2026-10-18)
+-- services/slot_placement.py places each QStash cron minute in the least
+-- loaded minute within ±tolerance of the requested time, instead of a blind
+-- ±5 min jitter that still let popular times (09:00, 12:00) pile up.
+--
+-- slot_minutes: the local minute of day actually used in each slot's cron,
+-- parallel to schedule_times. Empty for schedules created before placement
+-- (their jittered minute is unknown; the requested time stands in for it
+-- until scripts/rebalance_publish_slots.py re-creates them).
+
+ALTER TABLE platform_schedules
+    ADD COLUMN IF NOT EXISTS slot_minutes SMALLINT[] NOT NULL DEFAULT '{}';
+
+-- Per-minute load of all enabled schedules, keyed by UTC minute of the week
+-- (0 = Sunday 00:00 UTC). A slot counts once for every weekday it runs on
+-- (no days = every day), shifted by the project's current UTC offset.
+-- Must match services/slot_placement.py::week_minutes.
+CREATE OR REPLACE FUNCTION publish_slot_histogram()
+RETURNS TABLE (minute_of_week INTEGER, load INTEGER) AS $$
+    WITH slots AS (
+        SELECT s.schedule_days,
+               (extract(EPOCH FROM (now() AT TIME ZONE coalesce(p.timezone, 'UTC'))
+                                 - (now() AT TIME ZONE 'UTC')) / 60)::INTEGER AS utc_offset,
+               m AS minute
+        FROM platform_schedules s
+        JOIN categories c ON c.id = s.category_id
+        JOIN projects p ON p.id = c.project_id
+        CROSS JOIN LATERAL unnest(
+            CASE WHEN cardinality(s.slot_minutes) > 0 THEN s.slot_minutes::INTEGER[]
+                 ELSE ARRAY(
+                     SELECT split_part(t, ':', 1)::INTEGER * 60 + split_part(t, ':', 2)::INTEGER
+                     FROM unnest(s.schedule_times) AS t
+                 )
+            END
+        ) AS m
+        WHERE s.enabled
+    ),
+    fires AS (
+        SELECT d AS dow, utc_offset, minute
+        FROM slots
+        CROSS JOIN LATERAL unnest(
+            CASE WHEN cardinality(schedule_days) > 0 THEN ARRAY(
+                     SELECT DISTINCT array_position(ARRAY['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'], x) - 1
+                     FROM unnest(schedule_days) AS x
+                     WHERE x IN ('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat')
+                 )
+                 ELSE ARRAY[0, 1, 2, 3, 4, 5, 6]
+            END
+        ) AS d
+    )
+    SELECT ((dow * 1440 + minute - utc_offset) % 10080 + 10080) % 10080 AS minute_of_week,
+           count(*)::INTEGER AS load
+    FROM fires
+    GROUP BY 1;
+$$ LANGUAGE sql STABLE;
@@ -1,7 +1,19 @@
 """Root conftest — shared fixtures for all tests."""
 
+from collections.abc import Iterator
+
 import pytest
 
+from services.http_retry import reset_provider_guards
+
+
+@pytest.fixture(autouse=True)
+def _isolate_provider_guards() -> Iterator[None]:
+    """Circuit breakers are process-wide; don't leak open circuits between tests."""
+    reset_provider_guards()
+    yield
+    reset_provider_guards()
+
 
 @pytest.fixture
 def admin_ids() -> list[int]:
@@ -9,6 +9,7 @@ import pytest
 from aiohttp import web
 from aiohttp.test_utils import TestClient, TestServer
 
+from services.publish_queue import InMemoryPublishQueue
 from tests.integration.conftest import (
     MockRedisClient,
     MockSupabaseClient,
@@ -51,6 +52,7 @@ def _create_test_app(
     app["image_storage"] = MagicMock()
     app["yookassa_service"] = MagicMock()
     app["scheduler_service"] = MagicMock()
+    app["publish_queue"] = InMemoryPublishQueue()
 
     return app
 
@@ -97,4 +99,5 @@ def app_services(api_client: TestClient) -> dict[str, Any]:
         "image_storage": app["image_storage"],
         "yookassa_service": app["yookassa_service"],
         "scheduler_service": app["scheduler_service"],
+        "publish_queue": app["publish_queue"],
     }
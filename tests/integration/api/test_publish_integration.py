@@ -1,7 +1,7 @@
 """Integration tests for POST /api/publish endpoint.
 
-Tests QStash signature verification, idempotency, backpressure,
-shutdown handling, and notification delivery.
+Tests QStash signature verification, idempotency, job enqueueing,
+shutdown handling, and notification delivery via the worker pool.
 """
 
 from __future__ import annotations
@@ -62,18 +62,14 @@ async def test_publish_invalid_signature_401(api_client):
     assert "Invalid signature" in text
 
 
-async def test_publish_valid_signature_processes(api_client, app_services):
-    """POST /api/publish with valid (mocked) signature processes the payload."""
-    outcome = PublishOutcome(status="ok", reason="", keyword="test seo", user_id=12345, notify=False)
-
+async def test_publish_valid_signature_enqueues(api_client, app_services):
+    """POST /api/publish with valid (mocked) signature stores a job and returns 202."""
     with (
         patch("qstash.Receiver") as mock_receiver_cls,
         patch("bot.main.SHUTDOWN_EVENT", asyncio.Event()),
-        patch("bot.main.PUBLISH_SEMAPHORE", asyncio.Semaphore(10)),
         patch("api.publish.PublishService") as mock_svc_cls,
     ):
         mock_receiver_cls.return_value.verify = MagicMock()
-        mock_svc_cls.return_value.execute = AsyncMock(return_value=outcome)
 
         resp = await api_client.post(
             "/api/publish",
@@ -81,35 +77,32 @@ async def test_publish_valid_signature_processes(api_client, app_services):
             headers=_make_headers(),
         )
 
-    assert resp.status == 200
+    assert resp.status == 202
     body = await resp.json()
-    assert body["status"] == "ok"
+    assert body["status"] == "queued"
+    mock_svc_cls.assert_not_called()
+    job = app_services["publish_queue"].get(body["job_id"])
+    assert job.idempotency_key == "msg_001"
+    assert job.payload["connection_id"] == 20
 
 
 async def test_publish_idempotency_duplicate(api_client, app_services):
     """Second call with same Upstash-Message-Id returns status 'duplicate'."""
-    outcome = PublishOutcome(status="ok", reason="", keyword="kw", user_id=12345, notify=False)
-
     with (
         patch("qstash.Receiver") as mock_receiver_cls,
         patch("bot.main.SHUTDOWN_EVENT", asyncio.Event()),
-        patch("bot.main.PUBLISH_SEMAPHORE", asyncio.Semaphore(10)),
-        patch("api.publish.PublishService") as mock_svc_cls,
     ):
         mock_receiver_cls.return_value.verify = MagicMock()
-        mock_svc_cls.return_value.execute = AsyncMock(return_value=outcome)
 
         headers = _make_headers(msg_id="dup_msg_123")
 
-        # First call: should process
+        # First call: should enqueue
         resp1 = await api_client.post(
             "/api/publish",
             data=json.dumps(_VALID_PAYLOAD),
             headers=headers,
         )
-        assert resp1.status == 200
-        body1 = await resp1.json()
-        assert body1["status"] == "ok"
+        assert resp1.status == 202
 
         # Second call with same msg_id: duplicate
         resp2 = await api_client.post(
@@ -129,7 +122,6 @@ async def test_publish_invalid_payload(api_client, app_services):
     with (
         patch("qstash.Receiver") as mock_receiver_cls,
         patch("bot.main.SHUTDOWN_EVENT", asyncio.Event()),
-        patch("bot.main.PUBLISH_SEMAPHORE", asyncio.Semaphore(10)),
     ):
         mock_receiver_cls.return_value.verify = MagicMock()
 
@@ -145,8 +137,11 @@ async def test_publish_invalid_payload(api_client, app_services):
     assert body["reason"] == "invalid_payload"
 
 
-async def test_publish_ok_notifies_user(api_client, app_services):
-    """On successful publish with notify=True, bot.send_message is called."""
+async def test_publish_job_runs_and_notifies_user(api_client, app_services):
+    """Enqueued job is picked up by the worker pool; user is notified on success."""
+    from api.publish import run_publish_job
+    from services.publish_queue import PublishWorkerPool
+
     outcome = PublishOutcome(
         status="ok",
         reason="",
@@ -155,11 +150,17 @@ async def test_publish_ok_notifies_user(api_client, app_services):
         notify=True,
         post_url="https://example.com/post/1",
     )
+    queue = app_services["publish_queue"]
+    pool = PublishWorkerPool(
+        queue,
+        lambda job: run_publish_job(api_client.app, job),
+        concurrency=2,
+        poll_interval=0.01,
+    )
 
     with (
         patch("qstash.Receiver") as mock_receiver_cls,
         patch("bot.main.SHUTDOWN_EVENT", asyncio.Event()),
-        patch("bot.main.PUBLISH_SEMAPHORE", asyncio.Semaphore(10)),
         patch("api.publish.PublishService") as mock_svc_cls,
     ):
         mock_receiver_cls.return_value.verify = MagicMock()
@@ -170,8 +171,15 @@ async def test_publish_ok_notifies_user(api_client, app_services):
             data=json.dumps(_VALID_PAYLOAD),
             headers=_make_headers(msg_id="notify_msg"),
         )
+        job_id = (await resp.json())["job_id"]
 
-    assert resp.status == 200
+        pool.start()
+        async with asyncio.timeout(2):
+            while queue.get(job_id).status != "done":
+                await asyncio.sleep(0.01)
+        await pool.stop(timeout=1)
+
+    assert queue.get(job_id).result == {"status": "ok", "reason": ""}
     bot = app_services["bot"]
     bot.send_message.assert_called_once()
     call_args = bot.send_message.call_args
@@ -180,29 +188,6 @@ async def test_publish_ok_notifies_user(api_client, app_services):
     assert "https://example.com/post/1" in call_args[0][1]
 
 
-async def test_publish_error_no_retry(api_client, app_services):
-    """Internal error returns 200 (not 5xx) to prevent QStash retries."""
-    with (
-        patch("qstash.Receiver") as mock_receiver_cls,
-        patch("bot.main.SHUTDOWN_EVENT", asyncio.Event()),
-        patch("bot.main.PUBLISH_SEMAPHORE", asyncio.Semaphore(10)),
-        patch("api.publish.PublishService") as mock_svc_cls,
-    ):
-        mock_receiver_cls.return_value.verify = MagicMock()
-        mock_svc_cls.return_value.execute = AsyncMock(side_effect=RuntimeError("boom"))
-
-        resp = await api_client.post(
-            "/api/publish",
-            data=json.dumps(_VALID_PAYLOAD),
-            headers=_make_headers(msg_id="error_msg"),
-        )
-
-    assert resp.status == 200
-    body = await resp.json()
-    assert body["status"] == "error"
-    assert body["reason"] == "internal_error"
-
-
 async def test_publish_shutdown_503(api_client, app_services):
     """When SHUTDOWN_EVENT is set, handler returns 503 with Retry-After."""
     shutdown_event = asyncio.Event()
@@ -211,7 +196,6 @@ async def test_publish_shutdown_503(api_client, app_services):
     with (
         patch("qstash.Receiver") as mock_receiver_cls,
         patch("bot.main.SHUTDOWN_EVENT", shutdown_event),
-        patch("bot.main.PUBLISH_SEMAPHORE", asyncio.Semaphore(10)),
     ):
         mock_receiver_cls.return_value.verify = MagicMock()
 
@@ -225,30 +209,23 @@ async def test_publish_shutdown_503(api_client, app_services):
     assert resp.headers.get("Retry-After") == "60"
 
 
-async def test_publish_semaphore_timeout_503(api_client, app_services):
-    """When semaphore acquire times out, handler returns 503."""
-    # Patch the publish_handler to simulate TimeoutError inside the semaphore block.
-    # We cannot globally patch asyncio.timeout because aiohttp client uses it too.
-    # Instead, mock PUBLISH_SEMAPHORE as an async context manager that raises TimeoutError.
-    mock_semaphore = MagicMock()
-    mock_semaphore.acquire = AsyncMock(side_effect=TimeoutError)
-    mock_semaphore.release = MagicMock()
-
+async def test_publish_enqueue_failure_503(api_client, app_services):
+    """When the job store is unavailable, handler returns 503 so QStash retries."""
     with (
         patch("qstash.Receiver") as mock_receiver_cls,
         patch("bot.main.SHUTDOWN_EVENT", asyncio.Event()),
-        patch("bot.main.PUBLISH_SEMAPHORE", mock_semaphore),
+        patch.object(app_services["publish_queue"], "enqueue", AsyncMock(side_effect=RuntimeError("db down"))),
     ):
         mock_receiver_cls.return_value.verify = MagicMock()
 
         resp = await api_client.post(
             "/api/publish",
             data=json.dumps(_VALID_PAYLOAD),
-            headers=_make_headers(msg_id="semaphore_msg"),
+            headers=_make_headers(msg_id="enqueue_fail_msg"),
         )
 
     assert resp.status == 503
-    assert resp.headers.get("Retry-After") == "120"
+    assert resp.headers.get("Retry-After") == "30"
 
 
 async def test_publish_reason_templates():
@@ -400,6 +400,7 @@ def mock_settings() -> MagicMock:
     settings.supabase_key = MagicMock()
     settings.supabase_key.get_secret_value.return_value = "sb_fake"
     settings.railway_graceful_shutdown_timeout = 120
+    settings.publish_job_max_attempts = 3
     return settings
 
 
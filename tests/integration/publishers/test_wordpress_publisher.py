@@ -249,10 +249,10 @@ async def test_wp_upload_image_webp() -> None:
 
 @respx.mock
 async def test_wp_sets_alt_text() -> None:
-    """Image upload includes alt_text from images_meta via separate POST to /media/{id}."""
+    """alt_text/caption from images_meta are sent with the upload itself (no POST to /media/{id})."""
     png_bytes = b"\x89PNG" + b"\x00" * 50  # not WebP (no RIFF header)
 
-    respx.post(f"{_WP_BASE}/media").mock(
+    media_route = respx.post(f"{_WP_BASE}/media").mock(
         return_value=httpx.Response(201, json={"id": 200}),
     )
     alt_update_route = respx.post(f"{_WP_BASE}/media/200").mock(
@@ -271,11 +271,11 @@ async def test_wp_sets_alt_text() -> None:
 
     assert result.success is True
 
-    # Verify alt_text update was called with correct data
-    assert alt_update_route.call_count == 1
-    alt_body = json.loads(alt_update_route.calls[0].request.content)
-    assert alt_body["alt_text"] == "Premium SEO tool screenshot"
-    assert alt_body["caption"] == "Our tool in action"
+    # Verify alt_text/caption were passed as upload args
+    assert alt_update_route.call_count == 0
+    params = media_route.calls[0].request.url.params
+    assert params["alt_text"] == "Premium SEO tool screenshot"
+    assert params["caption"] == "Our tool in action"
 
 
 # ---------------------------------------------------------------------------
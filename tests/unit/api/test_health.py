@@ -151,3 +151,84 @@ async def test_health_empty_token_config() -> None:
 
     data = json.loads(resp.body)
     assert "checks" not in data
+
+
+@patch("qstash.QStash")
+async def test_health_reports_circuit_breakers(mock_qstash_cls: MagicMock) -> None:
+    """Provider circuit breaker states are included in the detailed response."""
+    from services.http_retry import get_provider_guard
+
+    mock_qstash_cls.return_value = MagicMock()
+    guard = get_provider_guard("serper")
+    for _ in range(5):
+        guard._record_failure(RuntimeError("boom"))
+
+    resp = await health_handler(_make_request(auth_header="Bearer secret123"))
+
+    breakers = json.loads(resp.body)["circuit_breakers"]
+    assert breakers["serper"]["state"] == "open"
+    assert breakers["serper"]["consecutive_failures"] == 5
+
+
+@patch("qstash.QStash")
+async def test_health_reports_http_pools(mock_qstash_cls: MagicMock) -> None:
+    """Connection-reuse metrics of pooled clients are included when the registry is set."""
+    from services.http_clients import HttpClientRegistry
+
+    mock_qstash_cls.return_value = MagicMock()
+    registry = HttpClientRegistry()
+    registry.get("google")
+    request = _make_request(auth_header="Bearer secret123")
+    request.app.get = MagicMock(side_effect=lambda key, default=None: registry if key == "http_clients" else None)
+
+    resp = await health_handler(request)
+
+    pools = json.loads(resp.body)["http_pools"]
+    assert pools["google"]["requests"] == 0
+    await registry.aclose()
+
+
+@patch("qstash.QStash")
+async def test_health_reports_image_storage(mock_qstash_cls: MagicMock) -> None:
+    """Dedup and batch-signing savings of ImageStorage are included when it is wired."""
+    from services.storage import ImageStorage
+
+    mock_qstash_cls.return_value = MagicMock()
+    storage = ImageStorage("https://x.supabase.co", "key", MagicMock(), MagicMock())
+    storage.stats.bytes_saved = 2048
+    request = _make_request(auth_header="Bearer secret123")
+    request.app.get = MagicMock(side_effect=lambda key, default=None: storage if key == "image_storage" else None)
+
+    resp = await health_handler(request)
+
+    assert json.loads(resp.body)["image_storage"]["bytes_saved"] == 2048
+
+
+@patch("qstash.QStash")
+async def test_health_reports_concurrency_limit(mock_qstash_cls: MagicMock) -> None:
+    """Current adaptive concurrency limit and per-gate usage are included when wired."""
+    from services.adaptive_limit import AdaptiveLimiter
+
+    mock_qstash_cls.return_value = MagicMock()
+    limiter = AdaptiveLimiter(6, max_limit=12)
+    limiter.gate("ai", scale=3)
+    request = _make_request(auth_header="Bearer secret123")
+    request.app.get = MagicMock(side_effect=lambda key, default=None: limiter if key == "concurrency_limiter" else None)
+
+    resp = await health_handler(request)
+
+    report = json.loads(resp.body)["concurrency"]
+    assert report["limit"] == 6
+    assert report["gates"]["ai"]["limit"] == 18
+
+
+@patch("qstash.QStash")
+async def test_health_reports_warmup(mock_qstash_cls: MagicMock) -> None:
+    """Cold/warm latency from the startup warm-up is included once it has run."""
+    mock_qstash_cls.return_value = MagicMock()
+    report = {"supabase": {"ok": True, "cold_ms": 120, "warm_ms": 15}}
+
+    with patch("api.health.warmup_report", return_value=report):
+        resp = await health_handler(_make_request(auth_header="Bearer secret123"))
+
+    assert json.loads(resp.body)["warmup"] == report
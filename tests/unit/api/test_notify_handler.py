@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from api.notify import _send_notifications, notify_handler
+from api.notify import notify_handler
+from cache.keys import CacheKeys
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -14,7 +16,9 @@ from api.notify import _send_notifications, notify_handler
 def _make_request(notify_type: str = "low_balance", msg_id: str = "msg_1") -> MagicMock:
     app = MagicMock()
     redis_mock = MagicMock()
+    redis_mock.get = AsyncMock(return_value=None)
     redis_mock.set = AsyncMock(return_value="OK")
+    redis_mock.delete = AsyncMock(return_value=1)
 
     bot_mock = MagicMock()
     bot_mock.send_message = AsyncMock()
@@ -84,53 +88,40 @@ async def test_notify_reactivation(mock_svc_cls: MagicMock) -> None:
     assert resp.status == 200
 
 
-async def test_notify_idempotency() -> None:
-    """Duplicate message ID returns duplicate."""
+@patch("api.notify.NotifyService")
+async def test_notify_idempotency(mock_svc_cls: MagicMock) -> None:
+    """Batch already running for this message ID returns duplicate."""
+    mock_svc_cls.return_value.build_low_balance = AsyncMock(return_value=[(1, "Low!")])
     request = _make_request()
     request.app["redis"].set = AsyncMock(return_value=None)
 
     resp = await notify_handler.__wrapped__(request)
-    assert resp.status == 200
-
-
-# ---------------------------------------------------------------------------
-# _send_notifications
-# ---------------------------------------------------------------------------
-
-
-async def test_send_notifications_happy() -> None:
-    """All messages sent successfully."""
-    bot = MagicMock()
-    bot.send_message = AsyncMock()
-
-    sent, failed = await _send_notifications(bot, [(1, "Hello"), (2, "World")])
-
-    assert sent == 2
-    assert failed == 0
 
+    assert resp.status == 200
+    assert json.loads(resp.text)["status"] == "duplicate"
+    request.app["bot"].send_message.assert_not_awaited()
 
-async def test_send_notifications_forbidden() -> None:
-    """TelegramForbiddenError counts as failed."""
-    from aiogram.exceptions import TelegramForbiddenError
-
-    bot = MagicMock()
-    bot.send_message = AsyncMock(side_effect=TelegramForbiddenError(method=MagicMock(), message="Forbidden"))
 
-    sent, failed = await _send_notifications(bot, [(1, "Hello")])
+async def test_notify_finished_batch_is_duplicate() -> None:
+    """QStash redelivery of a finished batch is not resent."""
+    request = _make_request()
+    request.app["redis"].get = AsyncMock(return_value=json.dumps({"done": True, "sent": 3}))
 
-    assert sent == 0
-    assert failed == 1
+    resp = await notify_handler.__wrapped__(request)
 
+    assert json.loads(resp.text)["status"] == "duplicate"
+    request.app["redis"].get.assert_awaited_once_with(CacheKeys.broadcast_state("notify:msg_1"))
 
-async def test_send_notifications_retry_after() -> None:
-    """TelegramRetryAfter triggers retry after sleep."""
-    from aiogram.exceptions import TelegramRetryAfter
 
-    bot = MagicMock()
-    err = TelegramRetryAfter(method=MagicMock(), message="Too many", retry_after=0)
-    bot.send_message = AsyncMock(side_effect=[err, None])
+@patch("api.notify.NotifyService")
+async def test_notify_reports_counts(mock_svc_cls: MagicMock) -> None:
+    mock_svc = MagicMock()
+    mock_svc.build_low_balance = AsyncMock(return_value=[(1, "Low!"), (2, "Low!")])
+    mock_svc_cls.return_value = mock_svc
 
-    sent, failed = await _send_notifications(bot, [(1, "Hello")])
+    request = _make_request(notify_type="low_balance")
+    resp = await notify_handler.__wrapped__(request)
 
-    assert sent == 1
-    assert failed == 0
+    body = json.loads(resp.text)
+    assert (body["status"], body["sent"], body["failed"]) == ("ok", 2, 0)
+    request.app["bot"].send_message.assert_any_await(1, "Low!", parse_mode="HTML")
@@ -0,0 +1,83 @@
+"""Tests for api/prefetch.py — QStash research prefetch handler."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.prefetch import prefetch_handler
+from services.prefetch import PrefetchResult
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_request(body: dict | None = None) -> MagicMock:
+    redis_mock = MagicMock()
+    redis_mock.set = AsyncMock(return_value="OK")
+
+    settings_mock = MagicMock()
+    settings_mock.encryption_key.get_secret_value.return_value = "key"
+    settings_mock.research_prefetch_lead_minutes = 45
+
+    app = MagicMock()
+    app.__getitem__ = MagicMock(
+        side_effect=lambda key: {
+            "db": MagicMock(),
+            "redis": redis_mock,
+            "ai_orchestrator": MagicMock(),
+            "settings": settings_mock,
+        }[key]
+    )
+
+    request = MagicMock()
+    request.app = app
+    request.__getitem__ = MagicMock(
+        side_effect=lambda k: {
+            "verified_body": body if body is not None else {"action": "prefetch"},
+            "qstash_msg_id": "msg_1",
+        }[k]
+    )
+    return request
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+@patch("api.prefetch.ResearchPrefetchService")
+async def test_prefetch_happy_path(mock_svc_cls: MagicMock) -> None:
+    mock_svc_cls.return_value.execute = AsyncMock(return_value=PrefetchResult(due=2, warmed=1, skipped=1))
+
+    resp = await prefetch_handler.__wrapped__(_make_request())
+
+    assert resp.status == 200
+    data = json.loads(resp.body)
+    assert data == {"status": "ok", "due": 2, "warmed": 1, "skipped": 1, "failed": 0}
+    assert mock_svc_cls.call_args.kwargs["lead_minutes"] == 45
+
+
+async def test_prefetch_duplicate() -> None:
+    request = _make_request()
+    request.app["redis"].set = AsyncMock(return_value=None)
+
+    resp = await prefetch_handler.__wrapped__(request)
+
+    assert json.loads(resp.body)["status"] == "duplicate"
+
+
+async def test_prefetch_invalid_payload() -> None:
+    resp = await prefetch_handler.__wrapped__(_make_request(body={"action": "other"}))
+    assert json.loads(resp.body)["reason"] == "invalid_payload"
+
+
+@patch("api.prefetch.ResearchPrefetchService")
+async def test_prefetch_error_returns_200(mock_svc_cls: MagicMock) -> None:
+    mock_svc_cls.return_value.execute = AsyncMock(side_effect=Exception("DB down"))
+
+    resp = await prefetch_handler.__wrapped__(_make_request())
+
+    assert resp.status == 200
+    assert json.loads(resp.body)["reason"] == "internal_error"
@@ -1,104 +1,102 @@
-"""Tests for api/publish.py — QStash auto-publish handler."""
+"""Tests for api/publish.py — QStash auto-publish handler and job runner."""
 
 from __future__ import annotations
 
-import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from api.publish import _build_notification_text, publish_handler
+import pytest
+
+from api.publish import _build_notification_text, publish_handler, run_publish_job
+from db.models import PublishJob
 from services.publish import PublishOutcome
+from services.publish_queue import InMemoryPublishQueue, RetryableJobError
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+_PAYLOAD = {
+    "schedule_id": 1,
+    "category_id": 10,
+    "connection_id": 5,
+    "platform_type": "wordpress",
+    "user_id": 1,
+    "project_id": 1,
+    "idempotency_key": "pub_1_09:00",
+}
 
-def _make_request(
-    body: dict | None = None,
-    msg_id: str = "msg_1",
-) -> MagicMock:
-    """Create mock request with verified_body and qstash_msg_id pre-set."""
-    if body is None:
-        body = {
-            "schedule_id": 1,
-            "category_id": 10,
-            "connection_id": 5,
-            "platform_type": "wordpress",
-            "user_id": 1,
-            "project_id": 1,
-            "idempotency_key": "pub_1_09:00",
-        }
-
-    app = MagicMock()
-    redis_mock = MagicMock()
-    redis_mock.set = AsyncMock(return_value="OK")
-    redis_mock.delete = AsyncMock(return_value=1)
 
+def _make_app(queue: Any = None, workers: Any = None) -> MagicMock:
     settings_mock = MagicMock()
     settings_mock.admin_ids = [999]
+    settings_mock.publish_job_max_attempts = 3
 
     bot_mock = MagicMock()
     bot_mock.send_message = AsyncMock()
 
-    scheduler_mock = MagicMock()
-    scheduler_mock.delete_qstash_schedules = AsyncMock()
-
     app_store = {
         "db": MagicMock(),
-        "redis": redis_mock,
+        "redis": MagicMock(),
         "http_client": MagicMock(),
         "ai_orchestrator": MagicMock(),
         "image_storage": MagicMock(),
         "settings": settings_mock,
         "bot": bot_mock,
-        "scheduler_service": scheduler_mock,
+        "scheduler_service": MagicMock(),
+        "publish_queue": queue if queue is not None else InMemoryPublishQueue(),
+        "publish_workers": workers,
     }
+    app = MagicMock()
     app.__getitem__ = MagicMock(side_effect=lambda key: app_store[key])
     app.get = MagicMock(side_effect=lambda key, default=None: app_store.get(key, default))
+    return app
 
+
+def _make_request(
+    body: dict | None = None,
+    msg_id: str = "msg_1",
+    app: MagicMock | None = None,
+) -> MagicMock:
+    """Create mock request with verified_body and qstash_msg_id pre-set."""
     request = MagicMock()
-    request.app = app
+    request.app = app if app is not None else _make_app()
     request.__getitem__ = MagicMock(
         side_effect=lambda k: {
-            "verified_body": body,
+            "verified_body": _PAYLOAD if body is None else body,
             "qstash_msg_id": msg_id,
         }[k]
     )
-
     return request
 
 
+def _job(payload: dict | None = None) -> PublishJob:
+    return PublishJob(id=1, idempotency_key="msg_1", payload=payload or _PAYLOAD, status="running", attempts=1)
+
+
 # ---------------------------------------------------------------------------
-# Tests
+# Handler: enqueue
 # ---------------------------------------------------------------------------
 
 
-@patch("bot.main.SHUTDOWN_EVENT", new_callable=lambda: type("", (), {"is_set": lambda self: False})())
-@patch("bot.main.PUBLISH_SEMAPHORE", new_callable=lambda: asyncio.Semaphore(10))
-@patch("api.publish.PublishService")
-async def test_publish_happy_path(
-    mock_svc_cls: MagicMock,
-    *args,
-) -> None:
-    """Successful publish returns 200 with ok status."""
-    from services.publish import PublishOutcome
-
-    mock_svc = MagicMock()
-    mock_svc.execute = AsyncMock(
-        return_value=PublishOutcome(
-            status="ok",
-            keyword="test",
-            user_id=1,
-            notify=False,
-        )
-    )
-    mock_svc_cls.return_value = mock_svc
-
-    request = _make_request()
-    # Need to unwrap the decorated function
-    resp = await publish_handler.__wrapped__(request)
+@patch("bot.main.SHUTDOWN_EVENT")
+async def test_publish_enqueues_and_returns_202(mock_event: MagicMock) -> None:
+    """Trigger is stored as a job and the dispatcher is woken; the pipeline does not run inline."""
+    mock_event.is_set.return_value = False
+    queue = InMemoryPublishQueue()
+    workers = MagicMock()
+    request = _make_request(app=_make_app(queue, workers))
+
+    with patch("api.publish.PublishService") as mock_svc_cls:
+        resp = await publish_handler.__wrapped__(request)
 
-    assert resp.status == 200
+    assert resp.status == 202
+    mock_svc_cls.assert_not_called()
+    workers.notify.assert_called_once()
+    job = queue.get(1)
+    assert job is not None
+    assert job.idempotency_key == "msg_1"
+    assert job.payload["schedule_id"] == 1
 
 
 @patch("bot.main.SHUTDOWN_EVENT")
@@ -112,31 +110,101 @@ async def test_publish_shutdown_503(mock_event: MagicMock) -> None:
     assert resp.status == 503
 
 
-async def test_publish_idempotency_duplicate() -> None:
-    """Duplicate message ID returns 200 with duplicate status."""
-    request = _make_request()
-    # Simulate lock not acquired (duplicate)
-    request.app["redis"].set = AsyncMock(return_value=None)
+@patch("bot.main.SHUTDOWN_EVENT")
+async def test_publish_idempotency_duplicate(mock_event: MagicMock) -> None:
+    """QStash redelivery of the same message ID is not enqueued twice."""
+    mock_event.is_set.return_value = False
+    app = _make_app()
 
-    with patch("bot.main.SHUTDOWN_EVENT") as mock_event:
-        mock_event.is_set.return_value = False
-        resp = await publish_handler.__wrapped__(request)
+    await publish_handler.__wrapped__(_make_request(app=app))
+    resp = await publish_handler.__wrapped__(_make_request(app=app))
 
     assert resp.status == 200
+    assert app["publish_queue"].get(2) is None
 
 
-async def test_publish_invalid_payload() -> None:
-    """Invalid payload returns 200 with error."""
-    request = _make_request(body={"invalid": "data"})
+@patch("bot.main.SHUTDOWN_EVENT")
+async def test_publish_invalid_payload(mock_event: MagicMock) -> None:
+    """Invalid payload returns 200 with error and nothing is enqueued."""
+    mock_event.is_set.return_value = False
+    app = _make_app()
 
-    with (
-        patch("bot.main.SHUTDOWN_EVENT") as mock_event,
-        patch("bot.main.PUBLISH_SEMAPHORE", asyncio.Semaphore(10)),
-    ):
-        mock_event.is_set.return_value = False
-        resp = await publish_handler.__wrapped__(request)
+    resp = await publish_handler.__wrapped__(_make_request(body={"invalid": "data"}, app=app))
 
     assert resp.status == 200
+    assert app["publish_queue"].get(1) is None
+
+
+@patch("bot.main.SHUTDOWN_EVENT")
+async def test_publish_missing_message_id_rejected(mock_event: MagicMock) -> None:
+    """Without Upstash-Message-Id the trigger is rejected, not enqueued under the key ""."""
+    mock_event.is_set.return_value = False
+    app = _make_app()
+
+    resp = await publish_handler.__wrapped__(_make_request(msg_id="", app=app))
+
+    assert resp.status == 400
+    assert app["publish_queue"].get(1) is None
+
+
+@patch("bot.main.SHUTDOWN_EVENT")
+async def test_publish_enqueue_failure_503(mock_event: MagicMock) -> None:
+    """If the job cannot be stored, QStash is asked to retry."""
+    mock_event.is_set.return_value = False
+    queue = MagicMock()
+    queue.enqueue = AsyncMock(side_effect=RuntimeError("db down"))
+
+    resp = await publish_handler.__wrapped__(_make_request(app=_make_app(queue)))
+
+    assert resp.status == 503
+    assert resp.headers["Retry-After"] == "30"
+
+
+# ---------------------------------------------------------------------------
+# Job runner
+# ---------------------------------------------------------------------------
+
+
+@patch("api.publish.PublishService")
+async def test_run_publish_job_notifies(mock_svc_cls: MagicMock) -> None:
+    """Runner executes the pipeline and sends the user notification."""
+    mock_svc_cls.return_value.execute = AsyncMock(
+        return_value=PublishOutcome(status="ok", keyword="test", user_id=1, notify=True)
+    )
+    app = _make_app()
+
+    result = await run_publish_job(app, _job())
+
+    assert result == {"status": "ok", "reason": ""}
+    payload = mock_svc_cls.return_value.execute.call_args[0][0]
+    assert payload.schedule_id == 1
+    app["bot"].send_message.assert_awaited_once()
+
+
+@patch("api.publish.PublishService")
+async def test_run_publish_job_propagates_errors(mock_svc_cls: MagicMock) -> None:
+    """Unexpected errors reach the worker pool as-is (terminal there, never retried)."""
+    mock_svc_cls.return_value.execute = AsyncMock(side_effect=RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await run_publish_job(_make_app(), _job())
+
+
+@patch("api.publish.PublishService")
+async def test_run_publish_job_resumable_failure_requeues(mock_svc_cls: MagicMock) -> None:
+    """status=retry is raised to the pool (job requeued, user not notified); checkpoints keyed by job key."""
+    mock_svc_cls.return_value.execute = AsyncMock(
+        return_value=PublishOutcome(status="retry", reason="Publish failed: 502", user_id=1, notify=True)
+    )
+    app = _make_app()
+
+    with pytest.raises(RetryableJobError, match="502"):
+        await run_publish_job(app, _job())
+
+    kwargs = mock_svc_cls.return_value.execute.call_args.kwargs
+    assert kwargs["run_key"] == "publish:msg_1"
+    assert kwargs["can_retry"] is True
+    app["bot"].send_message.assert_not_awaited()
 
 
 # ---------------------------------------------------------------------------
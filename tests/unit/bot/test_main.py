@@ -12,7 +12,7 @@ from bot.main import (
     _refund_active_generations,
     create_bot,
     create_dispatcher,
-    create_http_client,
+    create_http_clients,
 )
 
 
@@ -60,11 +60,11 @@ class TestCreateBot:
         assert bot is not None
 
 
-class TestCreateHttpClient:
-    def test_creates_httpx_client(self) -> None:
+class TestCreateHttpClients:
+    def test_default_pool_is_httpx_client(self) -> None:
         import httpx
 
-        client = create_http_client()
+        client = create_http_clients().get("default")
         assert isinstance(client, httpx.AsyncClient)
 
 
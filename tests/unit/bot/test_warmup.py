@@ -0,0 +1,174 @@
+"""Tests for bot/warmup.py -- startup connection warm-up for core upstreams."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from bot import warmup
+from bot.main import on_startup
+from bot.warmup import build_probes, keep_alive, start_warmup, stop_warmup, warm_up, warmup_report
+
+# ---------------------------------------------------------------------------
+# warm_up
+# ---------------------------------------------------------------------------
+
+
+class TestWarmUp:
+    async def test_probe_called_cold_then_warm(self) -> None:
+        probe = AsyncMock()
+
+        results = await warm_up({"supabase": probe}, timeout=1.0)
+
+        assert probe.await_count == 2
+        assert results[0].ok is True
+        assert results[0].cold_ms is not None
+        assert results[0].warm_ms is not None
+        assert warmup_report()["supabase"]["ok"] is True
+
+    async def test_failure_recorded_not_raised(self) -> None:
+        results = await warm_up({"upstash": AsyncMock(side_effect=RuntimeError("ping failed"))}, timeout=1.0)
+
+        assert results[0].ok is False
+        assert results[0].error == "ping failed"
+
+    async def test_slow_probe_bounded_by_timeout(self) -> None:
+        async def _slow() -> None:
+            await asyncio.sleep(5)
+
+        results = await warm_up({"openrouter": _slow, "supabase": AsyncMock()}, timeout=0.05)
+
+        by_name = {r.upstream: r for r in results}
+        assert by_name["openrouter"].error == "timeout"
+        assert by_name["supabase"].ok is True
+
+    async def test_start_warmup_runs_in_background(self) -> None:
+        probe = AsyncMock()
+
+        task = start_warmup({"supabase": probe}, timeout=1.0)
+
+        assert task is not None
+        assert warmup._task is task
+        await task
+        assert probe.await_count == 2
+
+    def test_start_warmup_without_probes(self) -> None:
+        assert start_warmup({}, timeout=1.0) is None
+
+
+# ---------------------------------------------------------------------------
+# keep_alive
+# ---------------------------------------------------------------------------
+
+
+class TestKeepAlive:
+    async def _ticks(self, *args: object, **kwargs: object) -> None:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(keep_alive(*args, **kwargs), 0.1)  # type: ignore[arg-type]
+
+    async def test_idle_upstream_reprobed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(warmup, "_keepalive", {})
+        probe = AsyncMock()
+
+        await self._ticks({"supabase": probe}, 0.02, 1.0)
+
+        assert probe.await_count >= 2
+        assert warmup_report()["supabase"]["keepalive"]["probes"] == probe.await_count
+
+    async def test_busy_upstream_skipped(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(warmup, "_keepalive", {})
+        probe = AsyncMock()
+        requests = iter(range(0, 1000, 5))  # real traffic between every tick
+
+        await self._ticks({"openrouter": probe}, 0.02, 1.0, {"openrouter": lambda: next(requests)})
+
+        probe.assert_not_awaited()
+        assert warmup_report()["openrouter"]["keepalive"]["skipped_busy"] >= 2
+
+    async def test_failure_recorded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(warmup, "_keepalive", {})
+
+        await self._ticks({"upstash": AsyncMock(side_effect=RuntimeError("ping failed"))}, 0.02, 1.0)
+
+        report = warmup_report()["upstash"]["keepalive"]
+        assert report["failures"] == report["probes"] > 0
+        assert report["last_error"] == "ping failed"
+
+    async def test_started_with_warmup_and_stopped(self) -> None:
+        start_warmup({"supabase": AsyncMock()}, timeout=1.0, keepalive_interval=60.0)
+        keepalive_task = warmup._keepalive_task
+        assert keepalive_task is not None
+
+        await stop_warmup()
+
+        assert keepalive_task.cancelled()
+        assert warmup._keepalive_task is None
+
+
+# ---------------------------------------------------------------------------
+# build_probes / on_startup
+# ---------------------------------------------------------------------------
+
+
+class TestBuildProbes:
+    def test_only_configured_upstreams(self) -> None:
+        probes = build_probes(db=MagicMock(), openrouter_client=MagicMock(), openrouter_api_key="")
+        assert set(probes) == {"supabase"}
+
+    async def test_openrouter_probe_uses_given_pool(self) -> None:
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={"data": {}})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        probes = build_probes(openrouter_client=client, openrouter_api_key="sk-test")
+
+        await probes["openrouter"]()
+
+        assert seen[0].url.path == "/api/v1/key"
+        assert seen[0].headers["Authorization"] == "Bearer sk-test"
+
+    async def test_redis_ping_false_is_failure(self) -> None:
+        redis = MagicMock()
+        redis.ping = AsyncMock(return_value=False)
+
+        results = await warm_up(build_probes(redis=redis), timeout=1.0)
+
+        assert results[0].ok is False
+
+
+@patch("bot.main.start_warmup")
+async def test_on_startup_schedules_warmup(mock_start: MagicMock) -> None:
+    settings = MagicMock()
+    settings.railway_public_url = ""
+    settings.startup_warmup_timeout = 3.0
+    bot = MagicMock()
+    bot.set_webhook = AsyncMock()
+
+    await on_startup(bot, settings, db=MagicMock(), redis=MagicMock())
+
+    probes = mock_start.call_args.args[0]
+    assert set(probes) == {"supabase", "upstash"}
+    assert mock_start.call_args.kwargs["timeout"] == 3.0
+    assert mock_start.call_args.kwargs["keepalive_interval"] is settings.upstream_keepalive_interval
+
+
+@patch("bot.main.start_warmup")
+async def test_on_startup_gates_keepalive_on_activity(mock_start: MagicMock) -> None:
+    """Supabase and Upstash probes are skipped while their clients carry real traffic."""
+    settings = MagicMock()
+    settings.railway_public_url = ""
+    bot = MagicMock()
+    bot.set_webhook = AsyncMock()
+    db, redis = MagicMock(), MagicMock()
+
+    await on_startup(bot, settings, db=db, redis=redis)
+
+    activity = mock_start.call_args.kwargs["activity"]
+    assert activity == {"supabase": db.request_count, "upstash": redis.request_count}
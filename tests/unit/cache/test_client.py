@@ -5,6 +5,21 @@ from unittest.mock import AsyncMock
 import pytest
 
 
+class TestRequestCount:
+    @pytest.mark.asyncio
+    async def test_counts_commands_sent(self) -> None:
+        from cache.client import RedisClient
+
+        client = RedisClient(url="https://test.upstash.io", token="test-token")
+        client._redis._http.execute = AsyncMock(return_value={"result": "PONG"})  # type: ignore[method-assign]
+        assert client.request_count() == 0
+
+        await client.ping()
+        await client.ping()
+
+        assert client.request_count() == 2
+
+
 class TestRedisPing:
     @pytest.mark.asyncio
     async def test_ping_returns_true_on_pong(self) -> None:
@@ -0,0 +1,128 @@
+"""Tests for db/repositories/bamboodom_keywords.py — bulk upsert via RPC."""
+
+from typing import Any
+
+import pytest
+
+from db.models import BamboodomKeywordCreate
+from db.repositories.bamboodom_keywords import BamboodomKeywordsRepository
+
+from .conftest import MockResponse, MockSupabaseClient
+
+
+@pytest.fixture
+def repo(mock_db: MockSupabaseClient) -> BamboodomKeywordsRepository:
+    return BamboodomKeywordsRepository(mock_db)  # type: ignore[arg-type]
+
+
+def _item(keyword: str, **overrides: Any) -> BamboodomKeywordCreate:
+    defaults: dict[str, Any] = {"keyword": keyword, "material": "wpc", "search_volume": 100}
+    defaults.update(overrides)
+    return BamboodomKeywordCreate(**defaults)
+
+
+def _base_row(keyword: str) -> dict[str, Any]:
+    return {"id": 1, "keyword": keyword, "material": "wpc", "search_volume": 500, "status": "used"}
+
+
+class TestSaveBatch:
+    async def test_empty(self, repo: BamboodomKeywordsRepository) -> None:
+        assert await repo.save_batch([]) == {"new": 0, "updated": 0, "total": 0}
+
+    async def test_single_rpc_call(self, repo: BamboodomKeywordsRepository, mock_db: MockSupabaseClient) -> None:
+        calls: list[tuple[str, dict]] = []
+
+        async def _rpc(fn_name: str, params: dict | None = None) -> list[dict]:
+            calls.append((fn_name, params or {}))
+            return [{"new_count": 2, "updated_count": 1}]
+
+        mock_db.rpc = _rpc  # type: ignore[method-assign]
+
+        result = await repo.save_batch([_item("a"), _item("b"), _item("c")])
+
+        assert result == {"new": 2, "updated": 1, "total": 3}
+        assert len(calls) == 1
+        fn_name, params = calls[0]
+        assert fn_name == "bbk_upsert_keywords"
+        assert params["p_update_existing"] is True
+        assert [r["keyword"] for r in params["p_rows"]] == ["a", "b", "c"]
+
+    async def test_large_batch_chunked(self, repo: BamboodomKeywordsRepository, mock_db: MockSupabaseClient) -> None:
+        sizes: list[int] = []
+
+        async def _rpc(fn_name: str, params: dict | None = None) -> list[dict]:
+            rows = (params or {})["p_rows"]
+            sizes.append(len(rows))
+            return [{"new_count": 0, "updated_count": len(rows)}]
+
+        mock_db.rpc = _rpc  # type: ignore[method-assign]
+
+        result = await repo.save_batch([_item(f"kw {i}") for i in range(1200)])
+
+        assert sizes == [500, 500, 200]
+        assert result["updated"] == 1200
+
+    async def test_rpc_unavailable_falls_back(
+        self, repo: BamboodomKeywordsRepository, mock_db: MockSupabaseClient
+    ) -> None:
+        mock_db.set_response("bamboodom_keywords", MockResponse(data=[]))
+
+        result = await repo.save_batch([_item("a"), _item("b")])
+
+        assert result == {"new": 2, "updated": 0, "total": 2}
+
+    async def test_later_chunk_failure_falls_back_for_rest(
+        self, repo: BamboodomKeywordsRepository, mock_db: MockSupabaseClient
+    ) -> None:
+        """Chunks already upserted are not redone; counts from both paths are summed."""
+        calls = 0
+
+        async def _rpc(fn_name: str, params: dict | None = None) -> list[dict]:
+            nonlocal calls
+            calls += 1
+            if calls > 1:
+                raise RuntimeError("statement timeout")
+            return [{"new_count": 0, "updated_count": len((params or {})["p_rows"])}]
+
+        mock_db.rpc = _rpc  # type: ignore[method-assign]
+        mock_db.set_response("bamboodom_keywords", MockResponse(data=[]))
+
+        result = await repo.save_batch([_item(f"kw {i}") for i in range(700)])
+
+        assert result == {"new": 200, "updated": 500, "total": 700}
+
+
+class TestExpandToCities:
+    async def test_skips_existing_via_rpc(self, repo: BamboodomKeywordsRepository, mock_db: MockSupabaseClient) -> None:
+        calls: list[dict] = []
+
+        async def _rpc(fn_name: str, params: dict | None = None) -> list[dict]:
+            calls.append(params or {})
+            return [{"new_count": 3, "updated_count": 0}]
+
+        mock_db.rpc = _rpc  # type: ignore[method-assign]
+        mock_db.set_response("bamboodom_keywords", MockResponse(data=[_base_row("купить wpc панели")]))
+
+        result = await repo.expand_to_cities("wpc", cities=["Ялта", "Керчь", "Саки", "Судак"])
+
+        assert result["new"] == 3
+        assert result["skipped"] == 1
+        assert calls[0]["p_update_existing"] is False
+        assert {r["city"] for r in calls[0]["p_rows"]} == {"Ялта", "Керчь", "Саки", "Судак"}
+        assert all(r["status"] == "new" for r in calls[0]["p_rows"])
+
+    async def test_rpc_unavailable_falls_back(
+        self, repo: BamboodomKeywordsRepository, mock_db: MockSupabaseClient
+    ) -> None:
+        mock_db.set_responses(
+            "bamboodom_keywords",
+            [
+                MockResponse(data=[_base_row("купить wpc панели")]),
+                MockResponse(data=[{"keyword": "купить wpc панели", "city": "Ялта"}]),
+                MockResponse(data=[]),
+            ],
+        )
+
+        result = await repo.expand_to_cities("wpc", cities=["Ялта", "Керчь"])
+
+        assert result == {"new": 1, "skipped": 1, "total": 2, "skipped_too_generic": 0}
@@ -0,0 +1,153 @@
+"""Tests for db/repositories/base.py — request-scoped identity map and batched get_by_id."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from db.models import CategoryUpdate
+from db.repositories.base import request_scope
+from db.repositories.categories import CategoriesRepository
+from db.repositories.users import UsersRepository
+
+from .conftest import MockResponse, MockSupabaseClient
+
+
+def _user(user_id: int, balance: int = 1500) -> dict[str, Any]:
+    return {"id": user_id, "username": f"u{user_id}", "balance": balance, "role": "user"}
+
+
+def _category(category_id: int, name: str = "Cat") -> dict[str, Any]:
+    return {"id": category_id, "project_id": 1, "name": name}
+
+
+@pytest.fixture
+def table_calls(mock_db: MockSupabaseClient) -> list[str]:
+    """Record every table() call made through mock_db."""
+    calls: list[str] = []
+    original = mock_db.table
+
+    def _table(name: str) -> Any:
+        calls.append(name)
+        return original(name)
+
+    mock_db.table = _table  # type: ignore[method-assign]
+    return calls
+
+
+class TestRequestScope:
+    async def test_memoized_within_scope(self, mock_db: MockSupabaseClient, table_calls: list[str]) -> None:
+        mock_db.set_response("users", MockResponse(data=[_user(1)]))
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope():
+            first = await repo.get_by_id(1)
+            second = await UsersRepository(mock_db).get_by_id(1)  # type: ignore[arg-type]
+
+        assert first is not None and second is not None
+        assert first is not second
+        assert table_calls == ["users"]
+
+    async def test_concurrent_gets_batched(self, mock_db: MockSupabaseClient, table_calls: list[str]) -> None:
+        mock_db.set_response("users", MockResponse(data=[_user(1), _user(2)]))
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope():
+            u1, u2, missing, again = await asyncio.gather(
+                repo.get_by_id(1), repo.get_by_id(2), repo.get_by_id(3), repo.get_by_id(1)
+            )
+
+        assert (u1.id, u2.id, again.id) == (1, 2, 1)  # type: ignore[union-attr]
+        assert missing is None
+        assert table_calls == ["users"]
+
+    async def test_update_refreshes_memoized_row(self, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_responses(
+            "categories",
+            [MockResponse(data=[_category(5)]), MockResponse(data=[_category(5, name="Renamed")])],
+        )
+        repo = CategoriesRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope():
+            assert (await repo.get_by_id(5)).name == "Cat"  # type: ignore[union-attr]
+            await repo.update(5, CategoryUpdate(name="Renamed"))
+            assert (await repo.get_by_id(5)).name == "Renamed"  # type: ignore[union-attr]
+
+    async def test_balance_change_invalidates(self, mock_db: MockSupabaseClient, table_calls: list[str]) -> None:
+        mock_db.set_response("users", MockResponse(data=[_user(1)]))
+        mock_db.set_rpc_response("charge_balance", [{"charge_balance": 1400}])
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope():
+            await repo.get_by_id(1)
+            await repo.charge_balance(1, 100)
+            await repo.get_by_id(1)
+
+        assert table_calls == ["users", "users"]
+
+    async def test_created_user_visible_in_scope(self, mock_db: MockSupabaseClient, table_calls: list[str]) -> None:
+        """get_or_create for a new user replaces the memoized None (balance not stuck at 0)."""
+        from db.models import UserCreate
+
+        mock_db.set_responses("users", [MockResponse(data=[]), MockResponse(data=[_user(7, balance=1500)])])
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope():
+            _, is_new = await repo.get_or_create(UserCreate(id=7, username="u7"))
+            user = await repo.get_by_id(7)
+
+        assert is_new is True
+        assert user is not None and user.balance == 1500
+        assert table_calls == ["users", "users"]
+
+    async def test_fresh_read_bypasses_memoized_row(self, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_responses("users", [MockResponse(data=[_user(1)]), MockResponse(data=[_user(1, balance=200)])])
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope():
+            assert (await repo.get_by_id(1)).balance == 1500  # type: ignore[union-attr]
+            assert (await repo.get_by_id(1, fresh=True)).balance == 200  # type: ignore[union-attr]
+            assert (await repo.get_by_id(1)).balance == 200  # type: ignore[union-attr]
+
+    async def test_fetch_error_propagates_and_is_not_cached(self, mock_db: MockSupabaseClient) -> None:
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+        original = mock_db.table
+        failures = iter([RuntimeError("boom")])
+
+        def _table(name: str) -> Any:
+            exc = next(failures, None)
+            if exc is not None:
+                raise exc
+            return original(name)
+
+        mock_db.table = _table  # type: ignore[method-assign]
+        mock_db.set_response("users", MockResponse(data=[_user(1)]))
+
+        with request_scope():
+            with pytest.raises(RuntimeError, match="boom"):
+                await repo.get_by_id(1)
+            assert await repo.get_by_id(1) is not None
+
+    async def test_no_caching_outside_scope(self, mock_db: MockSupabaseClient, table_calls: list[str]) -> None:
+        mock_db.set_response("users", MockResponse(data=[_user(1)]))
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope():
+            await repo.get_by_id(1)
+        await repo.get_by_id(1)
+        await repo.get_by_id(1)
+
+        assert table_calls == ["users", "users", "users"]
+
+    async def test_nested_scope_reuses_outer(self, mock_db: MockSupabaseClient, table_calls: list[str]) -> None:
+        mock_db.set_response("users", MockResponse(data=[_user(1)]))
+        repo = UsersRepository(mock_db)  # type: ignore[arg-type]
+
+        with request_scope() as outer:
+            await repo.get_by_id(1)
+            with request_scope() as inner:
+                await repo.get_by_id(1)
+            assert inner is outer
+            await repo.get_by_id(1)
+
+        assert table_calls == ["users"]
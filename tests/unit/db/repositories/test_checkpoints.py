@@ -0,0 +1,42 @@
+"""Tests for db/repositories/checkpoints.py — pipeline stage checkpoints."""
+
+from typing import Any
+
+import pytest
+
+from db.repositories.checkpoints import CheckpointsRepository
+
+from .conftest import MockResponse, MockSupabaseClient
+
+
+def _row(stage: str, **data: Any) -> dict[str, Any]:
+    return {"run_key": "publish:msg_1", "stage": stage, "data": data, "created_at": "2026-10-18T00:00:00+00:00"}
+
+
+@pytest.fixture
+def repo(mock_db: MockSupabaseClient) -> CheckpointsRepository:
+    return CheckpointsRepository(mock_db)  # type: ignore[arg-type]
+
+
+class TestCheckpointsRepository:
+    async def test_get_stages(self, repo: CheckpointsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response(
+            "pipeline_checkpoints",
+            MockResponse(data=[_row("keyword", keyword="kw"), _row("outline", outline="...")]),
+        )
+
+        rows = await repo.get_stages("publish:msg_1", "2026-10-17T00:00:00+00:00")
+
+        assert {r.stage: r.data for r in rows} == {"keyword": {"keyword": "kw"}, "outline": {"outline": "..."}}
+
+    async def test_get_stages_empty(self, repo: CheckpointsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("pipeline_checkpoints", MockResponse(data=[]))
+
+        assert await repo.get_stages("publish:msg_1", "2026-10-17T00:00:00+00:00") == []
+
+    async def test_delete_before_returns_rows(self, repo: CheckpointsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("pipeline_checkpoints", MockResponse(data=[_row("images", paths=["1/2/a.webp"])]))
+
+        rows = await repo.delete_before("2026-10-17T00:00:00+00:00")
+
+        assert [r.data["paths"] for r in rows] == [["1/2/a.webp"]]
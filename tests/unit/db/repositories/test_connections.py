@@ -1,5 +1,7 @@
 """Tests for db/repositories/connections.py — encryption integration."""
 
+from unittest.mock import patch
+
 import pytest
 
 from db.credential_manager import CredentialManager
@@ -53,6 +55,24 @@ class TestGetById:
         assert await repo.get_by_id(999) is None
 
 
+class TestGetByIds:
+    async def test_keyed_by_id(
+        self,
+        repo: ConnectionsRepository,
+        mock_db: MockSupabaseClient,
+        connection_row: dict,
+        raw_creds: dict,
+    ) -> None:
+        mock_db.set_response("platform_connections", MockResponse(data=[connection_row, {**connection_row, "id": 2}]))
+        conns = await repo.get_by_ids([1, 2, 3])
+        assert sorted(conns) == [1, 2]
+        assert conns[2].credentials == raw_creds
+
+    async def test_empty_ids_skip_query(self, repo: ConnectionsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("platform_connections", MockResponse(data=[{"id": 1}]))
+        assert await repo.get_by_ids([]) == {}
+
+
 class TestGetByProject:
     async def test_returns_decrypted_list(
         self,
@@ -65,6 +85,22 @@ class TestGetByProject:
         assert len(conns) == 1
         assert conns[0].platform_type == "wordpress"
 
+    async def test_list_decrypts_lazily(
+        self,
+        repo: ConnectionsRepository,
+        mock_db: MockSupabaseClient,
+        credential_manager: CredentialManager,
+        connection_row: dict,
+        raw_creds: dict,
+    ) -> None:
+        mock_db.set_response("platform_connections", MockResponse(data=[connection_row, {**connection_row, "id": 2}]))
+        with patch.object(credential_manager, "decrypt", wraps=credential_manager.decrypt) as decrypt:
+            conns = await repo.get_by_project(1)
+            assert [c.identifier for c in conns] == ["https://site.com", "https://site.com"]
+            decrypt.assert_not_called()
+            assert conns[0].credentials == raw_creds
+        decrypt.assert_called_once()
+
 
 class TestGetByProjectAndPlatform:
     async def test_filtered(
@@ -108,6 +144,23 @@ class TestUpdateCredentials:
         conn = await repo.update_credentials(1, new_creds)
         assert conn is not None
 
+    async def test_evicts_old_plaintext(
+        self,
+        repo: ConnectionsRepository,
+        mock_db: MockSupabaseClient,
+        credential_manager: CredentialManager,
+        connection_row: dict,
+    ) -> None:
+        credential_manager.decrypt(connection_row["credentials"])
+        new_row = {**connection_row, "credentials": credential_manager.encrypt({"user": "new"})}
+        mock_db.set_responses(
+            "platform_connections",
+            [MockResponse(data=connection_row), MockResponse(data=[new_row])],
+        )
+        with patch.object(credential_manager, "evict", wraps=credential_manager.evict) as evict:
+            await repo.update_credentials(1, {"user": "new"})
+        evict.assert_called_once_with(connection_row["credentials"])
+
     async def test_not_found(self, repo: ConnectionsRepository, mock_db: MockSupabaseClient) -> None:
         mock_db.set_response("platform_connections", MockResponse(data=[]))
         assert await repo.update_credentials(999, {"key": "val"}) is None
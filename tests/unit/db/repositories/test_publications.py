@@ -1,5 +1,7 @@
 """Tests for db/repositories/publications.py — including keyword rotation."""
 
+from typing import Any
+
 import pytest
 
 from db.models import PublicationLog, PublicationLogCreate
@@ -320,8 +322,81 @@ class TestContentTypeCooldown:
         assert kw == "seo tips"
 
 
+class TestRotateKeywordRpc:
+    """Server-side rotation: one rotate_keyword RPC, table reads only as fallback."""
+
+    async def test_rpc_result_used(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_rpc_response("rotate_keyword", [{"keyword": "p2", "low_pool": True}])
+        clusters = [_make_cluster("a", "p1", total_volume=2000), _make_cluster("b", "p2", total_volume=1000)]
+
+        kw, warning = await repo.get_rotation_keyword(1, clusters)
+
+        assert kw == "p2"
+        assert warning is True
+
+    async def test_rpc_receives_ordered_pool(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        calls: list[dict] = []
+
+        async def _rpc(fn_name: str, params: dict | None = None) -> list[dict]:
+            calls.append(params or {})
+            return [{"keyword": "high", "low_pool": False}]
+
+        mock_db.rpc = _rpc  # type: ignore[method-assign]
+        clusters = [
+            _make_cluster("x", "low", total_volume=10),
+            _make_cluster("y", "high", total_volume=900),
+            _make_cluster("z", "product", cluster_type="product_page", total_volume=5000),
+        ]
+
+        await repo.get_rotation_keyword(7, clusters, content_type="article")
+
+        assert calls[0]["p_category_id"] == 7
+        assert calls[0]["p_pool"] == ["high", "low"]
+        assert calls[0]["p_content_type"] == "article"
+
+    async def test_rpc_error_falls_back_to_table_reads(
+        self, repo: PublicationsRepository, mock_db: MockSupabaseClient
+    ) -> None:
+        mock_db.set_rpc_error("rotate_keyword", "function rotate_keyword does not exist")
+        mock_db.set_response("publication_logs", MockResponse(data=[{"keyword": "kw1"}]))
+        keywords = [
+            {"phrase": "kw1", "volume": 1000, "difficulty": 10},
+            {"phrase": "kw2", "volume": 500, "difficulty": 20},
+        ]
+
+        kw, _ = await repo.get_rotation_keyword(1, keywords)
+
+        assert kw == "kw2"
+
+
+def _stats_unavailable(mock_db: MockSupabaseClient) -> None:
+    """Make publication_stats reads fail (migration not applied)."""
+    original = mock_db.table
+
+    def _table(name: str) -> Any:
+        if name == "publication_stats":
+            raise RuntimeError('relation "publication_stats" does not exist')
+        return original(name)
+
+    mock_db.table = _table  # type: ignore[method-assign]
+
+
 class TestGetStatsByUser:
-    async def test_aggregated_stats(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+    async def test_reads_counters(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response(
+            "publication_stats",
+            MockResponse(data=[{"scope_id": 123456789, "total": 3, "success": 2, "tokens_spent": 300}]),
+        )
+        stats = await repo.get_stats_by_user(123456789)
+        assert stats == {"total_publications": 2, "total_tokens_spent": 300}
+
+    async def test_no_counter_row_is_zero(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("publication_stats", MockResponse(data=[]))
+        stats = await repo.get_stats_by_user(123456789)
+        assert stats == {"total_publications": 0, "total_tokens_spent": 0}
+
+    async def test_falls_back_to_log_scan(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        _stats_unavailable(mock_db)
         mock_db.set_response(
             "publication_logs",
             MockResponse(
@@ -332,3 +407,43 @@ class TestGetStatsByUser:
         stats = await repo.get_stats_by_user(123456789)
         assert stats["total_publications"] == 2
         assert stats["total_tokens_spent"] == 300
+
+
+class TestCounters:
+    async def test_stats_by_users_batch(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response(
+            "publication_stats",
+            MockResponse(
+                data=[
+                    {"scope_id": 1, "total": 5, "success": 4, "tokens_spent": 0},
+                    {"scope_id": 2, "total": 1, "success": 0, "tokens_spent": 0},
+                ]
+            ),
+        )
+        assert await repo.get_stats_by_users_batch([1, 2, 3]) == {1: 4}
+
+    async def test_count_by_user_counts_all_statuses(
+        self, repo: PublicationsRepository, mock_db: MockSupabaseClient
+    ) -> None:
+        mock_db.set_response(
+            "publication_stats", MockResponse(data=[{"scope_id": 7, "total": 5, "success": 4, "tokens_spent": 0}])
+        )
+        assert await repo.count_by_user(7) == 5
+
+    async def test_get_count_by_category(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response(
+            "publication_stats", MockResponse(data=[{"scope_id": 10, "total": 5, "success": 4, "tokens_spent": 0}])
+        )
+        assert await repo.get_count_by_category(10) == 4
+
+    async def test_count_recent_sums_days(self, repo: PublicationsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("publication_stats", MockResponse(data=[{"success": 3}, {"success": 4}]))
+        assert await repo.count_recent(7) == 7
+
+    async def test_count_falls_back_to_log_scan(
+        self, repo: PublicationsRepository, mock_db: MockSupabaseClient
+    ) -> None:
+        _stats_unavailable(mock_db)
+        mock_db.set_response("publication_logs", MockResponse(data=[], count=9))
+        assert await repo.get_count_by_connection(5) == 9
+        assert await repo.count_recent(7) == 9
@@ -0,0 +1,79 @@
+"""Tests for db/repositories/publish_jobs.py — durable publish queue."""
+
+from typing import Any
+
+import pytest
+
+from db.repositories.publish_jobs import PublishJobsRepository
+
+from .conftest import MockResponse, MockSupabaseClient
+
+
+def _job_row(**overrides: Any) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "id": 7,
+        "idempotency_key": "msg_1",
+        "payload": {"schedule_id": 1},
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": 3,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def repo(mock_db: MockSupabaseClient) -> PublishJobsRepository:
+    return PublishJobsRepository(mock_db)  # type: ignore[arg-type]
+
+
+class TestEnqueue:
+    async def test_new_job(self, repo: PublishJobsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("publish_jobs", MockResponse(data=[_job_row()]))
+
+        job = await repo.enqueue("msg_1", {"schedule_id": 1})
+
+        assert job is not None and job.id == 7
+
+    async def test_duplicate_returns_none(self, repo: PublishJobsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("publish_jobs", MockResponse(data=[]))
+
+        assert await repo.enqueue("msg_1", {"schedule_id": 1}) is None
+
+
+class TestClaim:
+    async def test_claim_via_rpc(self, repo: PublishJobsRepository, mock_db: MockSupabaseClient) -> None:
+        calls: list[tuple[str, dict]] = []
+
+        async def _rpc(fn_name: str, params: dict | None = None) -> list[dict]:
+            calls.append((fn_name, params or {}))
+            return [_job_row(status="running", attempts=1, lease_owner="w1")]
+
+        mock_db.rpc = _rpc  # type: ignore[method-assign]
+
+        jobs = await repo.claim("w1", 3, lease_seconds=120)
+
+        assert [j.lease_owner for j in jobs] == ["w1"]
+        assert calls == [("claim_publish_jobs", {"p_worker": "w1", "p_limit": 3, "p_lease_seconds": 120})]
+
+    async def test_claim_has_no_fallback(self, repo: PublishJobsRepository) -> None:
+        with pytest.raises(RuntimeError):
+            await repo.claim("w1", 1, lease_seconds=120)
+
+
+class TestSettle:
+    async def test_lost_lease_reports_false(self, repo: PublishJobsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("publish_jobs", MockResponse(data=[]))
+
+        assert await repo.complete(7, "w1", {"status": "ok"}) is False
+        assert await repo.heartbeat(7, "w1", 120) is False
+
+    async def test_fail_with_retry(self, repo: PublishJobsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("publish_jobs", MockResponse(data=[_job_row(status="queued")]))
+
+        assert await repo.fail(7, "w1", "boom", retry_in=60) is True
+
+    async def test_delete_finished_before(self, repo: PublishJobsRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_response("publish_jobs", MockResponse(data=[_job_row(id=1), _job_row(id=2)]))
+
+        assert await repo.delete_finished_before("2026-10-11T00:00:00+00:00") == 2
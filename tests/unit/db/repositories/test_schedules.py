@@ -71,6 +71,15 @@ class TestGetEnabled:
         assert scheds[0].enabled is True
 
 
+class TestGetSlotHistogram:
+    async def test_maps_rpc_rows(self, repo: SchedulesRepository, mock_db: MockSupabaseClient) -> None:
+        mock_db.set_rpc_response(
+            "publish_slot_histogram",
+            [{"minute_of_week": 1980, "load": 3}, {"minute_of_week": 2000, "load": 1}],
+        )
+        assert await repo.get_slot_histogram() == {1980: 3, 2000: 1}
+
+
 class TestCreate:
     async def test_create(self, repo: SchedulesRepository, mock_db: MockSupabaseClient, schedule_row: dict) -> None:
         mock_db.set_response("platform_schedules", MockResponse(data=[schedule_row]))
@@ -1,9 +1,12 @@
 """Tests for db/credential_manager.py — Fernet encrypt/decrypt."""
 
+from unittest.mock import patch
+
 import pytest
 from cryptography.fernet import Fernet, InvalidToken
 
-from db.credential_manager import CredentialManager
+from db.credential_manager import CredentialManager, LazyCredentials, get_credential_manager
+from db.models import PlatformConnection
 
 
 @pytest.fixture
@@ -67,3 +70,65 @@ class TestCredentialManager:
     def test_encrypt_with_numbers_and_booleans(self, cm: CredentialManager) -> None:
         original = {"port": 443, "verify": True, "retries": 0}
         assert cm.decrypt(cm.encrypt(original)) == original
+
+
+class TestDecryptCache:
+    def test_repeated_decrypt_skips_fernet(self, cm: CredentialManager) -> None:
+        encrypted = cm.encrypt({"token": "abc"})
+        cm.decrypt(encrypted)
+        with patch.object(cm._fernet, "decrypt", side_effect=AssertionError("not cached")):
+            assert cm.decrypt(encrypted) == {"token": "abc"}
+
+    def test_returns_copy(self, cm: CredentialManager) -> None:
+        encrypted = cm.encrypt({"nested": {"token": "abc"}})
+        cm.decrypt(encrypted)["nested"]["token"] = "mutated"
+        assert cm.decrypt(encrypted) == {"nested": {"token": "abc"}}
+
+    def test_bounded_lru(self, encryption_key: str) -> None:
+        cm = CredentialManager(encryption_key, cache_size=2)
+        tokens = [cm.encrypt({"n": i}) for i in range(3)]
+        for token in tokens:
+            cm.decrypt(token)
+        assert len(cm._cache) == 2
+        with patch.object(cm._fernet, "decrypt", wraps=cm._fernet.decrypt) as fernet_decrypt:
+            cm.decrypt(tokens[0])
+        fernet_decrypt.assert_called_once()
+
+    def test_evict(self, cm: CredentialManager) -> None:
+        encrypted = cm.encrypt({"token": "abc"})
+        cm.decrypt(encrypted)
+        cm.evict(encrypted)
+        assert not cm._cache
+
+    def test_process_wide_instance(self, encryption_key: str) -> None:
+        assert get_credential_manager(encryption_key) is get_credential_manager(encryption_key)
+
+
+class TestLazyCredentials:
+    def test_decrypts_on_first_access(self, cm: CredentialManager) -> None:
+        encrypted = cm.encrypt({"token": "abc"})
+        with patch.object(cm, "decrypt", wraps=cm.decrypt) as decrypt:
+            creds = LazyCredentials(cm, encrypted)
+            decrypt.assert_not_called()
+            assert creds["token"] == "abc"
+            assert creds.get("token") == "abc"
+            assert dict(creds) == {"token": "abc"}
+        decrypt.assert_called_once_with(encrypted)
+
+    def test_encrypt_materializes(self, cm: CredentialManager) -> None:
+        creds = LazyCredentials(cm, cm.encrypt({"token": "abc"}))
+        assert cm.decrypt(cm.encrypt(creds)) == {"token": "abc"}
+
+    def test_failed_decrypt_keeps_raising(self, cm: CredentialManager) -> None:
+        creds = LazyCredentials(cm, "not-a-token")
+        with pytest.raises(InvalidToken):
+            creds.get("token")
+        with pytest.raises(InvalidToken):
+            creds.get("token")
+
+    def test_model_dump_materializes(self, cm: CredentialManager) -> None:
+        conn = PlatformConnection(id=1, project_id=1, platform_type="telegram", credentials={}, identifier="@chan")
+        conn.credentials = LazyCredentials(cm, cm.encrypt({"token": "abc"}))
+
+        assert conn.model_dump()["credentials"] == {"token": "abc"}
+        assert '"token":"abc"' in conn.model_dump_json()
@@ -18,6 +18,7 @@ from routers.publishing.pipeline._common import ArticlePipelineFSM, select_keywo
 from routers.publishing.pipeline.generation import (
     MAX_REGENERATIONS_FREE,
     _build_preview_text,
+    _run_generation,
     back_to_readiness,
     cancel_refund,
     change_topic,
@@ -414,6 +415,50 @@ class TestBackToReadiness:
             show_mock.assert_called_once()
 
 
+# ---------------------------------------------------------------------------
+# Step 6: _run_generation checkpoint run key
+# ---------------------------------------------------------------------------
+
+
+class TestRunGenerationRunKey:
+    """Only a retry of the same FSM run resumes its checkpoints."""
+
+    async def _run(self, fsm_data: dict[str, Any], state: MagicMock, user: Any, redis: MagicMock) -> MagicMock:
+        checkpoint = MagicMock()
+        checkpoint.get.return_value = None
+        with (
+            patch(f"{_MODULE}.StageCheckpoints.open", new_callable=AsyncMock, return_value=checkpoint) as open_mock,
+            patch(f"{_MODULE}.select_keyword", new_callable=AsyncMock, return_value=None),
+            patch(f"{_MODULE}.try_refund", new_callable=AsyncMock),
+            patch(f"{_MODULE}.safe_edit_text", new_callable=AsyncMock),
+        ):
+            await _run_generation(
+                MagicMock(),
+                state,
+                user,
+                MagicMock(),
+                redis,
+                MagicMock(),
+                fsm_data,
+                ai_orchestrator=MagicMock(),
+                image_storage=MagicMock(),
+            )
+        return open_mock
+
+    async def test_new_generation_gets_fresh_run(self, mock_state: MagicMock, user: Any, mock_redis: MagicMock) -> None:
+        open_mock = await self._run(_make_fsm_data(), mock_state, user, mock_redis)
+
+        run_id = mock_state.update_data.call_args_list[0].kwargs["generation_run_id"]
+        assert run_id
+        assert open_mock.call_args.args[1] == f"preview:{user.id}:10:{run_id}:4"
+
+    async def test_retry_reuses_run(self, mock_state: MagicMock, user: Any, mock_redis: MagicMock) -> None:
+        open_mock = await self._run(_make_fsm_data(generation_run_id="r1"), mock_state, user, mock_redis)
+
+        assert open_mock.call_args.args[1] == f"preview:{user.id}:10:r1:4"
+        assert not any("generation_run_id" in c.kwargs for c in mock_state.update_data.call_args_list)
+
+
 # ---------------------------------------------------------------------------
 # Step 6: select_keyword (extracted to _common.py)
 # ---------------------------------------------------------------------------
@@ -761,7 +806,7 @@ class TestCancelRefund:
         mock_state.get_data = AsyncMock(return_value={"preview_id": 100})
         mock_http = MagicMock()
         mock_storage = MagicMock()
-        mock_storage.cleanup_by_paths = AsyncMock()
+        mock_storage.release_images = AsyncMock()
 
         with (
             patch(f"{_MODULE}.PreviewsRepository") as repo_cls,
@@ -837,7 +882,7 @@ class TestCancelRefund:
         mock_db: MagicMock,
         mock_redis: MagicMock,
     ) -> None:
-        """C14: Storage images are cleaned up on cancel."""
+        """C14: the preview's claim on its Storage images is released on cancel."""
         images = [
             {"storage_path": "123/1/img_0.webp", "url": "https://example.com/img0"},
             {"storage_path": "123/1/img_1.webp", "url": "https://example.com/img1"},
@@ -866,9 +911,7 @@ class TestCancelRefund:
             )
 
         refund_mock.assert_called_once()
-        mock_storage.cleanup_by_paths.assert_called_once_with(
-            ["123/1/img_0.webp", "123/1/img_1.webp"],
-        )
+        mock_storage.release_images.assert_called_once_with(images)
 
     async def test_cr77a_double_click_prevented_by_nx_lock(
         self,
@@ -1202,6 +1245,7 @@ async def test_change_topic_single_category_clears_generation_data(
     update_call = mock_state.update_data.call_args_list[0]
     assert update_call[1]["preview_id"] is None
     assert update_call[1]["keyword"] is None
+    assert update_call[1]["generation_run_id"] is None
 
 
 # ---------------------------------------------------------------------------
@@ -684,6 +684,7 @@ class TestModelChains:
             "review",
             "description",
             "cross_post",
+            "cross_post_batch",
             "image",
             "image_director",
             "article_outline",
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 from services.ai.reconciliation import (
     ContentBlock,
+    ConvertedImage,
     ImageUpload,
     distribute_images,
     extract_block_contexts,
@@ -219,6 +220,14 @@ class TestMixedScenarios:
         assert uploads[0].filename.endswith(".png")
         assert uploads[0].data == bad_bytes  # original bytes preserved
 
+    def test_converted_images_are_not_converted_again(self) -> None:
+        """Images converted by the streaming pipeline keep their bytes and extension."""
+        images: list[bytes | ConvertedImage | BaseException] = [ConvertedImage(data=b"webp-bytes", ext="webp")]
+        _, uploads = reconcile_images("Text", _SAMPLE_META[:1], images, _SAMPLE_TITLE)
+
+        assert uploads[0].data == b"webp-bytes"
+        assert uploads[0].filename == "kukhnya-iz-duba.webp"
+
     def test_empty_meta_fields_get_defaults(self) -> None:
         """Meta with empty alt/filename should get defaults."""
         meta = [{"alt": "", "filename": "", "figcaption": ""}]
@@ -11,6 +11,7 @@ Each service is tested for:
 
 from __future__ import annotations
 
+import asyncio
 import base64
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -748,6 +749,107 @@ class TestSocialPostAdaptForPlatform:
         assert "<script>" not in result.content["text"]  # type: ignore[index]
 
 
+# ---------------------------------------------------------------------------
+# SocialPostService — adapt_for_platforms (batched cross-post)
+# ---------------------------------------------------------------------------
+
+
+class TestSocialPostAdaptForPlatforms:
+    """Tests for SocialPostService.adapt_for_platforms() batched adaptation."""
+
+    @staticmethod
+    def _service(mock_orchestrator: AsyncMock, mock_db: MagicMock) -> Any:
+        from services.ai.social_posts import SocialPostService
+
+        svc = SocialPostService(orchestrator=mock_orchestrator, db=mock_db)
+        svc._projects = MagicMock()
+        svc._projects.get_by_id = AsyncMock(return_value=_make_project())
+        return svc
+
+    @staticmethod
+    async def _adapt(svc: Any, platforms: list[str]) -> dict[str, Any]:
+        return await svc.adapt_for_platforms(
+            original_text="Original TG post",
+            source_platform="telegram",
+            target_platforms=platforms,
+            user_id=123,
+            project_id=1,
+            keyword="test keyword",
+        )
+
+    async def test_one_call_for_all_platforms(self, mock_orchestrator: AsyncMock, mock_db: MagicMock) -> None:
+        """Every platform variant comes from a single cross_post_batch request."""
+        variants = [
+            {"platform": "vk", "text": "<b>VK</b> post", "hashtags": ["#seo"], "pin_title": ""},
+            {"platform": "pinterest", "text": "Pin text", "hashtags": [], "pin_title": "Pin"},
+        ]
+        mock_orchestrator.generate.return_value = _make_generation_result(
+            content={"variants": variants}, input_tokens=100, output_tokens=200
+        )
+        svc = self._service(mock_orchestrator, mock_db)
+
+        results = await self._adapt(svc, ["vk", "pinterest"])
+
+        mock_orchestrator.generate.assert_awaited_once()
+        request = mock_orchestrator.generate.call_args.args[0]
+        assert request.task == "cross_post_batch"
+        assert request.context["target_platforms"] == ["vk", "pinterest"]
+        assert request.context["platform_limits"]["pinterest"]["max_title"] == 100
+        assert results["vk"].content["text"] == "VK post"  # sanitized for plain-text VK
+        assert results["pinterest"].content["pin_title"] == "Pin"
+        assert results["vk"].output_tokens == 100  # usage split across variants
+
+    async def test_missing_or_invalid_variant_falls_back(
+        self, mock_orchestrator: AsyncMock, mock_db: MagicMock
+    ) -> None:
+        """Platforms without a valid batch variant are adapted with a single cross_post call."""
+        batch = _make_generation_result(
+            content={"variants": [{"platform": "vk", "text": "", "hashtags": [], "pin_title": ""}]}
+        )
+        single = _make_generation_result(content={"text": "Single", "hashtags": [], "pin_title": ""})
+        mock_orchestrator.generate.side_effect = [batch, single, single]
+        svc = self._service(mock_orchestrator, mock_db)
+
+        results = await self._adapt(svc, ["vk", "telegram"])
+
+        tasks = [c.args[0].task for c in mock_orchestrator.generate.call_args_list]
+        assert tasks == ["cross_post_batch", "cross_post", "cross_post"]
+        assert results["vk"].content["text"] == "Single"
+        assert results["telegram"].content["text"] == "Single"
+
+    async def test_batch_failure_returns_per_platform_errors(
+        self, mock_orchestrator: AsyncMock, mock_db: MagicMock
+    ) -> None:
+        """A failed batch falls back to single calls; a failed single call is returned as its exception."""
+        single = _make_generation_result(content={"text": "Single", "hashtags": [], "pin_title": ""})
+
+        async def _generate(request: Any) -> GenerationResult:
+            if request.task == "cross_post_batch":
+                raise AIGenerationError(message="batch down")
+            if request.context["target_platform"] == "vk":
+                raise AIGenerationError(message="vk down")
+            return single
+
+        mock_orchestrator.generate.side_effect = _generate
+        svc = self._service(mock_orchestrator, mock_db)
+
+        results = await self._adapt(svc, ["vk", "telegram"])
+
+        assert isinstance(results["vk"], AIGenerationError)
+        assert results["telegram"] is single
+
+    async def test_single_platform_skips_batch(self, mock_orchestrator: AsyncMock, mock_db: MagicMock) -> None:
+        mock_orchestrator.generate.return_value = _make_generation_result(
+            content={"text": "VK", "hashtags": [], "pin_title": ""}
+        )
+        svc = self._service(mock_orchestrator, mock_db)
+
+        results = await self._adapt(svc, ["vk", "vk"])
+
+        assert list(results) == ["vk"]
+        assert mock_orchestrator.generate.call_args.args[0].task == "cross_post"
+
+
 # ---------------------------------------------------------------------------
 # KeywordService
 # ---------------------------------------------------------------------------
@@ -1016,6 +1118,46 @@ class TestImageService:
 
         mock_rate_limiter.check_batch.assert_awaited_once_with(123, "image_generation", 4)
 
+    async def test_image_pipeline_processes_each_image_as_it_completes(self, mock_orchestrator: AsyncMock) -> None:
+        """generate_pipeline processes images in completion order, returns them in placeholder order."""
+        delays = {"1": 0.03, "2": 0.0, "3": 0.01}
+
+        async def _generate(request: Any) -> Any:
+            await asyncio.sleep(delays[request.context["image_number"]])
+            return _make_image_result()
+
+        mock_orchestrator.generate_without_rate_limit.side_effect = _generate
+        processed: list[int] = []
+
+        async def _process(index: int, image: GeneratedImage) -> str:
+            processed.append(index)
+            return f"stored_{index}"
+
+        from services.ai.images import ImageService
+
+        svc = ImageService(orchestrator=mock_orchestrator)
+
+        results = await svc.generate_pipeline(123, {"keyword": "test", "image_settings": {}}, _process, count=3)
+
+        assert processed == [1, 2, 0]
+        assert results == ["stored_0", "stored_1", "stored_2"]
+
+    async def test_image_pipeline_process_failure_stays_in_its_slot(self, mock_orchestrator: AsyncMock) -> None:
+        """A failed processing step is returned in its slot; it is not an all-failed generation."""
+        mock_orchestrator.generate_without_rate_limit.return_value = _make_image_result()
+
+        async def _process(index: int, image: GeneratedImage) -> int:
+            raise RuntimeError("upload failed")
+
+        from services.ai.images import ImageService
+
+        svc = ImageService(orchestrator=mock_orchestrator)
+
+        results = await svc.generate_pipeline(123, {"keyword": "test", "image_settings": {}}, _process, count=2)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(results) == 2
+
 
 # ---------------------------------------------------------------------------
 # ReviewService
@@ -0,0 +1,274 @@
+"""Tests for services/external/url_cache.py -- shared per-URL Firecrawl cache.
+
+Covers: normalize_url, fresh/stale/negative hits, single-flight misses,
+Redis failure degradation, FirecrawlClient integration (scrape + map).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+
+from services.external.firecrawl import FirecrawlClient
+from services.external.url_cache import UrlCache, normalize_url
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_redis(store: dict[str, str] | None = None) -> AsyncMock:
+    data: dict[str, str] = store if store is not None else {}
+    redis = AsyncMock()
+    redis.get = AsyncMock(side_effect=lambda key: data.get(key))
+
+    async def _set(key: str, value: str, ex: int | None = None, nx: bool = False) -> str:
+        data[key] = value
+        return "OK"
+
+    redis.set = AsyncMock(side_effect=_set)
+    redis.store = data
+    return redis
+
+
+def _make_cache(redis: Any, **kwargs: Any) -> UrlCache:
+    params: dict[str, Any] = {"namespace": "test", "fresh_ttl": 100, "stale_ttl": 100, "negative_ttl": 10}
+    params.update(kwargs)
+    return UrlCache(redis, **params)
+
+
+def _age_all_entries(redis: AsyncMock, seconds: float) -> None:
+    for key, raw in list(redis.store.items()):
+        envelope = json.loads(raw)
+        envelope["fetched_at"] -= seconds
+        redis.store[key] = json.dumps(envelope)
+
+
+# ---------------------------------------------------------------------------
+# normalize_url
+# ---------------------------------------------------------------------------
+
+
+class TestNormalizeUrl:
+    def test_lowercases_host_and_drops_fragment(self) -> None:
+        assert normalize_url("HTTPS://Example.COM/Page#top") == "https://example.com/Page"
+
+    def test_strips_trailing_slash_and_default_port(self) -> None:
+        assert normalize_url("https://example.com:443/blog/") == "https://example.com/blog"
+
+    def test_root_path_kept(self) -> None:
+        assert normalize_url("https://example.com") == "https://example.com/"
+
+    def test_drops_tracking_params_and_sorts_query(self) -> None:
+        url = "https://example.com/p?utm_source=x&b=2&a=1&gclid=abc"
+        assert normalize_url(url) == "https://example.com/p?a=1&b=2"
+
+    def test_non_default_port_kept(self) -> None:
+        assert normalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+# ---------------------------------------------------------------------------
+# UrlCache
+# ---------------------------------------------------------------------------
+
+
+class TestUrlCache:
+    async def test_miss_then_hit(self) -> None:
+        redis = _make_redis()
+        cache = _make_cache(redis)
+        fetch = AsyncMock(return_value={"v": 1})
+
+        first = await cache.get_or_fetch("https://a.com/x", fetch)
+        second = await cache.get_or_fetch("https://A.com/x/", fetch)
+
+        assert first == second == {"v": 1}
+        fetch.assert_awaited_once()
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 1
+        assert cache.report()["credits_saved"] == 1
+
+    async def test_ttl_covers_fresh_plus_stale(self) -> None:
+        redis = _make_redis()
+        cache = _make_cache(redis, fresh_ttl=100, stale_ttl=50)
+        await cache.get_or_fetch("https://a.com", AsyncMock(return_value={"v": 1}))
+        assert redis.set.call_args.kwargs["ex"] == 150
+
+    async def test_failure_is_negative_cached(self) -> None:
+        redis = _make_redis()
+        cache = _make_cache(redis, negative_ttl=10)
+        fetch = AsyncMock(return_value=None)
+
+        assert await cache.get_or_fetch("https://blocked.com", fetch) is None
+        assert await cache.get_or_fetch("https://blocked.com", fetch) is None
+
+        fetch.assert_awaited_once()
+        assert redis.set.call_args.kwargs["ex"] == 10
+        assert cache.stats.negative_hits == 1
+
+    async def test_negative_cache_disabled(self) -> None:
+        redis = _make_redis()
+        cache = _make_cache(redis, negative_ttl=0)
+        await cache.get_or_fetch("https://blocked.com", AsyncMock(return_value=None))
+        redis.set.assert_not_awaited()
+
+    async def test_stale_served_and_refreshed_in_background(self) -> None:
+        redis = _make_redis()
+        cache = _make_cache(redis, fresh_ttl=100, stale_ttl=1000)
+        await cache.get_or_fetch("https://a.com", AsyncMock(return_value={"v": 1}))
+        _age_all_entries(redis, 500)
+
+        refresh = AsyncMock(return_value={"v": 2})
+        stale = await cache.get_or_fetch("https://a.com", refresh)
+        assert stale == {"v": 1}
+        assert cache.stats.stale_hits == 1
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        refresh.assert_awaited_once()
+        fresh = await cache.get_or_fetch("https://a.com", AsyncMock())
+        assert fresh == {"v": 2}
+        assert cache.stats.refreshes == 1
+
+    async def test_failed_refresh_keeps_stale_copy(self) -> None:
+        redis = _make_redis()
+        cache = _make_cache(redis, fresh_ttl=100, stale_ttl=1000)
+        await cache.get_or_fetch("https://a.com", AsyncMock(return_value={"v": 1}))
+        _age_all_entries(redis, 500)
+
+        await cache.get_or_fetch("https://a.com", AsyncMock(return_value=None))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        envelope = json.loads(next(iter(redis.store.values())))
+        assert envelope["value"] == {"v": 1}
+
+    async def test_concurrent_misses_share_one_fetch(self) -> None:
+        cache = _make_cache(_make_redis())
+        calls = 0
+
+        async def _fetch() -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"v": calls}
+
+        results = await asyncio.gather(*(cache.get_or_fetch("https://a.com", _fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r == {"v": 1} for r in results)
+
+    async def test_variant_separates_entries(self) -> None:
+        cache = _make_cache(_make_redis())
+        await cache.get_or_fetch("https://a.com", AsyncMock(return_value={"n": 100}), variant="100")
+        other = await cache.get_or_fetch("https://a.com", AsyncMock(return_value={"n": 5}), variant="5")
+        assert other == {"n": 5}
+
+    async def test_redis_error_degrades_to_fetch(self) -> None:
+        redis = AsyncMock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = _make_cache(redis)
+
+        result = await cache.get_or_fetch("https://a.com", AsyncMock(return_value={"v": 1}))
+
+        assert result == {"v": 1}
+        assert cache.stats.errors == 2
+
+    async def test_no_redis_always_fetches(self) -> None:
+        cache = _make_cache(None)
+        fetch = AsyncMock(return_value={"v": 1})
+        await cache.get_or_fetch("https://a.com", fetch)
+        await cache.get_or_fetch("https://a.com", fetch)
+        assert fetch.await_count == 2
+
+    def test_report_hit_rate(self) -> None:
+        cache = _make_cache(None, credits_per_fetch=2)
+        cache.stats.hits = 3
+        cache.stats.misses = 1
+        report = cache.report()
+        assert report["hit_rate"] == 0.75
+        assert report["credits_saved"] == 6
+
+    def test_stale_hits_save_no_credits(self) -> None:
+        """A stale hit triggers a refresh fetch, so it saves nothing upstream."""
+        cache = _make_cache(None, credits_per_fetch=2)
+        cache.stats.hits = 1
+        cache.stats.stale_hits = 2
+        cache.stats.negative_hits = 1
+        assert cache.report()["credits_saved"] == 4
+
+
+# ---------------------------------------------------------------------------
+# FirecrawlClient integration
+# ---------------------------------------------------------------------------
+
+
+def _firecrawl_with_cache(handler: Any, redis: Any) -> FirecrawlClient:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return FirecrawlClient(
+        api_key="fc-test",
+        http_client=http,
+        scrape_cache=UrlCache(redis, namespace="firecrawl_scrape", fresh_ttl=100, negative_ttl=10),
+        map_cache=UrlCache(redis, namespace="firecrawl_map", fresh_ttl=100),
+    )
+
+
+class TestFirecrawlCaching:
+    async def test_scrape_cached_across_calls(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(
+                200,
+                json={"success": True, "data": {"markdown": "## H2\ntext", "metadata": {"title": "T"}}},
+            )
+
+        client = _firecrawl_with_cache(handler, _make_redis())
+        first = await client.scrape_content("https://comp.com/page")
+        second = await client.scrape_content("https://comp.com/page/?utm_source=x")
+
+        assert calls == 1
+        assert first is not None and second is not None
+        assert second.headings == first.headings
+        assert second.url == "https://comp.com/page/?utm_source=x"
+        assert client.cache_report()["firecrawl_scrape"]["credits_saved"] == 1
+
+    async def test_scrape_failure_negative_cached(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, json={"success": False, "error": "blocked"})
+
+        client = _firecrawl_with_cache(handler, _make_redis())
+        assert await client.scrape_content("https://blocked.com") is None
+        assert await client.scrape_content("https://blocked.com") is None
+        assert calls == 1
+
+    async def test_map_cached_per_limit(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, json={"success": True, "links": ["https://site.com/a"]})
+
+        client = _firecrawl_with_cache(handler, _make_redis())
+        await client.map_site("https://site.com", limit=100)
+        result = await client.map_site("https://site.com", limit=100)
+        await client.map_site("https://site.com", limit=50)
+
+        assert calls == 2
+        assert result is not None
+        assert result.urls == [{"url": "https://site.com/a"}]
+
+    def test_cache_report_empty_without_caches(self) -> None:
+        client = FirecrawlClient(api_key="k", http_client=httpx.AsyncClient())
+        assert client.cache_report() == {}
@@ -95,6 +95,19 @@ class TestCreatePublisher:
         assert isinstance(pub, VKPublisher)
         assert pub._on_token_refresh is my_callback
 
+    def test_create_vk_with_metadata_update_callback(self) -> None:
+        """on_metadata_update callback is passed through to VKPublisher (album id cache)."""
+        client = _noop_http_client()
+        settings = _mock_settings()
+
+        async def my_callback(extra: dict) -> None:
+            pass  # pragma: no cover
+
+        pub = create_publisher("vk", client, settings, on_metadata_update=my_callback)
+
+        assert isinstance(pub, VKPublisher)
+        assert pub._on_metadata_update is my_callback
+
     def test_create_pinterest_with_token_refresh_callback(self) -> None:
         """on_token_refresh callback is passed through to PinterestPublisher."""
         client = _noop_http_client()
@@ -16,7 +16,12 @@ import pytest
 
 from db.models import PlatformConnection
 from services.publishers.base import PublishRequest
-from services.publishers.vk import _VK_TEXT_LIMIT, VK_API_VERSION, VKPublisher
+from services.publishers.vk import _VK_MAX_PHOTOS, _VK_TEXT_LIMIT, VK_API_VERSION, VKPublisher, _upload_urls
+
+
+@pytest.fixture(autouse=True)
+def _clear_upload_url_cache() -> None:
+    _upload_urls.clear()
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -569,6 +574,186 @@ class TestPublish:
         assert all(m == "POST" for m in captured_methods)
 
 
+# ---------------------------------------------------------------------------
+# Photo upload engine (album cache, upload-server reuse, batched upload)
+# ---------------------------------------------------------------------------
+
+
+def _files_in_last_upload(calls: list[str]) -> int:
+    return next(int(c.split(":")[1]) for c in reversed(calls) if c.startswith("upload:"))
+
+
+def _album_handler(calls: list[str], *, album_upload_url: str = "https://upload.vk.com/album") -> object:
+    """VK mock: wall upload refused (community token), album upload works."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if "photos.getWallUploadServer" in url:
+            calls.append("get_wall_server")
+            return httpx.Response(200, json={"error": {"error_code": 27, "error_msg": "Group authorization failed"}})
+        if "photos.getAlbums" in url:
+            calls.append("get_albums")
+            return httpx.Response(200, json={"response": {"count": 1, "items": [{"id": 111, "title": "SEO Bot"}]}})
+        if "photos.getUploadServer" in url:
+            calls.append("get_server")
+            return httpx.Response(200, json={"response": {"upload_url": album_upload_url}})
+        if url.startswith(album_upload_url):
+            files = request.content.count(b'name="file')
+            calls.append(f"upload:{files}")
+            return httpx.Response(200, json={"photos_list": "[...]", "server": 1, "hash": "abc"})
+        if "photos.save" in url and "saveWallPhoto" not in url:
+            calls.append("save")
+            photos = [{"id": 700 + i, "owner_id": -12345} for i in range(_files_in_last_upload(calls))]
+            return httpx.Response(200, json={"response": photos})
+        if "wall.post" in url:
+            calls.append("post")
+            return httpx.Response(200, json={"response": {"post_id": 42}})
+        return httpx.Response(404)
+
+    return handler
+
+
+class TestPhotoUploadEngine:
+    async def test_cached_album_batches_all_images(self) -> None:
+        """Album id from metadata: one upload request + one photos.save for 4 images."""
+        calls: list[str] = []
+        pub = _make_publisher(_album_handler(calls))
+        conn = _make_connection(metadata={"vk_albums": {"12345": 111}})
+        req = PublishRequest(connection=conn, content="x", content_type="plain_text", images=[b"A", b"B", b"C", b"D"])
+
+        first = await pub.publish(req)
+        calls.clear()
+        second = await pub.publish(req)
+
+        assert first.success and second.success
+        # Upload-server URL reused: upload + save + wall.post
+        assert calls == ["upload:4", "save", "post"]
+
+    async def test_album_fallback_caches_album_id(self) -> None:
+        calls: list[str] = []
+        saved: list[dict] = []
+
+        async def on_metadata_update(extra: dict) -> None:
+            saved.append(extra)
+
+        transport = httpx.MockTransport(_album_handler(calls))  # type: ignore[arg-type]
+        pub = VKPublisher(httpx.AsyncClient(transport=transport), on_metadata_update=on_metadata_update)
+        req = PublishRequest(connection=_make_connection(), content="x", content_type="plain_text", images=[b"A"])
+
+        result = await pub.publish(req)
+
+        assert result.success is True
+        assert calls == ["get_wall_server", "get_albums", "get_server", "upload:1", "save", "post"]
+        assert saved == [{"vk_albums": {"12345": 111}}]
+
+    async def test_images_capped_to_one_upload_request(self) -> None:
+        calls: list[str] = []
+        pub = _make_publisher(_album_handler(calls))
+        conn = _make_connection(metadata={"vk_albums": {"12345": 111}})
+        images = [bytes([i]) for i in range(_VK_MAX_PHOTOS + 2)]
+
+        await pub.publish(PublishRequest(connection=conn, content="x", content_type="plain_text", images=images))
+
+        assert f"upload:{_VK_MAX_PHOTOS}" in calls
+
+    async def test_stale_upload_url_refreshed_once(self) -> None:
+        calls: list[str] = []
+        urls = iter(["https://upload.vk.com/old", "https://upload.vk.com/new"])
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            url = str(request.url)
+            if "photos.getUploadServer" in url:
+                calls.append("get_server")
+                return httpx.Response(200, json={"response": {"upload_url": next(urls)}})
+            if url == "https://upload.vk.com/old":
+                calls.append("upload_old")
+                # First publish succeeds, the second finds the URL expired
+                if calls.count("upload_old") == 1:
+                    return httpx.Response(200, json={"photos_list": "[...]", "server": 1, "hash": "a"})
+                return httpx.Response(200, text="expired")
+            if url == "https://upload.vk.com/new":
+                calls.append("upload_new")
+                return httpx.Response(200, json={"photos_list": "[...]", "server": 1, "hash": "b"})
+            if "photos.save" in url:
+                return httpx.Response(200, json={"response": [{"id": 1, "owner_id": -12345}]})
+            if "wall.post" in url:
+                return httpx.Response(200, json={"response": {"post_id": 1}})
+            return httpx.Response(404)
+
+        pub = _make_publisher(handler)
+        conn = _make_connection(metadata={"vk_albums": {"12345": 111}})
+        req = PublishRequest(connection=conn, content="x", content_type="plain_text", images=[b"A"])
+
+        await pub.publish(req)
+        result = await pub.publish(req)
+
+        assert result.success is True
+        assert calls == ["get_server", "upload_old", "upload_old", "get_server", "upload_new"]
+
+    async def test_deleted_cached_album_is_resolved_again(self) -> None:
+        saved: list[dict] = []
+
+        async def on_metadata_update(extra: dict) -> None:
+            saved.append(extra)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            url = str(request.url)
+            if "photos.getUploadServer" in url:
+                if _parse_form_data(request)["album_id"] == "111":
+                    return httpx.Response(200, json={"error": {"error_code": 114, "error_msg": "Invalid album id"}})
+                return httpx.Response(200, json={"response": {"upload_url": "https://upload.vk.com/album"}})
+            if "photos.getAlbums" in url:
+                return httpx.Response(200, json={"response": {"count": 0, "items": []}})
+            if "photos.createAlbum" in url:
+                return httpx.Response(200, json={"response": {"id": 222}})
+            if "upload.vk.com/album" in url:
+                return httpx.Response(200, json={"photos_list": "[...]", "server": 1, "hash": "a"})
+            if "photos.save" in url:
+                return httpx.Response(200, json={"response": [{"id": 5, "owner_id": -12345}]})
+            if "wall.post" in url:
+                assert _parse_form_data(request)["attachments"] == "photo-12345_5"
+                return httpx.Response(200, json={"response": {"post_id": 1}})
+            return httpx.Response(404)
+
+        transport = httpx.MockTransport(handler)
+        pub = VKPublisher(httpx.AsyncClient(transport=transport), on_metadata_update=on_metadata_update)
+        conn = _make_connection(metadata={"vk_albums": {"12345": 111}})
+
+        req = PublishRequest(connection=conn, content="x", content_type="plain_text", images=[b"A"])
+
+        result = await pub.publish(req)
+
+        assert result.success is True
+        assert saved == [{"vk_albums": {"12345": 222}}]
+
+    async def test_wall_upload_reuses_server_for_each_image(self) -> None:
+        calls: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            url = str(request.url)
+            if "photos.getWallUploadServer" in url:
+                calls.append("get_server")
+                return httpx.Response(200, json={"response": {"upload_url": "https://upload.vk.com/upload"}})
+            if "upload.vk.com/upload" in url:
+                calls.append("upload")
+                return httpx.Response(200, json={"photo": "p", "server": 1, "hash": "h"})
+            if "photos.saveWallPhoto" in url:
+                calls.append("save")
+                return httpx.Response(200, json={"response": [{"id": calls.count("save"), "owner_id": -12345}]})
+            if "wall.post" in url:
+                assert _parse_form_data(request)["attachments"] == "photo-12345_1,photo-12345_2"
+                return httpx.Response(200, json={"response": {"post_id": 1}})
+            return httpx.Response(404)
+
+        pub = _make_publisher(handler)
+        req = PublishRequest(connection=_make_connection(), content="x", content_type="plain_text", images=[b"A", b"B"])
+
+        result = await pub.publish(req)
+
+        assert result.success is True
+        assert calls == ["get_server", "upload", "save", "upload", "save"]
+
+
 # ---------------------------------------------------------------------------
 # delete_post
 # ---------------------------------------------------------------------------
@@ -6,6 +6,7 @@ _base_url, _auth helpers, E02 (WP unavailable).
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 
@@ -13,7 +14,7 @@ import httpx
 
 from db.models import PlatformConnection
 from services.publishers.base import PublishRequest
-from services.publishers.wordpress import WordPressPublisher
+from services.publishers.wordpress import _MEDIA_UPLOAD_CONCURRENCY, WordPressPublisher
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -261,6 +262,89 @@ class TestPublish:
         result = await pub.publish(req)
         assert result.success is False
 
+    async def test_post_failure_reports_uploaded_media(self) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if "/media" in str(request.url):
+                return httpx.Response(201, json={"id": 100, "source_url": "https://example.com/a.webp"})
+            return httpx.Response(502, text="Bad Gateway")
+
+        pub = _make_publisher(handler)
+        req = PublishRequest(connection=_make_connection(), content="x", content_type="html", images=[b"IMG"])
+        result = await pub.publish(req)
+
+        assert result.success is False
+        assert result.uploaded_media == [{"index": 0, "id": 100, "url": "https://example.com/a.webp"}]
+
+    async def test_retry_reuses_uploaded_media(self) -> None:
+        media_uploads = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal media_uploads
+            url = str(request.url)
+            if url.endswith("/media"):
+                media_uploads += 1
+                return httpx.Response(201, json={"id": 101, "source_url": "https://example.com/b.webp"})
+            if "/posts" in url:
+                body = json.loads(request.content)
+                assert body["featured_media"] == 100
+                return httpx.Response(201, json={"id": 42, "link": "https://example.com/post"})
+            return httpx.Response(200, json={})
+
+        pub = _make_publisher(handler)
+        req = PublishRequest(
+            connection=_make_connection(),
+            content="x",
+            content_type="html",
+            images=[b"IMG1", b"IMG2"],
+            metadata={"wp_media": [{"id": 100, "url": "https://example.com/a.webp"}]},
+        )
+        result = await pub.publish(req)
+
+        assert result.success is True
+        assert media_uploads == 1  # only the image missing from the previous attempt
+        assert [m["id"] for m in result.uploaded_media] == [100, 101]
+
+    async def test_media_uploads_overlap_with_bounded_concurrency(self) -> None:
+        active = 0
+        peak = 0
+        next_id = 100
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak, next_id
+            if str(request.url.path).endswith("/media"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                next_id += 1
+                return httpx.Response(201, json={"id": next_id, "source_url": f"https://example.com/{next_id}.webp"})
+            return httpx.Response(201, json={"id": 42, "link": "https://example.com/post"})
+
+        pub = _make_publisher(handler)
+        req = PublishRequest(
+            connection=_make_connection(), content="x", content_type="html", images=[b"IMG"] * 6
+        )
+        result = await pub.publish(req)
+
+        assert result.success is True
+        assert 1 < peak <= _MEDIA_UPLOAD_CONCURRENCY
+        assert sorted(m["index"] for m in result.uploaded_media) == list(range(6))
+
+    async def test_failed_upload_keeps_finished_ones_for_retry(self) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if str(request.url.path).endswith("/media"):
+                if request.content == b"BAD":
+                    return httpx.Response(413, text="File too large")
+                return httpx.Response(201, json={"id": 100, "source_url": "https://example.com/a.webp"})
+            return httpx.Response(201, json={"id": 42, "link": "https://example.com/post"})
+
+        pub = _make_publisher(handler)
+        req = PublishRequest(connection=_make_connection(), content="x", content_type="html", images=[b"BAD", b"OK"])
+        result = await pub.publish(req)
+
+        assert result.success is False
+        assert result.uploaded_media == [{"index": 1, "id": 100, "url": "https://example.com/a.webp"}]
+
     async def test_publish_no_title_defaults_empty(self) -> None:
         async def handler(request: httpx.Request) -> httpx.Response:
             if "/posts" in str(request.url):
@@ -0,0 +1,160 @@
+"""Tests for services/adaptive_limit.py — AIMD concurrency limit and gates."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from services import adaptive_limit
+from services.adaptive_limit import AdaptiveLimiter
+
+
+@pytest.fixture(autouse=True)
+def _no_cooldown(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(adaptive_limit, "_COOLDOWN", 0.0)
+
+
+def _limiter(initial: int = 4, **kwargs: object) -> AdaptiveLimiter:
+    kwargs.setdefault("memory_limit_bytes", 1000)
+    return AdaptiveLimiter(initial, max_limit=10, **kwargs)  # type: ignore[arg-type]
+
+
+class TestGate:
+    async def test_blocks_at_limit_and_wakes_on_release(self) -> None:
+        gate = _limiter(2).gate("publish")
+        await gate.acquire()
+        await gate.acquire()
+
+        waiter = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        gate.release()
+        await asyncio.wait_for(waiter, 1)
+        assert gate.in_flight == 2
+
+    async def test_scaled_gate_follows_shared_limit(self) -> None:
+        limiter = _limiter(4)
+        ai = limiter.gate("ai", scale=3)
+
+        limiter.decrease("test")
+
+        assert limiter.limit == 3
+        assert ai.limit == 9
+        assert limiter.gate("ai") is ai
+
+    async def test_cancelled_waiter_passes_wakeup_on(self) -> None:
+        gate = _limiter(1).gate("publish")
+        await gate.acquire()
+        first = asyncio.create_task(gate.acquire())
+        second = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+
+        gate.release()
+        first.cancel()
+        await asyncio.wait_for(second, 1)
+
+        assert gate.in_flight == 1
+
+
+class TestAimd:
+    async def test_saturated_completions_raise_limit(self) -> None:
+        limiter = _limiter(2)
+        gate = limiter.gate("publish")
+
+        for _ in range(4):
+            assert gate.acquire_nowait() and gate.acquire_nowait()
+            gate.release(1.0)
+            gate.release(1.0)
+
+        assert limiter.limit == 3
+
+    async def test_unsaturated_completions_do_not_raise_limit(self) -> None:
+        limiter = _limiter(4)
+        gate = limiter.gate("publish")
+
+        for _ in range(20):
+            gate.acquire_nowait()
+            gate.release(1.0)
+
+        assert limiter.limit == 4
+
+    async def test_latency_gradient_cuts_limit(self) -> None:
+        limiter = _limiter(8)
+        gate = limiter.gate("ai")
+        for _ in range(10):
+            gate.acquire_nowait()
+            gate.release(1.0)
+
+        for _ in range(3):
+            gate.acquire_nowait()
+            gate.release(10.0)
+
+        assert limiter.limit < 8
+        assert "ai_latency" in limiter.report()["decreases"]
+
+    async def test_mixed_gate_ignores_latency_gradient(self) -> None:
+        """Long articles after short posts are not a slowdown; saturation still raises the limit."""
+        limiter = _limiter(2)
+        gate = limiter.gate("publish", latency_signal=False)
+        for _ in range(10):
+            gate.acquire_nowait()
+            gate.release(5.0)
+
+        for _ in range(4):
+            assert gate.acquire_nowait() and gate.acquire_nowait()
+            gate.release(300.0)
+            gate.release(300.0)
+
+        assert limiter.limit == 3
+        assert limiter.report()["decreases"] == {}
+        assert limiter.report()["gates"]["publish"]["latency_ms"] > 5000
+
+    async def test_timeout_cuts_limit(self) -> None:
+        limiter = _limiter(8)
+        gate = limiter.gate("publish")
+
+        with pytest.raises(TimeoutError):
+            async with gate.slot():
+                raise TimeoutError
+
+        assert limiter.limit == 6
+        assert gate.in_flight == 0
+
+    async def test_loop_lag_and_memory_pressure(self) -> None:
+        limiter = _limiter(8, max_loop_lag=0.5)
+
+        limiter.observe_resources(loop_lag=1.0, rss=100)
+        assert limiter.limit == 6
+
+        limiter.observe_resources(loop_lag=0.0, rss=900)  # 90% of the 1000-byte budget
+        assert limiter.limit == 4
+        assert limiter.report()["decreases"] == {"loop_lag": 1, "memory": 1}
+
+        # No increase while under pressure
+        gate = limiter.gate("publish")
+        for _ in range(4):
+            gate.acquire_nowait()
+        for _ in range(4):
+            gate.release(1.0)
+        assert limiter.limit == 4
+
+    async def test_limit_stays_within_bounds(self) -> None:
+        limiter = AdaptiveLimiter(3, min_limit=2, max_limit=3, memory_limit_bytes=1000)
+
+        for _ in range(5):
+            limiter.decrease("test")
+        assert limiter.limit == 2
+
+        for _ in range(50):
+            limiter.increase()
+        assert limiter.limit == 3
+
+    async def test_monitor_start_stop(self) -> None:
+        limiter = _limiter()
+
+        limiter.start()
+        await limiter.stop()
+
+        assert limiter.report()["limit"] == 4
@@ -0,0 +1,282 @@
+"""Tests for services/broadcast.py — rate-limited, resumable Telegram broadcasts."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+)
+
+from cache.keys import CacheKeys
+from services.broadcast import (
+    BroadcastSender,
+    BroadcastState,
+    TokenBucket,
+    cancel_broadcasts,
+    interrupted_broadcasts,
+    load_broadcast_state,
+)
+
+
+def _redis() -> MagicMock:
+    """Dict-backed RedisClient stand-in (get/set nx/delete/expire/scan_keys)."""
+    store: dict[str, str] = {}
+
+    async def _set(key: str, value: str, ex: int | None = None, nx: bool = False) -> str | None:
+        if nx and key in store:
+            return None
+        store[key] = value
+        return "OK"
+
+    async def _delete(*keys: str) -> int:
+        return sum(store.pop(k, None) is not None for k in keys)
+
+    async def _scan(pattern: str) -> list[str]:
+        prefix, suffix = pattern.split("*")
+        return [k for k in store if k.startswith(prefix) and k.endswith(suffix)]
+
+    redis = MagicMock()
+    redis.store = store
+    redis.get = AsyncMock(side_effect=store.get)
+    redis.set = AsyncMock(side_effect=_set)
+    redis.delete = AsyncMock(side_effect=_delete)
+    redis.expire = AsyncMock(return_value=True)
+    redis.scan_keys = AsyncMock(side_effect=_scan)
+    return redis
+
+
+def _bot(side_effect: object = None) -> MagicMock:
+    bot = MagicMock()
+    bot.send_message = AsyncMock(side_effect=side_effect)
+    return bot
+
+
+def _sender(bot: MagicMock, redis: MagicMock, **kwargs: object) -> BroadcastSender:
+    return BroadcastSender(bot, redis, bucket=TokenBucket(rate=10_000), **kwargs)  # type: ignore[arg-type]
+
+
+def _retry_after(seconds: int = 0) -> TelegramRetryAfter:
+    return TelegramRetryAfter(method=MagicMock(), message="Too many", retry_after=seconds)
+
+
+class TestTokenBucket:
+    async def test_burst_then_paced(self) -> None:
+        bucket = TokenBucket(rate=100, capacity=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+
+        # 2 from the burst, 2 more at 100/s
+        assert time.monotonic() - start >= 0.015
+
+
+class TestSend:
+    async def test_all_sent(self) -> None:
+        bot, redis = _bot(), _redis()
+
+        result = await _sender(bot, redis).run("b1", [(1, "Hello"), (2, "World")], parse_mode="HTML")
+
+        assert result is not None
+        assert (result.sent, result.failed, result.resumed) == (2, 0, False)
+        bot.send_message.assert_any_await(1, "Hello", parse_mode="HTML")
+
+    async def test_default_parse_mode_not_overridden(self) -> None:
+        bot = _bot()
+
+        await _sender(bot, _redis()).run("b1", [(1, "Hi")])
+
+        bot.send_message.assert_awaited_once_with(1, "Hi")
+
+    async def test_forbidden_counts_as_failed(self) -> None:
+        bot = _bot(TelegramForbiddenError(method=MagicMock(), message="Forbidden"))
+
+        result = await _sender(bot, _redis()).run("b1", [(1, "Hello")])
+
+        assert result is not None
+        assert (result.sent, result.failed) == (0, 1)
+
+    async def test_rejected_chat_counts_as_failed(self) -> None:
+        bot = _bot(TelegramBadRequest(method=MagicMock(), message="Bad Request: chat not found"))
+
+        result = await _sender(bot, _redis()).run("b1", [(1, "Hello")])
+
+        assert result is not None
+        assert (result.sent, result.failed) == (0, 1)
+
+    async def test_duplicate_chat_gets_one_message(self) -> None:
+        bot = _bot()
+
+        result = await _sender(bot, _redis()).run("b1", [(1, "first"), (1, "second")])
+
+        assert result is not None
+        assert result.sent == 1
+        bot.send_message.assert_awaited_once_with(1, "first")
+
+
+class TestRetryAfter:
+    async def test_retried_after_delay(self) -> None:
+        bot = _bot([_retry_after(0), None])
+
+        result = await _sender(bot, _redis()).run("b1", [(1, "Hello")])
+
+        assert result is not None
+        assert (result.sent, result.failed) == (1, 0)
+        assert bot.send_message.await_count == 2
+
+    async def test_rate_limited_chat_does_not_block_others(self) -> None:
+        """Chat 1 waits out its retry-after while chats 2..5 are delivered."""
+        order: list[int] = []
+        limited = {1}
+
+        async def _send(chat_id: int, text: str, **kwargs: object) -> None:
+            if chat_id in limited:
+                limited.discard(chat_id)
+                raise _retry_after(0)
+            order.append(chat_id)
+
+        bot = _bot(_send)
+
+        result = await _sender(bot, _redis(), concurrency=1).run("b1", [(i, "x") for i in range(1, 6)])
+
+        assert result is not None
+        assert result.sent == 5
+        assert order[-1] == 1
+
+    async def test_exhausted_retries_count_as_failed(self) -> None:
+        bot = _bot(_retry_after(0))
+
+        result = await _sender(bot, _redis(), max_attempts=3).run("b1", [(1, "Hello")])
+
+        assert result is not None
+        assert (result.sent, result.failed) == (0, 1)
+        assert bot.send_message.await_count == 3
+
+
+class TestResume:
+    async def test_resumes_after_cursor(self) -> None:
+        redis = _redis()
+        state = BroadcastState(last_chat_id=2, ahead=[4], sent=3, failed=0)
+        redis.store[CacheKeys.broadcast_state("b1")] = json.dumps(state.__dict__)
+        bot = _bot()
+
+        result = await _sender(bot, redis).run("b1", [(i, "x") for i in range(1, 6)])
+
+        assert result is not None
+        assert result.resumed is True
+        assert (result.sent, result.failed) == (5, 0)
+        assert sorted(c.args[0] for c in bot.send_message.await_args_list) == [3, 5]
+
+    async def test_finished_broadcast_is_not_resent(self) -> None:
+        redis, bot = _redis(), _bot()
+        await _sender(bot, redis).run("b1", [(1, "x")])
+
+        result = await _sender(bot, redis).run("b1", [(1, "x")])
+
+        assert result is not None
+        assert result.already_done is True
+        assert bot.send_message.await_count == 1
+
+    async def test_busy_lease_returns_none(self) -> None:
+        redis, bot = _redis(), _bot()
+        redis.store[CacheKeys.broadcast_lease("b1")] = "1"
+
+        assert await _sender(bot, redis).run("b1", [(1, "x")]) is None
+        bot.send_message.assert_not_awaited()
+
+    async def test_lease_released_and_state_saved(self) -> None:
+        redis = _redis()
+
+        await _sender(_bot(), redis).run("b1", [(1, "x"), (2, "y")], meta={"kind": "admin"})
+
+        assert CacheKeys.broadcast_lease("b1") not in redis.store
+        state = await load_broadcast_state(redis, "b1")
+        assert state is not None
+        assert (state.done, state.last_chat_id, state.sent, state.meta) == (True, 2, 2, {"kind": "admin"})
+
+    async def test_checkpoint_survives_crash(self) -> None:
+        """A run cancelled mid-broadcast checkpoints every chat settled before it."""
+        redis = _redis()
+
+        async def _send(chat_id: int, text: str, **kwargs: object) -> None:
+            if chat_id == 60:
+                raise asyncio.CancelledError  # shutdown mid-broadcast
+
+        with pytest.raises(asyncio.CancelledError):
+            await _sender(_bot(_send), redis, concurrency=1).run("b1", [(i, "x") for i in range(1, 101)])
+
+        state = await load_broadcast_state(redis, "b1")
+        assert state is not None
+        assert state.done is False
+        assert state.last_chat_id == 59
+        assert [bid for bid, _ in await interrupted_broadcasts(redis)] == ["b1"]
+
+
+class TestSendErrors:
+    async def test_network_error_retried(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("services.broadcast._TRANSIENT_RETRY_DELAY", 0)
+        bot = _bot([TelegramNetworkError(method=MagicMock(), message="timeout"), None])
+
+        result = await _sender(bot, _redis()).run("b1", [(1, "Hello")])
+
+        assert result is not None
+        assert (result.sent, result.failed) == (1, 0)
+
+    async def test_persistent_network_error_leaves_chat_unsettled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Telegram unreachable: the run stops instead of writing the chats off as failed."""
+        monkeypatch.setattr("services.broadcast._TRANSIENT_RETRY_DELAY", 0)
+        redis = _redis()
+
+        async def _send(chat_id: int, text: str, **kwargs: object) -> None:
+            if chat_id >= 3:
+                raise TelegramNetworkError(method=MagicMock(), message="connection reset")
+
+        with pytest.raises(TelegramNetworkError):
+            await _sender(_bot(_send), redis, concurrency=1).run("b1", [(i, "x") for i in range(1, 6)])
+
+        state = await load_broadcast_state(redis, "b1")
+        assert state is not None
+        assert (state.done, state.last_chat_id, state.sent, state.failed) == (False, 2, 2, 0)
+
+    async def test_unexpected_error_is_not_settled(self) -> None:
+        """A closed session is not the chat's fault: nothing is checkpointed as failed."""
+        redis = _redis()
+        bot = _bot(RuntimeError("Session is closed"))
+
+        with pytest.raises(RuntimeError):
+            await _sender(bot, redis).run("b1", [(1, "x"), (2, "x")])
+
+        state = await load_broadcast_state(redis, "b1")
+        assert state is not None
+        assert (state.done, state.failed) == (False, 0)
+
+
+class TestCancelBroadcasts:
+    async def test_running_broadcast_cancelled_and_checkpointed(self) -> None:
+        redis = _redis()
+        started = asyncio.Event()
+
+        async def _send(chat_id: int, text: str, **kwargs: object) -> None:
+            if chat_id == 3:
+                started.set()
+                await asyncio.Event().wait()  # stuck until shutdown
+
+        task = asyncio.create_task(
+            _sender(_bot(_send), redis, concurrency=1).run("b1", [(i, "x") for i in range(1, 6)])
+        )
+        await started.wait()
+
+        await cancel_broadcasts()
+
+        assert task.cancelled()
+        state = await load_broadcast_state(redis, "b1")
+        assert state is not None
+        assert (state.done, state.last_chat_id) == (False, 2)
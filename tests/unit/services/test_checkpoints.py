@@ -0,0 +1,135 @@
+"""Tests for services/checkpoints.py — resumable article pipeline stages."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from db.models import PipelineCheckpoint
+from services.ai.articles import ArticleService
+from services.ai.orchestrator import GenerationResult
+from services.checkpoints import (
+    STAGE_OUTLINE,
+    StageCheckpoints,
+    image_storage_paths,
+    publish_run_key,
+)
+
+
+def _gen_result(content: Any) -> GenerationResult:
+    return GenerationResult(
+        content=content,
+        model_used="m",
+        input_tokens=1,
+        output_tokens=1,
+        cost_usd=0.0,
+        generation_time_ms=1,
+        prompt_version="v1",
+        fallback_used=False,
+    )
+
+
+class TestStageCheckpoints:
+    @patch("services.checkpoints.CheckpointsRepository")
+    async def test_open_loads_all_stages(self, repo_cls: MagicMock) -> None:
+        repo_cls.return_value.get_stages = AsyncMock(
+            return_value=[PipelineCheckpoint(run_key="publish:m1", stage="keyword", data={"keyword": "kw"})]
+        )
+
+        cp = await StageCheckpoints.open(MagicMock(), "publish:m1")
+
+        assert cp.stages == {"keyword"}
+        assert cp.get("keyword") == {"keyword": "kw"}
+
+    @patch("services.checkpoints.CheckpointsRepository")
+    async def test_open_failure_starts_fresh(self, repo_cls: MagicMock) -> None:
+        repo_cls.return_value.get_stages = AsyncMock(side_effect=RuntimeError("db down"))
+
+        cp = await StageCheckpoints.open(MagicMock(), "publish:m1")
+
+        assert cp.stages == set()
+
+    @patch("services.checkpoints.CheckpointsRepository")
+    async def test_save_stores_json_safe_payload(self, repo_cls: MagicMock) -> None:
+        repo_cls.return_value.save = AsyncMock()
+        cp = StageCheckpoints(MagicMock(), "publish:m1")
+        when = datetime(2026, 10, 18, tzinfo=UTC)
+
+        assert await cp.save("websearch", {"fetched_at": when}) is True
+
+        repo_cls.return_value.save.assert_awaited_once_with(
+            "publish:m1", "websearch", {"fetched_at": "2026-10-18 00:00:00+00:00"}
+        )
+        assert cp.get("websearch") == {"fetched_at": "2026-10-18 00:00:00+00:00"}
+
+    @patch("services.checkpoints.CheckpointsRepository")
+    async def test_save_failure_is_not_fatal(self, repo_cls: MagicMock) -> None:
+        repo_cls.return_value.save = AsyncMock(side_effect=RuntimeError("db down"))
+        cp = StageCheckpoints(MagicMock(), "publish:m1")
+
+        assert await cp.save("keyword", {"keyword": "kw"}) is False
+        assert cp.get("keyword") is None
+
+    async def test_disabled_is_noop(self) -> None:
+        cp = StageCheckpoints.disabled()
+
+        assert await cp.save("keyword", {"keyword": "kw"}) is False
+        await cp.clear()
+        assert cp.stages == set()
+
+    @patch("services.checkpoints.CheckpointsRepository")
+    async def test_clear_deletes_run(self, repo_cls: MagicMock) -> None:
+        repo_cls.return_value.delete_run = AsyncMock()
+        cp = StageCheckpoints(MagicMock(), "publish:m1", {"keyword": {"keyword": "kw"}})
+
+        await cp.clear()
+
+        repo_cls.return_value.delete_run.assert_awaited_once_with("publish:m1")
+        assert cp.stages == set()
+
+
+class TestHelpers:
+    def test_publish_run_key_requires_message_id(self) -> None:
+        assert publish_run_key("msg_1") == "publish:msg_1"
+        assert publish_run_key("") == ""
+
+    def test_image_storage_paths_both_layouts(self) -> None:
+        assert image_storage_paths({"paths": ["a.webp"], "failed": 0}) == ["a.webp"]
+        assert image_storage_paths({"stored_images": [{"storage_path": "b.webp"}, {"url": "x"}]}) == ["b.webp"]
+        assert image_storage_paths(None) == []
+
+
+class TestArticleOutlineResume:
+    async def test_saved_outline_skips_outline_step(self) -> None:
+        svc = ArticleService(MagicMock(), MagicMock())
+        svc._generate_outline = AsyncMock()  # type: ignore[method-assign]
+        svc._generate_article = AsyncMock(  # type: ignore[method-assign]
+            return_value=_gen_result({"content_markdown": "# Article"})
+        )
+        cp = StageCheckpoints(None, "publish:m1", {STAGE_OUTLINE: {"outline": "1. Intro"}})
+        context: dict[str, Any] = {}
+
+        _, markdown = await svc._generate_steps(1, context, "kw", cp)
+
+        svc._generate_outline.assert_not_awaited()
+        assert context["outline"] == "1. Intro"
+        assert markdown == "# Article"
+
+    async def test_generated_outline_is_saved(self) -> None:
+        svc = ArticleService(MagicMock(), MagicMock())
+        svc._generate_outline = AsyncMock(  # type: ignore[method-assign]
+            return_value=_gen_result({"title": "Title", "sections": []})
+        )
+        svc._generate_article = AsyncMock(  # type: ignore[method-assign]
+            return_value=_gen_result({"content_markdown": "# Article"})
+        )
+        cp = MagicMock(spec=StageCheckpoints)
+        cp.get.return_value = None
+        cp.save = AsyncMock(return_value=True)
+        context: dict[str, Any] = {}
+
+        await svc._generate_steps(1, context, "kw", cp)
+
+        assert context["outline"] == "Title: Title"
+        cp.save.assert_awaited_once_with(STAGE_OUTLINE, {"outline": "Title: Title"})
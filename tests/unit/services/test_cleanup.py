@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
-from db.models import ArticlePreview, User
+from db.models import ArticlePreview, PipelineCheckpoint, User
 from services.cleanup import CleanupService
 
 # ---------------------------------------------------------------------------
@@ -67,7 +67,7 @@ async def test_cleanup_expired_drafts_happy(mock_users_cls: MagicMock) -> None:
     svc._previews.get_expired_drafts = AsyncMock(return_value=[preview])
     svc._previews.atomic_mark_expired = AsyncMock(return_value=preview)
     svc._tokens.refund = AsyncMock(return_value=1200)
-    svc._image_storage.cleanup_by_paths = AsyncMock(return_value=0)
+    svc._image_storage.release_images = AsyncMock(return_value=0)
 
     result = await svc.execute()
 
@@ -116,20 +116,21 @@ async def test_cleanup_no_tokens_charged() -> None:
 
 @patch("services.cleanup.UsersRepository")
 async def test_cleanup_with_images(mock_users_cls: MagicMock) -> None:
-    """Preview with images: storage paths cleaned up."""
+    """Preview with images: its claim on the stored images is released."""
     svc = _make_service()
-    preview = _make_preview(images=[{"storage_path": "100/1/img_1.webp"}, {"storage_path": "100/1/img_2.webp"}])
+    images = [{"storage_path": "100/1/img_1.webp"}, {"storage_path": "100/1/img_2.webp"}]
+    preview = _make_preview(images=images)
     mock_users_cls.return_value.get_by_id = AsyncMock(return_value=_make_user())
 
     svc._previews.get_expired_drafts = AsyncMock(return_value=[preview])
     svc._previews.atomic_mark_expired = AsyncMock(return_value=preview)
     svc._tokens.refund = AsyncMock(return_value=1500)
-    svc._image_storage.cleanup_by_paths = AsyncMock(return_value=2)
+    svc._image_storage.release_images = AsyncMock(return_value=2)
 
     result = await svc.execute()
 
     assert result.images_deleted == 2
-    svc._image_storage.cleanup_by_paths.assert_called_once_with(["100/1/img_1.webp", "100/1/img_2.webp"])
+    svc._image_storage.release_images.assert_called_once_with(images)
 
 
 @patch("services.cleanup.UsersRepository")
@@ -193,3 +194,52 @@ async def test_cleanup_old_logs(mock_pubs_cls: MagicMock) -> None:
 
     assert result.logs_deleted == 2
     mock_pubs_cls.return_value.delete_old_logs.assert_awaited_once()
+
+
+@patch("services.cleanup.PublishJobsRepository")
+async def test_cleanup_finished_publish_jobs(mock_jobs_cls: MagicMock) -> None:
+    """Settled publish jobs (>7 days) are deleted; a failure does not abort cleanup."""
+    svc = _make_service()
+    svc._previews.get_expired_drafts = AsyncMock(return_value=[])
+    mock_jobs_cls.return_value.delete_finished_before = AsyncMock(return_value=5)
+
+    with patch("services.cleanup.PublicationsRepository") as mock_pubs_cls:
+        mock_pubs_cls.return_value.delete_old_logs = AsyncMock(side_effect=RuntimeError("db down"))
+        result = await svc.execute()
+
+    assert result.jobs_deleted == 5
+    assert result.logs_deleted == 0
+
+
+@patch("services.cleanup.CheckpointsRepository")
+async def test_cleanup_old_checkpoints_with_images(mock_cp_cls: MagicMock) -> None:
+    """Abandoned checkpoints (>24h) are deleted and each run releases the Storage images it held."""
+    svc = _make_service()
+    svc._previews.get_expired_drafts = AsyncMock(return_value=[])
+    svc._image_storage.release = AsyncMock(side_effect=[1, 2])
+    mock_cp_cls.return_value.delete_before = AsyncMock(
+        return_value=[
+            PipelineCheckpoint(run_key="publish:m1", stage="keyword", data={"keyword": "kw"}),
+            PipelineCheckpoint(run_key="publish:m1", stage="images", data={"paths": ["1/2/a.webp"], "failed": 0}),
+            PipelineCheckpoint(
+                run_key="preview:1:2",
+                stage="images",
+                data={"processed_md": "", "stored_images": [{"storage_path": "1/2/b.webp"}, {"url": "x"}]},
+            ),
+        ]
+    )
+
+    with (
+        patch("services.cleanup.PublicationsRepository") as mock_pubs_cls,
+        patch("services.cleanup.PublishJobsRepository") as mock_jobs_cls,
+    ):
+        mock_pubs_cls.return_value.delete_old_logs = AsyncMock(return_value=0)
+        mock_jobs_cls.return_value.delete_finished_before = AsyncMock(return_value=0)
+        result = await svc.execute()
+
+    assert result.checkpoints_deleted == 3
+    assert svc._image_storage.release.await_args_list == [
+        call(["1/2/a.webp"], "publish:m1"),
+        call(["1/2/b.webp"], "preview:1:2"),
+    ]
+    assert result.images_deleted == 3
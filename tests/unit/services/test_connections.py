@@ -45,7 +45,7 @@ def _make_service(
 
     with (
         patch(f"{_MODULE}.get_settings") as mock_settings,
-        patch(f"{_MODULE}.CredentialManager"),
+        patch(f"{_MODULE}.get_credential_manager"),
         patch(f"{_MODULE}.ConnectionsRepository", return_value=mock_repo),
     ):
         mock_settings.return_value.encryption_key.get_secret_value.return_value = "fake-key"
@@ -10,7 +10,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from pydantic import ValidationError
 
-from services.dashboard import DashboardData, DashboardService, LastPublication
+from services.dashboard import (
+    DashboardCache,
+    DashboardData,
+    DashboardService,
+    LastPublication,
+    dashboard_changed,
+    install_dashboard_cache,
+)
 
 _SVC_MODULE = "services.dashboard"
 
@@ -112,7 +119,7 @@ class TestGetDashboardDataWithProjects:
         cat1 = MagicMock(id=10)
         cat2 = MagicMock(id=20)
         mock_cats = MagicMock()
-        mock_cats.get_by_project = AsyncMock(side_effect=[[cat1], [cat2]])
+        mock_cats.get_by_projects = AsyncMock(return_value=[cat1, cat2])
         mock_cats_cls.return_value = mock_cats
 
         sched1 = MagicMock(
@@ -130,6 +137,7 @@ class TestGetDashboardDataWithProjects:
         assert result.schedule_count == 2  # 2 enabled out of 3
         assert result.tokens_per_week == 3 * 320 + 1 * 40  # 3 WP posts/wk + 1 TG post/wk
         assert result.tokens_per_month == result.tokens_per_week * 4
+        mock_cats.get_by_projects.assert_awaited_once_with([1, 2])
 
     @patch(f"{_SVC_MODULE}.SchedulesRepository")
     @patch(f"{_SVC_MODULE}.CategoriesRepository")
@@ -147,7 +155,7 @@ class TestGetDashboardDataWithProjects:
         mock_proj_cls.return_value.get_by_user = AsyncMock(return_value=projects)
         _mock_pub_repo(mock_pub_cls)
 
-        mock_cats_cls.return_value.get_by_project = AsyncMock(return_value=[])
+        mock_cats_cls.return_value.get_by_projects = AsyncMock(return_value=[])
         mock_sched_cls.return_value.get_by_project = AsyncMock(return_value=[])
 
         result = await dash_svc.get_dashboard_data(42)
@@ -182,7 +190,7 @@ class TestGetDashboardDataWithProjects:
         )
         mock_pub_cls.return_value.get_last_successful = AsyncMock(return_value=last_pub_mock)
 
-        mock_cats_cls.return_value.get_by_project = AsyncMock(return_value=[])
+        mock_cats_cls.return_value.get_by_projects = AsyncMock(return_value=[])
         mock_sched_cls.return_value.get_by_project = AsyncMock(return_value=[])
 
         result = await dash_svc.get_dashboard_data(42)
@@ -194,6 +202,75 @@ class TestGetDashboardDataWithProjects:
         assert result.total_publications == 5
 
 
+# ---------------------------------------------------------------------------
+# DashboardCache (two-tier snapshot)
+# ---------------------------------------------------------------------------
+
+
+def _mock_redis() -> MagicMock:
+    store: dict[str, str] = {}
+    redis = MagicMock()
+    redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+    async def _set(key: str, value: str, ex: int | None = None) -> None:
+        store[key] = value
+
+    async def _delete(*keys: str) -> int:
+        return sum(store.pop(k, None) is not None for k in keys)
+
+    redis.set = AsyncMock(side_effect=_set)
+    redis.delete = AsyncMock(side_effect=_delete)
+    redis.store = store
+    return redis
+
+
+class TestDashboardCache:
+    async def test_hit_skips_rebuild(self, mock_db: MagicMock) -> None:
+        svc = DashboardService(db=mock_db, cache=DashboardCache(_mock_redis()))
+        build = AsyncMock(return_value=_data())
+        with patch.object(svc, "_build", build):
+            first = await svc.get_dashboard_data(42)
+            second = await svc.get_dashboard_data(42)
+        assert first == second
+        build.assert_awaited_once_with(42)
+
+    async def test_redis_tier_shared_across_processes(self, mock_db: MagicMock) -> None:
+        redis = _mock_redis()
+        await DashboardCache(redis).put(42, _data(project_count=3), generation=0)
+
+        cached = await DashboardCache(redis).get(42)
+
+        assert cached == _data(project_count=3)
+
+    async def test_changed_event_invalidates_both_tiers(self, mock_db: MagicMock) -> None:
+        redis = _mock_redis()
+        cache = DashboardCache(redis)
+        install_dashboard_cache(cache)
+        try:
+            await cache.put(42, _data(), generation=cache.generation)
+            await dashboard_changed(42)
+        finally:
+            install_dashboard_cache(None)
+        assert await cache.get(42) is None
+        assert redis.store == {}
+
+    async def test_snapshot_built_before_write_not_stored(self, mock_db: MagicMock) -> None:
+        cache = DashboardCache(None)
+        generation = cache.generation
+        await cache.invalidate(42)
+        await cache.put(42, _data(), generation)
+        assert await cache.get(42) is None
+
+    async def test_redis_failure_degrades_to_rebuild(self, mock_db: MagicMock) -> None:
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis.set = AsyncMock(side_effect=ConnectionError("down"))
+        svc = DashboardService(db=mock_db, cache=DashboardCache(redis, local_ttl=0))
+        with patch.object(svc, "_build", AsyncMock(return_value=_data())) as build:
+            assert await svc.get_dashboard_data(42) == _data()
+        build.assert_awaited_once()
+
+
 # ---------------------------------------------------------------------------
 # build_text (moved from router to service — CR-113)
 # ---------------------------------------------------------------------------
@@ -137,7 +137,7 @@ class TestE06DuplicateQStashTasks:
         mock_db = MagicMock()
         svc = SchedulerService(db=mock_db, qstash_token="test", base_url="https://example.com")
         mock_qstash = MagicMock()
-        mock_qstash.schedule.create.return_value = MagicMock(schedule_id="qs_1")
+        mock_qstash.schedule.create = AsyncMock(return_value=MagicMock(schedule_id="qs_1"))
         svc._qstash = mock_qstash
 
         schedule = PlatformSchedule(
@@ -0,0 +1,146 @@
+"""Tests for services/http_clients.py -- pooled HTTP clients per upstream.
+
+Covers: HttpClientRegistry (pool reuse, unknown upstream fallback, recreate
+after close, per-upstream limits), connection-reuse metering.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+import pytest
+
+from services.http_clients import (
+    HttpClientRegistry,
+    PoolConfig,
+    PoolStats,
+    _MeteredTransport,
+)
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _FakePoolTransport(httpx.AsyncBaseTransport):
+    """Emits the httpcore new-connection trace event on the first request only."""
+
+    def __init__(self) -> None:
+        self.connected = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.connected:
+            trace = request.extensions.get("trace")
+            if trace is not None:
+                await trace("connection.connect_tcp.started", {})
+                await trace("connection.connect_tcp.complete", {})
+            self.connected = True
+        return httpx.Response(200, json={"ok": True})
+
+
+def _metered_client(stats: PoolStats, inner: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=_MeteredTransport(inner or _FakePoolTransport(), stats))
+
+
+# ---------------------------------------------------------------------------
+# HttpClientRegistry
+# ---------------------------------------------------------------------------
+
+
+class TestHttpClientRegistry:
+    async def test_same_upstream_returns_same_pool(self) -> None:
+        registry = HttpClientRegistry()
+        assert registry.get("yandex_metrika") is registry.get("yandex_metrika")
+        assert registry.get("yandex_metrika") is not registry.get("google")
+        await registry.aclose()
+
+    async def test_unknown_upstream_uses_default_pool(self) -> None:
+        registry = HttpClientRegistry()
+        assert registry.get("nope") is registry.get("default")
+        await registry.aclose()
+
+    async def test_closed_pool_is_recreated(self) -> None:
+        registry = HttpClientRegistry()
+        first = registry.get("bamboodom")
+        await first.aclose()
+        second = registry.get("bamboodom")
+        assert second is not first
+        assert not second.is_closed
+        await registry.aclose()
+
+    async def test_pool_uses_upstream_timeout_and_redirects(self) -> None:
+        registry = HttpClientRegistry({"default": PoolConfig(timeout=7.0, follow_redirects=True)})
+        client = registry.get()
+        assert client.timeout.read == 7.0
+        assert client.follow_redirects is True
+        await registry.aclose()
+
+    async def test_aclose_closes_all_pools(self) -> None:
+        registry = HttpClientRegistry()
+        clients = [registry.get("default"), registry.get("openrouter")]
+        await registry.aclose()
+        assert all(c.is_closed for c in clients)
+
+
+# ---------------------------------------------------------------------------
+# Connection-reuse metrics
+# ---------------------------------------------------------------------------
+
+
+class TestConnectionReuseMetrics:
+    async def test_counts_new_vs_reused_connections(self) -> None:
+        stats = PoolStats()
+        client = _metered_client(stats)
+        for _ in range(4):
+            await client.get("https://example.com/")
+
+        report = stats.report()
+        assert report["requests"] == 4
+        assert report["new_connections"] == 1
+        assert report["reused"] == 3
+        assert report["reuse_ratio"] == 0.75
+
+    async def test_caller_trace_still_called(self) -> None:
+        events: list[str] = []
+
+        async def trace(name: str, info: dict[str, Any]) -> None:
+            events.append(name)
+
+        client = _metered_client(PoolStats())
+        await client.get("https://example.com/", extensions={"trace": trace})
+        assert "connection.connect_tcp.complete" in events
+
+    async def test_transport_errors_counted(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        stats = PoolStats()
+        client = _metered_client(stats, httpx.MockTransport(handler))
+        with pytest.raises(httpx.ConnectError):
+            await client.get("https://example.com/")
+        assert stats.report() == {
+            "requests": 1,
+            "new_connections": 0,
+            "reused": 0,
+            "reuse_ratio": 0.0,
+            "errors": 1,
+        }
+
+    async def test_registry_stats_per_pool(self) -> None:
+        registry = HttpClientRegistry()
+        registry.get("google")
+        stats = registry.stats()
+        assert set(stats) == {"google"}
+        assert stats["google"]["requests"] == 0
+        assert "http2" in stats["google"]
+        await registry.aclose()
+
+    def test_registry_request_count(self) -> None:
+        registry = HttpClientRegistry()
+        assert registry.request_count("openrouter") == 0
+
+        registry.get("openrouter")
+        registry._stats["openrouter"].requests = 3
+
+        assert registry.request_count("openrouter") == 3
@@ -2,20 +2,27 @@
 
 Covers: retry_with_backoff (success, 429 with Retry-After, 5xx backoff,
 401/403 no retry, network errors, max retries exhausted),
-helper functions (_parse_retry_after, _is_retryable, _get_retry_delay).
+helper functions (_parse_retry_after, _is_retryable, _get_retry_delay),
+ProviderGuard (circuit breaker, half-open probe, shared 429 pause, concurrency).
 """
 
 from __future__ import annotations
 
+import asyncio
+import time
 from unittest.mock import AsyncMock
 
 import httpx
 import pytest
 
 from services.http_retry import (
+    CircuitOpenError,
+    ProviderGuard,
     _get_retry_delay,
     _is_retryable,
     _parse_retry_after,
+    get_provider_guard,
+    provider_states,
     retry_with_backoff,
 )
 
@@ -416,3 +423,130 @@ class TestRetryNonRetryable:
                 base_delay=0.01,
                 operation="test",
             )
+
+
+# ---------------------------------------------------------------------------
+# ProviderGuard
+# ---------------------------------------------------------------------------
+
+
+def _status_error(status: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    return httpx.HTTPStatusError(
+        f"HTTP {status}",
+        request=httpx.Request("GET", "https://example.com"),
+        response=httpx.Response(status, headers=headers),
+    )
+
+
+async def _fail_times(guard: ProviderGuard, exc: Exception, times: int) -> None:
+    for _ in range(times):
+        with pytest.raises(type(exc)):
+            await guard.call(AsyncMock(side_effect=exc))
+
+
+class TestProviderGuard:
+    async def test_opens_after_threshold_and_fails_fast(self) -> None:
+        guard = ProviderGuard("p", failure_threshold=3)
+        await _fail_times(guard, _status_error(503), 3)
+
+        func = AsyncMock(return_value="ok")
+        with pytest.raises(CircuitOpenError):
+            await guard.call(func)
+
+        func.assert_not_awaited()
+        assert guard.state == "open"
+        assert guard.snapshot()["rejected"] == 1
+
+    async def test_client_errors_do_not_open_circuit(self) -> None:
+        guard = ProviderGuard("p", failure_threshold=2)
+        await _fail_times(guard, _status_error(404), 3)
+        assert guard.state == "closed"
+
+    async def test_success_resets_failure_count(self) -> None:
+        guard = ProviderGuard("p", failure_threshold=2)
+        await _fail_times(guard, httpx.ConnectError("refused"), 1)
+        await guard.call(AsyncMock(return_value="ok"))
+        await _fail_times(guard, httpx.ConnectError("refused"), 1)
+        assert guard.state == "closed"
+
+    async def test_half_open_probe_closes_on_success(self) -> None:
+        guard = ProviderGuard("p", failure_threshold=1, recovery_timeout=0.0)
+        await _fail_times(guard, _status_error(500), 1)
+        assert guard.state == "half_open"
+
+        assert await guard.call(AsyncMock(return_value="ok")) == "ok"
+        assert guard.state == "closed"
+
+    async def test_half_open_probe_failure_reopens(self) -> None:
+        guard = ProviderGuard("p", failure_threshold=5, recovery_timeout=0.05)
+        await _fail_times(guard, _status_error(500), 5)
+        await asyncio.sleep(0.06)
+
+        await _fail_times(guard, _status_error(500), 1)
+        assert guard.state == "open"
+
+    async def test_half_open_allows_single_probe(self) -> None:
+        guard = ProviderGuard("p", failure_threshold=1, recovery_timeout=0.0)
+        await _fail_times(guard, _status_error(500), 1)
+        started = asyncio.Event()
+
+        async def slow_probe() -> str:
+            started.set()
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        probe = asyncio.create_task(guard.call(slow_probe))
+        await started.wait()
+        with pytest.raises(CircuitOpenError):
+            await guard.call(AsyncMock(return_value="ok"))
+        assert await probe == "ok"
+
+    async def test_429_pauses_all_callers(self) -> None:
+        guard = ProviderGuard("p")
+        await _fail_times(guard, _status_error(429, {"Retry-After": "0.05"}), 1)
+        assert "paused_for_s" in guard.snapshot()
+
+        t0 = time.monotonic()
+        await guard.call(AsyncMock(return_value="ok"))
+        assert time.monotonic() - t0 >= 0.04
+        assert guard.state == "closed"
+
+    async def test_bounds_concurrency(self) -> None:
+        guard = ProviderGuard("p", max_concurrency=2)
+        active = peak = 0
+
+        async def work() -> None:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await asyncio.gather(*(guard.call(work) for _ in range(6)))
+        assert peak == 2
+
+
+class TestRetryWithProvider:
+    async def test_open_circuit_is_not_retried(self) -> None:
+        guard = get_provider_guard("svc")
+        for _ in range(5):
+            guard._record_failure(RuntimeError("boom"))
+        func = AsyncMock(return_value="ok")
+
+        with pytest.raises(CircuitOpenError):
+            await retry_with_backoff(func, max_retries=3, base_delay=0.01, provider="svc")
+        func.assert_not_awaited()
+
+    async def test_retries_count_towards_breaker(self) -> None:
+        func = AsyncMock(side_effect=_status_error(502))
+        with pytest.raises(httpx.HTTPStatusError):
+            await retry_with_backoff(func, max_retries=2, base_delay=0.01, provider="svc")
+        assert provider_states()["svc"]["consecutive_failures"] == 3
+
+    def test_wordpress_hosts_share_lower_limit(self) -> None:
+        assert get_provider_guard("wordpress:example.com").max_concurrency == 4
+        assert get_provider_guard("firecrawl").max_concurrency == 10
+
+    def test_circuit_open_error_is_http_error(self) -> None:
+        assert isinstance(CircuitOpenError("p", 1.0), httpx.HTTPError)
+        assert not _is_retryable(CircuitOpenError("p", 1.0))
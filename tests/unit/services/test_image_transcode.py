@@ -0,0 +1,68 @@
+"""Tests for services/image_transcode.py — off-loop single-pass WebP transcoding."""
+
+from __future__ import annotations
+
+import threading
+from io import BytesIO
+
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from services.image_transcode import is_webp, run_in_pool, transcode, transcode_to_webp
+
+
+def _png(width: int, height: int, mode: str = "RGB") -> bytes:
+    buf = BytesIO()
+    Image.new(mode, (width, height), "red").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestTranscodeToWebp:
+    def test_png_is_encoded_once(self) -> None:
+        result = transcode_to_webp(_png(32, 16))
+
+        assert result.reencoded is True
+        assert (result.ext, result.mime) == ("webp", "image/webp")
+        assert is_webp(result.data)
+        assert result.cpu_ms >= 0
+
+    def test_webp_input_is_passed_through(self) -> None:
+        webp = transcode_to_webp(_png(32, 16)).data
+
+        result = transcode_to_webp(webp)
+
+        assert result.reencoded is False
+        assert result.data is webp
+
+    def test_crop_and_resize_in_one_pass(self) -> None:
+        """16:9 source cropped to 1:1 and resized to the target width."""
+        result = transcode_to_webp(_png(160, 90, mode="RGBA"), aspect=(1, 1), target_width=40, rgb=True)
+
+        img = Image.open(BytesIO(result.data))
+        assert img.size == (40, 40)
+        assert img.mode == "RGB"
+
+    def test_webp_with_geometry_change_is_reencoded(self) -> None:
+        webp = transcode_to_webp(_png(160, 90)).data
+
+        result = transcode_to_webp(webp, aspect=(21, 9), target_width=42)
+
+        assert result.reencoded is True
+        assert Image.open(BytesIO(result.data)).size == (42, 18)
+
+    def test_undecodable_input_raises(self) -> None:
+        with pytest.raises(UnidentifiedImageError):
+            transcode_to_webp(b"not-an-image")
+
+
+class TestOffLoop:
+    async def test_transcode_encodes_off_loop(self) -> None:
+        result = await transcode(_png(16, 16))
+
+        assert result.reencoded is True
+        assert is_webp(result.data)
+
+    async def test_run_in_pool_uses_worker_thread(self) -> None:
+        name = await run_in_pool(lambda: threading.current_thread().name)
+
+        assert name.startswith("image-transcode")
@@ -0,0 +1,198 @@
+"""Tests for services/prefetch.py — predictive research prefetch before publish slots."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cryptography.fernet import Fernet
+
+from db.models import Category, PlatformConnection, PlatformSchedule, Project
+from services.prefetch import ResearchPrefetchService, upcoming_slots
+
+# 2026-10-19 is a Monday; 06:00 UTC = 09:00 Europe/Moscow
+_NOW = datetime(2026, 10, 19, 5, 30, tzinfo=UTC)
+_LEAD = timedelta(minutes=45)
+
+# ---------------------------------------------------------------------------
+# Factories
+# ---------------------------------------------------------------------------
+
+
+def _make_schedule(**overrides) -> PlatformSchedule:
+    defaults = {
+        "id": 7,
+        "category_id": 10,
+        "platform_type": "wordpress",
+        "connection_id": 5,
+        "schedule_days": ["mon"],
+        "schedule_times": ["09:00"],
+        "enabled": True,
+    }
+    defaults.update(overrides)
+    return PlatformSchedule(**defaults)
+
+
+def _make_service() -> ResearchPrefetchService:
+    svc = ResearchPrefetchService(
+        db=MagicMock(),
+        redis=MagicMock(),
+        ai_orchestrator=MagicMock(),
+        encryption_key=Fernet.generate_key().decode(),
+        serper_client=MagicMock(),
+        firecrawl_client=MagicMock(),
+        lead_minutes=45,
+    )
+    svc._redis.set = AsyncMock(return_value="OK")
+    svc._redis.delete = AsyncMock(return_value=1)
+    svc._schedules.get_enabled = AsyncMock(return_value=[_make_schedule()])
+    svc._categories.get_by_ids = AsyncMock(
+        return_value=[Category(id=10, project_id=1, name="Cat", keywords=[{"phrase": "kw", "volume": 10}])]
+    )
+    svc._projects.get_by_ids = AsyncMock(
+        return_value=[
+            Project(
+                id=1,
+                user_id=100,
+                name="P",
+                company_name="Co",
+                specialization="Spec",
+                website_url="https://site.com",
+                company_city="Moscow",
+            )
+        ]
+    )
+    svc._publications.get_rotation_keyword = AsyncMock(return_value=("kw", False))
+    svc._connections.get_by_id = AsyncMock(
+        return_value=PlatformConnection(
+            id=5,
+            project_id=1,
+            platform_type="wordpress",
+            identifier="site.com",
+            credentials={},
+            metadata={"internal_links": "https://site.com/a"},
+        )
+    )
+    return svc
+
+
+# ---------------------------------------------------------------------------
+# upcoming_slots
+# ---------------------------------------------------------------------------
+
+
+class TestUpcomingSlots:
+    def test_slot_inside_window(self) -> None:
+        slots = upcoming_slots(_make_schedule(), "Europe/Moscow", _NOW, _LEAD)
+        assert slots == [datetime(2026, 10, 19, 6, 0, tzinfo=UTC)]
+
+    def test_slot_outside_window(self) -> None:
+        slots = upcoming_slots(_make_schedule(schedule_times=["12:00"]), "Europe/Moscow", _NOW, _LEAD)
+        assert slots == []
+
+    def test_wrong_weekday_skipped(self) -> None:
+        slots = upcoming_slots(_make_schedule(schedule_days=["tue"]), "Europe/Moscow", _NOW, _LEAD)
+        assert slots == []
+
+    def test_empty_days_means_every_day(self) -> None:
+        slots = upcoming_slots(_make_schedule(schedule_days=[]), "Europe/Moscow", _NOW, _LEAD)
+        assert len(slots) == 1
+
+    def test_window_crosses_midnight(self) -> None:
+        now = datetime(2026, 10, 19, 20, 50, tzinfo=UTC)  # 23:50 Moscow, Monday
+        schedule = _make_schedule(schedule_days=["tue"], schedule_times=["00:10"])
+        assert upcoming_slots(schedule, "Europe/Moscow", now, _LEAD) == [datetime(2026, 10, 19, 21, 10, tzinfo=UTC)]
+
+    def test_invalid_timezone_falls_back(self) -> None:
+        slots = upcoming_slots(_make_schedule(), "Not/AZone", _NOW, _LEAD)
+        assert len(slots) == 1
+
+
+# ---------------------------------------------------------------------------
+# ResearchPrefetchService.execute
+# ---------------------------------------------------------------------------
+
+
+@patch("services.prefetch.gather_websearch_data", new_callable=AsyncMock)
+async def test_prefetch_warms_predicted_keyword(mock_gather: AsyncMock) -> None:
+    """Due slot: rotation keyword predicted and websearch run with publish-path args."""
+    mock_gather.return_value = {"serper_data": {"organic": []}, "research_data": {}, "competitor_pages": []}
+    svc = _make_service()
+
+    result = await svc.execute(now=_NOW)
+
+    assert result.warmed == 1
+    svc._publications.get_rotation_keyword.assert_awaited_once_with(10, [{"phrase": "kw", "volume": 10}], "article")
+    kwargs = mock_gather.call_args.kwargs
+    assert kwargs["keyword"] == "kw"
+    assert kwargs["project_url"] == "https://site.com"
+    assert kwargs["company_name"] == "Co"
+    assert kwargs["geography"] == "Moscow"
+    assert kwargs["internal_links_cache"] == "https://site.com/a"
+
+
+@patch("services.prefetch.gather_websearch_data", new_callable=AsyncMock)
+async def test_prefetch_slot_already_warmed(mock_gather: AsyncMock) -> None:
+    """Second cron run for the same slot is skipped via Redis NX key."""
+    svc = _make_service()
+    svc._redis.set = AsyncMock(return_value=None)
+
+    result = await svc.execute(now=_NOW)
+
+    assert result.skipped == 1
+    mock_gather.assert_not_awaited()
+
+
+@patch("services.prefetch.gather_websearch_data", new_callable=AsyncMock)
+async def test_prefetch_ignores_social_and_not_due(mock_gather: AsyncMock) -> None:
+    svc = _make_service()
+    svc._schedules.get_enabled = AsyncMock(
+        return_value=[
+            _make_schedule(id=1, platform_type="telegram"),
+            _make_schedule(id=2, schedule_times=["18:00"]),
+        ]
+    )
+
+    result = await svc.execute(now=_NOW)
+
+    assert result.due == 0
+    mock_gather.assert_not_awaited()
+
+
+@patch("services.prefetch.gather_websearch_data", new_callable=AsyncMock)
+async def test_prefetch_failure_isolated(mock_gather: AsyncMock) -> None:
+    """One failing schedule does not abort the run."""
+    mock_gather.side_effect = [RuntimeError("serper down"), {"competitor_pages": []}]
+    svc = _make_service()
+    svc._schedules.get_enabled = AsyncMock(return_value=[_make_schedule(id=1), _make_schedule(id=2)])
+
+    result = await svc.execute(now=_NOW)
+
+    assert result.failed == 1
+    assert result.warmed == 1
+
+
+@patch("services.prefetch.gather_websearch_data", new_callable=AsyncMock)
+async def test_prefetch_failure_releases_slot(mock_gather: AsyncMock) -> None:
+    """A failed warm-up deletes its NX key so the next cron run can retry the slot."""
+    mock_gather.side_effect = RuntimeError("serper down")
+    svc = _make_service()
+
+    await svc.execute(now=_NOW)
+
+    slot_key = svc._redis.set.call_args.args[0]
+    svc._redis.delete.assert_awaited_once_with(slot_key)
+
+
+@patch("services.prefetch.gather_websearch_data", new_callable=AsyncMock)
+async def test_prefetch_batches_lookups(mock_gather: AsyncMock) -> None:
+    """Categories and projects are loaded once per run, not once per schedule."""
+    mock_gather.return_value = {"competitor_pages": []}
+    svc = _make_service()
+    svc._schedules.get_enabled = AsyncMock(return_value=[_make_schedule(id=i) for i in range(1, 6)])
+
+    result = await svc.execute(now=_NOW)
+
+    assert result.warmed == 5
+    svc._categories.get_by_ids.assert_awaited_once_with([10])
+    svc._projects.get_by_ids.assert_awaited_once_with([1])
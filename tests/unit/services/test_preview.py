@@ -6,6 +6,7 @@ error handling, image flows, token charging/refund on error.
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -85,6 +86,18 @@ class _MockImageResult:
     data: bytes
 
 
+def _image_pipeline(*images: bytes) -> AsyncMock:
+    """ImageService.generate_pipeline stand-in: runs ``process`` on each fake image."""
+
+    async def _run(user_id: int, context: dict[str, Any], process: Any, **kwargs: Any) -> list[Any]:
+        return await asyncio.gather(
+            *(process(i, _MockImageResult(data=data)) for i, data in enumerate(images)),
+            return_exceptions=True,
+        )
+
+    return AsyncMock(side_effect=_run)
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -112,6 +125,10 @@ def mock_image_storage() -> AsyncMock:
             signed_url="https://storage.example.com/signed/12345_0.webp",
         )
     )
+    storage.store = AsyncMock(return_value="123/1/abc.webp")
+    storage.sign_urls = AsyncMock(
+        side_effect=lambda paths: {p: f"https://storage.example.com/signed/{p}" for p in paths}
+    )
     storage.download = AsyncMock(return_value=b"fake_image_bytes")
     return storage
 
@@ -418,7 +435,7 @@ class TestGenerateArticleContent:
         # Article service returns text first (sequential, not parallel)
         mock_article_svc.return_value.generate = AsyncMock(return_value=_gen_result(_ARTICLE_CONTENT))
         # Image service generates AFTER text with block_contexts
-        mock_image_svc.return_value.generate = AsyncMock(return_value=[_MockImageResult(data=b"fake_img")])
+        mock_image_svc.return_value.generate_pipeline = _image_pipeline(b"fake_img")
 
         mock_reconcile.return_value = (
             "## Introduction\n\nText with ![img]({{RECONCILED_IMAGE_1}})",
@@ -437,8 +454,12 @@ class TestGenerateArticleContent:
         mock_distribute.assert_called_once()
         mock_extract_ctx.assert_called_once()
         # Verify images were generated with block_contexts
-        img_call = mock_image_svc.return_value.generate.call_args
+        img_call = mock_image_svc.return_value.generate_pipeline.call_args
         assert img_call.kwargs.get("block_contexts") == ["Intro context", "Body context"]
+        # The image was stored as it completed, before reconciliation; one signing request
+        mock_image_storage.store.assert_awaited_once()
+        mock_image_storage.sign_urls.assert_awaited_once_with(["123/1/abc.webp"])
+        assert result.images_count == 1
 
     @patch("services.ai.articles.ArticleService")
     @patch("services.ai.images.ImageService")
@@ -512,7 +533,9 @@ class TestGenerateArticleContent:
         )
         mock_audit_cls.return_value.get_branding_by_project = AsyncMock(return_value=None)
         mock_article_svc.return_value.generate = AsyncMock(return_value=_gen_result(_ARTICLE_CONTENT))
-        mock_image_svc.return_value.generate = AsyncMock(side_effect=AIGenerationError(message="Image gen failed"))
+        mock_image_svc.return_value.generate_pipeline = AsyncMock(
+            side_effect=AIGenerationError(message="Image gen failed")
+        )
 
         result = await preview_service.generate_article_content(user_id=1, project_id=1, category_id=10, keyword="test")
 
@@ -556,18 +579,17 @@ class TestGenerateArticleContent:
         )
         mock_audit_cls.return_value.get_branding_by_project = AsyncMock(return_value=None)
         mock_article_svc.return_value.generate = AsyncMock(return_value=_gen_result(_ARTICLE_CONTENT))
-        mock_image_svc.return_value.generate = AsyncMock(return_value=[_MockImageResult(data=b"img")])
-        mock_reconcile.return_value = (
-            "## Text\n\n![alt]({{RECONCILED_IMAGE_1}})",
-            [MagicMock(data=b"img", alt_text="alt", filename="f", caption="c")],
-        )
-        mock_image_storage.upload.side_effect = Exception("Storage down")
+        mock_image_svc.return_value.generate_pipeline = _image_pipeline(b"img")
+        mock_reconcile.return_value = ("## Text", [])
+        mock_image_storage.store.side_effect = Exception("Storage down")
 
         result = await preview_service.generate_article_content(user_id=1, project_id=1, category_id=10, keyword="test")
 
         # Article still returned, but without stored images
         assert isinstance(result, ArticleContent)
         assert result.images_count == 0
+        # Failed image is dropped before reconciliation, so its placeholder is removed
+        assert mock_reconcile.call_args.kwargs["generated_images"] == []
 
 
 # ---------------------------------------------------------------------------
@@ -712,7 +734,7 @@ class TestImageDirectorIntegration:
         )
         mock_audit_cls.return_value.get_branding_by_project = AsyncMock(return_value=None)
         mock_article_svc.return_value.generate = AsyncMock(return_value=_gen_result(_ARTICLE_CONTENT))
-        mock_image_svc.return_value.generate = AsyncMock(return_value=[])
+        mock_image_svc.return_value.generate_pipeline = _image_pipeline()
 
         mock_block = MagicMock()
         mock_block.heading = "Introduction"
@@ -746,5 +768,5 @@ class TestImageDirectorIntegration:
         # Director was called
         mock_director_cls.return_value.plan_images.assert_awaited_once()
         # Plans were passed to ImageService
-        img_call = mock_image_svc.return_value.generate.call_args
+        img_call = mock_image_svc.return_value.generate_pipeline.call_args
         assert img_call.kwargs.get("director_plans") == director_plans
@@ -169,7 +169,7 @@ class TestBuildCardData:
     @patch(f"{_SVC_MODULE}.PublicationsRepository")
     @patch(f"{_SVC_MODULE}.CategoriesRepository")
     @patch(f"{_SVC_MODULE}.ConnectionsRepository")
-    @patch(f"{_SVC_MODULE}.CredentialManager")
+    @patch(f"{_SVC_MODULE}.get_credential_manager")
     async def test_returns_card_data(
         self,
         _mock_cm_cls: MagicMock,
@@ -154,7 +154,7 @@ class TestMakeTokenRefreshCb:
 
     @patch("services.publish.get_settings")
     @patch("db.repositories.connections.ConnectionsRepository")
-    @patch("db.credential_manager.CredentialManager")
+    @patch("db.credential_manager.get_credential_manager")
     async def test_make_token_refresh_cb_calls_update_credentials(
         self,
         mock_cm_cls: MagicMock,
@@ -194,7 +194,7 @@ class TestMakeTokenRefreshCb:
 
     @patch("services.publish.get_settings")
     @patch("db.repositories.connections.ConnectionsRepository")
-    @patch("db.credential_manager.CredentialManager")
+    @patch("db.credential_manager.get_credential_manager")
     async def test_token_refresh_cb_different_connection_ids(
         self,
         mock_cm_cls: MagicMock,
@@ -0,0 +1,308 @@
+"""Tests for services/publish_queue.py — in-memory queue and worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from db.models import PublishJob
+from services.adaptive_limit import AdaptiveLimiter
+from services.publish_queue import InMemoryPublishQueue, PublishWorkerPool, RetryableJobError
+
+_PAYLOAD = {"schedule_id": 1, "category_id": 10, "connection_id": 5, "platform_type": "telegram", "user_id": 1}
+
+
+async def _wait_for(predicate: Any, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+def _pool(queue: InMemoryPublishQueue, handler: Any, **kwargs: Any) -> PublishWorkerPool:
+    kwargs.setdefault("concurrency", 2)
+    kwargs.setdefault("poll_interval", 0.01)
+    return PublishWorkerPool(queue, handler, worker_id="w1", **kwargs)
+
+
+class TestInMemoryPublishQueue:
+    async def test_enqueue_is_idempotent(self) -> None:
+        queue = InMemoryPublishQueue()
+
+        first = await queue.enqueue("msg_1", _PAYLOAD)
+        second = await queue.enqueue("msg_1", _PAYLOAD)
+
+        assert first is not None and first.status == "queued"
+        assert second is None
+
+    async def test_claim_leases_once(self) -> None:
+        queue = InMemoryPublishQueue()
+        await queue.enqueue("msg_1", _PAYLOAD)
+
+        claimed = await queue.claim("w1", 5, lease_seconds=60)
+        again = await queue.claim("w2", 5, lease_seconds=60)
+
+        assert [j.attempts for j in claimed] == [1]
+        assert claimed[0].lease_owner == "w1"
+        assert again == []
+
+    async def test_expired_lease_is_reclaimable(self) -> None:
+        queue = InMemoryPublishQueue()
+        job = await queue.enqueue("msg_1", _PAYLOAD)
+        assert job is not None
+        await queue.claim("w1", 1, lease_seconds=60)
+        queue._jobs[job.id].lease_expires_at = datetime.now(tz=UTC) - timedelta(seconds=1)
+
+        reclaimed = await queue.claim("w2", 1, lease_seconds=60)
+
+        assert reclaimed[0].lease_owner == "w2"
+        assert reclaimed[0].attempts == 2
+        # The old owner can no longer settle or heartbeat
+        assert await queue.complete(job.id, "w1", {}) is False
+        assert await queue.heartbeat(job.id, "w1", 60) is False
+
+    async def test_retry_delay_hides_job(self) -> None:
+        queue = InMemoryPublishQueue()
+        job = await queue.enqueue("msg_1", _PAYLOAD)
+        assert job is not None
+        await queue.claim("w1", 1, lease_seconds=60)
+
+        assert await queue.fail(job.id, "w1", "boom", retry_in=60) is True
+
+        assert await queue.claim("w1", 1, lease_seconds=60) == []
+        assert queue.get(job.id).status == "queued"  # type: ignore[union-attr]
+
+
+class TestPublishWorkerPool:
+    async def test_runs_job_and_completes(self) -> None:
+        queue = InMemoryPublishQueue()
+        seen: list[PublishJob] = []
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            seen.append(job)
+            return {"status": "ok"}
+
+        pool = _pool(queue, handler)
+        job = await queue.enqueue("msg_1", _PAYLOAD)
+        assert job is not None
+        pool.start()
+        pool.notify()
+        await _wait_for(lambda: queue.get(job.id).status == "done")  # type: ignore[union-attr]
+        await pool.stop(timeout=1)
+
+        assert queue.get(job.id).result == {"status": "ok"}  # type: ignore[union-attr]
+        assert seen[0].payload == _PAYLOAD
+        assert pool.stats()["completed"] == 1
+
+    async def test_concurrency_cap(self) -> None:
+        queue = InMemoryPublishQueue()
+        release = asyncio.Event()
+        active = 0
+        peak = 0
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await release.wait()
+            active -= 1
+            return {}
+
+        for i in range(5):
+            await queue.enqueue(f"msg_{i}", _PAYLOAD)
+        pool = _pool(queue, handler, concurrency=2)
+        pool.start()
+        await _wait_for(lambda: pool.in_flight == 2)
+        await asyncio.sleep(0.05)
+        assert peak == 2
+
+        release.set()
+        await _wait_for(lambda: pool.stats()["completed"] == 5)
+        await pool.stop(timeout=1)
+        assert peak == 2
+
+    async def test_failure_retries_with_backoff_then_fails(self) -> None:
+        queue = InMemoryPublishQueue()
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            raise RetryableJobError("boom")
+
+        job = await queue.enqueue("msg_1", _PAYLOAD, max_attempts=2)
+        assert job is not None
+        pool = _pool(queue, handler, retry_base_delay=0)
+        pool.start()
+        await _wait_for(lambda: queue.get(job.id).status == "failed")  # type: ignore[union-attr]
+        await pool.stop(timeout=1)
+
+        stored = queue.get(job.id)
+        assert stored is not None
+        assert stored.attempts == 2
+        assert "boom" in (stored.last_error or "")
+        assert pool.stats()["retried"] == 1
+        assert pool.stats()["failed"] == 1
+
+    async def test_unexpected_error_is_terminal(self) -> None:
+        """A non-retryable error may follow a successful publish — never run the job again."""
+        queue = InMemoryPublishQueue()
+        calls = 0
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            raise RuntimeError("create_log failed")
+
+        job = await queue.enqueue("msg_1", _PAYLOAD, max_attempts=3)
+        assert job is not None
+        pool = _pool(queue, handler, retry_base_delay=0)
+        pool.start()
+        await _wait_for(lambda: queue.get(job.id).status == "failed")  # type: ignore[union-attr]
+        await pool.stop(timeout=1)
+
+        assert calls == 1
+        assert (pool.stats()["retried"], pool.stats()["failed"]) == (0, 1)
+
+    async def test_lost_lease_cancels_handler(self) -> None:
+        """Another worker took the job over: the pipeline stops and the job is left to the new owner."""
+        queue = InMemoryPublishQueue()
+        cancelled = asyncio.Event()
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+
+        job = await queue.enqueue("msg_1", _PAYLOAD)
+        assert job is not None
+        pool = _pool(queue, handler, heartbeat_interval=0.01)
+        pool.start()
+        await _wait_for(lambda: pool.in_flight == 1)
+        queue._jobs[job.id].lease_owner = "w2"  # lease expired and re-claimed elsewhere
+
+        await _wait_for(cancelled.is_set)
+        await _wait_for(lambda: pool.in_flight == 0)
+        await pool.stop(timeout=1)
+
+        stored = queue.get(job.id)
+        assert stored is not None
+        assert (stored.status, stored.lease_owner) == ("running", "w2")
+        assert pool.stats()["failed"] == 1
+
+    async def test_retry_delay_is_exponential_and_capped(self) -> None:
+        pool = _pool(InMemoryPublishQueue(), None, retry_base_delay=60, retry_max_delay=200)
+
+        assert [pool.retry_delay(n) for n in (1, 2, 3)] == [60, 120, 200]
+
+    async def test_heartbeat_extends_lease(self) -> None:
+        queue = InMemoryPublishQueue()
+        release = asyncio.Event()
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            await release.wait()
+            return {}
+
+        job = await queue.enqueue("msg_1", _PAYLOAD)
+        assert job is not None
+        pool = _pool(queue, handler, lease_seconds=60, heartbeat_interval=0.01)
+        pool.start()
+        await _wait_for(lambda: pool.in_flight == 1)
+        first_lease = queue.get(job.id).lease_expires_at  # type: ignore[union-attr]
+        await asyncio.sleep(0.05)
+
+        assert queue.get(job.id).lease_expires_at > first_lease  # type: ignore[operator, union-attr]
+        release.set()
+        await pool.stop(timeout=1)
+
+    async def test_stop_releases_unfinished_jobs(self) -> None:
+        queue = InMemoryPublishQueue()
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            await asyncio.sleep(60)
+            return {}
+
+        job = await queue.enqueue("msg_1", _PAYLOAD)
+        assert job is not None
+        pool = _pool(queue, handler)
+        pool.start()
+        await _wait_for(lambda: pool.in_flight == 1)
+
+        await pool.stop(timeout=0.01)
+
+        stored = queue.get(job.id)
+        assert stored is not None
+        assert stored.status == "queued"
+        assert stored.attempts == 0  # released, not counted as a failed attempt
+        assert stored.lease_owner is None
+
+    async def test_exhausted_expired_job_not_rerun(self) -> None:
+        queue = InMemoryPublishQueue()
+        calls = 0
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            return {}
+
+        job = await queue.enqueue("msg_1", _PAYLOAD, max_attempts=1)
+        assert job is not None
+        await queue.claim("dead_worker", 1, lease_seconds=60)
+        queue._jobs[job.id].lease_expires_at = datetime.now(tz=UTC) - timedelta(seconds=1)
+
+        pool = _pool(queue, handler)
+        pool.start()
+        await _wait_for(lambda: queue.get(job.id).status == "failed")  # type: ignore[union-attr]
+        await pool.stop(timeout=1)
+
+        assert calls == 0
+        assert queue.get(job.id).last_error == "lease_expired"  # type: ignore[union-attr]
+
+    async def test_claim_error_does_not_kill_dispatcher(self) -> None:
+        queue = InMemoryPublishQueue()
+        original = queue.claim
+        failures = iter([RuntimeError("db down")])
+
+        async def flaky_claim(*args: Any) -> list[PublishJob]:
+            exc = next(failures, None)
+            if exc is not None:
+                raise exc
+            return await original(*args)
+
+        queue.claim = flaky_claim  # type: ignore[method-assign]
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            return {}
+
+        job = await queue.enqueue("msg_1", _PAYLOAD)
+        assert job is not None
+        pool = _pool(queue, handler)
+        pool.start()
+        await _wait_for(lambda: queue.get(job.id).status == "done")  # type: ignore[union-attr]
+        await pool.stop(timeout=1)
+
+    async def test_gate_limits_slots_and_gets_feedback(self) -> None:
+        """With a shared limiter gate, slots follow the limiter and completions feed it back."""
+        queue = InMemoryPublishQueue()
+        limiter = AdaptiveLimiter(1, max_limit=4, memory_limit_bytes=1 << 40)
+        gate = limiter.gate("publish")
+        peak = 0
+
+        async def handler(job: PublishJob) -> dict[str, Any]:
+            nonlocal peak
+            peak = max(peak, gate.in_flight)
+            await asyncio.sleep(0.01)
+            return {}
+
+        for i in range(6):
+            await queue.enqueue(f"msg_{i}", _PAYLOAD)
+        pool = _pool(queue, handler, gate=gate)
+        pool.start()
+        await _wait_for(lambda: pool.stats()["completed"] == 6)
+        await pool.stop(timeout=1)
+
+        # Completions while the gate was full raised the limit past 1
+        assert limiter.limit > 1
+        assert peak <= limiter.limit
+        assert gate.in_flight == 0
+        assert pool.stats()["concurrency"] == gate.limit
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from api.models import PublishPayload
-from db.models import Category, PlatformConnection, PlatformSchedule, User
-from services.publish import PublishService
+from db.models import Category, PlatformConnection, PlatformSchedule, Project, User
+from services.ai.reconciliation import ConvertedImage
+from services.checkpoints import StageCheckpoints
+from services.publish import _CROSS_POST_CONCURRENCY, PublishService
 from services.research_helpers import (
     fetch_research,
     format_competitor_analysis,
@@ -17,6 +20,7 @@ from services.research_helpers import (
     identify_gaps,
     is_own_site,
 )
+from services.tokens import estimate_cross_post_cost
 
 
 @pytest.fixture(autouse=True)
@@ -148,7 +152,7 @@ def _make_service() -> PublishService:
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_publish_happy_path(
     mock_conn_cls: MagicMock,
@@ -198,20 +202,37 @@ async def test_schedule_disabled_h13() -> None:
     assert result.reason == "schedule_disabled"
 
 
-async def test_user_not_found() -> None:
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_user_not_found(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+) -> None:
     """Missing user returns error."""
     svc = _make_service()
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection())
     svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
     svc._users.get_by_id = AsyncMock(return_value=None)
+    svc._categories.get_by_id = AsyncMock(return_value=_make_category())
 
     result = await svc.execute(_make_payload())
     assert result.status == "error"
     assert result.reason == "user_not_found"
 
 
-async def test_category_not_found() -> None:
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_category_not_found(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+) -> None:
     """Missing category returns error with notify."""
     svc = _make_service()
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection())
     svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
     svc._users.get_by_id = AsyncMock(return_value=_make_user())
     svc._categories.get_by_id = AsyncMock(return_value=None)
@@ -222,9 +243,17 @@ async def test_category_not_found() -> None:
     assert result.notify is True
 
 
-async def test_no_keywords_e17() -> None:
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_no_keywords_e17(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+) -> None:
     """E17: No keywords configured returns error with notify=True."""
     svc = _make_service()
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection())
     svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
     svc._users.get_by_id = AsyncMock(return_value=_make_user(notify_publications=True))
     svc._categories.get_by_id = AsyncMock(return_value=_make_category(keywords=[]))
@@ -235,9 +264,17 @@ async def test_no_keywords_e17() -> None:
     assert result.notify is True
 
 
-async def test_no_keywords_e17_notify_off() -> None:
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_no_keywords_e17_notify_off(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+) -> None:
     """E17: No keywords with notify_publications=False does not notify."""
     svc = _make_service()
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection())
     svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
     svc._users.get_by_id = AsyncMock(return_value=_make_user(notify_publications=False))
     svc._categories.get_by_id = AsyncMock(return_value=_make_category(keywords=[]))
@@ -249,7 +286,7 @@ async def test_no_keywords_e17_notify_off() -> None:
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_connection_inactive(
     mock_conn_cls: MagicMock,
@@ -274,7 +311,83 @@ async def test_connection_inactive(
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_connection_of_other_project_rejected(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+) -> None:
+    """Connection must belong to the payload project (ownership checked in _load_context)."""
+    svc = _make_service()
+    svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
+    svc._users.get_by_id = AsyncMock(return_value=_make_user())
+    svc._categories.get_by_id = AsyncMock(return_value=_make_category())
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection(project_id=2))
+
+    result = await svc.execute(_make_payload())
+    assert result.reason == "connection_inactive"
+
+
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_project_of_other_user_rejected(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+) -> None:
+    """Project owned by another user: error without notifying the payload user."""
+    svc = _make_service()
+    svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
+    svc._users.get_by_id = AsyncMock(return_value=_make_user())
+    svc._categories.get_by_id = AsyncMock(return_value=_make_category())
+    other_owner = Project(id=1, user_id=2, name="P", company_name="C", specialization="S")
+    svc._projects.get_by_id = AsyncMock(return_value=other_owner)
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection())
+
+    result = await svc.execute(_make_payload())
+    assert result.reason == "project_not_found"
+    assert result.notify is False
+
+
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_context_records_loaded_concurrently(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+) -> None:
+    """User, category, project and connection lookups are in flight at the same time."""
+    in_flight = 0
+    peak = 0
+
+    def _slow(value: Any) -> AsyncMock:
+        async def _get(*args: Any) -> Any:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return value
+
+        return AsyncMock(side_effect=_get)
+
+    svc = _make_service()
+    svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
+    svc._users.get_by_id = _slow(_make_user())
+    svc._categories.get_by_id = _slow(_make_category(keywords=[]))
+    svc._projects.get_by_id = _slow(None)
+    mock_conn_cls.return_value.get_by_id = _slow(_make_connection())
+
+    result = await svc.execute(_make_payload())
+    assert result.reason == "no_keywords"
+    assert peak == 4
+
+
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_insufficient_balance_e01_notifies(
     mock_conn_cls: MagicMock,
@@ -303,7 +416,7 @@ async def test_insufficient_balance_e01_notifies(
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_no_available_keyword(
     mock_conn_cls: MagicMock,
@@ -329,7 +442,7 @@ async def test_no_available_keyword(
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_insufficient_balance_e01(
     mock_conn_cls: MagicMock,
@@ -363,7 +476,7 @@ async def test_insufficient_balance_e01(
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_low_pool_warning_e22(
     mock_conn_cls: MagicMock,
@@ -399,7 +512,7 @@ async def test_low_pool_warning_e22(
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_refund_on_generation_error(
     mock_conn_cls: MagicMock,
@@ -432,13 +545,130 @@ async def test_refund_on_generation_error(
     svc._tokens.refund.assert_not_called()
 
 
+def _resumable_service() -> PublishService:
+    svc = _make_service()
+    svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule())
+    svc._users.get_by_id = AsyncMock(return_value=_make_user())
+    svc._categories.get_by_id = AsyncMock(return_value=_make_category())
+    svc._publications.get_rotation_keyword = AsyncMock(return_value=("other kw", False))
+    svc._publications.create_log = AsyncMock(return_value=MagicMock())
+    svc._tokens.check_balance = AsyncMock(return_value=True)
+    svc._generate_and_publish = AsyncMock(side_effect=RuntimeError("Publish failed: 502"))
+    return svc
+
+
+@patch("services.publish.StageCheckpoints.open")
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_checkpointed_failure_returns_retry(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+    mock_open: AsyncMock,
+) -> None:
+    """Failure after the article was checkpointed: resume keyword, no error log, status=retry."""
+    svc = _resumable_service()
+    mock_open.return_value = StageCheckpoints(
+        None, "publish:msg_1", {"keyword": {"keyword": "seo tips"}, "article": {"content": {}}}
+    )
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection())
+    mock_settings.return_value = MagicMock(encryption_key=MagicMock(get_secret_value=MagicMock(return_value="key")))
+
+    result = await svc.execute(_make_payload(), run_key="publish:msg_1", can_retry=True)
+
+    assert result.status == "retry"
+    assert result.keyword == "seo tips"
+    svc._publications.get_rotation_keyword.assert_not_awaited()
+    svc._publications.create_log.assert_not_awaited()
+    svc._redis.incr.assert_not_awaited()
+    assert svc._generate_and_publish.call_args.kwargs["checkpoint"] is mock_open.return_value
+
+
+@patch("services.publish.StageCheckpoints.open")
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_last_attempt_failure_is_logged_as_error(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+    mock_open: AsyncMock,
+) -> None:
+    """No attempts left: a checkpointed failure is a regular error."""
+    svc = _resumable_service()
+    mock_open.return_value = StageCheckpoints(None, "publish:msg_1", {"article": {"content": {}}})
+    mock_conn_cls.return_value.get_by_id = AsyncMock(return_value=_make_connection())
+    mock_settings.return_value = MagicMock(encryption_key=MagicMock(get_secret_value=MagicMock(return_value="key")))
+
+    result = await svc.execute(_make_payload(), run_key="publish:msg_1", can_retry=False)
+
+    assert result.status == "error"
+    svc._publications.create_log.assert_awaited_once()
+
+
+async def test_article_images_checkpointed_in_placeholder_order() -> None:
+    """Images are stored as they complete; the checkpoint keeps placeholder order."""
+    svc = _make_service()
+    svc._image_storage.store = AsyncMock(side_effect=lambda data, uid, pid, mime, holder: f"p{data.decode()[-1]}")
+    checkpoint = StageCheckpoints(None, "publish:msg_1")
+    checkpoint.save = AsyncMock(return_value=True)  # type: ignore[method-assign]
+
+    async def _pipeline(user_id: int, context: dict[str, Any], process: Any, **kwargs: Any) -> list[Any]:
+        # Image 2 finishes first, image 1 failed to generate
+        last = await process(2, MagicMock(data=b"img2"))
+        first = await process(0, MagicMock(data=b"img0"))
+        return [first, RuntimeError("gen failed"), last]
+
+    image_service = MagicMock(generate_pipeline=AsyncMock(side_effect=_pipeline))
+
+    images, failed, intact = await svc._generate_article_images(
+        image_service,
+        checkpoint,
+        user_id=1,
+        project_id=1,
+        image_context={},
+        image_count=3,
+        block_contexts=None,
+        director_plans=None,
+    )
+
+    assert [img.data for img in images] == [b"img0", b"img2"]
+    assert (failed, intact) == (1, True)
+    checkpoint.save.assert_awaited_once_with("images", {"paths": ["p0", "p2"], "failed": 1})
+    # Stored objects belong to this run only (its cleanup deletes them)
+    assert {c.kwargs["holder"] for c in svc._image_storage.store.await_args_list} == {"publish:msg_1"}
+
+
+async def test_resumed_article_images_are_not_converted_again() -> None:
+    """Checkpointed images were converted before upload; extension comes from the path."""
+    svc = _make_service()
+    svc._image_storage.download = AsyncMock(side_effect=[b"webp", RuntimeError("gone")])
+    checkpoint = StageCheckpoints(None, "publish:msg_1", {"images": {"paths": ["a.webp", "b.png"], "failed": 0}})
+
+    images, failed, intact = await svc._generate_article_images(
+        MagicMock(),
+        checkpoint,
+        user_id=1,
+        project_id=1,
+        image_context={},
+        image_count=2,
+        block_contexts=None,
+        director_plans=None,
+    )
+
+    assert isinstance(images[0], ConvertedImage) and images[0].ext == "webp"
+    assert isinstance(images[1], RuntimeError)
+    assert (failed, intact) == (1, False)
+
+
 # ---------------------------------------------------------------------------
 # Social post pipeline
 # ---------------------------------------------------------------------------
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_social_post_content_type(
     mock_conn_cls: MagicMock,
@@ -500,10 +730,15 @@ def _make_social_gen_result():
     return result
 
 
+def _adapt_all(result: Any) -> AsyncMock:
+    """adapt_for_platforms mock returning the same result for every requested platform."""
+    return AsyncMock(side_effect=lambda **kw: dict.fromkeys(kw["target_platforms"], result))
+
+
 @patch("services.ai.social_posts.SocialPostService", autospec=True)
 @patch("services.ai.content_validator.ContentValidator", autospec=True)
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_cross_post_happy_path(
     mock_conn_cls: MagicMock,
@@ -521,7 +756,9 @@ async def test_cross_post_happy_path(
     svc._schedules.update = AsyncMock(return_value=None)
     svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule(cross_post_connection_ids=[20, 30]))
     svc._tokens.check_balance = AsyncMock(return_value=True)
+    svc._tokens.get_balance = AsyncMock(return_value=1000)
     svc._tokens.charge = AsyncMock(return_value=680)
+    svc._tokens.refund = AsyncMock(return_value=True)
 
     # Lead generates with text
     gen = MagicMock()
@@ -532,13 +769,14 @@ async def test_cross_post_happy_path(
     vk_conn = _make_connection(id=20, platform_type="vk", identifier="VK Group")
     pin_conn = _make_connection(id=30, platform_type="pinterest", identifier="Board")
     conn_repo = MagicMock()
-    conn_repo.get_by_id = AsyncMock(side_effect=lambda cid: {5: _make_connection(), 20: vk_conn, 30: pin_conn}[cid])
+    conn_repo.get_by_id = AsyncMock(return_value=_make_connection())
+    conn_repo.get_by_ids = AsyncMock(return_value={20: vk_conn, 30: pin_conn})
     mock_conn_cls.return_value = conn_repo
     mock_settings.return_value = MagicMock(encryption_key=MagicMock(get_secret_value=MagicMock(return_value="key")))
 
-    # SocialPostService.adapt_for_platform returns adapted text
+    # SocialPostService.adapt_for_platforms returns adapted text for both platforms in one call
     mock_social_inst = MagicMock()
-    mock_social_inst.adapt_for_platform = AsyncMock(return_value=_make_social_gen_result())
+    mock_social_inst.adapt_for_platforms = _adapt_all(_make_social_gen_result())
     mock_social_cls.return_value = mock_social_inst
 
     # Validator passes
@@ -557,11 +795,18 @@ async def test_cross_post_happy_path(
     assert result.status == "ok"
     assert len(result.cross_post_results) == 2
     assert all(xp.status == "ok" for xp in result.cross_post_results)
+    # Connections batch-loaded, one adaptation call, tokens reserved for both targets in one charge
+    conn_repo.get_by_ids.assert_awaited_once_with([20, 30])
+    mock_social_inst.adapt_for_platforms.assert_awaited_once()
+    assert mock_social_inst.adapt_for_platforms.await_args.kwargs["target_platforms"] == ["vk", "pinterest"]
+    xp_charges = [c for c in svc._tokens.charge.await_args_list if c.args[2] == "cross_post"]
+    assert [c.args[1] for c in xp_charges] == [estimate_cross_post_cost() * 2]
+    svc._tokens.refund.assert_not_awaited()
 
 
 @patch("services.ai.social_posts.SocialPostService", autospec=True)
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_cross_post_inactive_connection_skipped(
     mock_conn_cls: MagicMock,
@@ -587,7 +832,8 @@ async def test_cross_post_inactive_connection_skipped(
     # Cross-post connection is inactive
     inactive_conn = _make_connection(id=20, platform_type="vk", status="error")
     conn_repo = MagicMock()
-    conn_repo.get_by_id = AsyncMock(side_effect=lambda cid: {5: _make_connection(), 20: inactive_conn}[cid])
+    conn_repo.get_by_id = AsyncMock(return_value=_make_connection())
+    conn_repo.get_by_ids = AsyncMock(return_value={20: inactive_conn})
     mock_conn_cls.return_value = conn_repo
     mock_settings.return_value = MagicMock(encryption_key=MagicMock(get_secret_value=MagicMock(return_value="key")))
 
@@ -596,49 +842,156 @@ async def test_cross_post_inactive_connection_skipped(
     assert len(result.cross_post_results) == 1
     assert result.cross_post_results[0].status == "error"
     assert result.cross_post_results[0].error == "connection_inactive"
+    # Nothing to reserve for
+    assert all(c.args[2] != "cross_post" for c in svc._tokens.charge.await_args_list)
 
 
-@patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
-@patch("services.publish.ConnectionsRepository")
-async def test_cross_post_insufficient_balance_stops_remaining(
+def _cross_post_service(
     mock_conn_cls: MagicMock,
-    mock_cm_cls: MagicMock,
     mock_settings: MagicMock,
-) -> None:
-    """Insufficient balance for cross-post stops remaining targets."""
+    mock_social_cls: MagicMock,
+    mock_validator_cls: MagicMock,
+    targets: list[PlatformConnection],
+    balance: int = 1000,
+) -> tuple[PublishService, MagicMock]:
+    """Service whose lead publish succeeds and whose cross-posts adapt/validate OK."""
     svc = _make_service()
     svc._users.get_by_id = AsyncMock(return_value=_make_user())
     svc._categories.get_by_id = AsyncMock(return_value=_make_category())
     svc._publications.get_rotation_keyword = AsyncMock(return_value=("seo tips", False))
     svc._publications.create_log = AsyncMock(return_value=MagicMock(post_url="https://t.me/post"))
     svc._schedules.update = AsyncMock(return_value=None)
-    svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule(cross_post_connection_ids=[20, 30]))
-    # Lead charge OK, but cross-post balance check fails
-    svc._tokens.check_balance = AsyncMock(side_effect=[True, False])
+    svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule(cross_post_connection_ids=[c.id for c in targets]))
+    svc._tokens.check_balance = AsyncMock(return_value=True)
+    svc._tokens.get_balance = AsyncMock(return_value=balance)
     svc._tokens.charge = AsyncMock(return_value=680)
+    svc._tokens.refund = AsyncMock(return_value=True)
 
     gen = MagicMock()
     gen.content = {"text": "Lead text", "images_meta": []}
     svc._generate_and_publish = AsyncMock(return_value=(gen, _make_pub_result(), 0))
 
-    vk_conn = _make_connection(id=20, platform_type="vk")
     conn_repo = MagicMock()
-    conn_repo.get_by_id = AsyncMock(side_effect=lambda cid: {5: _make_connection(), 20: vk_conn}[cid])
+    conn_repo.get_by_id = AsyncMock(return_value=_make_connection())
+    conn_repo.get_by_ids = AsyncMock(return_value={c.id: c for c in targets})
     mock_conn_cls.return_value = conn_repo
     mock_settings.return_value = MagicMock(encryption_key=MagicMock(get_secret_value=MagicMock(return_value="key")))
 
+    mock_social_inst = MagicMock()
+    mock_social_inst.adapt_for_platforms = _adapt_all(_make_social_gen_result())
+    mock_social_cls.return_value = mock_social_inst
+    mock_val_inst = MagicMock()
+    mock_val_inst.validate.return_value = MagicMock(is_valid=True, errors=[])
+    mock_validator_cls.return_value = mock_val_inst
+    return svc, conn_repo
+
+
+@patch("services.ai.content_validator.ContentValidator", autospec=True)
+@patch("services.ai.social_posts.SocialPostService", autospec=True)
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_cross_post_reservation_covers_affordable_targets(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+    mock_social_cls: MagicMock,
+    mock_validator_cls: MagicMock,
+) -> None:
+    """Balance covers one of two targets: first is reserved and posted, second gets insufficient_balance."""
+    cost = estimate_cross_post_cost()
+    targets = [_make_connection(id=20, platform_type="vk"), _make_connection(id=30, platform_type="pinterest")]
+    svc, _ = _cross_post_service(
+        mock_conn_cls, mock_settings, mock_social_cls, mock_validator_cls, targets, balance=cost
+    )
+    svc._get_publisher = MagicMock(
+        return_value=MagicMock(publish=AsyncMock(return_value=MagicMock(success=True, post_url="https://vk/1")))
+    )
+
     result = await svc.execute(_make_payload(platform_type="telegram"))
+
     assert result.status == "ok"
-    # First cross-post fails with balance, second never attempted (break)
-    assert len(result.cross_post_results) == 1
-    assert result.cross_post_results[0].error == "insufficient_balance"
+    assert [xp.status for xp in result.cross_post_results] == ["ok", "error"]
+    assert result.cross_post_results[1].error == "insufficient_balance"
+    xp_charges = [c for c in svc._tokens.charge.await_args_list if c.args[2] == "cross_post"]
+    assert [c.args[1] for c in xp_charges] == [cost]
+    # Balance re-read past the run's identity map (the user row from the start may be stale)
+    svc._tokens.get_balance.assert_awaited_once_with(1, fresh=True)
+
+
+@patch("services.ai.content_validator.ContentValidator", autospec=True)
+@patch("services.ai.social_posts.SocialPostService", autospec=True)
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_cross_post_reservation_failure_skips_all(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+    mock_social_cls: MagicMock,
+    mock_validator_cls: MagicMock,
+) -> None:
+    """Charge losing a race with a concurrent spend: no target is attempted."""
+    from bot.exceptions import InsufficientBalanceError
+
+    targets = [_make_connection(id=20, platform_type="vk"), _make_connection(id=30, platform_type="pinterest")]
+    svc, _ = _cross_post_service(mock_conn_cls, mock_settings, mock_social_cls, mock_validator_cls, targets)
+
+    async def _charge(user_id: int, amount: int, operation_type: str, **kwargs: Any) -> int:
+        if operation_type == "cross_post":
+            raise InsufficientBalanceError
+        return 680
+
+    svc._tokens.charge = AsyncMock(side_effect=_charge)
+    svc._get_publisher = MagicMock()
+
+    result = await svc.execute(_make_payload(platform_type="telegram"))
+
+    assert result.status == "ok"
+    assert [xp.error for xp in result.cross_post_results] == ["insufficient_balance"] * 2
+    svc._get_publisher.assert_not_called()
+    svc._tokens.refund.assert_not_awaited()
+
+
+@patch("services.ai.content_validator.ContentValidator", autospec=True)
+@patch("services.ai.social_posts.SocialPostService", autospec=True)
+@patch("services.publish.get_settings")
+@patch("services.publish.get_credential_manager")
+@patch("services.publish.ConnectionsRepository")
+async def test_cross_posts_run_concurrently_with_cap(
+    mock_conn_cls: MagicMock,
+    mock_cm_cls: MagicMock,
+    mock_settings: MagicMock,
+    mock_social_cls: MagicMock,
+    mock_validator_cls: MagicMock,
+) -> None:
+    """Targets publish in parallel up to _CROSS_POST_CONCURRENCY; results keep configured order."""
+    targets = [_make_connection(id=20 + i, platform_type="vk") for i in range(_CROSS_POST_CONCURRENCY + 2)]
+    svc, _ = _cross_post_service(mock_conn_cls, mock_settings, mock_social_cls, mock_validator_cls, targets)
+    active = 0
+    peak = 0
+
+    async def _publish(request: Any) -> MagicMock:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return MagicMock(success=True, post_url=f"https://vk/{request.connection.id}")
+
+    svc._get_publisher = MagicMock(return_value=MagicMock(publish=AsyncMock(side_effect=_publish)))
+
+    result = await svc.execute(_make_payload(platform_type="telegram"))
+
+    assert peak == _CROSS_POST_CONCURRENCY
+    assert [xp.connection_id for xp in result.cross_post_results] == [c.id for c in targets]
+    assert all(xp.status == "ok" for xp in result.cross_post_results)
 
 
 @patch("services.ai.content_validator.ContentValidator", autospec=True)
 @patch("services.ai.social_posts.SocialPostService", autospec=True)
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_cross_post_adaptation_error_refunds_and_continues(
     mock_conn_cls: MagicMock,
@@ -647,7 +1000,7 @@ async def test_cross_post_adaptation_error_refunds_and_continues(
     mock_social_cls: MagicMock,
     mock_validator_cls: MagicMock,
 ) -> None:
-    """Adaptation error for cross-post: no charge, no refund (charge-after-result)."""
+    """Adaptation error for cross-post: its reserved tokens are refunded, other targets continue."""
     svc = _make_service()
     svc._users.get_by_id = AsyncMock(return_value=_make_user())
     svc._categories.get_by_id = AsyncMock(return_value=_make_category())
@@ -656,6 +1009,7 @@ async def test_cross_post_adaptation_error_refunds_and_continues(
     svc._schedules.update = AsyncMock(return_value=None)
     svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule(cross_post_connection_ids=[20, 30]))
     svc._tokens.check_balance = AsyncMock(return_value=True)
+    svc._tokens.get_balance = AsyncMock(return_value=1000)
     svc._tokens.charge = AsyncMock(return_value=680)
     svc._tokens.refund = AsyncMock(return_value=True)
 
@@ -668,14 +1022,15 @@ async def test_cross_post_adaptation_error_refunds_and_continues(
     vk_conn = _make_connection(id=20, platform_type="vk")
     pin_conn = _make_connection(id=30, platform_type="pinterest", identifier="Board")
     conn_repo = MagicMock()
-    conn_repo.get_by_id = AsyncMock(side_effect=lambda cid: {5: _make_connection(), 20: vk_conn, 30: pin_conn}[cid])
+    conn_repo.get_by_id = AsyncMock(return_value=_make_connection())
+    conn_repo.get_by_ids = AsyncMock(return_value={20: vk_conn, 30: pin_conn})
     mock_conn_cls.return_value = conn_repo
     mock_settings.return_value = MagicMock(encryption_key=MagicMock(get_secret_value=MagicMock(return_value="key")))
 
-    # adapt_for_platform: first call raises, second succeeds
+    # adapt_for_platforms: VK adaptation failed (fallback call raised), Pinterest succeeded
     mock_social_inst = MagicMock()
-    mock_social_inst.adapt_for_platform = AsyncMock(
-        side_effect=[RuntimeError("AI service down"), _make_social_gen_result()]
+    mock_social_inst.adapt_for_platforms = AsyncMock(
+        return_value={"vk": RuntimeError("AI service down"), "pinterest": _make_social_gen_result()}
     )
     mock_social_cls.return_value = mock_social_inst
 
@@ -696,12 +1051,13 @@ async def test_cross_post_adaptation_error_refunds_and_continues(
     assert "AI service down" in (result.cross_post_results[0].error or "")
     # Second: success
     assert result.cross_post_results[1].status == "ok"
-    # No refund needed — charge-after-result: failed cross-post was never charged
-    svc._tokens.refund.assert_not_awaited()
+    # Only the failed target's share of the reservation is returned
+    svc._tokens.refund.assert_awaited_once()
+    assert svc._tokens.refund.await_args.args[1] == estimate_cross_post_cost()
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_cross_post_empty_ids_no_cross_posts(
     mock_conn_cls: MagicMock,
@@ -965,7 +1321,7 @@ async def test_fetch_research_failure_returns_none() -> None:
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_schedule_loaded_once_cr77c(
     mock_conn_cls: MagicMock,
@@ -997,7 +1353,7 @@ async def test_schedule_loaded_once_cr77c(
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_schedule_passed_to_pause_cr77c(
     mock_conn_cls: MagicMock,
@@ -1035,7 +1391,7 @@ async def test_schedule_passed_to_pause_cr77c(
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_cluster_passed_to_generate_and_publish(
     mock_conn_cls: MagicMock,
@@ -1136,7 +1492,7 @@ def test_identify_gaps_with_pages() -> None:
 
 
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_publish_sequential_with_director(
     mock_conn_cls: MagicMock,
@@ -1177,7 +1533,7 @@ async def test_publish_sequential_with_director(
 @patch("services.ai.social_posts.SocialPostService", autospec=True)
 @patch("services.ai.images.ImageService", autospec=True)
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_autopublish_pinterest_hashtags_in_description(
     mock_conn_cls: MagicMock,
@@ -1254,7 +1610,7 @@ async def test_autopublish_pinterest_hashtags_in_description(
 @patch("services.ai.content_validator.ContentValidator", autospec=True)
 @patch("services.ai.social_posts.SocialPostService", autospec=True)
 @patch("services.publish.get_settings")
-@patch("services.publish.CredentialManager")
+@patch("services.publish.get_credential_manager")
 @patch("services.publish.ConnectionsRepository")
 async def test_crosspost_pinterest_hashtags_in_description(
     mock_conn_cls: MagicMock,
@@ -1276,6 +1632,7 @@ async def test_crosspost_pinterest_hashtags_in_description(
     svc._schedules.update = AsyncMock(return_value=None)
     svc._schedules.get_by_id = AsyncMock(return_value=_make_schedule(cross_post_connection_ids=[30]))
     svc._tokens.check_balance = AsyncMock(return_value=True)
+    svc._tokens.get_balance = AsyncMock(return_value=1000)
     svc._tokens.charge = AsyncMock(return_value=680)
 
     # Lead generates with text
@@ -1286,11 +1643,12 @@ async def test_crosspost_pinterest_hashtags_in_description(
     # Cross-post connection is Pinterest
     pin_conn = _make_connection(id=30, platform_type="pinterest", identifier="Board")
     conn_repo = MagicMock()
-    conn_repo.get_by_id = AsyncMock(side_effect=lambda cid: {5: _make_connection(), 30: pin_conn}[cid])
+    conn_repo.get_by_id = AsyncMock(return_value=_make_connection())
+    conn_repo.get_by_ids = AsyncMock(return_value={30: pin_conn})
     mock_conn_cls.return_value = conn_repo
     mock_settings.return_value = MagicMock(encryption_key=MagicMock(get_secret_value=MagicMock(return_value="key")))
 
-    # SocialPostService.adapt_for_platform returns adapted content with hashtags
+    # SocialPostService.adapt_for_platforms returns adapted content with hashtags
     adapted = MagicMock()
     adapted.content = {
         "text": "Adapted pin description",
@@ -1298,7 +1656,7 @@ async def test_crosspost_pinterest_hashtags_in_description(
         "pin_title": "Pin Tips",
     }
     mock_social_inst = MagicMock()
-    mock_social_inst.adapt_for_platform = AsyncMock(return_value=adapted)
+    mock_social_inst.adapt_for_platforms = _adapt_all(adapted)
     mock_social_cls.return_value = mock_social_inst
 
     # Validator passes
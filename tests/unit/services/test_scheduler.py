@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -39,6 +41,8 @@ def _make_service(mock_db=None) -> tuple[SchedulerService, MagicMock]:
     db = mock_db or MagicMock()
     svc = SchedulerService(db=db, qstash_token="test_token", base_url="https://example.com")
     mock_qstash = MagicMock()
+    mock_qstash.schedule.create = AsyncMock()
+    mock_qstash.schedule.delete = AsyncMock()
     svc._qstash = mock_qstash
     return svc, mock_qstash
 
@@ -114,10 +118,87 @@ async def test_create_qstash_partial_failure_cleans_up() -> None:
 
     schedule = _make_schedule(schedule_times=["09:00", "15:00"])
     with pytest.raises(ScheduleError):
-        await svc.create_qstash_schedules(schedule, user_id=1, project_id=1, timezone="UTC")
+        await svc.create_qstash_schedules(schedule, user_id=1, project_id=1, timezone="UTC", minutes=[540, 900])
 
-    # Verify cleanup of the first schedule
-    mock_q.schedule.delete.assert_called_once_with("qs_1")
+    # Created slot and the failed slot (outcome unknown to the caller) are both deleted
+    deleted = sorted(c.args[0] for c in mock_q.schedule.delete.await_args_list)
+    assert deleted == ["pub-1-1-900", "qs_1"]
+
+
+async def test_create_qstash_failure_keeps_live_ids() -> None:
+    """Compensation never deletes IDs already recorded on the schedule (rebalance upserts)."""
+    from bot.exceptions import ScheduleError
+
+    svc, mock_q = _make_service()
+    mock_q.schedule.create.side_effect = ["pub-1-0-540", Exception("API error")]
+
+    schedule = _make_schedule(schedule_times=["09:00", "15:00"], qstash_schedule_ids=["pub-1-0-540", "qs_old"])
+    with pytest.raises(ScheduleError):
+        await svc.create_qstash_schedules(schedule, user_id=1, project_id=1, timezone="UTC", minutes=[540, 903])
+
+    mock_q.schedule.delete.assert_awaited_once_with("pub-1-1-903")
+
+
+async def test_create_qstash_uses_deterministic_slot_ids() -> None:
+    """Each slot is created under pub-{schedule_id}-{n}-{minute}, so retries upsert."""
+    svc, mock_q = _make_service()
+    mock_q.schedule.create.side_effect = lambda **kw: kw["schedule_id"]
+
+    schedule = _make_schedule(id=7, schedule_times=["09:00", "15:00", "21:00"])
+    ids = await svc.create_qstash_schedules(schedule, 1, 1, "UTC", minutes=[541, 900, 1258])
+
+    assert ids == ["pub-7-0-541", "pub-7-1-900", "pub-7-2-1258"]
+    crons = [c.kwargs["cron"] for c in mock_q.schedule.create.await_args_list]
+    assert crons == ["CRON_TZ=UTC 1 9 * * 1,3,5", "CRON_TZ=UTC 0 15 * * 1,3,5", "CRON_TZ=UTC 58 20 * * 1,3,5"]
+
+
+async def test_create_qstash_places_slot_in_least_loaded_minute() -> None:
+    """09:00 Monday is crowded: the slot goes to the only free minute in the window."""
+    svc, mock_q = _make_service()
+    svc._slot_tolerance = 2
+    mock_q.schedule.create.side_effect = lambda **kw: kw["schedule_id"]
+    svc._schedules = MagicMock()
+    svc._schedules.get_slot_histogram = AsyncMock(return_value={1440 + m: 7 for m in range(538, 542)})
+
+    schedule = _make_schedule(schedule_days=["mon"], schedule_times=["09:00"])
+    ids = await svc.create_qstash_schedules(schedule, user_id=1, project_id=1, timezone="UTC")
+
+    assert ids == ["pub-1-0-542"]
+    assert mock_q.schedule.create.call_args.kwargs["cron"] == "CRON_TZ=UTC 2 9 * * 1"
+
+
+async def test_slot_histogram_failure_falls_back_to_jitter() -> None:
+    svc, _ = _make_service()
+    svc._schedules = MagicMock()
+    svc._schedules.get_slot_histogram = AsyncMock(side_effect=Exception("rpc missing"))
+
+    minutes = await svc.place_slots(_make_schedule(schedule_times=["09:00"]), "UTC")
+
+    assert 535 <= minutes[0] <= 545
+
+
+async def test_create_qstash_runs_concurrently_within_bound() -> None:
+    """Slots are created in parallel, never more than _QSTASH_CONCURRENCY at once."""
+    from services.scheduler import _QSTASH_CONCURRENCY
+
+    in_flight = peak = 0
+
+    async def _create(**kwargs: object) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return str(kwargs["schedule_id"])
+
+    svc, mock_q = _make_service()
+    mock_q.schedule.create.side_effect = _create
+
+    times = [f"{h:02d}:00" for h in range(_QSTASH_CONCURRENCY + 4)]
+    ids = await svc.create_qstash_schedules(_make_schedule(schedule_times=times), 1, 1, "UTC")
+
+    assert len(ids) == len(times)
+    assert peak == _QSTASH_CONCURRENCY
 
 
 # ---------------------------------------------------------------------------
@@ -219,6 +300,37 @@ async def test_cancel_for_project(mock_cat_cls: MagicMock) -> None:
     mock_q.schedule.delete.assert_called_once_with("qs_x")
 
 
+@patch("services.scheduler.CategoriesRepository")
+async def test_cancel_for_project_bulk(mock_cat_cls: MagicMock) -> None:
+    """All slots of all project schedules go out in one batch; failures don't stop the rest."""
+    mock_cat = MagicMock()
+    mock_cat.get_by_project = AsyncMock(return_value=[MagicMock(id=10), MagicMock(id=11)])
+    mock_cat_cls.return_value = mock_cat
+
+    svc, mock_q = _make_service()
+    mock_q.schedule.delete.side_effect = lambda sid: _raise_404() if sid == "qs_b" else None
+    mock_repo = MagicMock()
+    mock_repo.get_by_project = AsyncMock(
+        return_value=[
+            _make_schedule(id=1, qstash_schedule_ids=["qs_a", "qs_b"]),
+            _make_schedule(id=2, qstash_schedule_ids=[]),
+            _make_schedule(id=3, category_id=11, qstash_schedule_ids=["qs_c"]),
+        ]
+    )
+    mock_repo.update = AsyncMock(return_value=None)
+    svc._schedules = mock_repo
+
+    await svc.cancel_schedules_for_project(1)
+
+    mock_repo.get_by_project.assert_awaited_once_with([10, 11])
+    assert sorted(c.args[0] for c in mock_q.schedule.delete.await_args_list) == ["qs_a", "qs_b", "qs_c"]
+    assert sorted(c.args[0] for c in mock_repo.update.await_args_list) == [1, 3]
+
+
+def _raise_404() -> None:
+    raise Exception("404")
+
+
 # ---------------------------------------------------------------------------
 # estimate_weekly_cost
 # ---------------------------------------------------------------------------
@@ -266,6 +378,9 @@ async def test_create_schedule_full_flow() -> None:
     assert result.enabled is True
     mock_repo.create.assert_called_once()
     mock_repo.update.assert_called_once()
+    update = mock_repo.update.call_args.args[1]
+    assert len(update.slot_minutes) == 1
+    assert update.qstash_schedule_ids == ["qs_new"]
 
 
 # ---------------------------------------------------------------------------
@@ -460,7 +575,7 @@ async def test_get_category_schedules_map_empty() -> None:
 
 
 @patch("services.scheduler.ConnectionsRepository")
-@patch("services.scheduler.CredentialManager")
+@patch("services.scheduler.get_credential_manager")
 @patch("services.scheduler.ProjectsRepository")
 @patch("services.scheduler.CategoriesRepository")
 async def test_apply_schedule_happy(
@@ -580,3 +695,83 @@ async def test_has_active_schedule_different_connection() -> None:
     svc._schedules = mock_repo
 
     assert await svc.has_active_schedule(10, 5) is False
+
+
+# ---------------------------------------------------------------------------
+# rebalance_slots
+# ---------------------------------------------------------------------------
+
+
+def _rebalance_service(schedules: list[PlatformSchedule]) -> tuple[SchedulerService, MagicMock, MagicMock]:
+    svc, mock_q = _make_service()
+    mock_q.schedule.create.side_effect = lambda **kw: kw["schedule_id"]
+    mock_repo = MagicMock()
+    mock_repo.get_enabled = AsyncMock(return_value=schedules)
+    mock_repo.update = AsyncMock(return_value=None)
+    svc._schedules = mock_repo
+    return svc, mock_q, mock_repo
+
+
+def _crowded() -> list[PlatformSchedule]:
+    """Two Monday 09:00 schedules: one placed, one from the old random-jitter era."""
+    common = {"schedule_days": ["mon"], "schedule_times": ["09:00"], "posts_per_day": 1, "enabled": True}
+    return [
+        _make_schedule(id=1, slot_minutes=[540], qstash_schedule_ids=["pub-1-0-540"], **common),
+        _make_schedule(id=2, qstash_schedule_ids=["qs_old"], **common),
+    ]
+
+
+@pytest.fixture
+def _repos():
+    project = MagicMock(id=3, user_id=99, timezone="UTC")
+    with (
+        patch("services.scheduler.CategoriesRepository") as cat_cls,
+        patch("services.scheduler.ProjectsRepository") as proj_cls,
+    ):
+        cat_cls.return_value.get_by_ids = AsyncMock(return_value=[MagicMock(id=10, project_id=3)])
+        proj_cls.return_value.get_by_ids = AsyncMock(return_value=[project])
+        yield
+
+
+@pytest.mark.usefixtures("_repos")
+async def test_rebalance_dry_run_reports_peaks() -> None:
+    svc, mock_q, mock_repo = _rebalance_service(_crowded())
+
+    report = await svc.rebalance_slots()
+
+    assert (report.schedules, report.slots, report.moved) == (2, 2, 1)
+    assert (report.peak_before, report.peak_after) == (2, 1)
+    assert report.applied is False
+    mock_q.schedule.create.assert_not_called()
+    mock_repo.update.assert_not_called()
+
+
+@pytest.mark.usefixtures("_repos")
+async def test_rebalance_apply_recreates_moved_schedule() -> None:
+    """Placed schedule keeps its minute; legacy one gets a new slot, then its old ID is deleted."""
+    svc, mock_q, mock_repo = _rebalance_service(_crowded())
+
+    report = await svc.rebalance_slots(apply=True)
+
+    assert (report.moved, report.failed) == (1, 0)
+    mock_q.schedule.create.assert_called_once()
+    body = json.loads(mock_q.schedule.create.call_args.kwargs["body"])
+    assert (body["schedule_id"], body["user_id"], body["project_id"]) == (2, 99, 3)
+    mock_q.schedule.delete.assert_awaited_once_with("qs_old")
+    schedule_id, update = mock_repo.update.call_args.args
+    assert schedule_id == 2
+    assert update.slot_minutes != [540] and 535 <= update.slot_minutes[0] <= 545
+    assert update.qstash_schedule_ids == [f"pub-2-0-{update.slot_minutes[0]}"]
+
+
+@pytest.mark.usefixtures("_repos")
+async def test_rebalance_failed_create_keeps_old_slots() -> None:
+    svc, mock_q, mock_repo = _rebalance_service(_crowded())
+    mock_q.schedule.create.side_effect = Exception("API error")
+
+    report = await svc.rebalance_slots(apply=True)
+
+    assert (report.moved, report.failed) == (0, 1)
+    deleted = [c.args[0] for c in mock_q.schedule.delete.await_args_list]
+    assert "qs_old" not in deleted
+    mock_repo.update.assert_not_called()
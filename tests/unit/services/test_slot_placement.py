@@ -0,0 +1,97 @@
+"""Tests for services/slot_placement.py — load-aware cron minute placement."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import UTC, datetime
+
+from services.slot_placement import (
+    MINUTES_PER_DAY,
+    add_load,
+    parse_slot,
+    peak,
+    place_minute,
+    place_slots,
+    slot_dows,
+    utc_offset_minutes,
+    week_minutes,
+)
+
+_MON = 1
+
+
+class TestMapping:
+    def test_utc_offset(self) -> None:
+        assert utc_offset_minutes("Europe/Moscow") == 180
+        assert utc_offset_minutes("UTC") == 0
+        assert utc_offset_minutes("Not/AZone") == 0
+
+    def test_utc_offset_follows_dst(self) -> None:
+        assert utc_offset_minutes("Europe/Berlin", datetime(2026, 1, 15, tzinfo=UTC)) == 60
+        assert utc_offset_minutes("Europe/Berlin", datetime(2026, 7, 15, tzinfo=UTC)) == 120
+
+    def test_slot_dows(self) -> None:
+        assert slot_dows(["fri", "mon", "bogus"]) == [1, 5]
+        assert slot_dows([]) == list(range(7))
+
+    def test_week_minutes_wraps_to_previous_day(self) -> None:
+        """Sunday 00:10 in UTC+3 is Saturday 21:10 UTC."""
+        assert week_minutes([0], 10, 180) == [6 * MINUTES_PER_DAY + 21 * 60 + 10]
+
+    def test_peak(self) -> None:
+        histogram: Counter[int] = Counter()
+        add_load(histogram, [1, 2], parse_slot("09:00"), 0)
+        add_load(histogram, [2], parse_slot("09:00"), 0)
+
+        assert peak(histogram) == 2
+        assert peak({}) == 0
+
+
+class TestPlaceMinute:
+    def test_picks_least_loaded_minute(self) -> None:
+        nine = parse_slot("09:00")
+        histogram = {_MON * MINUTES_PER_DAY + m: 3 for m in range(nine - 2, nine + 2)}
+
+        assert place_minute(histogram, [_MON], nine, 0, tolerance=2) == nine + 2
+
+    def test_busiest_day_decides(self) -> None:
+        """A minute free on Monday but full on Tuesday loses to one moderately used on both."""
+        nine = parse_slot("09:00")
+        mon, tue = _MON * MINUTES_PER_DAY, 2 * MINUTES_PER_DAY
+        histogram = {tue + nine: 5, mon + nine - 1: 2, mon + nine + 1: 1, tue + nine + 1: 1}
+
+        assert place_minute(histogram, [_MON, 2], nine, 0, tolerance=1) == nine + 1
+
+    def test_prefer_kept_on_tie(self) -> None:
+        nine = parse_slot("09:00")
+
+        assert place_minute({}, [_MON], nine, 0, tolerance=5, prefer=nine + 3) == nine + 3
+
+    def test_window_does_not_cross_midnight(self) -> None:
+        for _ in range(20):
+            assert 0 <= place_minute({}, [_MON], 2, 0, tolerance=5) <= 7
+
+    def test_timezone_offset_applied(self) -> None:
+        """09:00 Moscow competes with 06:00 UTC load."""
+        nine = parse_slot("09:00")
+        histogram = {_MON * MINUTES_PER_DAY + parse_slot("06:00"): 4}
+
+        assert place_minute(histogram, [_MON], nine, 180, tolerance=1) != nine
+
+
+class TestPlaceSlots:
+    def test_slots_of_one_schedule_do_not_collide(self) -> None:
+        histogram: Counter[int] = Counter()
+
+        minutes = place_slots(histogram, ["mon"], ["09:00", "09:00"], "UTC", tolerance=3)
+
+        assert len(set(minutes)) == 2
+        assert peak(histogram) == 1
+
+    def test_spreads_popular_time(self) -> None:
+        histogram: Counter[int] = Counter()
+
+        for _ in range(11):
+            place_slots(histogram, ["mon"], ["12:00"], "Europe/Moscow", tolerance=5)
+
+        assert peak(histogram) == 1
@@ -469,13 +469,11 @@ class TestH24PublicationsBatch:
 
         mock_db = MockSupabaseClient()
         mock_db.set_response(
-            "publication_logs",
+            "publication_stats",
             MockResponse(
                 data=[
-                    {"user_id": 1},
-                    {"user_id": 1},
-                    {"user_id": 1},
-                    {"user_id": 2},
+                    {"scope_id": 1, "total": 3, "success": 3, "tokens_spent": 0},
+                    {"scope_id": 2, "total": 1, "success": 1, "tokens_spent": 0},
                 ]
             ),
         )
@@ -1,11 +1,13 @@
 """Tests for services/storage.py — Supabase Storage image operations.
 
-Covers: upload (success/failure/WebP conversion/fallback), download (success/failure),
-cleanup_by_paths, cleanup_prefix, signed URL failure, WebP conversion (E33).
+Covers: store (success/failure/WebP conversion/fallback), content-hash dedup
+with an existence check, holder-aware release, batch signed URLs, download
+(success/failure), cleanup_by_paths, cleanup_prefix, WebP conversion (E33).
 """
 
 from __future__ import annotations
 
+import hashlib
 from unittest.mock import AsyncMock, patch
 
 import httpx
@@ -21,6 +23,11 @@ from services.storage import BUCKET, SIGNED_URL_TTL, ImageStorage, StoredImage
 FAKE_URL = "https://test.supabase.co"
 FAKE_KEY = "test-service-role-key"
 BASE_STORAGE = f"{FAKE_URL}/storage/v1"
+WEBP = b"RIFF\x00\x00\x00\x00WEBPVP8 payload"
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
 
 
 @pytest.fixture
@@ -29,12 +36,42 @@ def mock_http() -> AsyncMock:
     return AsyncMock(spec=httpx.AsyncClient)
 
 
+class _FakeHolders:
+    """In-memory stand-in for the Redis sets that record image holders."""
+
+    def __init__(self) -> None:
+        self.sets: dict[str, set[str]] = {}
+
+    async def sadd(self, key: str, *members: str) -> int:
+        before = len(self.sets.setdefault(key, set()))
+        self.sets[key].update(members)
+        return len(self.sets[key]) - before
+
+    async def srem(self, key: str, *members: str) -> int:
+        current = self.sets.get(key, set())
+        removed = len(current & set(members))
+        current.difference_update(members)
+        return removed
+
+    async def scard(self, key: str) -> int:
+        return len(self.sets.get(key, set()))
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        return key in self.sets
+
+
 @pytest.fixture
-def storage(mock_http: AsyncMock) -> ImageStorage:
+def holders() -> _FakeHolders:
+    return _FakeHolders()
+
+
+@pytest.fixture
+def storage(mock_http: AsyncMock, holders: _FakeHolders) -> ImageStorage:
     return ImageStorage(
         supabase_url=FAKE_URL,
         supabase_key=FAKE_KEY,
         http_client=mock_http,
+        redis=holders,  # type: ignore[arg-type]
     )
 
 
@@ -64,129 +101,183 @@ class TestStoredImage:
 
 
 # ---------------------------------------------------------------------------
-# ImageStorage.upload
+# ImageStorage.store
 # ---------------------------------------------------------------------------
 
+_MISSING = httpx.Response(400, json={"statusCode": "404", "error": "not_found", "message": "Object not found"})
+_DUPLICATE = httpx.Response(
+    400, json={"statusCode": "409", "error": "Duplicate", "message": "The resource already exists"}
+)
+
 
-class TestUpload:
-    @patch("services.storage.time")
-    async def test_upload_webp_success_returns_stored_image(
+class TestStore:
+    async def test_store_webp_uploads_under_content_hash(
         self,
-        mock_time: AsyncMock,
         storage: ImageStorage,
         mock_http: AsyncMock,
+        holders: _FakeHolders,
     ) -> None:
-        """upload() converts to WebP and returns StoredImage with correct path."""
-        mock_time.time.return_value = 1700000000
-        user_id = 123
-        project_id = 456
-        index = 0
-        # WebP conversion is mocked — just test path format
-        signed_suffix = "/object/sign/content-images/token123"
-
-        upload_resp = httpx.Response(200, json={"Key": "ok"})
-        sign_resp = httpx.Response(200, json={"signedURL": signed_suffix})
-        mock_http.post.side_effect = [upload_resp, sign_resp]
-
-        # Patch _convert_to_webp to avoid needing Pillow
-        with patch.object(
-            ImageStorage,
-            "_convert_to_webp",
-            return_value=(b"webp-data", "webp", "image/webp"),
-        ):
-            result = await storage.upload(b"png-data", user_id, project_id, index, mime="image/png")
-
-        assert isinstance(result, StoredImage)
-        assert result.path == "123/456/1700000000_0.webp"
-        assert result.signed_url == f"{BASE_STORAGE}{signed_suffix}"
-
-        # Verify upload call uses webp mime
-        upload_call = mock_http.post.call_args_list[0]
-        assert upload_call[1]["headers"]["Content-Type"] == "image/webp"
-        assert upload_call[1]["headers"]["x-upsert"] == "true"
-        assert upload_call[1]["content"] == b"webp-data"
-
-    @patch("services.storage.time")
-    async def test_upload_webp_fallback_uses_original_ext(
-        self,
-        mock_time: AsyncMock,
-        storage: ImageStorage,
-        mock_http: AsyncMock,
+        """store() converts to WebP, uploads without upsert and records the holder."""
+        mock_http.get.return_value = _MISSING
+        mock_http.post.return_value = httpx.Response(200, json={"Key": "ok"})
+
+        with patch.object(ImageStorage, "_convert_to_webp", return_value=(b"webp-data", "webp", "image/webp")):
+            path = await storage.store(b"png-data", 123, 456, mime="image/png", holder="publish:m1")
+
+        assert path == f"123/456/{_sha(b'webp-data')}.webp"
+        upload_call = mock_http.post.call_args
+        assert upload_call.args[0] == f"{BASE_STORAGE}/object/{BUCKET}/{path}"
+        assert upload_call.kwargs["headers"]["Content-Type"] == "image/webp"
+        assert "x-upsert" not in upload_call.kwargs["headers"]
+        assert upload_call.kwargs["content"] == b"webp-data"
+        assert holders.sets[f"storage_holders:{path}"] == {"publish:m1"}
+        assert storage.stats.uploads == 1
+
+    async def test_store_webp_fallback_uses_original_ext(self, storage: ImageStorage, mock_http: AsyncMock) -> None:
+        """store() falls back to original format when WebP conversion fails (E33)."""
+        mock_http.get.return_value = _MISSING
+        mock_http.post.return_value = httpx.Response(200, json={"Key": "ok"})
+
+        with patch.object(ImageStorage, "_convert_to_webp", return_value=(b"jpeg-data", "jpg", "image/jpeg")):
+            path = await storage.store(b"jpeg-data", 1, 2, mime="image/jpeg", holder="publish:m1")
+
+        assert path.endswith(f"/{_sha(b'jpeg-data')}.jpg")
+
+    @pytest.mark.parametrize("status", [403, 500])
+    async def test_store_failure_raises_app_error(
+        self, storage: ImageStorage, mock_http: AsyncMock, status: int
     ) -> None:
-        """upload() falls back to original format when WebP conversion fails (E33)."""
-        mock_time.time.return_value = 1700000000
+        """store() raises AppError when storage returns non-200/201."""
+        mock_http.get.return_value = _MISSING
+        mock_http.post.return_value = httpx.Response(status, text="error")
 
-        upload_resp = httpx.Response(200, json={"Key": "ok"})
-        sign_resp = httpx.Response(200, json={"signedURL": "/signed"})
-        mock_http.post.side_effect = [upload_resp, sign_resp]
+        with pytest.raises(AppError, match=f"Storage upload failed: {status}"):
+            await storage.store(WEBP, 1, 2, mime="image/webp", holder="publish:m1")
 
-        # _convert_to_webp returns original format on failure
-        with patch.object(
-            ImageStorage,
-            "_convert_to_webp",
-            return_value=(b"jpeg-data", "jpg", "image/jpeg"),
-        ):
-            result = await storage.upload(b"jpeg-data", 1, 2, 0, mime="image/jpeg")
 
-        assert result.path == "1/2/1700000000_0.jpg"
+class TestDedup:
+    async def test_existing_object_is_not_sent_again(self, storage: ImageStorage, mock_http: AsyncMock) -> None:
+        """The same bytes from another run reuse the object: no POST, bytes counted as saved."""
+        mock_http.get.side_effect = [_MISSING, httpx.Response(200, json={"name": "x"})]
+        mock_http.post.return_value = httpx.Response(200, json={"Key": "ok"})
 
-    async def test_upload_failure_non200_raises_app_error(
-        self,
-        storage: ImageStorage,
-        mock_http: AsyncMock,
+        publish = await storage.store(WEBP, 1, 2, mime="image/webp", holder="publish:m1")
+        preview = await storage.store(WEBP, 1, 2, mime="image/webp", holder="preview:1:2:r1:1")
+
+        assert publish == preview == f"1/2/{_sha(WEBP)}.webp"
+        assert mock_http.post.await_count == 1
+        assert mock_http.get.call_args.args[0] == f"{BASE_STORAGE}/object/info/{BUCKET}/{publish}"
+        report = storage.stats.report()
+        assert report["uploads"] == 1
+        assert report["dedup_hits"] == 1
+        assert report["bytes_saved"] == len(WEBP)
+        assert report["bytes_uploaded"] == len(WEBP)
+
+    async def test_concurrent_duplicate_is_not_counted_as_saved(
+        self, storage: ImageStorage, mock_http: AsyncMock
     ) -> None:
-        """upload() raises AppError when storage returns non-200/201."""
-        upload_resp = httpx.Response(403, json={"error": "Forbidden"})
-        mock_http.post.return_value = upload_resp
-
-        with (
-            patch.object(
-                ImageStorage,
-                "_convert_to_webp",
-                return_value=(b"data", "webp", "image/webp"),
-            ),
-            pytest.raises(AppError, match="Storage upload failed: 403"),
-        ):
-            await storage.upload(b"data", 1, 2, 0)
-
-    async def test_upload_failure_500_raises_app_error(
-        self,
-        storage: ImageStorage,
-        mock_http: AsyncMock,
+        """A "Duplicate" answer (another upload won the race) is fine, but the bytes were sent."""
+        mock_http.get.return_value = _MISSING
+        mock_http.post.return_value = _DUPLICATE
+
+        path = await storage.store(WEBP, 1, 2, mime="image/webp", holder="publish:m1")
+
+        assert path.endswith(f"/{_sha(WEBP)}.webp")
+        assert storage.stats.dedup_hits == 0
+        assert storage.stats.bytes_saved == 0
+        assert storage.stats.bytes_uploaded == len(WEBP)
+
+    async def test_holder_recorded_before_existence_check(
+        self, storage: ImageStorage, mock_http: AsyncMock, holders: _FakeHolders
     ) -> None:
-        """upload() raises AppError on server error."""
-        upload_resp = httpx.Response(500, text="Internal Server Error")
-        mock_http.post.return_value = upload_resp
-
-        with (
-            patch.object(
-                ImageStorage,
-                "_convert_to_webp",
-                return_value=(b"data", "webp", "image/webp"),
-            ),
-            pytest.raises(AppError, match="Storage upload failed: 500"),
-        ):
-            await storage.upload(b"data", 5, 3, 0)
-
-    async def test_upload_signed_url_failure_raises_app_error(
-        self,
-        storage: ImageStorage,
-        mock_http: AsyncMock,
+        """A release() racing with store() must already see the new holder."""
+        seen: list[set[str]] = []
+
+        async def _info(url: str, **kwargs: object) -> httpx.Response:
+            seen.append(set(holders.sets.get(f"storage_holders:1/2/{_sha(WEBP)}.webp", set())))
+            return httpx.Response(200, json={})
+
+        mock_http.get.side_effect = _info
+
+        await storage.store(WEBP, 1, 2, mime="image/webp", holder="preview:1:2:r1:1")
+
+        assert seen == [{"preview:1:2:r1:1"}]
+
+
+class TestRelease:
+    async def test_shared_object_kept_until_last_holder(
+        self, storage: ImageStorage, mock_http: AsyncMock, holders: _FakeHolders
+    ) -> None:
+        path = f"1/2/{_sha(WEBP)}.webp"
+        holders.sets[f"storage_holders:{path}"] = {"publish:m1", "preview:1:2:r1:1"}
+        mock_http.post.return_value = httpx.Response(200, json=[])
+
+        assert await storage.release([path], "publish:m1") == 0
+        mock_http.post.assert_not_awaited()
+
+        assert await storage.release([path], "preview:1:2:r1:1") == 1
+        mock_http.post.assert_awaited_once()
+        assert mock_http.post.call_args.kwargs["json"] == [path]
+
+    async def test_path_without_holders_is_deleted(self, storage: ImageStorage, mock_http: AsyncMock) -> None:
+        """Objects stored before holders were recorded have no set and are deleted as before."""
+        mock_http.post.return_value = httpx.Response(200, json=[])
+
+        assert await storage.release(["1/2/legacy.webp"], "") == 1
+
+    async def test_release_images_groups_by_holder(
+        self, storage: ImageStorage, mock_http: AsyncMock, holders: _FakeHolders
     ) -> None:
-        """upload() raises AppError when signed URL creation fails."""
-        upload_resp = httpx.Response(200, json={"Key": "ok"})
-        sign_resp = httpx.Response(500, json={"error": "internal"})
-        mock_http.post.side_effect = [upload_resp, sign_resp]
-
-        with (
-            patch.object(
-                ImageStorage,
-                "_convert_to_webp",
-                return_value=(b"data", "webp", "image/webp"),
-            ),
-            pytest.raises(AppError, match="Signed URL creation failed: 500"),
-        ):
-            await storage.upload(b"data", 1, 2, 0)
+        holders.sets["storage_holders:1/2/a.webp"] = {"preview:a", "publish:m1"}
+        holders.sets["storage_holders:1/2/b.webp"] = {"preview:a"}
+        mock_http.post.return_value = httpx.Response(200, json=[])
+
+        deleted = await storage.release_images(
+            [
+                {"storage_path": "1/2/a.webp", "storage_holder": "preview:a"},
+                {"storage_path": "1/2/b.webp", "storage_holder": "preview:a"},
+                {"url": "no-path"},
+            ]
+        )
+
+        assert deleted == 1
+        assert mock_http.post.call_args.kwargs["json"] == ["1/2/b.webp"]
+        assert holders.sets["storage_holders:1/2/a.webp"] == {"publish:m1"}
+
+
+class TestSignUrls:
+    async def test_one_request_for_all_paths(self, storage: ImageStorage, mock_http: AsyncMock) -> None:
+        mock_http.post.return_value = httpx.Response(
+            200,
+            json=[
+                {"path": "1/2/a.webp", "signedURL": "/object/sign/content-images/1/2/a.webp?token=a", "error": None},
+                {"path": "1/2/b.webp", "signedURL": None, "error": "Either the object does not exist"},
+                {"path": "1/2/c.webp", "signedURL": "/object/sign/content-images/1/2/c.webp?token=c", "error": None},
+            ],
+        )
+
+        signed = await storage.sign_urls(["1/2/a.webp", "1/2/b.webp", "1/2/c.webp"])
+
+        assert signed == {
+            "1/2/a.webp": f"{BASE_STORAGE}/object/sign/content-images/1/2/a.webp?token=a",
+            "1/2/c.webp": f"{BASE_STORAGE}/object/sign/content-images/1/2/c.webp?token=c",
+        }
+        mock_http.post.assert_awaited_once_with(
+            f"{BASE_STORAGE}/object/sign/{BUCKET}",
+            json={"expiresIn": SIGNED_URL_TTL, "paths": ["1/2/a.webp", "1/2/b.webp", "1/2/c.webp"]},
+            headers={**storage._headers, "Content-Type": "application/json"},
+        )
+        assert storage.stats.requests_saved == 2
+
+    async def test_empty_paths_make_no_request(self, storage: ImageStorage, mock_http: AsyncMock) -> None:
+        assert await storage.sign_urls([]) == {}
+        mock_http.post.assert_not_awaited()
+
+    async def test_failure_raises_app_error(self, storage: ImageStorage, mock_http: AsyncMock) -> None:
+        mock_http.post.return_value = httpx.Response(500, json={"error": "internal"})
+
+        with pytest.raises(AppError, match="Signed URL creation failed: 500"):
+            await storage.sign_urls(["1/2/a.webp"])
 
 
 # ---------------------------------------------------------------------------
@@ -203,6 +294,13 @@ class TestConvertToWebp:
         assert mime == "image/png"
         assert result_bytes == b"not-an-image"
 
+    def test_webp_input_is_not_reencoded(self) -> None:
+        """Images converted upstream (reconciliation) are uploaded as is."""
+        webp = b"RIFF\x00\x00\x00\x00WEBPVP8 payload"
+        result_bytes, ext, mime = ImageStorage._convert_to_webp(webp, "image/webp")
+        assert result_bytes is webp
+        assert (ext, mime) == ("webp", "image/webp")
+
     def test_fallback_on_error_returns_original_jpg(self) -> None:
         """_convert_to_webp falls back to jpg for JPEG mime."""
         _result_bytes, ext, mime = ImageStorage._convert_to_webp(b"not-an-image", "image/jpeg")
@@ -341,6 +439,25 @@ class TestCleanupPrefix:
             "123/456/1700000000_1.webp",
         ]
 
+    async def test_cleanup_prefix_descends_into_scope_folders(
+        self,
+        storage: ImageStorage,
+        mock_http: AsyncMock,
+    ) -> None:
+        mock_http.post.side_effect = [
+            httpx.Response(200, json=[{"name": "ab12", "id": None}, {"name": "top.webp", "id": "f1"}]),
+            httpx.Response(200, json=[{"name": "x.webp", "id": "f2"}]),
+            httpx.Response(200, json=[]),
+            httpx.Response(200, json=[]),
+        ]
+
+        result = await storage.cleanup_prefix("123/456/")
+
+        assert result == 2
+        assert mock_http.post.call_args_list[1][1]["json"]["prefix"] == "123/456/ab12/"
+        assert mock_http.post.call_args_list[2][1]["json"] == ["123/456/ab12/x.webp"]
+        assert mock_http.post.call_args_list[3][1]["json"] == ["123/456/top.webp"]
+
     async def test_cleanup_prefix_no_files_returns_zero(
         self,
         storage: ImageStorage,
@@ -194,6 +194,11 @@ class TestGetBalance:
         mock_users_repo.get_by_id.return_value = None
         assert await service.get_balance(123) == 0
 
+    async def test_fresh_rereads_user(self, service: TokenService, mock_users_repo: AsyncMock) -> None:
+        mock_users_repo.get_by_id.return_value = None
+        await service.get_balance(123, fresh=True)
+        mock_users_repo.get_by_id.assert_awaited_once_with(123, fresh=True)
+
 
 # ---------------------------------------------------------------------------
 # TokenService.charge
@@ -101,3 +101,15 @@ class TestRedisClientExists:
         mock_redis.exists.return_value = 1
         result = await client.exists("key")
         assert result == 1
+
+
+class TestRedisClientSets:
+    @pytest.mark.asyncio
+    async def test_set_commands_pass_through(self, client: RedisClient, mock_redis: AsyncMock) -> None:
+        mock_redis.sadd.return_value = 1
+        mock_redis.srem.return_value = 1
+        mock_redis.scard.return_value = 0
+        assert await client.sadd("s", "a") == 1
+        assert await client.srem("s", "a") == 1
+        assert await client.scard("s") == 0
+        mock_redis.sadd.assert_awaited_once_with("s", "a")
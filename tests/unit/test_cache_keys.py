@@ -5,7 +5,6 @@ from cache.keys import (
     FSM_TTL,
     PINTEREST_AUTH_TTL,
     PROMPT_CACHE_TTL,
-    PUBLISH_LOCK_TTL,
     RATE_LIMIT_WINDOW,
     SERPER_TTL,
     CacheKeys,
@@ -16,9 +15,6 @@ class TestTTLConstants:
     def test_fsm_ttl_24h(self) -> None:
         assert FSM_TTL == 86400
 
-    def test_publish_lock_ttl_10min(self) -> None:
-        assert PUBLISH_LOCK_TTL == 600
-
     def test_branding_ttl_7days(self) -> None:
         assert BRANDING_TTL == 604800
 
@@ -42,10 +38,6 @@ class TestCacheKeys:
     def test_throttle_key(self) -> None:
         assert CacheKeys.throttle(123, "generate") == "throttle:123:generate"
 
-    def test_publish_lock_key(self) -> None:
-        key = CacheKeys.publish_lock("pub_42_2026-02-11T10:00:00Z")
-        assert key == "publish_lock:pub_42_2026-02-11T10:00:00Z"
-
     def test_branding_key(self) -> None:
         assert CacheKeys.branding(5) == "branding:5"
 